@@ -0,0 +1,400 @@
+# benchmarks/run_benchmarks.py
+# 전략/리스크 체크/백테스트/거래소 어댑터 성능 측정 및 기준 결과 대비 회귀 검사
+#
+# 사용 예:
+#   python -m benchmarks.run_benchmarks                          # 측정 후 benchmarks/results/latest.json 저장
+#   python -m benchmarks.run_benchmarks --baseline benchmarks/results/baseline.json
+#   python -m benchmarks.run_benchmarks --only strategy --scale 0.1
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from src.strategies.breakout import BreakoutStrategy
+from src.strategies.risk_management import PortfolioRiskManager, RiskManager
+from src.strategies.simple_moving_average import SimpleMovingAverageStrategy
+from src.trading.backtester import Backtester
+from src.utils.metrics import MetricsRegistry
+
+DEFAULT_OUTPUT = os.path.join("benchmarks", "results", "latest.json")
+DEFAULT_THRESHOLD = 0.20  # 기준 대비 20% 이상 느려지면 회귀로 판단
+STRATEGY_WINDOWS = ((5, 20), (20, 100), (50, 200))
+BREAKOUT_LOOKBACKS = (20, 5000)
+PORTFOLIO_POSITIONS = 500
+
+
+def _prices(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return 50000000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.002, n)))
+
+
+def _best_of(fn, repeat):
+    """
+    fn을 repeat번 실행해 가장 짧은 소요 시간(초)을 반환합니다. (다른 프로세스 간섭의 영향을 줄이기 위함)
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _rate(name, count, seconds, unit):
+    return name, {"value": count / seconds, "unit": unit, "higher_is_better": True}
+
+
+def bench_strategy(scale=1.0, repeat=3):
+    """
+    SimpleMovingAverageStrategy(윈도우 크기별)와 BreakoutStrategy(채널 기간별)의
+    update_price + compute_signals 초당 처리 틱 수를 측정합니다.
+    """
+    n = max(1000, int(20000 * scale))
+    prices = _prices(n).tolist()
+    results = []
+    for short_window, long_window in STRATEGY_WINDOWS:
+        for incremental in (False, True):
+            def run():
+                strategy = SimpleMovingAverageStrategy(short_window, long_window, incremental=incremental)
+                for price in prices:
+                    strategy.update_price(price)
+                    strategy.compute_signals()
+
+            mode = "incremental" if incremental else "full"
+            name = f"strategy.sma_{short_window}_{long_window}.{mode}"
+            results.append(_rate(name, n, _best_of(run, repeat), "ticks/s"))
+
+    for lookback in BREAKOUT_LOOKBACKS:
+        def run():
+            strategy = BreakoutStrategy(lookback)
+            for price in prices:
+                strategy.update_price(price)
+                strategy.compute_signals()
+
+        results.append(_rate(f"strategy.breakout_{lookback}", n, _best_of(run, repeat), "ticks/s"))
+    return results
+
+
+def bench_risk(scale=1.0, repeat=3):
+    """
+    포지션 보유 중 RiskManager.check_exit_conditions의 초당 호출 수와,
+    여러 시장 포지션을 RiskManager 여러 개/PortfolioRiskManager 배치 평가로 확인할 때의 초당 확인 수를 측정합니다.
+    """
+    n = max(1000, int(200000 * scale))
+    prices = (50000000.0 * (1 + 0.04 * np.sin(np.arange(n) / 50.0))).tolist()
+    risk = RiskManager(stop_loss_pct=0.05, take_profit_pct=0.10)
+    risk.set_entry_price(50000000.0)
+
+    def run():
+        check = risk.check_exit_conditions
+        for price in prices:
+            check(price)
+
+    results = [_rate("risk.check_exit_conditions", n, _best_of(run, repeat), "calls/s")]
+
+    # 여러 시장 포지션: 포지션마다 RiskManager 하나 vs PortfolioRiskManager 한 번의 배치 평가
+    positions, batches = PORTFOLIO_POSITIONS, max(10, int(2000 * scale))
+    rng = np.random.default_rng(5)
+    entries = rng.uniform(1000.0, 100000.0, positions)
+    moves = entries * rng.uniform(0.97, 1.03, (batches, positions))
+    singles = [RiskManager(0.05, 0.10) for _ in range(positions)]
+    portfolio = PortfolioRiskManager(0.05, 0.10, trailing_stop_pct=0.03)
+    for i, (single, entry) in enumerate(zip(singles, entries)):
+        single.set_entry_price(entry)
+        portfolio.open(f"KRW-C{i}", entry)
+    rows = moves.tolist()
+
+    def run_singles():
+        for row in rows:
+            for single, price in zip(singles, row):
+                single.check_exit_conditions(price)
+
+    def run_portfolio():
+        evaluate = portfolio.evaluate
+        for row in moves:
+            evaluate(row)
+
+    count = positions * batches
+    results.append(_rate(f"risk.positions_{positions}.single", count, _best_of(run_singles, repeat), "checks/s"))
+    results.append(_rate(f"risk.positions_{positions}.portfolio", count, _best_of(run_portfolio, repeat), "checks/s"))
+    return results
+
+
+def bench_backtest(scale=1.0, repeat=3):
+    """
+    Backtester의 루프/벡터화 경로별 초당 처리 봉 수를 측정합니다.
+    """
+    backtester = Backtester()
+    results = []
+    for mode, n in (("loop", int(50000 * scale)), ("vectorized", int(1000000 * scale))):
+        prices = _prices(max(1000, n), seed=1)
+        seconds = _best_of(lambda: backtester.run(prices, mode=mode), repeat)
+        results.append(_rate(f"backtest.{mode}", len(prices), seconds, "bars/s"))
+    return results
+
+
+def bench_upbit_api(scale=1.0, repeat=3):
+    """
+    로컬 스텁 서버를 상대로 UpbitAPI 호출 1회당 오버헤드(서명, 세션, JSON 처리 포함)를 측정합니다.
+    (Upbit 요청 수 제한 대기는 제외)
+    """
+    from src.exchange_apis.rate_limit import RateLimitController
+    from src.exchange_apis.upbit_api import UpbitAPI
+    from tests.stub_servers import UpbitStubServer
+
+    n = max(50, int(500 * scale))
+    results = []
+    with UpbitStubServer() as server:
+        server.tickers = {"KRW-BTC": 50000000.0}
+        server.accounts = [{"currency": "KRW", "balance": "100000.0"}]
+        api = UpbitAPI(access_key="bench", secret_key="benchmark-secret-key-0123456789abcdef",
+                       base_url=server.base_url, metrics=MetricsRegistry(window=n),
+                       rate_limiter=RateLimitController(enabled=False))
+        try:
+            calls = (
+                ("get_current_price", lambda: api.get_current_price("KRW-BTC")),
+                ("get_accounts", api.get_accounts),
+            )
+            for name, call in calls:
+                call()  # 연결 수립은 측정에서 제외
+
+                def run():
+                    for _ in range(n):
+                        call()
+
+                seconds = _best_of(run, repeat)
+                del server.requests[:]
+                results.append((f"upbit_api.{name}",
+                                {"value": seconds / n * 1e6, "unit": "us/call", "higher_is_better": False}))
+        finally:
+            api.close()
+    return results
+
+
+def bench_bars(scale=1.0, repeat=3):
+    """
+    틱 -> 1분봉 집계의 초당 처리 틱 수를 스트리밍(TimeBarAggregator)/배치(resample_ticks)별로 측정합니다.
+    """
+    from src.data_handler.preprocess import TimeBarAggregator, resample_ticks
+
+    n = max(1000, int(200000 * scale))
+    rng = np.random.default_rng(3)
+    timestamps = 1700000000000 + np.cumsum(rng.integers(0, 2000, n))
+    prices = _prices(n, seed=3)
+    volumes = rng.exponential(0.01, n)
+    rows = list(zip(timestamps.tolist(), prices.tolist(), volumes.tolist()))
+
+    def stream():
+        aggregator = TimeBarAggregator(60_000)
+        for t, p, v in rows:
+            aggregator.update(t, p, v)
+        aggregator.flush()
+
+    return [
+        _rate("bars.time_1m.streaming", n, _best_of(stream, repeat), "ticks/s"),
+        _rate("bars.time_1m.batch", n,
+              _best_of(lambda: resample_ticks(timestamps, prices, volumes, 60_000), repeat), "ticks/s"),
+    ]
+
+
+def bench_indicators(scale=1.0, repeat=3):
+    """
+    IndicatorEngine에 SMA/EMA/RSI/볼린저/ATR/최고·최저를 모두 구독했을 때
+    증분 업데이트와 배치 계산(compute_batch)의 초당 처리 봉 수를 측정합니다.
+    """
+    from src.strategies.indicators import IndicatorEngine
+
+    def engine():
+        e = IndicatorEngine()
+        e.sma(20), e.ema(12), e.rsi(14), e.bollinger(20, 2.0), e.atr(14), e.rolling_max(20), e.rolling_min(20)
+        return e
+
+    n_stream, n_batch = max(1000, int(50000 * scale)), max(1000, int(1000000 * scale))
+    prices = _prices(n_stream, seed=4).tolist()
+
+    def stream():
+        update = engine().update
+        for price in prices:
+            update(price)
+
+    batch_prices = _prices(n_batch, seed=4)
+    return [
+        _rate("indicators.all.incremental", n_stream, _best_of(stream, repeat), "bars/s"),
+        _rate("indicators.all.batch", n_batch, _best_of(lambda: engine().compute_batch(batch_prices), repeat), "bars/s"),
+    ]
+
+
+def bench_replay(scale=1.0, repeat=3):
+    """
+    ReplayPriceSource + 가상 시계로 run_live_trading 전체 루프의 초당 처리 틱 수를 측정합니다.
+    """
+    from src.trading.replay import run_replay
+
+    n = max(1000, int(50000 * scale))
+    prices = _prices(n, seed=2)
+    timestamps = 1700000000000 + 5000 * np.arange(n)
+    seconds = _best_of(lambda: run_replay({"timestamp": timestamps, "close": prices},
+                                          SimpleMovingAverageStrategy(5, 20, incremental=True),
+                                          initial_cash=1e12), repeat)
+    return [_rate("replay.live_loop", n, seconds, "ticks/s")]
+
+
+def bench_journal(scale=1.0, repeat=3):
+    """
+    TradeJournal의 기록 호출(매매 루프가 기다리는 시간)과 백그라운드 커밋까지의 초당 행 수,
+    기록된 체결 전체의 손익 통계(pnl_stats) 계산의 초당 처리 행 수를 측정합니다.
+    """
+    from src.data_handler.journal import TradeJournal, pnl_stats
+
+    n_write, n_fills = max(1000, int(200000 * scale)), max(1000, int(2000000 * scale))
+    rng = np.random.default_rng(6)
+    prices = _prices(n_write, seed=6).tolist()
+    results = []
+    with tempfile.TemporaryDirectory() as root:
+        with TradeJournal(os.path.join(root, "journal.sqlite3"), batch_size=5000) as journal:
+            enqueue, commit = [], []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                for price in prices:
+                    journal.record_fill("KRW-BTC", "buy", price, 0.001, fee=price * 0.0005e-3)
+                enqueue.append(time.perf_counter() - started)
+                journal.flush()
+                commit.append(time.perf_counter() - started)
+        results.append(_rate("journal.record", n_write, min(enqueue), "rows/s"))
+        results.append(_rate("journal.record_and_commit", n_write, min(commit), "rows/s"))
+
+    side = np.where(rng.random(n_fills) < 0.55, 1, -1)
+    price = _prices(n_fills, seed=7)
+    volume = rng.uniform(0.001, 0.01, n_fills)
+    fee = price * volume * 0.0005
+    results.append(_rate("journal.pnl_stats", n_fills,
+                         _best_of(lambda: pnl_stats(side, price, volume, fee), repeat), "rows/s"))
+    return results
+
+
+BENCHMARKS = {
+    "strategy": bench_strategy,
+    "risk": bench_risk,
+    "backtest": bench_backtest,
+    "upbit_api": bench_upbit_api,
+    "bars": bench_bars,
+    "indicators": bench_indicators,
+    "replay": bench_replay,
+    "journal": bench_journal,
+}
+
+
+def run_benchmarks(only=None, scale=1.0, repeat=3):
+    """
+    벤치마크를 실행하고 결과를 반환합니다.
+
+    Args:
+        only (list): 실행할 그룹 이름 (None이면 전체, 예: ["strategy", "risk"])
+        scale (float): 입력 크기 배율 (빠른 확인용으로 0.1 등)
+        repeat (int): 측정 반복 횟수 (가장 빠른 값을 사용)
+
+    Returns:
+        dict: {"meta": {...}, "results": {이름: {"value", "unit", "higher_is_better"}}}
+    """
+    groups = only or list(BENCHMARKS)
+    unknown = set(groups) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"알 수 없는 벤치마크: {sorted(unknown)}")
+    results = {}
+    for group in groups:
+        for name, result in BENCHMARKS[group](scale=scale, repeat=repeat):
+            results[name] = result
+    meta = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "numpy": np.__version__,
+        "scale": scale,
+        "repeat": repeat,
+    }
+    return {"meta": meta, "results": results}
+
+
+def compare_results(current, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    현재 결과를 기준 결과와 비교합니다. 양쪽에 모두 있는 항목만 비교합니다.
+
+    Args:
+        current (dict): run_benchmarks() 결과
+        baseline (dict): 이전에 저장한 run_benchmarks() 결과
+        threshold (float): 허용 악화 비율 (0.2 = 20%)
+
+    Returns:
+        list: (이름, 기준 값, 현재 값, 변화율, 회귀 여부) 목록. 변화율은 양수가 개선
+    """
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or base["value"] <= 0:
+            continue
+        change = result["value"] / base["value"] - 1.0
+        if not result["higher_is_better"]:
+            change = base["value"] / result["value"] - 1.0
+        rows.append((name, base["value"], result["value"], change, change < -threshold))
+    return rows
+
+
+def format_results(current, comparison=None):
+    """
+    결과(와 비교)를 사람이 읽을 수 있는 표 문자열로 만듭니다.
+    """
+    compared = {row[0]: row for row in comparison or []}
+    lines = [f"{'benchmark':<40} {'value':>16}  unit       change"]
+    for name, result in current["results"].items():
+        line = f"{name:<40} {result['value']:>16,.1f}  {result['unit']:<9}"
+        if name in compared:
+            _, _, _, change, regressed = compared[name]
+            line += f"  {change:+7.1%}" + ("  REGRESSION" if regressed else "")
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def save_results(results, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AlphaMindPro 성능 벤치마크")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="실행할 벤치마크 그룹")
+    parser.add_argument("--scale", type=float, default=1.0, help="입력 크기 배율")
+    parser.add_argument("--repeat", type=int, default=3, help="측정 반복 횟수")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="결과 JSON 경로")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 경로")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="회귀 판단 비율")
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(only=args.only, scale=args.scale, repeat=args.repeat)
+    save_results(current, args.output)
+
+    comparison = None
+    if args.baseline:
+        comparison = compare_results(current, load_results(args.baseline), args.threshold)
+    print(format_results(current, comparison))
+    print(f"\nresults saved to {args.output}")
+
+    if comparison and any(row[4] for row in comparison):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
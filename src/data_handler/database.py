@@ -0,0 +1,263 @@
+# src/data_handler/database.py
+# 시장/봉 간격/타임스탬프 기준으로 캔들을 저장하는 로컬 컬럼형 저장소
+import os
+import shutil
+import sqlite3
+import threading
+
+import numpy as np
+
+# 저장 컬럼과 자료형 (timestamp는 캔들 시작 시각, UTC 기준 밀리초)
+COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+DTYPES = {
+    "timestamp": np.int64,
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    market TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    start_ts INTEGER NOT NULL,
+    end_ts INTEGER NOT NULL,
+    rows INTEGER NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_segments_key ON segments (market, interval, start_ts);
+"""
+
+
+def candles_to_columns(candles):
+    """
+    여러 형태의 캔들 입력을 컬럼별 NumPy 배열 dict로 변환합니다.
+
+    Args:
+        candles: 컬럼 dict, 구조화 배열 또는 {"timestamp", "open", ...} dict의 리스트
+
+    Returns:
+        dict: 컬럼 이름 -> np.ndarray
+    """
+    if isinstance(candles, (list, tuple)):
+        return {
+            name: np.fromiter((c[name] for c in candles), dtype=DTYPES[name], count=len(candles))
+            for name in COLUMNS
+        }
+    return {name: np.asarray(candles[name], dtype=DTYPES[name]) for name in COLUMNS}
+
+
+class CandleStore:
+    """
+    CandleStore는 캔들을 추가 전용 세그먼트 단위로 저장하는 클래스입니다.
+
+    - 세그먼트 목록(시장, 간격, 시작/끝 타임스탬프, 경로)은 SQLite에 저장합니다.
+    - 각 세그먼트는 컬럼별 .npy 파일이며, 조회 시 np.load(mmap_mode="r")로 메모리 매핑합니다.
+    - 조회 범위가 한 세그먼트 안에 있으면 복사 없는 memmap 슬라이스를 반환합니다.
+      여러 세그먼트에 걸치면 합쳐서 정렬한 복사본을 반환하므로, compact()로 세그먼트를 합쳐 두면 좋습니다.
+    """
+    def __init__(self, root="data/candles"):
+        """
+        Args:
+            root (str): 저장소 루트 디렉터리
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(root, "index.sqlite3"), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._mmaps = {}  # (세그먼트 경로, 컬럼) -> memmap
+
+    def close(self):
+        with self._lock:
+            self._mmaps.clear()
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _segments(self, market, interval, start=None, end=None):
+        sql = "SELECT id, start_ts, end_ts, rows, path FROM segments WHERE market = ? AND interval = ?"
+        args = [market, interval]
+        if start is not None:
+            sql += " AND end_ts >= ?"
+            args.append(int(start))
+        if end is not None:
+            sql += " AND start_ts < ?"
+            args.append(int(end))
+        sql += " ORDER BY start_ts, id"
+        return self._conn.execute(sql, args).fetchall()
+
+    def _column(self, path, name):
+        key = (path, name)
+        arr = self._mmaps.get(key)
+        if arr is None:
+            arr = np.load(os.path.join(self.root, path, f"{name}.npy"), mmap_mode="r")
+            self._mmaps[key] = arr
+        return arr
+
+    def append(self, market, interval, candles):
+        """
+        캔들을 새 세그먼트로 추가합니다. 이미 저장된 타임스탬프와 입력 내 중복은 버립니다.
+
+        Args:
+            market (str): 예: "KRW-BTC"
+            interval (str): 예: "minute1", "day"
+            candles: candles_to_columns가 받는 형태의 캔들 데이터
+
+        Returns:
+            int: 실제로 저장된 캔들 수
+        """
+        cols = candles_to_columns(candles)
+        ts = cols["timestamp"]
+        if not len(ts):
+            return 0
+
+        # 입력 정렬 및 입력 내부 중복 제거 (같은 타임스탬프는 처음 값 유지)
+        order = np.argsort(ts, kind="stable")
+        ts_sorted = ts[order]
+        first = np.concatenate(([True], ts_sorted[1:] != ts_sorted[:-1]))
+        order = order[first]
+        ts = ts[order]
+
+        with self._lock:
+            # 기존 세그먼트와 겹치는 타임스탬프 제거
+            keep = np.ones(len(ts), dtype=bool)
+            for _, _, _, _, path in self._segments(market, interval, ts[0], ts[-1] + 1):
+                seg_ts = self._column(path, "timestamp")
+                lo, hi = np.searchsorted(seg_ts, [ts[0], ts[-1] + 1])
+                keep &= ~np.isin(ts, seg_ts[lo:hi], assume_unique=True)
+            order = order[keep]
+            if not len(order):
+                return 0
+            data = {name: np.ascontiguousarray(cols[name][order]) for name in COLUMNS}
+            self._write_segment(market, interval, data)
+        return len(order)
+
+    def _write_segment(self, market, interval, data):
+        ts = data["timestamp"]
+        cur = self._conn.execute(
+            "INSERT INTO segments (market, interval, start_ts, end_ts, rows, path) VALUES (?, ?, ?, ?, ?, '')",
+            (market, interval, int(ts[0]), int(ts[-1]), len(ts)),
+        )
+        seg_id = cur.lastrowid
+        path = os.path.join(market, interval, f"seg_{seg_id:08d}")
+        final_dir = os.path.join(self.root, path)
+        tmp_dir = final_dir + ".tmp"
+        try:
+            os.makedirs(tmp_dir, exist_ok=True)
+            for name in COLUMNS:
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), data[name])
+            os.replace(tmp_dir, final_dir)
+            self._conn.execute("UPDATE segments SET path = ? WHERE id = ?", (path, seg_id))
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return seg_id
+
+    def query(self, market, interval, start=None, end=None, columns=COLUMNS):
+        """
+        [start, end) 구간의 캔들을 타임스탬프 순으로 반환합니다.
+
+        Args:
+            market (str): 예: "KRW-BTC"
+            interval (str): 예: "minute1"
+            start (int): 시작 타임스탬프(ms, 포함). None이면 처음부터
+            end (int): 끝 타임스탬프(ms, 미포함). None이면 끝까지
+            columns (tuple): 반환할 컬럼 이름
+
+        Returns:
+            dict: 컬럼 이름 -> np.ndarray (단일 세그먼트면 읽기 전용 memmap 뷰)
+        """
+        names = tuple(columns) if "timestamp" in columns else ("timestamp",) + tuple(columns)
+        with self._lock:
+            parts = []
+            for _, _, _, _, path in self._segments(market, interval, start, end):
+                seg_ts = self._column(path, "timestamp")
+                lo = 0 if start is None else int(np.searchsorted(seg_ts, start, side="left"))
+                hi = len(seg_ts) if end is None else int(np.searchsorted(seg_ts, end, side="left"))
+                if hi > lo:
+                    parts.append({name: self._column(path, name)[lo:hi] for name in names})
+
+        if not parts:
+            return {name: np.empty(0, dtype=DTYPES[name]) for name in columns}
+        if len(parts) == 1:
+            return {name: parts[0][name] for name in columns}
+
+        # 여러 세그먼트는 시간 구간이 겹칠 수 있으므로 합친 뒤 타임스탬프 순으로 정렬
+        merged = {name: np.concatenate([p[name] for p in parts]) for name in names}
+        ts = merged["timestamp"]
+        if np.any(ts[1:] < ts[:-1]):
+            order = np.argsort(ts, kind="stable")
+            merged = {name: arr[order] for name, arr in merged.items()}
+        return {name: merged[name] for name in columns}
+
+    def compact(self, market, interval):
+        """
+        한 시장/간격의 세그먼트를 하나로 합칩니다. 이후 조회는 전 구간에서 복사 없이 동작합니다.
+        합치는 동안 잠금을 유지하므로 그 사이에 추가된 세그먼트가 복사되면서 함께 남는 일이 없습니다.
+
+        Returns:
+            int: 합친 뒤의 캔들 수
+        """
+        with self._lock:
+            segments = self._segments(market, interval)
+            if len(segments) <= 1:
+                return segments[0][3] if segments else 0
+
+            # 목록에 있는 세그먼트만 읽어 타임스탬프 순으로 합침 (세그먼트끼리 타임스탬프는 겹치지 않음)
+            data = {name: np.concatenate([self._column(seg[4], name) for seg in segments]) for name in COLUMNS}
+            order = np.argsort(data["timestamp"], kind="stable")
+            data = {name: np.ascontiguousarray(arr[order]) for name, arr in data.items()}
+            self._write_segment(market, interval, data)
+            old_ids = [seg[0] for seg in segments]
+            self._conn.execute(
+                f"DELETE FROM segments WHERE id IN ({','.join('?' * len(old_ids))})", old_ids
+            )
+            self._conn.commit()
+            for seg in segments:
+                path = seg[4]
+                for name in COLUMNS:
+                    self._mmaps.pop((path, name), None)
+                shutil.rmtree(os.path.join(self.root, path), ignore_errors=True)
+        return len(data["timestamp"])
+
+    def time_range(self, market, interval):
+        """
+        저장된 캔들의 (최초, 최종) 타임스탬프를 반환합니다. 없으면 None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MIN(start_ts), MAX(end_ts) FROM segments WHERE market = ? AND interval = ?",
+                (market, interval),
+            ).fetchone()
+        return None if row[0] is None else (row[0], row[1])
+
+    def count(self, market, interval):
+        """
+        저장된 캔들 수를 반환합니다.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(rows), 0) FROM segments WHERE market = ? AND interval = ?",
+                (market, interval),
+            ).fetchone()
+        return row[0]
+
+    def markets(self):
+        """
+        저장된 (시장, 간격) 목록을 반환합니다.
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT DISTINCT market, interval FROM segments ORDER BY market, interval"
+            ).fetchall()
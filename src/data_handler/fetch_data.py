@@ -0,0 +1,248 @@
+# src/data_handler/fetch_data.py
+# Upbit 과거 캔들을 뒤로 페이지 넘기며 내려받아 CandleStore에 저장하는 다운로더
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import requests
+
+from src.exchange_apis.rate_limit import RETRY_STATUSES, RetryPolicy, get_rate_limiter
+from src.utils.helpers import create_session
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+UPBIT_BASE_URL = "https://api.upbit.com/v1"
+MAX_COUNT = 200  # Upbit 캔들 API 1회 최대 조회 개수
+MINUTE_UNITS = (1, 3, 5, 10, 15, 30, 60, 240)
+
+
+def candle_endpoint(interval):
+    """
+    저장소 간격 이름을 Upbit 캔들 엔드포인트 경로로 변환합니다.
+
+    Args:
+        interval (str): "minute1", "minute5", ..., "minute240" 또는 "day"
+
+    Returns:
+        str: 예: "candles/minutes/1", "candles/days"
+    """
+    if interval == "day":
+        return "candles/days"
+    if interval.startswith("minute"):
+        unit = int(interval[len("minute"):])
+        if unit in MINUTE_UNITS:
+            return f"candles/minutes/{unit}"
+    raise ValueError(f"지원하지 않는 캔들 간격: {interval}")
+
+
+def interval_to_ms(interval):
+    """
+    저장소 간격 이름을 밀리초로 변환합니다. (예: "minute5" -> 300000)
+    """
+    candle_endpoint(interval)  # 지원하지 않는 간격이면 ValueError
+    if interval == "day":
+        return 86_400_000
+    return int(interval[len("minute"):]) * 60_000
+
+
+def utc_string_to_ms(value):
+    """
+    "2024-01-01T00:00:00" 형태의 UTC 시각 문자열을 밀리초 타임스탬프로 변환합니다.
+    """
+    dt = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+    return int(dt.timestamp() * 1000)
+
+
+def ms_to_utc_string(ts):
+    """
+    밀리초 타임스탬프를 Upbit `to` 파라미터 형식("yyyy-MM-dd HH:mm:ss", UTC)으로 변환합니다.
+    """
+    return datetime.fromtimestamp(ts / 1000, tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def parse_candles(rows):
+    """
+    Upbit 캔들 응답을 CandleStore 입력용 dict 리스트로 변환합니다.
+    """
+    return [
+        {
+            "timestamp": utc_string_to_ms(row["candle_date_time_utc"]),
+            "open": row["opening_price"],
+            "high": row["high_price"],
+            "low": row["low_price"],
+            "close": row["trade_price"],
+            "volume": row["candle_acc_trade_volume"],
+        }
+        for row in rows
+    ]
+
+
+class CandleDownloader:
+    """
+    CandleDownloader는 Upbit 분/일 캔들을 최신에서 과거 방향으로 내려받는 클래스입니다.
+
+    - `to`/`count` 파라미터로 페이지를 넘기며, 페이지마다 CandleStore에 바로 저장합니다.
+    - 저장 후 (시장, 간격)별 체크포인트 파일에 진행 위치를 기록하므로,
+      중단된 다운로드는 같은 인자로 다시 실행하면 이어서 받습니다.
+    - 다운로드가 끝나면 페이지별 세그먼트를 CandleStore.compact()로 하나로 합칩니다.
+    - 여러 시장을 스레드로 동시에 받되, UpbitAPI와 같은 RateLimitController를 거치므로
+      전체 요청 수가 같은 프로세스의 라이브 루프와 함께 제한됩니다.
+    - 429/5xx/연결 오류는 지터 백오프 후 다시 요청합니다.
+    """
+    def __init__(self, store, base_url=UPBIT_BASE_URL, checkpoint_dir="data/checkpoints",
+                 max_workers=4, session=None, timeout=10,
+                 rate_limit=None, retry=None):
+        """
+        Args:
+            store (CandleStore): 캔들을 저장할 저장소
+            base_url (str): Upbit API 기본 URL
+            checkpoint_dir (str): 체크포인트 파일 디렉터리
+            max_workers (int): 동시에 받을 시장 수
+            session (requests.Session): 재사용할 세션 (없으면 커넥션 풀 세션 생성)
+            timeout (float): 요청 타임아웃(초)
+            rate_limit (RateLimitController): 공유 속도 제한 (없으면 프로세스 공용 컨트롤러)
+            retry (RetryPolicy): 재시도 정책 (없으면 기본 정책)
+        """
+        self.store = store
+        self.base_url = base_url.rstrip("/")
+        self.checkpoint_dir = checkpoint_dir
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.session = session or create_session(pool_size=max_workers)
+        self.rate_limit = rate_limit or get_rate_limiter()
+        self.retry = retry or RetryPolicy()
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    def _checkpoint_path(self, market, interval):
+        return os.path.join(self.checkpoint_dir, f"{market}_{interval}.json")
+
+    def load_checkpoint(self, market, interval):
+        """
+        저장된 체크포인트를 반환합니다. 없으면 None.
+        """
+        path = self._checkpoint_path(market, interval)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_checkpoint(self, market, interval, checkpoint):
+        path = self._checkpoint_path(market, interval)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, path)
+
+    def fetch_page(self, market, interval, to=None, count=MAX_COUNT):
+        """
+        캔들 한 페이지를 조회합니다. 결과는 최신 캔들이 먼저 옵니다.
+
+        Args:
+            market (str): 예: "KRW-BTC"
+            interval (str): 예: "minute1"
+            to (int): 이 시각(ms, 미포함) 이전 캔들만 조회. None이면 최신부터
+            count (int): 조회 개수 (최대 200)
+
+        Returns:
+            list: Upbit 캔들 응답 목록
+        """
+        params = {"market": market, "count": count}
+        if to is not None:
+            params["to"] = ms_to_utc_string(to)
+        path = "/" + candle_endpoint(interval)
+        attempt = 0
+        while True:
+            group = self.rate_limit.acquire("GET", path)
+            try:
+                resp = self.session.get(self.base_url + path, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.retry.max_retries:
+                    raise
+                delay = self.retry.delay(attempt)
+                logger.warning("%s %s: %r, retrying in %.2fs", market, interval, e, delay)
+            else:
+                self.rate_limit.update("GET", path, resp.headers)
+                if resp.status_code not in RETRY_STATUSES or attempt >= self.retry.max_retries:
+                    resp.raise_for_status()
+                    return resp.json()
+                delay = self.retry.delay(attempt)
+                logger.warning("%s %s: HTTP %s, retrying in %.2fs", market, interval, resp.status_code, delay)
+                if resp.status_code == 429:
+                    self.rate_limit.backoff(group, delay)
+                    delay = 0.0
+            time.sleep(delay)
+            attempt += 1
+
+    def download(self, market, interval, start, end=None):
+        """
+        [start, end) 구간의 캔들을 내려받아 저장합니다.
+
+        Args:
+            market (str): 예: "KRW-BTC"
+            interval (str): 예: "minute1"
+            start (int): 받을 가장 오래된 시각 (ms, 포함)
+            end (int): 받을 가장 최근 시각 (ms, 미포함). None이면 현재 시각
+
+        Returns:
+            int: 새로 저장한 캔들 수
+        """
+        checkpoint = self.load_checkpoint(market, interval)
+        if checkpoint and checkpoint["start"] == start and (end is None or checkpoint["end"] == end):
+            if checkpoint["done"]:
+                logger.info("%s %s: already downloaded", market, interval)
+                return 0
+            end = checkpoint["end"]
+            cursor = checkpoint["cursor"]
+            logger.info("%s %s: resuming from %s", market, interval, ms_to_utc_string(cursor))
+        else:
+            end = end if end is not None else int(time.time() * 1000)
+            cursor = end
+            checkpoint = {"start": start, "end": end, "cursor": cursor, "done": False}
+
+        saved = 0
+        while cursor > start:
+            rows = self.fetch_page(market, interval, to=cursor)
+            candles = [c for c in parse_candles(rows) if start <= c["timestamp"] < cursor]
+            if candles:
+                saved += self.store.append(market, interval, candles)
+                cursor = min(c["timestamp"] for c in candles)
+            if not candles or len(rows) < MAX_COUNT:
+                break
+            checkpoint["cursor"] = cursor
+            self._save_checkpoint(market, interval, checkpoint)
+
+        checkpoint["cursor"] = cursor
+        checkpoint["done"] = True
+        self._save_checkpoint(market, interval, checkpoint)
+        if saved:
+            # 페이지마다 생긴 세그먼트를 하나로 합쳐 이후 조회가 복사 없는 memmap으로 동작하게 함
+            self.store.compact(market, interval)
+        logger.info("%s %s: saved %d candles", market, interval, saved)
+        return saved
+
+    def download_many(self, markets, interval, start, end=None):
+        """
+        여러 시장을 동시에 내려받습니다. 한 시장이 실패해도 나머지는 계속 진행합니다.
+
+        Args:
+            markets (list): 시장 목록
+            interval (str): 예: "minute1"
+            start (int): 가장 오래된 시각 (ms, 포함)
+            end (int): 가장 최근 시각 (ms, 미포함). None이면 시장마다 현재 시각
+
+        Returns:
+            dict: 시장 -> 저장한 캔들 수 또는 발생한 예외
+        """
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {m: executor.submit(self.download, m, interval, start, end) for m in markets}
+            for market, future in futures.items():
+                try:
+                    results[market] = future.result()
+                except Exception as e:
+                    logger.error("%s %s: download failed: %s", market, interval, e)
+                    results[market] = e
+        return results
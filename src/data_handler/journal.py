@@ -0,0 +1,408 @@
+# src/data_handler/journal.py
+# 시그널/주문/체결/잔고를 추가 전용으로 기록하는 거래 저널과, 기록된 체결에 대한 벡터화 손익 분석
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from src.utils.clock import SYSTEM_CLOCK
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 이벤트 종류 (events.kind)
+SIGNAL, ORDER, FILL, BALANCE = 0, 1, 2, 3
+KIND_NAMES = ("signal", "order", "fill", "balance")
+# 주문 방향 (events.side)
+BUY, SELL = 1, -1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    kind INTEGER NOT NULL,
+    market TEXT NOT NULL,
+    side INTEGER NOT NULL DEFAULT 0,
+    price REAL,
+    volume REAL,
+    funds REAL,
+    fee REAL,
+    cash REAL,
+    coin REAL,
+    label TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_kind ON events (kind, market, ts);
+"""
+_INSERT = ("INSERT INTO events (ts, kind, market, side, price, volume, funds, fee, cash, coin, label) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+
+# 조회 컬럼과 자료형 (NULL은 NaN)
+_COLUMN_DTYPES = {
+    "ts": np.float64,
+    "side": np.int8,
+    "price": np.float64,
+    "volume": np.float64,
+    "funds": np.float64,
+    "fee": np.float64,
+    "cash": np.float64,
+    "coin": np.float64,
+}
+FILL_COLUMNS = ("ts", "side", "price", "volume", "fee")
+BALANCE_COLUMNS = ("ts", "cash", "coin", "price")
+
+_STOP = object()
+
+
+def _side_code(side):
+    return BUY if side == "buy" else SELL
+
+
+class TradeJournal:
+    """
+    TradeJournal은 매매 이벤트를 SQLite(WAL) 테이블 하나에 추가 전용으로 기록하는 클래스입니다.
+
+    - record_*()는 행을 큐에 넣고 바로 반환하므로 매매 루프는 디스크 쓰기나 fsync를 기다리지 않습니다.
+    - 백그라운드 스레드가 batch_size개 또는 flush_interval초마다 모아 트랜잭션 하나로 씁니다.
+      WAL + synchronous=NORMAL이므로 커밋마다 fsync하지 않습니다. (전원이 꺼지면 마지막 몇 배치는 잃을 수 있음)
+    - 조회(fills/balances/stats)는 별도 연결로 읽으므로 기록 중에도 사용할 수 있습니다.
+      아직 큐에 있는 행까지 보려면 먼저 flush()를 호출합니다.
+    """
+    def __init__(self, path="data/journal/trades.sqlite3", batch_size=1000, flush_interval=0.5, clock=None):
+        """
+        Args:
+            path (str): 저널 파일 경로
+            batch_size (int): 한 트랜잭션에 쓰는 최대 행 수
+            flush_interval (float): 행이 큐에 머무는 최대 시간(초)
+            clock: time()을 제공하는 시계 (리플레이에서는 SimulatedClock)
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.clock = clock or SYSTEM_CLOCK
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._queue = queue.SimpleQueue()
+        self.written = 0
+        self.errors = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="trade-journal", daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _put(self, kind, market, side=0, price=None, volume=None, funds=None, fee=None, cash=None, coin=None,
+             label=None, ts=None):
+        self._queue.put((self.clock.time() if ts is None else ts, kind, market, side, price, volume, funds,
+                         fee, cash, coin, label))
+
+    def record_signal(self, market, signal, price, ts=None):
+        """
+        틱마다 계산한 시그널("BUY", "SELL", "HOLD")을 기록합니다.
+        """
+        self._put(SIGNAL, market, price=price, label=signal, ts=ts)
+
+    def record_order(self, market, side, price=None, volume=None, funds=None, order_id=None, ts=None):
+        """
+        제출한 주문을 기록합니다.
+
+        Args:
+            market (str): 시장
+            side (str): "buy" 또는 "sell"
+            price (float): 주문 시점 현재가
+            volume (float): 매도 수량
+            funds (float): 매수 원화 금액
+            order_id (str): 주문 UUID 또는 identifier
+        """
+        self._put(ORDER, market, _side_code(side), price=price, volume=volume, funds=funds, label=order_id,
+                  ts=ts)
+
+    def record_fill(self, market, side, price, volume, fee=0.0, order_id=None, ts=None):
+        """
+        잔고에 반영한 체결을 기록합니다. (price는 평균 체결가, fee는 기준 통화 수수료)
+        """
+        self._put(FILL, market, _side_code(side), price=price, volume=volume, funds=price * volume, fee=fee,
+                  label=order_id, ts=ts)
+
+    def record_balance(self, market, cash, coin, price=None, ts=None):
+        """
+        잔고 스냅샷을 기록합니다. price가 있으면 자산 곡선 계산에 사용합니다.
+        """
+        self._put(BALANCE, market, price=price, cash=cash, coin=coin, ts=ts)
+
+    def _run(self):
+        batch, waiters, stop = [], [], False
+        while not stop:
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if stop or waiters or len(batch) >= self.batch_size:
+                    break
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+            self._write(batch)
+            batch = []
+            for event in waiters:
+                event.set()
+            waiters = []
+
+    def _write(self, batch):
+        if not batch:
+            return
+        try:
+            with self._conn:
+                self._conn.executemany(_INSERT, batch)
+            self.written += len(batch)
+        except sqlite3.Error as e:
+            self.errors += 1
+            logger.error("Dropped %d journal rows: %r", len(batch), e)
+
+    def flush(self, timeout=None):
+        """
+        지금까지 기록한 행이 모두 커밋될 때까지 기다립니다.
+
+        Returns:
+            bool: 시간 안에 커밋되면 True
+        """
+        if self._closed:
+            return True
+        event = threading.Event()
+        self._queue.put(event)
+        return event.wait(timeout)
+
+    def close(self):
+        """
+        남은 행을 모두 쓰고 백그라운드 스레드와 연결을 닫습니다.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._conn.close()
+
+    def read(self, kind, market=None, start=None, end=None, columns=FILL_COLUMNS):
+        """
+        한 종류의 이벤트를 시각 순서(같은 시각이면 기록 순서)대로 컬럼별 배열로 읽습니다.
+
+        Args:
+            kind (int): SIGNAL, ORDER, FILL, BALANCE
+            market (str): 시장 (None이면 전체)
+            start (float): 시작 시각(초, 포함)
+            end (float): 끝 시각(초, 미포함)
+            columns (tuple): _COLUMN_DTYPES의 컬럼 이름
+
+        Returns:
+            dict: 컬럼 이름 -> np.ndarray
+        """
+        dtype = [(name, _COLUMN_DTYPES[name]) for name in columns]
+        select = ", ".join(
+            f"COALESCE({name}, 0)" if name == "side" else f"COALESCE({name}, 'nan')" for name in columns
+        )
+        sql = f"SELECT {select} FROM events WHERE kind = ?"
+        args = [kind]
+        if market is not None:
+            sql += " AND market = ?"
+            args.append(market)
+        if start is not None:
+            sql += " AND ts >= ?"
+            args.append(start)
+        if end is not None:
+            sql += " AND ts < ?"
+            args.append(end)
+        sql += " ORDER BY ts, id"  # 시장을 지정하면 (kind, market, ts) 인덱스 순서 그대로 읽음
+        conn = sqlite3.connect(self.path)
+        try:
+            rows = np.fromiter(conn.execute(sql, args), dtype=dtype)
+        finally:
+            conn.close()
+        return {name: rows[name] for name in columns}
+
+    def fills(self, market=None, start=None, end=None):
+        return self.read(FILL, market, start, end, FILL_COLUMNS)
+
+    def balances(self, market=None, start=None, end=None):
+        return self.read(BALANCE, market, start, end, BALANCE_COLUMNS)
+
+    def count(self, kind=None):
+        """
+        커밋된 이벤트 수를 반환합니다. (kind가 None이면 전체)
+        """
+        conn = sqlite3.connect(self.path)
+        try:
+            if kind is None:
+                return conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+            return conn.execute("SELECT COUNT(*) FROM events WHERE kind = ?", (kind,)).fetchone()[0]
+        finally:
+            conn.close()
+
+    def markets(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            return [r[0] for r in conn.execute("SELECT DISTINCT market FROM events ORDER BY market")]
+        finally:
+            conn.close()
+
+    def stats(self, market, start=None, end=None):
+        """
+        한 시장의 체결로 실현 손익/수수료/승률을, 잔고 스냅샷으로 자산 곡선의 최대 낙폭을 계산합니다.
+
+        Returns:
+            dict: pnl_stats 결과 + "final_equity", "max_drawdown"
+        """
+        fills = self.fills(market, start, end)
+        result = pnl_stats(fills["side"], fills["price"], fills["volume"], fills["fee"])
+        balances = self.balances(market, start, end)
+        equity = equity_curve(balances["cash"], balances["coin"], balances["price"])
+        valid = equity[~np.isnan(equity)]
+        result["final_equity"] = float(valid[-1]) if len(valid) else None
+        result["max_drawdown"] = max_drawdown(valid)
+        return result
+
+
+def _linear_scan(a, b):
+    """
+    y_t = a_t * y_{t-1} + b_t (y_{-1} = 0)를 모든 t에 대해 구합니다.
+    (a, b) 쌍의 합성은 결합 법칙을 만족하므로 배열 전체 연산 log2(n)번의 누적 스캔으로 계산합니다.
+    나눗셈이 없어 a_t가 0에 가까워져도 수치적으로 안정합니다.
+    """
+    a = np.array(a, dtype=np.float64)
+    y = np.array(b, dtype=np.float64)
+    shift = 1
+    while shift < len(y) and a[shift:].any():
+        # 두 줄 모두 오른쪽을 먼저 계산하므로 이전 단계 값만 사용
+        y[shift:] += a[shift:] * y[:-shift]
+        a[shift:] *= a[:-shift]
+        shift *= 2
+    return y
+
+
+def realized_pnl(side, price, volume, fee, tolerance=1e-9):
+    """
+    체결 시계열의 체결별 실현 손익을 평균 단가 기준으로 계산합니다.
+
+    매수는 수수료를 포함해 보유 원가에 더하고, 매도는 (매도 금액 - 수수료 - 매도 비율만큼의 원가)를 실현합니다.
+    보유 원가의 점화식 basis_t = a_t * basis_{t-1} + b_t (매도 a_t = 1 - 매도 수량/보유 수량, 매수 b_t = 매수 원가,
+    포지션이 0이 되면 a_t = 0)를 _linear_scan으로 한 번에 풉니다.
+
+    Args:
+        side (array-like): 1=매수, -1=매도
+        price (array-like): 평균 체결가
+        volume (array-like): 체결 수량
+        fee (array-like): 수수료 (기준 통화)
+        tolerance (float): 이 값(최대 체결 수량 대비) 이하의 잔량은 포지션 청산으로 간주
+
+    Returns:
+        np.ndarray: 체결별 실현 손익 (매수는 0, 기록 이전에 산 코인을 판 매도는 원가를 알 수 없으므로 NaN)
+    """
+    side = np.asarray(side)
+    price = np.asarray(price, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    fee = np.nan_to_num(np.asarray(fee, dtype=np.float64))
+    n = len(side)
+    if n == 0:
+        return np.empty(0)
+    buy = side > 0
+    sell = ~buy
+    eps = tolerance * float(volume.max() or 1.0)
+
+    # 보유 수량보다 많이 판 기록이 있어도 포지션은 0 아래로 내려가지 않음: pos_t = S_t - min(0, min_{k<=t} S_k)
+    total = np.cumsum(np.where(buy, volume, -volume))
+    pos_after = total - np.minimum(np.minimum.accumulate(total), 0.0)
+    pos_before = np.r_[0.0, pos_after[:-1]]
+    known = sell & (pos_before > eps)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frac = np.where(known, np.minimum(volume / pos_before, 1.0), 0.0)
+    closed = (pos_after <= eps) | (frac >= 1.0)
+
+    # 원가 점화식: 매도는 남은 비율만큼 줄이고, 매수는 원가를 더하고, 포지션이 0이 되면 0으로 초기화
+    keep = np.where(closed, 0.0, 1.0 - frac)
+    basis = _linear_scan(keep, np.where(buy, price * volume + fee, 0.0))
+    basis_before = np.r_[0.0, basis[:-1]]
+
+    realized = np.where(known, price * volume - fee - basis_before * frac, 0.0)
+    realized[sell & ~known] = np.nan
+    return realized
+
+
+def equity_curve(cash, coin, price):
+    """
+    잔고 스냅샷의 자산 가치(cash + coin * price)를 계산합니다. price가 NaN인 스냅샷은 직전 가격을 씁니다.
+
+    Returns:
+        np.ndarray: 자산 가치 (처음 가격이 나오기 전은 NaN)
+    """
+    cash = np.asarray(cash, dtype=np.float64)
+    coin = np.asarray(coin, dtype=np.float64)
+    price = np.asarray(price, dtype=np.float64)
+    if not len(price):
+        return np.empty(0)
+    has_price = ~np.isnan(price)
+    last = np.maximum.accumulate(np.where(has_price, np.arange(len(price)), -1))
+    filled = np.where(last >= 0, price[np.maximum(last, 0)], np.nan)
+    return cash + coin * filled
+
+
+def max_drawdown(equity):
+    """
+    자산 곡선의 최대 낙폭(고점 대비 하락 비율)을 반환합니다.
+    """
+    equity = np.asarray(equity, dtype=np.float64)
+    if not len(equity):
+        return 0.0
+    peak = np.maximum.accumulate(equity)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown = np.where(peak > 0, 1.0 - equity / peak, 0.0)
+    return float(drawdown.max())
+
+
+def pnl_stats(side, price, volume, fee):
+    """
+    체결 시계열의 손익 통계를 계산합니다.
+
+    Returns:
+        dict: {"num_fills", "num_sells", "realized_pnl", "total_fees", "turnover", "win_rate",
+               "avg_win", "avg_loss", "profit_factor", "open_volume"}
+    """
+    side = np.asarray(side)
+    volume = np.asarray(volume, dtype=np.float64)
+    fee = np.nan_to_num(np.asarray(fee, dtype=np.float64))
+    realized = realized_pnl(side, price, volume, fee)
+    closed = realized[(side < 0) & ~np.isnan(realized)]
+    wins, losses = closed[closed > 0], closed[closed < 0]
+    gross_loss = -losses.sum()
+    return {
+        "num_fills": int(len(side)),
+        "num_sells": int(len(closed)),
+        "realized_pnl": float(closed.sum()),
+        "total_fees": float(fee.sum()),
+        "turnover": float(np.sum(np.asarray(price, dtype=np.float64) * volume)),
+        "win_rate": float(len(wins) / len(closed)) if len(closed) else None,
+        "avg_win": float(wins.mean()) if len(wins) else None,
+        "avg_loss": float(losses.mean()) if len(losses) else None,
+        "profit_factor": float(wins.sum() / gross_loss) if gross_loss > 0 else None,
+        "open_volume": float(np.sum(np.where(side > 0, volume, -volume))),
+    }
@@ -0,0 +1,276 @@
+# src/data_handler/preprocess.py
+# 틱/체결 스트림을 OHLCV 봉으로 묶는 스트리밍 집계기와, 저장된 이력을 한 번에 리샘플링하는 배치 함수
+#
+# 스트리밍 집계기와 배치 함수는 같은 입력에 대해 같은 봉을 만듭니다.
+# (라이브 루프와 백테스트가 전략에 동일한 봉을 넘길 수 있도록)
+import math
+
+import numpy as np
+
+from src.data_handler.database import COLUMNS
+
+
+def _bar(timestamp, open_, high, low, close, volume):
+    return {"timestamp": timestamp, "open": open_, "high": high, "low": low, "close": close, "volume": volume}
+
+
+class TimeBarAggregator:
+    """
+    TimeBarAggregator는 틱을 interval_ms 단위의 시간 봉으로 묶는 스트리밍 집계기입니다.
+
+    - 봉은 지금까지 본 가장 늦은 틱 시각(워터마크)이 봉 끝 + allowed_lateness_ms를 지나면 확정됩니다.
+      그 전에 도착한 늦은 틱은 해당 봉에 합쳐지고(시가/종가는 틱 시각 기준), 확정 후 도착한 틱은 버리고
+      late_ticks로 셉니다.
+    - fill_gaps가 True면 틱이 없던 구간을 직전 종가의 거래량 0 봉으로 채웁니다.
+    - 봉은 CandleStore에 그대로 넣을 수 있는 {"timestamp", "open", "high", "low", "close", "volume"} dict입니다.
+    """
+    def __init__(self, interval_ms=60_000, fill_gaps=True, allowed_lateness_ms=0, on_bar=None):
+        """
+        Args:
+            interval_ms (int): 봉 간격 (ms)
+            fill_gaps (bool): 빈 구간을 직전 종가 봉으로 채울지 여부
+            allowed_lateness_ms (int): 봉 끝 이후 늦은 틱을 기다리는 시간 (ms)
+            on_bar (callable): 봉이 확정될 때마다 on_bar(bar) 호출
+        """
+        self.interval_ms = int(interval_ms)
+        self.fill_gaps = fill_gaps
+        self.allowed_lateness_ms = int(allowed_lateness_ms)
+        self.on_bar = on_bar
+        self._open = {}          # 봉 시작 시각 -> [open, high, low, close, volume, open_ts, close_ts]
+        self._next_start = None  # 다음에 확정할 봉 시작 시각
+        self._watermark = None
+        self._last_close = None
+        self.late_ticks = 0
+
+    def update(self, timestamp, price, volume=0.0):
+        """
+        틱 하나를 반영하고 이번에 확정된 봉 목록을 반환합니다.
+
+        Args:
+            timestamp (int): 틱 시각 (ms)
+            price (float): 체결가
+            volume (float): 체결량
+
+        Returns:
+            list: 확정된 봉 (시간 순)
+        """
+        timestamp = int(timestamp)
+        start = timestamp - timestamp % self.interval_ms
+        if self._next_start is None:
+            self._next_start = start
+        elif start < self._next_start:
+            self.late_ticks += 1
+            return []
+
+        state = self._open.get(start)
+        if state is None:
+            self._open[start] = [price, price, price, price, volume, timestamp, timestamp]
+        else:
+            if timestamp < state[5]:
+                state[0], state[5] = price, timestamp
+            if timestamp >= state[6]:
+                state[3], state[6] = price, timestamp
+            if price > state[1]:
+                state[1] = price
+            if price < state[2]:
+                state[2] = price
+            state[4] += volume
+
+        if self._watermark is None or timestamp > self._watermark:
+            self._watermark = timestamp
+        return self._emit(self._watermark - self.allowed_lateness_ms)
+
+    def flush(self):
+        """
+        아직 열려 있는 봉을 모두 확정해 반환합니다. (스트림 종료 시)
+        """
+        if not self._open:
+            return []
+        return self._emit(max(self._open) + self.interval_ms)
+
+    def _emit(self, until):
+        bars = []
+        interval = self.interval_ms
+        while self._next_start + interval <= until:
+            start = self._next_start
+            state = self._open.pop(start, None)
+            if state is not None:
+                bar = _bar(start, state[0], state[1], state[2], state[3], state[4])
+                self._last_close = state[3]
+            elif self.fill_gaps and self._last_close is not None:
+                c = self._last_close
+                bar = _bar(start, c, c, c, c, 0.0)
+            else:
+                # 채우지 않는 빈 구간은 다음 열린 봉(없으면 아직 확정되지 않은 첫 구간)으로 건너뜀
+                pending = [s for s in self._open if s > start]
+                self._next_start = min(pending) if pending else max(start + interval, until - until % interval)
+                continue
+            bars.append(bar)
+            self._next_start = start + interval
+            if self.on_bar is not None:
+                self.on_bar(bar)
+        return bars
+
+
+class VolumeBarAggregator:
+    """
+    VolumeBarAggregator는 누적 거래량이 bar_volume의 배수를 넘을 때마다 봉을 확정하는 스트리밍 집계기입니다.
+    틱은 나누지 않으며, 봉 경계를 넘긴 초과 거래량은 다음 경계 계산에 이어집니다. 봉 시각은 첫 틱 시각입니다.
+    """
+    def __init__(self, bar_volume, on_bar=None):
+        """
+        Args:
+            bar_volume (float): 봉 하나의 목표 거래량
+            on_bar (callable): 봉이 확정될 때마다 on_bar(bar) 호출
+        """
+        if bar_volume <= 0:
+            raise ValueError("bar_volume은 0보다 커야 합니다.")
+        self.bar_volume = float(bar_volume)
+        self.on_bar = on_bar
+        self._total = 0.0
+        self._state = None  # [timestamp, open, high, low, close, volume, bar_id]
+
+    def update(self, timestamp, price, volume):
+        """
+        틱 하나를 반영하고 이번에 확정된 봉 목록을 반환합니다.
+        """
+        bar_id = math.floor(self._total / self.bar_volume)
+        state = self._state
+        if state is None:
+            state = self._state = [int(timestamp), price, price, price, price, volume, bar_id]
+        else:
+            if price > state[2]:
+                state[2] = price
+            if price < state[3]:
+                state[3] = price
+            state[4] = price
+            state[5] += volume
+        self._total += volume
+        if math.floor(self._total / self.bar_volume) > state[6]:
+            return [self._close()]
+        return []
+
+    def flush(self):
+        """
+        아직 목표 거래량을 채우지 못한 마지막 봉을 확정해 반환합니다.
+        """
+        return [self._close()] if self._state is not None else []
+
+    def _close(self):
+        state, self._state = self._state, None
+        bar = _bar(*state[:6])
+        if self.on_bar is not None:
+            self.on_bar(bar)
+        return bar
+
+
+def _reduce(group_starts, timestamps, opens, highs, lows, closes, volumes):
+    ends = np.append(group_starts[1:], len(timestamps)) - 1
+    # bincount는 입력 순서대로 더하므로 스트리밍 집계기의 누적 합과 비트 단위로 같은 거래량이 나옴
+    group_ids = np.repeat(np.arange(len(group_starts)), ends - group_starts + 1)
+    return {
+        "timestamp": timestamps[group_starts],
+        "open": opens[group_starts],
+        "high": np.maximum.reduceat(highs, group_starts),
+        "low": np.minimum.reduceat(lows, group_starts),
+        "close": closes[ends],
+        "volume": np.bincount(group_ids, weights=volumes, minlength=len(group_starts)),
+    }
+
+
+def _empty():
+    return {name: np.empty(0, dtype=np.int64 if name == "timestamp" else np.float64) for name in COLUMNS}
+
+
+def _fill_gaps(bars, interval_ms):
+    buckets = (bars["timestamp"] - bars["timestamp"][0]) // interval_ms
+    n = int(buckets[-1]) + 1
+    if n == len(buckets):
+        return bars
+    # 각 구간에 대해 직전(포함) 실제 봉의 위치를 구해 종가를 앞으로 채움
+    present = np.zeros(n, dtype=bool)
+    present[buckets] = True
+    close = bars["close"][np.cumsum(present) - 1]
+    out = {
+        "timestamp": bars["timestamp"][0] + np.arange(n, dtype=np.int64) * interval_ms,
+        "open": close.copy(), "high": close.copy(), "low": close.copy(), "close": close,
+        "volume": np.zeros(n),
+    }
+    for name in ("open", "high", "low", "close", "volume"):
+        out[name][buckets] = bars[name]
+    return out
+
+
+def resample_ticks(timestamps, prices, volumes=None, interval_ms=60_000, fill_gaps=True):
+    """
+    틱 배열을 시간 봉으로 한 번에 리샘플링합니다. (TimeBarAggregator를 끝까지 돌린 뒤 flush한 결과와 같음)
+
+    Args:
+        timestamps (array-like): 틱 시각 (ms). 정렬되어 있지 않으면 안정 정렬 후 처리
+        prices (array-like): 체결가
+        volumes (array-like): 체결량 (없으면 0)
+        interval_ms (int): 봉 간격 (ms)
+        fill_gaps (bool): 빈 구간을 직전 종가 봉으로 채울지 여부
+
+    Returns:
+        dict: 컬럼 이름 -> np.ndarray (CandleStore.append에 그대로 사용 가능)
+    """
+    ts = np.asarray(timestamps, dtype=np.int64)
+    px = np.asarray(prices, dtype=np.float64)
+    vol = np.zeros(len(ts)) if volumes is None else np.asarray(volumes, dtype=np.float64)
+    if len(ts) == 0:
+        return _empty()
+    if np.any(ts[1:] < ts[:-1]):
+        order = np.argsort(ts, kind="stable")
+        ts, px, vol = ts[order], px[order], vol[order]
+    starts = ts - ts % interval_ms
+    group_starts = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]])
+    bars = _reduce(group_starts, starts, px, px, px, px, vol)
+    return _fill_gaps(bars, interval_ms) if fill_gaps else bars
+
+
+def resample_bars(bars, interval_ms, fill_gaps=True):
+    """
+    저장된 OHLCV 봉(예: 1분봉)을 더 긴 간격(예: 5분봉)으로 한 번에 리샘플링합니다.
+
+    Args:
+        bars (dict): 컬럼 이름 -> 배열 (CandleStore.query 결과, 시간 순)
+        interval_ms (int): 새 봉 간격 (ms). 원래 간격의 배수여야 함
+        fill_gaps (bool): 빈 구간을 직전 종가 봉으로 채울지 여부
+
+    Returns:
+        dict: 컬럼 이름 -> np.ndarray
+    """
+    ts = np.asarray(bars["timestamp"], dtype=np.int64)
+    if len(ts) == 0:
+        return _empty()
+    starts = ts - ts % interval_ms
+    group_starts = np.flatnonzero(np.r_[True, starts[1:] != starts[:-1]])
+    columns = [np.asarray(bars[name], dtype=np.float64) for name in ("open", "high", "low", "close", "volume")]
+    out = _reduce(group_starts, starts, *columns)
+    return _fill_gaps(out, interval_ms) if fill_gaps else out
+
+
+def volume_bars(timestamps, prices, volumes, bar_volume):
+    """
+    틱 배열을 거래량 봉으로 한 번에 묶습니다. (VolumeBarAggregator를 끝까지 돌린 뒤 flush한 결과와 같음)
+
+    Args:
+        timestamps (array-like): 틱 시각 (ms, 도착 순)
+        prices (array-like): 체결가
+        volumes (array-like): 체결량
+        bar_volume (float): 봉 하나의 목표 거래량
+
+    Returns:
+        dict: 컬럼 이름 -> np.ndarray
+    """
+    ts = np.asarray(timestamps, dtype=np.int64)
+    px = np.asarray(prices, dtype=np.float64)
+    vol = np.asarray(volumes, dtype=np.float64)
+    if len(ts) == 0:
+        return _empty()
+    # 틱 i가 속한 봉 = 틱 i 직전까지의 누적 거래량이 넘은 bar_volume 배수의 개수
+    before = np.r_[0.0, np.cumsum(vol)[:-1]]
+    bar_id = np.floor(before / float(bar_volume))
+    group_starts = np.flatnonzero(np.r_[True, bar_id[1:] != bar_id[:-1]])
+    return _reduce(group_starts, ts, px, px, px, px, vol)
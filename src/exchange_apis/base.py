@@ -0,0 +1,281 @@
+# src/exchange_apis/base.py
+# 거래소 어댑터 공통 인터페이스와, REST 어댑터가 공유하는 HTTP 코어(연결 풀, 서명, 속도 제한, 재시도)
+import math
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+
+from src.exchange_apis.rate_limit import RETRY_STATUSES, RetryPolicy, is_retryable_error
+from src.utils.clock import SYSTEM_CLOCK
+from src.utils.helpers import get_shared_session
+from src.utils.logger import get_logger
+from src.utils.metrics import get_registry
+
+logger = get_logger(__name__)
+
+
+class ExchangeAPI:
+    """
+    ExchangeAPI는 라이브 루프, PositionManager, OrderExecutor가 사용하는 거래소 공통 인터페이스입니다.
+
+    - 시장 이름은 Upbit 형식("KRW-BTC", "USDT-BTC": 기준 통화-코인)으로 주고받습니다.
+    - 계좌/주문 응답은 Upbit 형식으로 맞춥니다.
+      계좌: [{"currency", "balance", "locked", "avg_buy_price"}]
+      주문: {"uuid", "identifier", "market", "side", "ord_type", "state"("wait"/"done"/"cancel"),
+             "executed_volume", "paid_fee", "trades": [{"price", "volume", "funds"}]}
+    - place_order는 시장가 주문만 다룹니다. 매수는 기준 통화 금액(price), 매도는 코인 수량(volume)입니다.
+
+    하위 클래스는 get_current_prices, get_accounts, place_order, get_order, get_candles를 구현합니다.
+    """
+    name = "exchange"
+    min_order_total = 0.0  # 최소 주문 금액 (기준 통화)
+
+    def get_current_prices(self, markets) -> dict:
+        """
+        여러 시장의 현재가를 한 번의 요청으로 조회합니다.
+
+        Returns:
+            dict: 시장 -> 현재가 (조회되지 않은 시장은 빠짐)
+        """
+        raise NotImplementedError
+
+    def get_current_price(self, market: str) -> float:
+        return self.get_current_prices([market])[market]
+
+    def get_accounts(self) -> list:
+        """
+        모든 통화의 잔고를 한 번에 조회합니다. (AccountSnapshot이 사용)
+        """
+        raise NotImplementedError
+
+    def get_balance(self, asset: str) -> float:
+        for d in self.get_accounts():
+            if d["currency"].upper() == asset.upper():
+                return float(d["balance"])
+        return 0.0
+
+    def place_order(self, market: str, side: str, volume: float = None, price: float = None,
+                    identifier: str = None) -> dict:
+        """
+        시장가 주문을 제출합니다.
+
+        Args:
+            market (str): 시장
+            side (str): "buy" 또는 "sell"
+            volume (float): 매도 수량
+            price (float): 매수 금액 (기준 통화)
+            identifier (str): 중복 주문 방지용 주문 식별자 (없으면 어댑터가 생성)
+
+        Returns:
+            dict: 주문 (Upbit 주문 형식)
+        """
+        raise NotImplementedError
+
+    def get_order(self, order_uuid: str = None, identifier: str = None, market: str = None) -> dict:
+        """
+        주문 하나의 상태와 체결 내역을 조회합니다. (Upbit 주문 형식)
+
+        Args:
+            order_uuid (str): 주문 uuid
+            identifier (str): 주문 식별자 (order_uuid 대신 사용 가능)
+            market (str): 주문한 시장 (주문 조회에 심볼이 필요한 거래소에서 사용. 예: 재시작 후 Binance 주문 조회)
+        """
+        raise NotImplementedError
+
+    def get_candles(self, market: str, interval: str = "minute1", count: int = 200, to: int = None) -> list:
+        """
+        최근 캔들을 오래된 순으로 조회합니다.
+
+        Args:
+            market (str): 시장
+            interval (str): "minute1", "minute5", ..., "day"
+            count (int): 최대 개수
+            to (int): 이 시각(ms, 미포함) 이전 캔들만 조회. None이면 최신부터
+
+        Returns:
+            list: [{"timestamp", "open", "high", "low", "close", "volume"}, ...]
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+def parse_retry_after(value, now):
+    """
+    Retry-After 헤더 값을 대기 시간(초)으로 바꿉니다.
+    초 단위 숫자와 HTTP 날짜("Wed, 21 Oct 2015 07:28:00 GMT") 형식을 모두 받습니다.
+
+    Args:
+        value (str): Retry-After 헤더 값
+        now (float): 현재 시각 (epoch 초, HTTP 날짜 형식일 때 기준)
+
+    Returns:
+        float or None: 대기 시간(초). 해석할 수 없으면 None (호출자는 백오프 지연을 그대로 씀)
+    """
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(seconds, 0.0) if math.isfinite(seconds) else None
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when is None or when.tzinfo is None:
+        return None
+    return max(when.timestamp() - now, 0.0)
+
+
+class RestTransport:
+    """
+    RestTransport는 REST 어댑터들이 공유하는 HTTP 코어입니다.
+
+    - 세션은 기본적으로 프로세스 공용 세션(get_shared_session)이므로 여러 거래소/인스턴스가
+      호스트별 keep-alive 연결 풀을 함께 씁니다.
+    - 요청 전에 거래소별 공용 속도 제한 토큰을 얻고, 응답 헤더로 제한을 조절합니다.
+    - 서명은 시도마다 sign(method, path, params) -> (params, headers)로 다시 합니다. (nonce/timestamp 갱신)
+    - 429 응답은 서버가 처리하지 않은 요청이므로 항상 다시 보내고(Retry-After 헤더가 있으면 그만큼 대기),
+      연결 오류/타임아웃/5xx는 idempotent 요청만 지터 백오프 후 다시 보냅니다.
+    - 지연 시간/오류/재시도는 "<venue>_request_seconds" 등으로 기록합니다.
+    """
+    def __init__(self, venue, base_url, rate_limiter, timeout=(3.05, 10), session=None, retry=None,
+                 metrics=None, clock=None, debug=False, log=None):
+        """
+        Args:
+            venue (str): 거래소 이름 (지표 이름 접두어, 예: "upbit")
+            base_url (str): API 기본 URL
+            rate_limiter (RateLimitController): 거래소 공용 속도 제한
+            timeout (float or tuple): 요청 타임아웃(초). (연결, 읽기) 튜플 가능
+            session (requests.Session): 사용할 세션 (없으면 프로세스 공용 세션)
+            retry (RetryPolicy): 재시도 정책 (없으면 기본 정책)
+            metrics (MetricsRegistry): 지표 레지스트리 (없으면 공용 레지스트리)
+            clock: 재시도 대기에 사용할 시계 (sleep 제공)
+            debug (bool): True면 요청/응답을 DEBUG 레벨로 기록 (서명 헤더는 기록하지 않음)
+            log (logging.Logger): 요청 기록에 사용할 로거 (없으면 이 모듈 로거, 보통 어댑터 모듈 로거를 넘김)
+        """
+        self.log = log or logger
+        self.venue = venue
+        self.base_url = base_url.rstrip("/")
+        self.rate_limiter = rate_limiter
+        self.timeout = timeout
+        self.session = session or get_shared_session()
+        self.retry = retry or RetryPolicy()
+        self.metrics = metrics or get_registry()
+        self.clock = clock or SYSTEM_CLOCK
+        self.debug = debug
+        self.seconds_metric = f"{venue}_request_seconds"
+        self.errors_metric = f"{venue}_request_errors_total"
+        self.retries_metric = f"{venue}_request_retries_total"
+
+    def request(self, method, path, params=None, sign=None, idempotent=None, weight=1):
+        """
+        요청을 보내고 JSON 응답을 반환합니다.
+
+        Args:
+            method (str): "GET", "POST" 등
+            path (str): 예: "/ticker"
+            params (dict): 쿼리 파라미터
+            sign (callable): 서명 함수 sign(method, path, params) -> (params, headers) (없으면 서명하지 않음)
+            idempotent (bool): 다시 보내도 안전한 요청인지 (None이면 GET만 안전)
+            weight (float): 속도 제한 토큰 수 (Binance 요청 가중치)
+
+        Returns:
+            dict or list: 응답 JSON
+        """
+        if idempotent is None:
+            idempotent = method == "GET"
+        endpoint = f"{method} {path}"
+        attempt = 0
+        while True:
+            group = self.rate_limiter.acquire(method, path, weight)
+            query, headers = sign(method, path, params) if sign is not None else (params, None)
+            if self.debug:
+                self.log.debug("%s %s params=%s", method, path, params)
+
+            start = time.perf_counter()
+            try:
+                resp = self.session.request(method, self.base_url + path, params=query,
+                                            headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                self.metrics.inc(self.errors_metric, endpoint=endpoint)
+                if not idempotent or attempt >= self.retry.max_retries:
+                    raise
+                delay = self.retry.delay(attempt)
+                self.log.warning("%s failed (%r), retrying in %.2fs", endpoint, e, delay)
+                self.metrics.inc(self.retries_metric, endpoint=endpoint)
+                self.clock.sleep(delay)
+                attempt += 1
+                continue
+            elapsed = time.perf_counter() - start
+            self.metrics.observe(self.seconds_metric, elapsed, endpoint=endpoint)
+            self.rate_limiter.update(method, path, resp.headers)
+
+            if self.debug:
+                self.log.debug("%s %s -> %s in %.1fms: %s", method, path, resp.status_code,
+                               elapsed * 1000, resp.text)
+            status = resp.status_code
+            if status >= 400:
+                self.metrics.inc(self.errors_metric, endpoint=endpoint)
+            if status in RETRY_STATUSES and (idempotent or status == 429) and attempt < self.retry.max_retries:
+                delay = self.retry.delay(attempt)
+                retry_after = resp.headers.get("Retry-After")
+                if status == 429 and retry_after:
+                    wait = parse_retry_after(retry_after, self.clock.time())
+                    if wait is not None:
+                        delay = max(delay, wait)
+                self.log.warning("%s -> %s, retrying in %.2fs", endpoint, status, delay)
+                self.metrics.inc(self.retries_metric, endpoint=endpoint)
+                if status == 429:
+                    # 같은 그룹을 쓰는 다른 호출자도 함께 기다리도록 버킷을 멈춤
+                    self.rate_limiter.backoff(group, delay)
+                else:
+                    self.clock.sleep(delay)
+                attempt += 1
+                continue
+            resp.raise_for_status()
+            return resp.json()
+
+    def submit_order(self, identifier, submit, find):
+        """
+        결과를 알 수 없는 실패(타임아웃, 연결 오류, 5xx) 뒤에도 중복 주문 없이 주문을 제출합니다.
+        실패하면 잠시 기다린 뒤 find()로 같은 식별자의 주문을 찾고, 없을 때만 submit()을 다시 호출합니다.
+
+        Args:
+            identifier (str): 주문 식별자 (기록용)
+            submit (callable): 주문을 한 번 제출하는 함수 (idempotent=False 요청)
+            find (callable): 주문 식별자로 이미 접수된 주문을 찾는 함수 (없으면 None)
+
+        Returns:
+            dict: 주문 응답
+        """
+        attempt = 0
+        while True:
+            try:
+                return submit()
+            except requests.RequestException as e:
+                if not is_retryable_error(e) or attempt >= self.retry.max_retries:
+                    raise
+                last_error = e
+            attempt += 1
+            self.clock.sleep(self.retry.delay(attempt - 1))
+            existing = find()
+            if existing is not None:
+                self.log.info("Order %s was accepted despite %r", identifier, last_error)
+                return existing
+            self.log.warning("Order %s not found after %r, resending", identifier, last_error)
+
+    def latency_stats(self):
+        """
+        엔드포인트별 왕복 시간 통계를 반환합니다.
+        """
+        return self.metrics.summary(self.seconds_metric, "endpoint")
+
+    def close(self):
+        """
+        직접 만든 세션을 받은 경우 어댑터 쪽에서 닫습니다. 공용 세션은 닫지 않습니다.
+        """
+        if self.session is not get_shared_session():
+            self.session.close()
@@ -0,0 +1,305 @@
+# src/exchange_apis/binance_api.py
+# Binance 현물 REST 어댑터: 시장/계좌/주문 응답을 Upbit 형식으로 맞춰 ExchangeAPI 인터페이스로 제공
+import hashlib
+import hmac
+import json
+import os
+import uuid
+from urllib.parse import urlencode
+
+import requests
+
+from src.exchange_apis.base import ExchangeAPI, RestTransport
+from src.exchange_apis.rate_limit import get_rate_limiter
+from src.utils.helpers import get_shared_session
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 엔드포인트별 요청 가중치 (Binance 문서 기준, 시세 조회는 ticker_price_weight 참고)
+WEIGHTS = {
+    "/api/v3/account": 20,
+    "/api/v3/order": 4,
+    "/api/v3/myTrades": 20,
+    "/api/v3/klines": 2,
+}
+ORDER_WEIGHT = 1  # 주문 생성 (POST /api/v3/order)
+# 저장소 간격 이름 -> Binance kline 간격
+KLINE_INTERVALS = {
+    "minute1": "1m", "minute3": "3m", "minute5": "5m", "minute15": "15m", "minute30": "30m",
+    "minute60": "1h", "minute240": "4h", "day": "1d",
+}
+# Binance 주문 상태 -> Upbit 주문 상태
+ORDER_STATES = {
+    "FILLED": "done",
+    "CANCELED": "cancel",
+    "EXPIRED": "cancel",
+    "EXPIRED_IN_MATCH": "cancel",
+    "REJECTED": "cancel",
+}
+ORDER_NOT_FOUND = -2013
+
+
+def ticker_price_weight(num_symbols):
+    """
+    /api/v3/ticker/price 요청 가중치를 조회 심볼 수로 계산합니다. (Binance 문서: 1~20개 2, 21~100개 40, 그 이상 80)
+    """
+    if num_symbols <= 20:
+        return 2
+    if num_symbols <= 100:
+        return 40
+    return 80
+
+
+def to_symbol(market):
+    """
+    Upbit 형식 시장 이름을 Binance 심볼로 변환합니다. (예: "USDT-BTC" -> "BTCUSDT")
+    """
+    quote, base = market.upper().split("-", 1)
+    return base + quote
+
+
+class BinanceAPI(ExchangeAPI):
+    """
+    BinanceAPI는 Binance 현물 REST API를 ExchangeAPI 인터페이스로 감싼 어댑터입니다.
+
+    - 시장은 Upbit 형식("USDT-BTC")으로 받아 Binance 심볼("BTCUSDT")로 바꿔 보냅니다.
+    - 서명이 필요한 요청은 timestamp/recvWindow를 붙인 쿼리를 HMAC-SHA256으로 서명합니다.
+    - 주문은 newClientOrderId에 identifier를 넣어 보내므로, UpbitAPI와 같이 결과를 알 수 없는 실패 뒤에는
+      origClientOrderId로 조회해 이미 접수된 주문을 반환하고 없을 때만 다시 보냅니다.
+    - 연결 풀, 재시도, 지표는 UpbitAPI와 같은 RestTransport를 쓰고, 속도 제한은 요청 가중치 기반의
+      BinanceRateLimitController를 씁니다.
+    """
+    name = "binance"
+    min_order_total = 5.0  # USDT 마켓 최소 주문 금액 (NOTIONAL 필터)
+
+    def __init__(self, api_key=None, secret_key=None, base_url="https://api.binance.com",
+                 timeout=(3.05, 10), pool_size=10, session=None, debug=False, metrics=None,
+                 rate_limiter=None, retry=None, clock=None, recv_window=5000):
+        """
+        Args:
+            api_key (str): Binance API Key (없으면 BINANCE_API_KEY 환경변수)
+            secret_key (str): Binance Secret Key (없으면 BINANCE_SECRET_KEY 환경변수)
+            base_url (str): API 기본 URL
+            timeout (float or tuple): 요청 타임아웃(초). (연결, 읽기) 튜플 가능
+            pool_size (int): 호스트당 keep-alive로 유지할 최대 연결 수 (공용 세션을 처음 만들 때만 적용)
+            session (requests.Session): 사용할 세션 (없으면 다른 거래소 어댑터와 함께 쓰는 프로세스 공용 세션)
+            debug (bool): True면 요청/응답을 DEBUG 레벨로 기록 (키는 기록하지 않음)
+            metrics (MetricsRegistry): 요청 지연 시간/오류 수를 기록할 레지스트리 (없으면 공용 레지스트리)
+            rate_limiter (BinanceRateLimitController): 가중치 기반 속도 제한 (없으면 프로세스 공용 컨트롤러)
+            retry (RetryPolicy): 일시적 오류 재시도 정책 (없으면 기본 정책)
+            clock: time()/sleep()을 제공하는 시계 (서명 timestamp와 재시도 대기)
+            recv_window (int): 서명 요청의 유효 시간(ms)
+        """
+        self.api_key = api_key or os.getenv("BINANCE_API_KEY")
+        self.secret_key = secret_key or os.getenv("BINANCE_SECRET_KEY")
+        if not self.api_key or not self.secret_key:
+            raise ValueError("BINANCE_API_KEY와 BINANCE_SECRET_KEY 설정 필요")
+        self.recv_window = recv_window
+
+        self.transport = RestTransport(
+            "binance", base_url, rate_limiter or get_rate_limiter("binance"), timeout=timeout,
+            session=session or get_shared_session(pool_size), retry=retry, metrics=metrics, clock=clock,
+            debug=debug, log=logger,
+        )
+        self.base_url = self.transport.base_url
+        self.session = self.transport.session
+        self.metrics = self.transport.metrics
+        self.rate_limiter = self.transport.rate_limiter
+        self.retry = self.transport.retry
+        self.clock = self.transport.clock
+        self._order_markets = {}  # 주문 uuid/identifier -> 시장 (Binance 주문 조회에는 심볼이 필요)
+
+    def _sign(self, method, path, params):
+        # timestamp가 recvWindow 안에 있어야 하므로 RestTransport가 재시도마다 다시 호출함
+        query = dict(params or {})
+        query["timestamp"] = int(self.clock.time() * 1000)
+        query["recvWindow"] = self.recv_window
+        query["signature"] = hmac.new(self.secret_key.encode("utf-8"), urlencode(query).encode("utf-8"),
+                                      hashlib.sha256).hexdigest()
+        return query, {"X-MBX-APIKEY": self.api_key}
+
+    def _request(self, method, path, params=None, signed=False, idempotent=None, weight=None):
+        if weight is None:
+            weight = ORDER_WEIGHT if method == "POST" else WEIGHTS.get(path, 1)
+        return self.transport.request(method, path, params=params, sign=self._sign if signed else None,
+                                      idempotent=idempotent, weight=weight)
+
+    def latency_stats(self):
+        """
+        엔드포인트별 왕복 시간 통계를 반환합니다. (UpbitAPI.latency_stats와 같은 형식)
+        """
+        return self.transport.latency_stats()
+
+    def close(self):
+        self.transport.close()
+
+    def get_current_prices(self, markets) -> dict:
+        """
+        여러 시장의 현재가를 /api/v3/ticker/price 한 번의 요청으로 조회합니다.
+
+        Args:
+            markets (list): 예: ["USDT-BTC", "USDT-ETH"]
+
+        Returns:
+            dict: 시장 -> 현재가
+        """
+        by_symbol = {to_symbol(m): m for m in markets}
+        data = self._request("GET", "/api/v3/ticker/price",
+                             params={"symbols": json.dumps(list(by_symbol), separators=(",", ":"))},
+                             weight=ticker_price_weight(len(by_symbol)))
+        return {by_symbol[d["symbol"]]: float(d["price"]) for d in data if d["symbol"] in by_symbol}
+
+    def get_accounts(self) -> list:
+        """
+        잔고가 있는 모든 자산을 UpbitAPI.get_accounts와 같은 형식으로 반환합니다.
+        (Binance는 평균 매수가를 알려주지 않으므로 avg_buy_price는 "0")
+        """
+        data = self._request("GET", "/api/v3/account", params={"omitZeroBalances": "true"}, signed=True)
+        return [{"currency": b["asset"], "balance": b["free"], "locked": b["locked"], "avg_buy_price": "0"}
+                for b in data["balances"] if float(b["free"]) or float(b["locked"])]
+
+    def place_order(self, market: str, side: str, volume: float = None, price: float = None,
+                    identifier: str = None) -> dict:
+        """
+        시장가 주문을 발행합니다. 매수는 quoteOrderQty(기준 통화 금액), 매도는 quantity(코인 수량)로 보냅니다.
+
+        Args:
+            market (str): 예: "USDT-BTC"
+            side (str): "buy" 또는 "sell"
+            volume (float): 매도 시 코인 수량
+            price (float): 매수 시 기준 통화 금액
+            identifier (str): 주문 식별자 (newClientOrderId, 없으면 생성)
+
+        Returns:
+            dict: 주문 (Upbit 주문 형식)
+        """
+        query = {"symbol": to_symbol(market), "type": "MARKET", "newOrderRespType": "FULL"}
+        if side == "buy":
+            if price is None:
+                raise ValueError("매수 시 price 필요")
+            query["side"] = "BUY"
+            query["quoteOrderQty"] = str(price)
+        elif side == "sell":
+            if volume is None:
+                raise ValueError("매도 시 volume 필요")
+            query["side"] = "SELL"
+            query["quantity"] = str(volume)
+        else:
+            raise ValueError(f"알 수 없는 주문 방향: {side}")
+        identifier = identifier or f"amp-{uuid.uuid4().hex}"
+        query["newClientOrderId"] = identifier
+        self._order_markets[identifier] = market
+
+        data = self.transport.submit_order(
+            identifier,
+            lambda: self._request("POST", "/api/v3/order", params=query, signed=True, idempotent=False),
+            lambda: self._find_order(market, identifier),
+        )
+        return self._to_order(market, data)
+
+    def _find_order(self, market, identifier):
+        try:
+            data = self._request("GET", "/api/v3/order",
+                                 params={"symbol": to_symbol(market), "origClientOrderId": identifier},
+                                 signed=True)
+            return self._with_fills(data)
+        except requests.HTTPError as e:
+            if _error_code(e) == ORDER_NOT_FOUND:
+                return None
+            raise
+
+    def get_order(self, order_uuid: str = None, identifier: str = None, market: str = None) -> dict:
+        """
+        주문 하나의 상태와 체결 내역을 조회합니다.
+        Binance 주문 조회에는 심볼이 필요하므로 이 인스턴스가 낸 주문은 주문할 때 기록한 시장을 쓰고,
+        재시작 등으로 기록이 없는 주문은 market을 받아 orderId 또는 origClientOrderId로 조회합니다.
+
+        Args:
+            order_uuid (str): place_order 결과의 uuid (Binance orderId)
+            identifier (str): 주문 식별자 (newClientOrderId, order_uuid 대신 사용 가능)
+            market (str): 주문한 시장 (기록이 없는 주문을 조회할 때 필요)
+
+        Returns:
+            dict: 주문 (Upbit 주문 형식)
+        """
+        key = order_uuid if order_uuid is not None else identifier
+        market = self._order_markets.get(key) or market
+        if market is None:
+            raise ValueError(f"주문 시장을 알 수 없습니다. market을 지정하세요: {key}")
+        params = {"symbol": to_symbol(market)}
+        if order_uuid is not None:
+            params["orderId"] = order_uuid
+        else:
+            params["origClientOrderId"] = identifier
+        data = self._request("GET", "/api/v3/order", params=params, signed=True)
+        return self._to_order(market, self._with_fills(data))
+
+    def _with_fills(self, data):
+        # 주문 조회 응답에는 체결 내역이 없으므로 끝난 주문만 체결 내역을 한 번 더 조회
+        if ORDER_STATES.get(data["status"]) and float(data["executedQty"]):
+            trades = self._request("GET", "/api/v3/myTrades",
+                                   params={"symbol": data["symbol"], "orderId": data["orderId"]}, signed=True)
+            data["fills"] = [{"price": t["price"], "qty": t["qty"], "commission": t["commission"],
+                              "commissionAsset": t["commissionAsset"]} for t in trades]
+        return data
+
+    def _to_order(self, market, data):
+        """
+        Binance 주문 응답을 Upbit 주문 형식으로 바꿉니다.
+
+        기준 통화로 낸 수수료만 paid_fee에 넣습니다. 코인으로 낸 수수료(BNB 미사용 시 매수 수수료)는
+        Binance가 코인에서 떼므로, 체결 수량을 실제로 오간 코인 수량(매수는 빼고 매도는 더함)으로 바꾸고
+        체결 금액은 그대로 둡니다. (BNB 등 다른 자산으로 낸 수수료는 반영하지 않음)
+        """
+        quote, base = market.upper().split("-", 1)
+        sign = -1.0 if data["side"] == "BUY" else 1.0
+        trades, fee, executed_volume = [], 0.0, float(data["executedQty"])
+        for f in data.get("fills") or []:
+            price, qty, commission = float(f["price"]), float(f["qty"]), float(f["commission"])
+            volume = qty
+            if f["commissionAsset"] == quote:
+                fee += commission
+            elif f["commissionAsset"] == base:
+                volume += sign * commission
+                executed_volume += sign * commission
+            trades.append({"price": f["price"], "volume": str(volume), "funds": str(price * qty)})
+        order_uuid = str(data["orderId"])
+        self._order_markets[order_uuid] = market
+        if data.get("clientOrderId"):
+            self._order_markets[data["clientOrderId"]] = market
+        return {
+            "uuid": order_uuid,
+            "identifier": data.get("clientOrderId"),
+            "market": market,
+            "side": "bid" if data["side"] == "BUY" else "ask",
+            "ord_type": "price" if data["side"] == "BUY" else "market",
+            "state": ORDER_STATES.get(data["status"], "wait"),
+            "executed_volume": str(executed_volume),
+            "executed_funds": data.get("cummulativeQuoteQty"),
+            "paid_fee": str(fee),
+            "trades": trades,
+        }
+
+    def get_candles(self, market: str, interval: str = "minute1", count: int = 200, to: int = None) -> list:
+        """
+        최근 캔들을 /api/v3/klines로 조회합니다. (요청 한 번, 최대 1000개, 오래된 순)
+
+        Returns:
+            list: [{"timestamp", "open", "high", "low", "close", "volume"}, ...]
+        """
+        if interval not in KLINE_INTERVALS:
+            raise ValueError(f"지원하지 않는 캔들 간격: {interval}")
+        params = {"symbol": to_symbol(market), "interval": KLINE_INTERVALS[interval], "limit": min(count, 1000)}
+        if to is not None:
+            params["endTime"] = to - 1
+        rows = self._request("GET", "/api/v3/klines", params=params)
+        return [{"timestamp": int(r[0]), "open": float(r[1]), "high": float(r[2]), "low": float(r[3]),
+                 "close": float(r[4]), "volume": float(r[5])} for r in rows]
+
+
+def _error_code(exc):
+    try:
+        return exc.response.json().get("code")
+    except (AttributeError, ValueError):
+        return None
@@ -1,5 +1,14 @@
 # mock_exchange_api.py
-import time
+import math
+import threading
+
+import numpy as np
+
+from src.exchange_apis.base import ExchangeAPI
+from src.utils.clock import SYSTEM_CLOCK
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
 
 class MockPositionManager:
     """
@@ -29,7 +38,7 @@ class MockPositionManager:
                 self.coin_balance += volume
                 return True
             else:
-                print("[MockPositionManager] Not enough cash to buy")
+                logger.warning("Not enough cash to buy")
                 return False
         else:  # "sell"
             if self.coin_balance >= volume:
@@ -37,31 +46,112 @@ class MockPositionManager:
                 self.cash_balance += price * volume
                 return True
             else:
-                print("[MockPositionManager] Not enough coin to sell")
+                logger.warning("Not enough coin to sell")
                 return False
 
-class MockExchangeAPI:
+def krw_tick_size(price):
+    """
+    Upbit 원화 마켓의 호가 단위를 반환합니다.
+
+    Args:
+        price (float): 가격
+
+    Returns:
+        float: 호가 단위
+    """
+    for floor, tick in ((2000000, 1000), (1000000, 500), (500000, 100), (100000, 50),
+                        (10000, 10), (1000, 1), (100, 0.1), (10, 0.01), (1, 0.001)):
+        if price >= floor:
+            return tick
+    return 0.0001
+
+
+class SimulatedExchangeError(ValueError):
+    """
+    시뮬레이션 거래소의 주문 거부 오류입니다. name은 Upbit 오류 이름을 따릅니다.
+    (예: "under_min_total_bid", "insufficient_funds_ask")
+    """
+    def __init__(self, name, message=""):
+        super().__init__(f"{name}: {message}" if message else name)
+        self.name = name
+
+
+class MockExchangeAPI(ExchangeAPI):
     """
-    MockExchangeAPI는 가상의 시세 변동 및 주문 체결 응답을 제공하는 클래스입니다.
-    실제 거래소 API 없이 트레이딩 로직 테스트를 위해 사용할 수 있습니다.
+    MockExchangeAPI는 UpbitAPI와 같은 인터페이스를 제공하는 시뮬레이션 거래소입니다.
+    실제 거래소 API 없이 트레이딩 로직 테스트와 슬리피지 측정에 사용할 수 있습니다.
+
+    - 시장마다 현재가(중간가) 주변에 호가 단위를 지킨 가상 호가창을 만들고,
+      시장가 매도(ord_type="market")와 원화 금액 매수(ord_type="price")를 호가를 따라 내려가며 체결합니다.
+      체결한 잔량은 호가창에서 빠지고, 가격이 바뀌면 호가창을 다시 만듭니다.
+    - 수수료, 최소 주문 금액, 잔고 부족을 Upbit과 같은 오류 이름으로 거부합니다.
+    - 모든 호출에 네트워크 지연(latency + 0~latency_jitter초)을 주입합니다. clock이 가상 시계이면 가상 시각만 흐릅니다.
+    - get_accounts/get_order 형식이 Upbit과 같아 PositionManager와 OrderExecutor를 그대로 붙일 수 있습니다.
+
+    set_price()로 가격을 지정하지 않은 시장은 일정 범위를 오가는 가상 가격을 사용합니다.
     """
-    def __init__(self, api_key=None, api_secret=None):
+    name = "mock"
+
+    def __init__(self, api_key=None, api_secret=None, initial_cash=1000000.0, base_currency="KRW",
+                 clock=None, fee_rate=0.0005, min_order_total=5000.0, depth_levels=15,
+                 level_volume=0.5, depth_growth=0.2, latency=0.0, latency_jitter=0.0, seed=0):
+        """
+        Args:
+            api_key (str): 사용하지 않음 (UpbitAPI와 생성 인자 호환)
+            api_secret (str): 사용하지 않음
+            initial_cash (float): 기준 통화 초기 잔고
+            base_currency (str): 기준 통화
+            clock: time()/sleep()을 제공하는 시계 (리플레이에서는 SimulatedClock)
+            fee_rate (float): 체결 금액 대비 수수료율 (Upbit 원화 마켓 0.05%)
+            min_order_total (float): 최소 주문 금액 (기준 통화)
+            depth_levels (int): 호가창 한쪽의 호가 수
+            level_volume (float): 최우선 호가의 평균 잔량 (코인)
+            depth_growth (float): 호가가 한 단계 멀어질 때마다 늘어나는 잔량 비율
+            latency (float): 호출마다 주입할 기본 지연(초)
+            latency_jitter (float): 기본 지연에 더할 0~latency_jitter초의 무작위 지연
+            seed (int): 호가 잔량/지연 난수 시드 (같은 시드와 같은 호출 순서면 같은 결과)
+        """
         self.api_key = api_key
         self.api_secret = api_secret
         self.current_price = 20000.0  # 초기 가상 가격
         self.price_trend = 10         # 가격 변동 폭 (매 루프마다 가격 변경)
+        self.prices = {}              # set_price로 지정한 시장별 가격
+        self.candles = {}             # (시장, 간격) -> 오래된 순 캔들 목록 (get_candles)
+        self.base_currency = base_currency
+        self.balances = {base_currency: float(initial_cash)}
+        self.orders = []              # 체결된 주문 목록 (주문 순서)
+        self.clock = clock or SYSTEM_CLOCK
+        self.fee_rate = fee_rate
+        self.min_order_total = min_order_total
+        self.depth_levels = depth_levels
+        self.level_volume = level_volume
+        self.depth_growth = depth_growth
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self._rng = np.random.default_rng(seed)
+        self._books = {}   # 시장 -> 호가창
+        self._by_uuid = {}
+        self._by_identifier = {}
+        self.avg_buy_price = {}  # 자산 -> 평균 매수가 (Upbit 계좌 avg_buy_price)
+        self._lock = threading.RLock()
 
-    def get_current_price(self, symbol: str) -> float:
-        """
-        현재 가상 가격을 반환합니다.
-        가격이 일정 범위를 초과하면 상승/하강 방향을 반전하여 반복적인 변동을 유도합니다.
-
-        Args:
-            symbol (str): 예: "BTC/USDT"
+    def _network_delay(self):
+        delay = self.latency
+        if self.latency_jitter:
+            with self._lock:
+                delay += self.latency_jitter * self._rng.random()
+        self.clock.sleep(delay)
 
-        Returns:
-            float: 현재 가상 가격
+    def set_price(self, symbol: str, price: float):
         """
+        시장의 현재가(중간가)를 지정합니다. 이후 조회와 체결에 이 가격을 사용합니다.
+        """
+        with self._lock:
+            self.prices[symbol] = float(price)
+
+    def _price(self, symbol):
+        if symbol in self.prices:
+            return self.prices[symbol]
         self.current_price += self.price_trend
         if self.current_price > 21000:
             self.price_trend = -10
@@ -69,27 +159,270 @@ class MockExchangeAPI:
             self.price_trend = 10
         return self.current_price
 
-    def place_order(self, symbol: str, side: str, quantity: float) -> dict:
+    def get_current_price(self, symbol: str) -> float:
+        """
+        현재가를 반환합니다.
+        set_price로 지정한 가격이 없으면 일정 범위를 오가는 가격을 만들어 반복적인 변동을 유도합니다.
+
+        Args:
+            symbol (str): 예: "KRW-BTC"
+
+        Returns:
+            float: 현재 가상 가격
+        """
+        self._network_delay()
+        with self._lock:
+            return self._price(symbol)
+
+    def get_current_prices(self, symbols) -> dict:
+        self._network_delay()
+        with self._lock:
+            return {symbol: self._price(symbol) for symbol in symbols}
+
+    def get_accounts(self) -> list:
+        """
+        UpbitAPI.get_accounts와 같은 형식의 계좌 목록을 반환합니다.
+        """
+        self._network_delay()
+        with self._lock:
+            return [{"currency": currency, "balance": str(balance), "locked": "0",
+                     "avg_buy_price": str(self.avg_buy_price.get(currency, 0.0))}
+                    for currency, balance in self.balances.items()]
+
+    def get_balance(self, asset: str) -> float:
+        self._network_delay()
+        with self._lock:
+            return self.balances.get(asset.upper(), 0.0)
+
+    @staticmethod
+    def _asset(symbol):
+        # "KRW-BTC"(Upbit) 또는 "BTC/USDT" 형식에서 코인 심볼 추출
+        if "-" in symbol:
+            return symbol.split("-", 1)[1]
+        return symbol.split("/", 1)[0]
+
+    def _make_book(self, mid):
+        tick = krw_tick_size(mid)
+        best_bid = math.ceil(mid / tick) * tick - tick
+        best_ask = math.floor(mid / tick) * tick + tick
+        steps = np.arange(self.depth_levels)
+        base = self.level_volume * (1.0 + self.depth_growth * steps)
+        return {
+            "mid": mid,
+            "ask_prices": best_ask + tick * steps,
+            "ask_sizes": base * self._rng.uniform(0.5, 1.5, self.depth_levels),
+            "bid_prices": np.maximum(best_bid - tick * steps, tick),
+            "bid_sizes": base * self._rng.uniform(0.5, 1.5, self.depth_levels),
+        }
+
+    def _book(self, symbol):
+        # 호가창 조회/주문은 가상 가격을 움직이지 않음 (get_current_price만 움직임)
+        mid = self.prices.get(symbol, self.current_price)
+        book = self._books.get(symbol)
+        if book is None or book["mid"] != mid:
+            book = self._books[symbol] = self._make_book(mid)
+        return book
+
+    def get_orderbook(self, symbol: str) -> dict:
+        """
+        Upbit /orderbook과 같은 형식의 현재 호가창을 반환합니다.
+
+        Returns:
+            dict: {"market", "timestamp", "orderbook_units": [{"ask_price", "bid_price", "ask_size", "bid_size"}]}
+        """
+        self._network_delay()
+        return self._orderbook(symbol)
+
+    def get_orderbooks(self, symbols) -> dict:
+        """
+        여러 시장의 호가창을 요청 한 번(지연 한 번)으로 반환합니다. (UpbitAPI.get_orderbooks와 같은 형식)
+
+        Returns:
+            dict: 시장 -> 호가창
+        """
+        self._network_delay()
+        return {symbol: self._orderbook(symbol) for symbol in symbols}
+
+    def _orderbook(self, symbol):
+        with self._lock:
+            book = self._book(symbol)
+            units = [
+                {"ask_price": float(ap), "bid_price": float(bp), "ask_size": float(az), "bid_size": float(bz)}
+                for ap, bp, az, bz in zip(book["ask_prices"], book["bid_prices"],
+                                          book["ask_sizes"], book["bid_sizes"])
+            ]
+            return {"market": symbol, "timestamp": int(self.clock.time() * 1000), "orderbook_units": units}
+
+    @staticmethod
+    def _walk(prices, sizes, volume=None, funds=None):
         """
-        가상의 주문 체결 결과를 반환합니다.
-        이 예제에서는 항상 주문이 성공한다고 가정합니다.
+        최우선 호가부터 순서대로 수량(volume) 또는 금액(funds)만큼 체결할 호가별 수량을 계산합니다.
+        호가창 잔량이 모자라면 있는 만큼만 체결합니다.
+        """
+        if funds is not None:
+            cum = np.cumsum(prices * sizes)
+            target = funds
+        else:
+            cum = np.cumsum(sizes)
+            target = volume
+        k = int(np.searchsorted(cum, target))
+        take = np.zeros_like(sizes)
+        take[:k] = sizes[:k]
+        if k < len(sizes):
+            remaining = target - (cum[k - 1] if k else 0.0)
+            take[k] = remaining / prices[k] if funds is not None else remaining
+        return take
+
+    def place_order(self, symbol: str, side: str, volume: float = None, price: float = None,
+                    identifier: str = None) -> dict:
+        """
+        호가창을 따라 즉시 체결하고 잔고에 반영합니다. (UpbitAPI.place_order와 같은 인자)
 
         Args:
-            symbol (str): 예: "BTC/USDT"
+            symbol (str): 예: "KRW-BTC"
             side (str): "buy" 또는 "sell"
-            quantity (float): 주문 수량
+            volume (float): 매도 수량 (매수 시 price 없이 volume만 주면 해당 수량을 시장가 매수)
+            price (float): 매수 시 원화 금액 (ord_type="price")
+            identifier (str): 주문 식별자 (이미 쓴 식별자면 Upbit처럼 거부)
+
+        Returns:
+            dict: Upbit 주문 조회 형식의 주문 (state, executed_volume, paid_fee, trades 포함)
+        """
+        self._network_delay()
+        asset = self._asset(symbol)
+        with self._lock:
+            if identifier is not None and identifier in self._by_identifier:
+                raise SimulatedExchangeError("duplicate_identifier", identifier)
+            book = self._book(symbol)
+            mid = book["mid"]
+            cash = self.balances.get(self.base_currency, 0.0)
+            coin = self.balances.get(asset, 0.0)
+            if side == "buy":
+                if price is not None:
+                    ord_type = "price"
+                    if price < self.min_order_total:
+                        raise SimulatedExchangeError("under_min_total_bid", f"최소 주문 금액 {self.min_order_total}")
+                    if cash < price * (1 + self.fee_rate):
+                        raise SimulatedExchangeError("insufficient_funds_bid")
+                    take = self._walk(book["ask_prices"], book["ask_sizes"], funds=price)
+                elif volume is not None:
+                    ord_type = "market"
+                    if volume * book["ask_prices"][0] < self.min_order_total:
+                        raise SimulatedExchangeError("under_min_total_bid", f"최소 주문 금액 {self.min_order_total}")
+                    take = self._walk(book["ask_prices"], book["ask_sizes"], volume=volume)
+                    if cash < float(np.dot(take, book["ask_prices"])) * (1 + self.fee_rate):
+                        raise SimulatedExchangeError("insufficient_funds_bid")
+                else:
+                    raise SimulatedExchangeError("invalid_parameter", "매수 시 price 또는 volume 필요")
+                prices, sizes = book["ask_prices"], book["ask_sizes"]
+            elif side == "sell":
+                ord_type = "market"
+                if volume is None:
+                    raise SimulatedExchangeError("invalid_parameter", "매도 시 volume 필요")
+                if coin < volume:
+                    raise SimulatedExchangeError("insufficient_funds_ask")
+                if volume * book["bid_prices"][0] < self.min_order_total:
+                    raise SimulatedExchangeError("under_min_total_ask", f"최소 주문 금액 {self.min_order_total}")
+                take = self._walk(book["bid_prices"], book["bid_sizes"], volume=volume)
+                prices, sizes = book["bid_prices"], book["bid_sizes"]
+            else:
+                raise SimulatedExchangeError("invalid_parameter", f"알 수 없는 주문 방향: {side}")
+
+            # 체결한 잔량은 호가창에서 제거
+            sizes -= take
+            np.maximum(sizes, 0.0, out=sizes)
+            touched = np.nonzero(take)[0]
+            trades = [{"price": str(prices[i]), "volume": str(take[i]), "funds": str(prices[i] * take[i])}
+                      for i in touched]
+            executed_volume = float(take.sum())
+            executed_funds = float(np.dot(take, prices))
+            fee = executed_funds * self.fee_rate
+            avg_price = executed_funds / executed_volume if executed_volume else 0.0
+
+            if side == "buy":
+                self.balances[self.base_currency] = cash - executed_funds - fee
+                self.balances[asset] = coin + executed_volume
+                if executed_volume:
+                    held_cost = coin * self.avg_buy_price.get(asset, 0.0)
+                    self.avg_buy_price[asset] = (held_cost + executed_funds) / (coin + executed_volume)
+                slippage = (avg_price / mid - 1.0) * 1e4 if executed_volume else 0.0
+            else:
+                self.balances[asset] = coin - executed_volume
+                self.balances[self.base_currency] = cash + executed_funds - fee
+                slippage = (1.0 - avg_price / mid) * 1e4 if executed_volume else 0.0
+            if ord_type == "price":
+                filled = executed_funds >= price * (1 - 1e-9)
+            else:
+                filled = executed_volume >= volume * (1 - 1e-9)
+
+            order = {
+                "uuid": f"mock-{len(self.orders) + 1}",
+                "identifier": identifier,
+                "side": "bid" if side == "buy" else "ask",
+                "ord_type": ord_type,
+                "price": None if price is None else str(price),
+                "volume": None if volume is None else str(volume),
+                "state": "done" if filled else "cancel",  # 호가 잔량 부족으로 남은 주문은 취소
+                "market": symbol,
+                "executed_volume": str(executed_volume),
+                "paid_fee": str(fee),
+                "trades_count": len(trades),
+                "trades": trades,
+                # 시뮬레이션 전용 필드
+                "symbol": symbol,
+                "quantity": executed_volume,
+                "price_executed": avg_price,
+                "slippage_bps": slippage,
+                "timestamp": int(self.clock.time() * 1000),
+                "status": "filled" if filled else "partially_filled",
+            }
+            self.orders.append(order)
+            self._by_uuid[order["uuid"]] = order
+            if identifier is not None:
+                self._by_identifier[identifier] = order
+            return dict(order)
+
+    def get_order(self, order_uuid: str = None, identifier: str = None, market: str = None) -> dict:
+        """
+        주문 하나의 상태와 체결 내역을 조회합니다. (UpbitAPI.get_order와 같은 형식)
+        """
+        self._network_delay()
+        with self._lock:
+            if order_uuid is not None:
+                order = self._by_uuid.get(order_uuid)
+            else:
+                order = self._by_identifier.get(identifier)
+            if order is None:
+                raise SimulatedExchangeError("order_not_found", order_uuid or identifier)
+            return dict(order)
+
+    def get_candles(self, symbol: str, interval: str = "minute1", count: int = 200, to: int = None) -> list:
+        """
+        candles에 넣어 둔 캔들을 오래된 순으로 반환합니다. (ExchangeAPI.get_candles와 같은 형식)
+        """
+        self._network_delay()
+        with self._lock:
+            rows = self.candles.get((symbol, interval), [])
+            if to is not None:
+                rows = [c for c in rows if c["timestamp"] < to]
+            return [dict(c) for c in rows[-count:]]
+
+    def slippage_stats(self):
+        """
+        체결된 주문의 중간가 대비 슬리피지(bp, 양수가 불리한 방향) 통계를 반환합니다.
 
         Returns:
-            dict: 주문 체결 결과 정보 (체결가격, 수량, 타임스탬프, 상태 등)
+            dict: {"count", "mean_bps", "p95_bps", "max_bps"}
         """
-        timestamp = int(time.time() * 1000)
+        with self._lock:
+            values = np.array([o["slippage_bps"] for o in self.orders if o["quantity"] > 0])
+        if not len(values):
+            return {"count": 0, "mean_bps": 0.0, "p95_bps": 0.0, "max_bps": 0.0}
         return {
-            "symbol": symbol,
-            "side": side,
-            "quantity": quantity,
-            "price_executed": self.current_price,
-            "timestamp": timestamp,
-            "status": "filled"
+            "count": int(len(values)),
+            "mean_bps": float(values.mean()),
+            "p95_bps": float(np.percentile(values, 95)),
+            "max_bps": float(values.max()),
         }
 
 if __name__ == "__main__":
@@ -97,12 +430,12 @@ if __name__ == "__main__":
     position_manager = MockPositionManager()
     api = MockExchangeAPI(api_key="dummy_key", api_secret="dummy_secret")
 
-    symbol = "BTC/USDT"
-    price = api.get_current_price(symbol)
-    volume = 0.001
+    symbol = "KRW-BTC"
+    api.set_price(symbol, 50000000.0)
 
-    # 매수 주문 시뮬레이션
-    order_result = api.place_order(symbol, "buy", volume)
+    # 매수 주문 시뮬레이션 (1만원 시장가 매수)
+    order_result = api.place_order(symbol, "buy", price=10000)
+    volume = order_result["quantity"]
     if position_manager.execute_order("buy", order_result["price_executed"], volume):
         print("[INFO] After buy:",
               "cash=", position_manager.cash_balance,
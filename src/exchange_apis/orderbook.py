@@ -0,0 +1,286 @@
+# src/exchange_apis/orderbook.py
+# 짧은 TTL로 공유하는 호가창 스냅샷 캐시와, 주문 전 호가를 따라 체결가/슬리피지를 예측하는 추정기
+import threading
+
+import numpy as np
+
+from src.utils.clock import SYSTEM_CLOCK
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class FillEstimate:
+    """
+    FillEstimate는 호가창을 따라 시장가 주문을 체결했을 때 예상되는 결과입니다.
+    """
+    def __init__(self, side, volume, funds, avg_price, mid, levels, filled):
+        self.side = side            # "buy" 또는 "sell"
+        self.volume = volume        # 예상 체결 수량
+        self.funds = funds          # 예상 체결 금액 (수수료 제외)
+        self.avg_price = avg_price  # 예상 평균 체결가
+        self.mid = mid              # 최우선 매도/매수 호가의 중간가
+        self.levels = levels        # 체결에 닿는 호가 단계 수
+        self.filled = filled        # 호가창 잔량으로 전부 체결되는지 여부
+
+    @property
+    def slippage_bps(self):
+        """
+        중간가 대비 불리한 방향의 슬리피지 (bp, 양수가 불리)
+        """
+        if not self.volume or not self.mid:
+            return 0.0
+        if self.side == "buy":
+            return (self.avg_price / self.mid - 1.0) * 1e4
+        return (1.0 - self.avg_price / self.mid) * 1e4
+
+    def __repr__(self):
+        return (f"FillEstimate({self.side} volume={self.volume} funds={self.funds} avg_price={self.avg_price} "
+                f"slippage_bps={self.slippage_bps:.2f} levels={self.levels} filled={self.filled})")
+
+
+class OrderBookSnapshot:
+    """
+    OrderBookSnapshot은 호가창 하나를 배열로 들고, 누적 잔량/누적 금액을 미리 계산해 두는 클래스입니다.
+    같은 스냅샷으로 여러 번 추정해도 추정마다 호가 단계 수에 대해 이진 탐색 한 번이면 됩니다.
+    """
+    def __init__(self, market, ask_prices, ask_sizes, bid_prices, bid_sizes, timestamp=None):
+        self.market = market
+        self.timestamp = timestamp
+        self.ask_prices = np.asarray(ask_prices, dtype=np.float64)
+        self.ask_sizes = np.asarray(ask_sizes, dtype=np.float64)
+        self.bid_prices = np.asarray(bid_prices, dtype=np.float64)
+        self.bid_sizes = np.asarray(bid_sizes, dtype=np.float64)
+        self._cum_size = {"buy": np.cumsum(self.ask_sizes), "sell": np.cumsum(self.bid_sizes)}
+        self._cum_funds = {"buy": np.cumsum(self.ask_prices * self.ask_sizes),
+                           "sell": np.cumsum(self.bid_prices * self.bid_sizes)}
+
+    @classmethod
+    def from_upbit(cls, data):
+        """
+        Upbit /orderbook 응답 항목(또는 MockExchangeAPI.get_orderbook 결과)으로 스냅샷을 만듭니다.
+        """
+        units = data["orderbook_units"]
+        return cls(
+            data["market"],
+            [float(u["ask_price"]) for u in units], [float(u["ask_size"]) for u in units],
+            [float(u["bid_price"]) for u in units], [float(u["bid_size"]) for u in units],
+            timestamp=data.get("timestamp"),
+        )
+
+    @property
+    def mid(self):
+        if not len(self.ask_prices) or not len(self.bid_prices):
+            return None
+        return (self.ask_prices[0] + self.bid_prices[0]) / 2.0
+
+    @property
+    def spread_bps(self):
+        mid = self.mid
+        return None if mid is None else (self.ask_prices[0] - self.bid_prices[0]) / mid * 1e4
+
+    def _side(self, side):
+        if side == "buy":
+            return self.ask_prices, self._cum_size["buy"], self._cum_funds["buy"]
+        if side == "sell":
+            return self.bid_prices, self._cum_size["sell"], self._cum_funds["sell"]
+        raise ValueError(f"알 수 없는 주문 방향: {side}")
+
+    def estimate(self, side, volume=None, funds=None):
+        """
+        최우선 호가부터 수량(volume) 또는 금액(funds)만큼 체결했을 때의 결과를 예측합니다.
+        잔량이 모자라면 있는 만큼만 체결한 결과(filled=False)를 반환합니다.
+
+        Args:
+            side (str): "buy"(매도 호가를 소진) 또는 "sell"(매수 호가를 소진)
+            volume (float): 체결할 수량
+            funds (float): 체결할 원화 금액 (매수 ord_type="price")
+
+        Returns:
+            FillEstimate: 예상 체결 결과
+        """
+        prices, cum_size, cum_funds = self._side(side)
+        if funds is None and volume is None:
+            raise ValueError("volume 또는 funds 필요")
+        by_funds = funds is not None
+        cum, target = (cum_funds, funds) if by_funds else (cum_size, volume)
+        k = int(np.searchsorted(cum, target))
+        if k >= len(prices):
+            total_volume = float(cum_size[-1]) if len(prices) else 0.0
+            total_funds = float(cum_funds[-1]) if len(prices) else 0.0
+            filled, levels = False, len(prices)
+        else:
+            prev_size = cum_size[k - 1] if k else 0.0
+            prev_funds = cum_funds[k - 1] if k else 0.0
+            remaining = target - (prev_funds if by_funds else prev_size)
+            part = remaining / prices[k] if by_funds else remaining
+            total_volume = float(prev_size + part)
+            total_funds = float(prev_funds + part * prices[k])
+            filled, levels = True, k + 1
+        avg_price = total_funds / total_volume if total_volume else 0.0
+        return FillEstimate(side, total_volume, total_funds, avg_price, self.mid, levels, filled)
+
+    def max_order(self, side, max_slippage_bps):
+        """
+        예상 슬리피지가 max_slippage_bps 이하인 가장 큰 주문을 구합니다.
+
+        평균 체결가는 주문이 커질수록 단조롭게 나빠지므로, 한도를 넘는 첫 호가 단계를 찾은 뒤
+        그 단계 안에서 평균가가 한도와 같아지는 수량을 닫힌 식으로 풉니다.
+
+        Returns:
+            float: 매수면 원화 금액, 매도면 수량
+        """
+        prices, cum_size, cum_funds = self._side(side)
+        mid = self.mid
+        if mid is None:
+            return 0.0
+        sign = 1.0 if side == "buy" else -1.0
+        limit = mid * (1.0 + sign * max_slippage_bps / 1e4)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            avg_to_level = cum_funds / cum_size
+        beyond = sign * (avg_to_level - limit) > 0
+        k = int(np.argmax(beyond)) if beyond.any() else len(prices)
+        if k == len(prices):
+            return float(cum_funds[-1] if side == "buy" else cum_size[-1])
+        prev_size = cum_size[k - 1] if k else 0.0
+        prev_funds = cum_funds[k - 1] if k else 0.0
+        # (prev_funds + p v) / (prev_size + v) = limit 를 v에 대해 풂
+        part = max(0.0, (limit * prev_size - prev_funds) / (prices[k] - limit))
+        if side == "buy":
+            return float(prev_funds + part * prices[k])
+        return float(prev_size + part)
+
+
+class OrderBookCache:
+    """
+    OrderBookCache는 시장별 호가창 스냅샷을 ttl초 동안 재사용하는 스레드 안전 캐시입니다.
+
+    같은 시장을 보는 여러 전략이 한 인스턴스를 공유하면 결정마다 호가를 다시 요청하지 않습니다.
+    만료된 시장을 여러 스레드가 동시에 요청해도 조회는 한 번만 일어납니다.
+    거래소가 get_orderbooks(markets)를 제공하면 prefetch()로 여러 시장을 요청 한 번에 갱신합니다.
+    """
+    def __init__(self, exchange, ttl=1.0, clock=None):
+        """
+        Args:
+            exchange: get_orderbook(market)(과 선택적으로 get_orderbooks(markets))을 제공하는 거래소
+            ttl (float): 스냅샷 유효 시간(초)
+            clock: monotonic()을 제공하는 시계
+        """
+        self.exchange = exchange
+        self.ttl = ttl
+        self.clock = clock or SYSTEM_CLOCK
+        self._snapshots = {}  # 시장 -> (조회 시각, OrderBookSnapshot)
+        self._locks = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _market_lock(self, market):
+        with self._lock:
+            lock = self._locks.get(market)
+            if lock is None:
+                lock = self._locks[market] = threading.Lock()
+            return lock
+
+    def _fresh(self, market):
+        entry = self._snapshots.get(market)
+        if entry is not None and self.clock.monotonic() - entry[0] < self.ttl:
+            return entry[1]
+        return None
+
+    def get(self, market):
+        """
+        시장의 호가창 스냅샷을 반환합니다. 만료됐으면 새로 조회합니다.
+        """
+        snapshot = self._fresh(market)
+        if snapshot is not None:
+            self.hits += 1
+            return snapshot
+        with self._market_lock(market):
+            snapshot = self._fresh(market)  # 기다리는 동안 다른 스레드가 갱신했을 수 있음
+            if snapshot is not None:
+                self.hits += 1
+                return snapshot
+            self.misses += 1
+            snapshot = OrderBookSnapshot.from_upbit(self.exchange.get_orderbook(market))
+            self._snapshots[market] = (self.clock.monotonic(), snapshot)
+            return snapshot
+
+    def prefetch(self, markets):
+        """
+        만료된 시장의 호가창을 한 번의 요청으로 갱신합니다.
+
+        Returns:
+            int: 갱신한 시장 수
+        """
+        stale = [m for m in markets if self._fresh(m) is None]
+        if not stale:
+            return 0
+        if not hasattr(self.exchange, "get_orderbooks"):
+            for market in stale:
+                self.get(market)
+            return len(stale)
+        books = self.exchange.get_orderbooks(stale)
+        now = self.clock.monotonic()
+        for data in books.values():
+            self._snapshots[data["market"]] = (now, OrderBookSnapshot.from_upbit(data))
+        self.misses += len(books)
+        return len(books)
+
+    def invalidate(self, market=None):
+        """
+        스냅샷을 버립니다. (주문 체결 직후 등, market이 None이면 전체)
+        """
+        if market is None:
+            self._snapshots.clear()
+        else:
+            self._snapshots.pop(market, None)
+
+
+class SlippageEstimator:
+    """
+    SlippageEstimator는 캐시된 호가창으로 주문 전에 체결가/슬리피지를 예측하고,
+    슬리피지 한도에 맞춰 주문 크기를 줄이는 클래스입니다.
+    """
+    def __init__(self, cache):
+        """
+        Args:
+            cache (OrderBookCache): 호가창 캐시 (같은 시장의 전략들이 공유)
+        """
+        self.cache = cache
+
+    def estimate(self, market, side, volume=None, funds=None):
+        """
+        Returns:
+            FillEstimate: 예상 체결 결과 (OrderBookSnapshot.estimate 참고)
+        """
+        return self.cache.get(market).estimate(side, volume=volume, funds=funds)
+
+    def size_buy(self, market, funds, max_slippage_bps=None):
+        """
+        원화 funds만큼 시장가 매수할 때, 예상 슬리피지가 한도를 넘으면 한도 안의 최대 금액으로 줄입니다.
+
+        Args:
+            market (str): 시장
+            funds (float): 원하는 매수 금액
+            max_slippage_bps (float): 허용 슬리피지 (bp, None이면 줄이지 않음)
+
+        Returns:
+            tuple: (매수 금액, FillEstimate)
+        """
+        snapshot = self.cache.get(market)
+        if max_slippage_bps is not None:
+            funds = min(funds, snapshot.max_order("buy", max_slippage_bps))
+        return funds, snapshot.estimate("buy", funds=funds)
+
+    def size_sell(self, market, volume, max_slippage_bps=None):
+        """
+        volume만큼 시장가 매도할 때, 예상 슬리피지가 한도를 넘으면 한도 안의 최대 수량으로 줄입니다.
+
+        Returns:
+            tuple: (매도 수량, FillEstimate)
+        """
+        snapshot = self.cache.get(market)
+        if max_slippage_bps is not None:
+            volume = min(volume, snapshot.max_order("sell", max_slippage_bps))
+        return volume, snapshot.estimate("sell", volume=volume)
@@ -0,0 +1,355 @@
+# src/exchange_apis/rate_limit.py
+# Upbit Remaining-Req 응답 헤더에 맞춰 조절되는 요청 그룹별 토큰 버킷과 재시도 정책
+#
+# Upbit는 요청 그룹(default, order, candles, ticker ...)마다 초당 요청 수를 제한하고, 모든 응답에
+# "Remaining-Req: group=default; min=1800; sec=29" 헤더로 현재 초에 남은 요청 수를 알려줍니다.
+# 한 프로세스의 UpbitAPI 인스턴스와 CandleDownloader가 get_rate_limiter()의 컨트롤러를 함께 쓰면
+# 여러 시장/스레드의 요청이 같은 예산 안에서 나뉩니다.
+#
+# Binance는 IP별 분당 요청 가중치(X-MBX-USED-WEIGHT-1M)와 계정별 10초당 주문 수(X-MBX-ORDER-COUNT-10S)로
+# 제한하므로 BinanceRateLimitController가 같은 토큰 버킷으로 두 예산을 관리합니다. (get_rate_limiter("binance"))
+import os
+import random
+import threading
+
+import requests
+
+from src.utils.clock import SYSTEM_CLOCK
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 그룹별 초당 요청 수 (Upbit 공지 기준). 응답 헤더를 보면 그에 맞춰 줄어듦
+DEFAULT_LIMITS = {
+    "default": 30,
+    "order": 8,
+    "market": 10,
+    "candles": 10,
+    "ticker": 10,
+    "orderbook": 10,
+    "trades": 10,
+}
+UNKNOWN_GROUP_LIMIT = 10
+# Binance 그룹별 (창 안의 허용량, 창 길이(초))
+BINANCE_LIMITS = {
+    "weight": (6000, 60.0),
+    "orders": (50, 10.0),
+}
+# 대기 후 시각/토큰 계산의 반올림 오차 때문에 아주 짧은 대기를 반복하지 않도록 허용하는 오차
+EPSILON = 1e-9
+# 이 상태 코드는 잠시 뒤 같은 요청을 다시 보내면 성공할 수 있음
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def parse_remaining_req(value):
+    """
+    Remaining-Req 헤더 값을 해석합니다.
+
+    Args:
+        value (str): 예: "group=default; min=1800; sec=29"
+
+    Returns:
+        tuple: (그룹 이름, 현재 초에 남은 요청 수). 형식이 맞지 않으면 None
+    """
+    if not value:
+        return None
+    fields = {}
+    for part in value.split(";"):
+        key, sep, val = part.strip().partition("=")
+        if sep:
+            fields[key.strip()] = val.strip()
+    try:
+        return fields["group"], int(fields["sec"])
+    except (KeyError, ValueError):
+        return None
+
+
+def is_retryable_error(exc):
+    """
+    잠시 뒤 다시 시도할 만한 요청 오류인지 판단합니다. (연결 실패, 타임아웃, 429/5xx 응답)
+    """
+    if isinstance(exc, requests.HTTPError):
+        return exc.response is not None and exc.response.status_code in RETRY_STATUSES
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+
+class TokenBucket:
+    """
+    스레드 안전 토큰 버킷입니다. 서버가 알려준 남은 요청 수(sync)나 429 응답(pause)에 맞춰
+    자기 토큰 수를 줄이므로, 다른 클라이언트와 예산을 나눠 쓰는 경우에도 제한을 넘지 않습니다.
+    """
+    def __init__(self, rate, burst=None, clock=None, window=1.0):
+        """
+        Args:
+            rate (float): 초당 허용 요청 수
+            burst (int): 한 번에 보낼 수 있는 최대 요청 수 (기본값: rate)
+            clock: monotonic()/sleep()을 제공하는 시계
+            window (float): 서버 제한 창 길이(초). 남은 요청이 0이라고 알려오면 이만큼 멈춤
+        """
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self.clock = clock or SYSTEM_CLOCK
+        self.window = window
+        self._tokens = self.capacity
+        self._last = self.clock.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def acquire(self, tokens=1.0):
+        """
+        토큰 tokens개를 얻을 때까지 대기합니다. (Binance처럼 요청마다 가중치가 다르면 가중치만큼)
+
+        Returns:
+            float: 기다린 시간(초)
+        """
+        tokens = min(float(tokens), self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self.clock.monotonic()
+                self._refill(now)
+                if now < self._blocked_until - EPSILON:
+                    wait = self._blocked_until - now
+                elif self._tokens >= tokens - EPSILON:
+                    self._tokens = max(0.0, self._tokens - tokens)
+                    return waited
+                else:
+                    wait = (tokens - self._tokens) / self.rate
+            self.clock.sleep(wait)
+            waited += wait
+
+    def sync(self, remaining):
+        """
+        서버가 알려준 현재 창의 남은 요청 수에 맞춰 토큰 수를 줄입니다. (늘리지는 않음)
+        """
+        with self._lock:
+            now = self.clock.monotonic()
+            self._refill(now)
+            self._tokens = min(self._tokens, float(remaining))
+            if remaining <= 0:
+                self._blocked_until = max(self._blocked_until, now + self.window)
+
+    def pause(self, seconds):
+        """
+        seconds 동안 토큰을 내주지 않습니다. (429 응답 등)
+        """
+        with self._lock:
+            now = self.clock.monotonic()
+            self._refill(now)
+            self._tokens = 0.0
+            self._last = now
+            self._blocked_until = max(self._blocked_until, now + seconds)
+
+    @property
+    def tokens(self):
+        with self._lock:
+            self._refill(self.clock.monotonic())
+            return self._tokens
+
+
+class RetryPolicy:
+    """
+    지수 백오프 + 전체 지터(full jitter) 재시도 정책입니다.
+    attempt번째 재시도 전 대기 시간은 [0, min(max_delay, base_delay * 2^attempt)]에서 고르게 뽑습니다.
+    """
+    def __init__(self, max_retries=3, base_delay=0.1, max_delay=2.0, seed=None):
+        """
+        Args:
+            max_retries (int): 최대 재시도 횟수 (0이면 재시도하지 않음)
+            base_delay (float): 첫 재시도 대기 시간 상한(초)
+            max_delay (float): 대기 시간 상한(초)
+            seed (int): 지터 난수 시드 (테스트용)
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._random = random.Random(seed)
+
+    def delay(self, attempt):
+        return self._random.uniform(0.0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class RateLimitController:
+    """
+    RateLimitController는 요청 그룹별 TokenBucket을 관리하는 클래스입니다.
+
+    - 요청 전 acquire(method, path)로 그룹의 토큰을 얻습니다. 그룹은 경로로 추정하되,
+      응답 헤더로 실제 그룹을 알게 되면 그 경로는 이후 그 그룹으로 셉니다.
+    - 응답마다 update()로 Remaining-Req 헤더를 반영하고, 429면 backoff()로 그룹 전체를 잠시 멈춥니다.
+    """
+    def __init__(self, limits=None, clock=None, enabled=True):
+        """
+        Args:
+            limits (dict): 그룹 -> 초당 요청 수 (없으면 DEFAULT_LIMITS)
+            clock: monotonic()/sleep()을 제공하는 시계
+            enabled (bool): False면 제한하지 않음 (벤치마크, 로컬 스텁 서버용)
+        """
+        self.limits = dict(DEFAULT_LIMITS if limits is None else limits)
+        self.clock = clock or SYSTEM_CLOCK
+        self.enabled = enabled
+        self._buckets = {}
+        self._learned = {}  # (method, path 첫 부분) -> 응답 헤더로 확인한 그룹
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _route(method, path):
+        return method.upper(), path.strip("/").split("/", 1)[0]
+
+    def group_for(self, method, path):
+        """
+        요청이 속할 그룹을 반환합니다.
+
+        Args:
+            method (str): "GET" 또는 "POST" 등
+            path (str): 예: "/candles/minutes/1"
+
+        Returns:
+            str: 그룹 이름
+        """
+        route = self._route(method, path)
+        learned = self._learned.get(route)
+        if learned is not None:
+            return learned
+        method, head = route
+        if head == "orders" and method != "GET":
+            return "order"
+        if head in ("candles", "ticker", "orderbook", "trades", "market"):
+            return head
+        return "default"
+
+    def _make_bucket(self, group):
+        return TokenBucket(self.limits.get(group, UNKNOWN_GROUP_LIMIT), clock=self.clock)
+
+    def bucket(self, group):
+        with self._lock:
+            bucket = self._buckets.get(group)
+            if bucket is None:
+                bucket = self._buckets[group] = self._make_bucket(group)
+            return bucket
+
+    def acquire(self, method, path, weight=1):
+        """
+        요청 그룹의 토큰을 얻을 때까지 대기하고 그룹 이름을 반환합니다.
+
+        Args:
+            method (str): HTTP 메서드
+            path (str): 요청 경로
+            weight (float): 요청이 쓰는 토큰 수 (Upbit는 항상 1)
+        """
+        group = self.group_for(method, path)
+        if self.enabled:
+            waited = self.bucket(group).acquire(weight)
+            if waited:
+                logger.debug("Rate limited %s %s for %.3fs (group=%s)", method, path, waited, group)
+        return group
+
+    def update(self, method, path, headers):
+        """
+        응답의 Remaining-Req 헤더를 반영합니다.
+
+        Returns:
+            tuple: (그룹, 남은 요청 수). 헤더가 없으면 None
+        """
+        parsed = parse_remaining_req(headers.get("Remaining-Req") if headers else None)
+        if parsed is None:
+            return None
+        group, remaining = parsed
+        self._learned[self._route(method, path)] = group
+        if self.enabled:
+            self.bucket(group).sync(remaining)
+        return parsed
+
+    def backoff(self, group, seconds):
+        """
+        그룹의 모든 요청을 seconds 동안 멈춥니다.
+        """
+        if self.enabled:
+            self.bucket(group).pause(seconds)
+
+
+class BinanceRateLimitController(RateLimitController):
+    """
+    BinanceRateLimitController는 Binance의 요청 가중치/주문 수 제한을 관리하는 컨트롤러입니다.
+
+    - 모든 요청은 "weight" 버킷(기본 분당 6000)에서 요청 가중치만큼 토큰을 씁니다.
+    - 주문 생성(POST /api/v3/order)은 "orders" 버킷(기본 10초당 50)에서도 토큰 하나를 씁니다.
+    - 응답의 X-MBX-USED-WEIGHT-1M / X-MBX-ORDER-COUNT-10S 헤더로 서버가 센 사용량에 맞춰 토큰을 줄입니다.
+    """
+    def __init__(self, limits=None, clock=None, enabled=True):
+        """
+        Args:
+            limits (dict): 그룹 -> (창 안의 허용량, 창 길이(초)) (없으면 BINANCE_LIMITS)
+            clock: monotonic()/sleep()을 제공하는 시계
+            enabled (bool): False면 제한하지 않음
+        """
+        super().__init__(BINANCE_LIMITS if limits is None else limits, clock=clock, enabled=enabled)
+
+    def _make_bucket(self, group):
+        limit, window = self.limits[group]
+        return TokenBucket(limit / window, burst=limit, clock=self.clock, window=window)
+
+    def group_for(self, method, path):
+        if method.upper() == "POST" and path.rstrip("/").endswith("/order"):
+            return "orders"
+        return "weight"
+
+    def acquire(self, method, path, weight=1):
+        group = self.group_for(method, path)
+        if self.enabled:
+            waited = self.bucket("weight").acquire(weight)
+            if group == "orders":
+                waited += self.bucket("orders").acquire()
+            if waited:
+                logger.debug("Rate limited %s %s for %.3fs (group=%s)", method, path, waited, group)
+        return group
+
+    def update(self, method, path, headers):
+        """
+        응답의 사용량 헤더를 반영합니다.
+
+        Returns:
+            tuple: (그룹, 남은 허용량) 중 가중치 그룹. 헤더가 없으면 None
+        """
+        if not headers:
+            return None
+        result = None
+        for group, header in (("orders", "X-MBX-ORDER-COUNT-10S"), ("weight", "X-MBX-USED-WEIGHT-1M")):
+            used = headers.get(header)
+            if used is None:
+                continue
+            try:
+                remaining = self.limits[group][0] - int(used)
+            except ValueError:
+                continue
+            if self.enabled:
+                self.bucket(group).sync(remaining)
+            result = (group, remaining)
+        return result
+
+
+_CONTROLLER_TYPES = {
+    "upbit": RateLimitController,
+    "binance": BinanceRateLimitController,
+}
+_DEFAULT_CONTROLLERS = {}
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_rate_limiter(venue="upbit"):
+    """
+    거래소별 프로세스 공용 속도 제한 컨트롤러를 반환합니다. (각 어댑터와 CandleDownloader의 기본값)
+    ALPHAMAIND_RATE_LIMIT=0이면 제한하지 않는 컨트롤러를 반환합니다.
+
+    Args:
+        venue (str): "upbit" 또는 "binance"
+    """
+    with _DEFAULT_LOCK:
+        controller = _DEFAULT_CONTROLLERS.get(venue)
+        if controller is None:
+            enabled = os.getenv("ALPHAMAIND_RATE_LIMIT", "1") != "0"
+            controller = _DEFAULT_CONTROLLERS[venue] = _CONTROLLER_TYPES[venue](enabled=enabled)
+        return controller
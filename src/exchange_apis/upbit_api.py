@@ -4,22 +4,58 @@ import os
 import uuid
 import jwt
 import hashlib
-import requests
 from urllib.parse import urlencode
 
-class UpbitAPI:
-    def __init__(self, access_key=None, secret_key=None):
+import requests
+
+from src.data_handler.fetch_data import candle_endpoint, ms_to_utc_string, parse_candles
+from src.exchange_apis.base import ExchangeAPI, RestTransport
+from src.exchange_apis.rate_limit import get_rate_limiter
+from src.utils.helpers import get_shared_session
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class UpbitAPI(ExchangeAPI):
+    name = "upbit"
+    min_order_total = 5000.0
+
+    def __init__(self, access_key=None, secret_key=None, base_url="https://api.upbit.com/v1",
+                 timeout=(3.05, 10), pool_size=10, session=None, debug=False, metrics=None,
+                 rate_limiter=None, retry=None, clock=None):
+        """
+        Args:
+            access_key (str): Upbit Access Key (없으면 UPBIT_API_KEY 환경변수)
+            secret_key (str): Upbit Secret Key (없으면 UPBIT_SECRET_KEY 환경변수)
+            base_url (str): API 기본 URL
+            timeout (float or tuple): 요청 타임아웃(초). (연결, 읽기) 튜플 가능
+            pool_size (int): 호스트당 keep-alive로 유지할 최대 연결 수 (공용 세션을 처음 만들 때만 적용)
+            session (requests.Session): 사용할 세션 (없으면 다른 거래소 어댑터와 함께 쓰는 프로세스 공용 세션)
+            debug (bool): True면 요청/응답을 DEBUG 레벨로 기록 (토큰은 기록하지 않음)
+            metrics (MetricsRegistry): 요청 지연 시간/오류 수를 기록할 레지스트리 (없으면 공용 레지스트리)
+            rate_limiter (RateLimitController): 요청 그룹별 속도 제한 (없으면 프로세스 공용 컨트롤러)
+            retry (RetryPolicy): 일시적 오류 재시도 정책 (없으면 기본 정책)
+            clock: 재시도 대기에 사용할 시계 (sleep 제공)
+        """
         self.access_key = access_key or os.getenv("UPBIT_API_KEY")
         self.secret_key = secret_key or os.getenv("UPBIT_SECRET_KEY")
-        self.base_url = "https://api.upbit.com/v1"
-        
         if not self.access_key or not self.secret_key:
             raise ValueError("UPBIT_API_KEY와 UPBIT_SECRET_KEY 설정 필요")
 
+        self.transport = RestTransport(
+            "upbit", base_url, rate_limiter or get_rate_limiter("upbit"), timeout=timeout,
+            session=session or get_shared_session(pool_size), retry=retry, metrics=metrics, clock=clock,
+            debug=debug, log=logger,
+        )
+        self.base_url = self.transport.base_url
+        self.session = self.transport.session
+        self.metrics = self.transport.metrics
+        self.rate_limiter = self.transport.rate_limiter
+        self.retry = self.transport.retry
+        self.clock = self.transport.clock
+
     def _make_headers(self, query=None):
-        # 디버그: query 파라미터 상태 확인
-        print(f"[DEBUG] _make_headers - Query: {query}")
-        
         payload = {
             'access_key': self.access_key,
             'nonce': str(uuid.uuid4()),
@@ -27,79 +63,124 @@ class UpbitAPI:
 
         if query is not None:
             q_string = urlencode(query)
-            # 디버그: query 문자열 변환 확인
-            print(f"[DEBUG] _make_headers - Encoded Query String: {q_string}")
-            
             m = hashlib.sha512()
             m.update(q_string.encode('utf-8'))
-            query_hash = m.hexdigest()
-            payload['query_hash'] = query_hash
+            payload['query_hash'] = m.hexdigest()
             payload['query_hash_alg'] = 'SHA512'
-            # 디버그: query_hash 생성 확인
-            print(f"[DEBUG] _make_headers - Query Hash: {query_hash}")
 
         jwt_token = jwt.encode(payload, self.secret_key, algorithm='HS256')
-        headers = {
+        return {
             "Accept": "application/json",
             "Authorization": f'Bearer {jwt_token}'
         }
-        # 디버그: 생성된 헤더 확인
-        print(f"[DEBUG] _make_headers - Headers: {headers}")
-        return headers
+
+    def _sign(self, method, path, params):
+        # nonce는 요청마다 새로 만들어야 하므로 RestTransport가 재시도마다 다시 호출함
+        return params, self._make_headers(params or None)
+
+    def _request(self, method, path, params=None, auth=False, idempotent=None):
+        """
+        공용 RestTransport로 요청을 보내고 JSON 응답을 반환합니다.
+        (속도 제한, 재시도, 지연 시간 기록은 RestTransport.request 참고)
+
+        Args:
+            method (str): "GET" 또는 "POST"
+            path (str): 예: "/ticker"
+            params (dict): 쿼리 파라미터
+            auth (bool): True면 JWT 인증 헤더 추가 (params가 있으면 query_hash 포함)
+            idempotent (bool): 다시 보내도 안전한 요청인지 (None이면 GET만 안전)
+
+        Returns:
+            dict or list: 응답 JSON
+        """
+        return self.transport.request(method, path, params=params, sign=self._sign if auth else None,
+                                      idempotent=idempotent)
+
+    def latency_stats(self):
+        """
+        엔드포인트별 왕복 시간 통계를 반환합니다.
+
+        Returns:
+            dict: "GET /ticker" 등 -> {"count", "avg_ms", "last_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms", ...}
+        """
+        return self.transport.latency_stats()
+
+    def close(self):
+        self.transport.close()
 
     def get_current_price(self, market_pair: str) -> float:
-        url = f"{self.base_url}/ticker?markets={market_pair}"
-        print(f"[DEBUG] Fetching current price from URL: {url}")  
-        resp = requests.get(url)
-        print(f"[DEBUG] API Response Status Code: {resp.status_code}")  
-        print(f"[DEBUG] API Response Body: {resp.text}")  
-        resp.raise_for_status()
-        data = resp.json()
-        trade_price = float(data[0]['trade_price'])
-        print(f"[DEBUG] Parsed Trade Price: {trade_price}")  
-        print(f"[DEBUG] 현재가: {trade_price}")  
-        return trade_price
-
-    def get_balance(self, asset: str) -> float:
-        url = f"{self.base_url}/accounts"
-        headers = self._make_headers()
-        print(f"[DEBUG] get_balance - Requesting balance for {asset}")
-        resp = requests.get(url, headers=headers)
-        print(f"[DEBUG] get_balance - Status Code: {resp.status_code}")
-        print(f"[DEBUG] get_balance - Response Body: {resp.text}")
-        resp.raise_for_status()
-        data = resp.json()
-        for d in data:
-            if d['currency'].upper() == asset.upper():
-                balance = float(d['balance'])
-                print(f"[DEBUG] get_balance - Found balance: {balance}")
-                return balance
-        print("[DEBUG] get_balance - No balance found, returning 0.0")
-        return 0.0
-
-    def place_order(self, market_pair: str, side: str, volume: float = None, price: float = None):
+        data = self._request("GET", "/ticker", params={"markets": market_pair})
+        return float(data[0]['trade_price'])
+
+    def get_current_prices(self, market_pairs) -> dict:
+        """
+        여러 마켓의 현재가를 /ticker 한 번의 요청으로 조회합니다.
+
+        Args:
+            market_pairs (list): 예: ["KRW-BTC", "KRW-ETH"]
+
+        Returns:
+            dict: 마켓 -> 현재가
+        """
+        data = self._request("GET", "/ticker", params={"markets": ",".join(market_pairs)})
+        return {d['market']: float(d['trade_price']) for d in data}
+
+    def get_orderbook(self, market_pair: str) -> dict:
+        """
+        호가창을 조회합니다.
+
+        Args:
+            market_pair (str): 예: "KRW-BTC"
+
+        Returns:
+            dict: {"market", "timestamp", "total_ask_size", "total_bid_size",
+                   "orderbook_units": [{"ask_price", "bid_price", "ask_size", "bid_size"}, ...]}
+        """
+        return self._request("GET", "/orderbook", params={"markets": market_pair})[0]
+
+    def get_orderbooks(self, market_pairs) -> dict:
+        """
+        여러 마켓의 호가창을 /orderbook 한 번의 요청으로 조회합니다.
+
+        Returns:
+            dict: 마켓 -> 호가창 (get_orderbook과 같은 형식)
+        """
+        data = self._request("GET", "/orderbook", params={"markets": ",".join(market_pairs)})
+        return {d["market"]: d for d in data}
+
+    def get_accounts(self) -> list:
+        """
+        전체 계좌 목록을 조회합니다. 모든 통화의 잔고가 한 번에 들어옵니다.
+
+        Returns:
+            list: [{"currency": "KRW", "balance": "...", "locked": "...", ...}, ...]
+        """
+        return self._request("GET", "/accounts", auth=True)
+
+    def place_order(self, market_pair: str, side: str, volume: float = None, price: float = None,
+                    identifier: str = None):
         """
         실제 Upbit 주문을 발행합니다.
 
+        주문마다 고유한 identifier를 붙여 보내므로, 타임아웃/연결 오류/5xx처럼 주문이 접수됐는지 알 수 없는
+        실패 뒤에는 identifier로 주문을 조회해 이미 접수된 주문을 반환하고, 없을 때만 같은 identifier로
+        다시 보냅니다. (Upbit는 같은 identifier의 주문을 두 번 받지 않으므로 중복 주문이 생기지 않음)
+
         Args:
             market_pair (str): 예: "KRW-BTC"
             side (str): "buy" 또는 "sell" -> Upbit에서는 "bid"(매수), "ask"(매도)로 변환 필요
             volume (float): 매도 시 코인 수량
             price (float): 매수 시 원화 금액
+            identifier (str): 주문 식별자 (없으면 생성)
 
         Returns:
             dict: 주문 결과 응답
         """
-        
-        # 디버그: side 값 확인 및 변환
-        print(f"[DEBUG] place_order - Original side: {side}")
         if side == 'buy':
             side = 'bid'
         elif side == 'sell':
             side = 'ask'
-        print(f"[DEBUG] place_order - Converted side: {side}")
 
-        url = f"{self.base_url}/orders"
         query = {"market": market_pair, "side": side}
         if side == 'bid':  # 매수
             # 시장가 매수 시 ord_type='price'로 설정하고, price에 매수할 원화 금액을 지정
@@ -113,11 +194,46 @@ class UpbitAPI:
                 raise ValueError("매도 시 volume 필요")
             query["ord_type"] = "market"
             query["volume"] = str(volume)
+        query["identifier"] = identifier or f"amp-{uuid.uuid4()}"
+
+        return self.transport.submit_order(
+            query["identifier"],
+            lambda: self._request("POST", "/orders", params=query, auth=True, idempotent=False),
+            lambda: self._find_order(query["identifier"]),
+        )
+
+    def _find_order(self, identifier):
+        try:
+            return self.get_order(identifier=identifier)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+
+    def get_order(self, order_uuid: str = None, identifier: str = None, market: str = None) -> dict:
+        """
+        주문 하나의 상태와 체결 내역을 조회합니다.
+
+        Args:
+            order_uuid (str): 주문 UUID
+            identifier (str): 주문 시 지정한 식별자 (order_uuid 대신 사용 가능)
+            market (str): 사용하지 않음 (Upbit은 uuid/식별자만으로 조회)
+
+        Returns:
+            dict: 주문 정보 (state, executed_volume, paid_fee, trades 등)
+        """
+        params = {"uuid": order_uuid} if order_uuid is not None else {"identifier": identifier}
+        return self._request("GET", "/order", params=params, auth=True)
 
-        print(f"[DEBUG] place_order - Final query: {query}")
-        headers = self._make_headers(query)
-        resp = requests.post(url, headers=headers, params=query)
-        print(f"[DEBUG] place_order - Status Code: {resp.status_code}")
-        print(f"[DEBUG] place_order - Response Body: {resp.text}")
-        resp.raise_for_status()
-        return resp.json()
+    def get_candles(self, market_pair: str, interval: str = "minute1", count: int = 200, to: int = None) -> list:
+        """
+        최근 캔들을 오래된 순으로 조회합니다. (요청 한 번, 최대 200개)
+
+        Returns:
+            list: [{"timestamp", "open", "high", "low", "close", "volume"}, ...]
+        """
+        params = {"market": market_pair, "count": min(count, 200)}
+        if to is not None:
+            params["to"] = ms_to_utc_string(to)
+        rows = self._request("GET", "/" + candle_endpoint(interval), params=params)
+        return sorted(parse_candles(rows), key=lambda c: c["timestamp"])
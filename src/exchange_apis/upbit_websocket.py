@@ -0,0 +1,150 @@
+# src/exchange_apis/upbit_websocket.py
+# Upbit 실시간 시세(ticker/trade) WebSocket 구독 클라이언트
+import json
+import random
+import threading
+import time
+import uuid
+
+from websockets.sync.client import connect
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+UPBIT_WEBSOCKET_URL = "wss://api.upbit.com/websocket/v1"
+
+
+class UpbitTickerStream:
+    """
+    UpbitTickerStream은 백그라운드 스레드에서 Upbit WebSocket을 구독해
+    시장별 최신 체결가를 유지하는 클래스입니다.
+
+    연결이 끊기면 지수 백오프(지터 포함)로 다시 연결하고 구독을 재전송합니다.
+    새 가격이 들어오면 wait_for_update()로 대기 중인 쪽을 깨우고, on_price 콜백을 호출합니다.
+    """
+    def __init__(self, markets, url=UPBIT_WEBSOCKET_URL, stream_type="ticker", on_price=None,
+                 reconnect_delay=1.0, max_reconnect_delay=30.0, open_timeout=10):
+        """
+        Args:
+            markets (list): 구독할 시장 목록 (예: ["KRW-BTC"])
+            url (str): WebSocket URL
+            stream_type (str): "ticker" 또는 "trade"
+            on_price (callable): on_price(market, price, timestamp_ms)를 수신 스레드에서 호출
+            reconnect_delay (float): 첫 재연결 대기(초)
+            max_reconnect_delay (float): 최대 재연결 대기(초)
+            open_timeout (float): 연결 타임아웃(초)
+        """
+        self.markets = list(markets)
+        self.url = url
+        self.stream_type = stream_type
+        self.on_price = on_price
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.open_timeout = open_timeout
+
+        self._cond = threading.Condition()
+        self._latest = {}  # market -> (price, exchange_ts_ms, received_monotonic, seq)
+        self._seq = 0
+        self._stop = threading.Event()
+        self._thread = None
+        self.connections = 0  # 성공한 연결 횟수 (재연결 포함)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="upbit-ws", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _subscribe_message(self):
+        return json.dumps([
+            {"ticket": str(uuid.uuid4())},
+            {"type": self.stream_type, "codes": self.markets},
+        ])
+
+    def _run(self):
+        delay = self.reconnect_delay
+        while not self._stop.is_set():
+            try:
+                with connect(self.url, open_timeout=self.open_timeout) as ws:
+                    ws.send(self._subscribe_message())
+                    self.connections += 1
+                    logger.info("WebSocket connected: %s %s", self.url, self.markets)
+                    while not self._stop.is_set():
+                        try:
+                            message = ws.recv(timeout=1.0)
+                        except TimeoutError:
+                            continue
+                        self._handle_message(message)
+                        delay = self.reconnect_delay
+            except Exception as e:
+                if self._stop.is_set():
+                    break
+                wait = delay * (0.5 + random.random())
+                logger.warning("WebSocket disconnected (%s); reconnecting in %.2fs", e, wait)
+                self._stop.wait(wait)
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _handle_message(self, message):
+        data = json.loads(message)
+        # DEFAULT 포맷("code", "trade_price")과 SIMPLE 포맷("cd", "tp") 모두 처리
+        market = data.get("code", data.get("cd"))
+        price = data.get("trade_price", data.get("tp"))
+        if market is None or price is None:
+            return
+        price = float(price)
+        timestamp = data.get("trade_timestamp", data.get("ttms", data.get("timestamp")))
+        with self._cond:
+            self._seq += 1
+            self._latest[market] = (price, timestamp, time.monotonic(), self._seq)
+            self._cond.notify_all()
+        if self.on_price is not None:
+            self.on_price(market, price, timestamp)
+
+    def latest(self, market):
+        """
+        시장의 최신 시세를 반환합니다.
+
+        Returns:
+            tuple or None: (가격, 거래소 타임스탬프(ms), 수신 시각(monotonic), 순번)
+        """
+        with self._cond:
+            return self._latest.get(market)
+
+    def wait_for_update(self, market, after_seq=0, timeout=None):
+        """
+        after_seq 이후의 새 시세가 들어올 때까지 대기합니다.
+
+        Args:
+            market (str): 시장
+            after_seq (int): 이미 처리한 마지막 순번
+            timeout (float): 최대 대기 시간(초)
+
+        Returns:
+            tuple or None: 새 시세 (latest 형식). 시간 초과 또는 중지 시 None
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._stop.is_set():
+                entry = self._latest.get(market)
+                if entry is not None and entry[3] > after_seq:
+                    return entry
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+        return None
@@ -1,13 +1,28 @@
 # src/main.py
 
+from src.data_handler.database import CandleStore
+from src.data_handler.fetch_data import CandleDownloader
+from src.data_handler.journal import TradeJournal
+from src.exchange_apis.orderbook import OrderBookCache, SlippageEstimator
 from src.exchange_apis.upbit_api import UpbitAPI
+from src.exchange_apis.upbit_websocket import UpbitTickerStream
+from src.strategies.risk_management import RiskManager
 from src.strategies.simple_moving_average import SimpleMovingAverageStrategy
 from src.trading.live_trading import run_live_trading
+from src.trading.order_executor import OrderExecutor
+from src.trading.price_source import StreamingPriceSource
+from src.trading.warm_start import StateCheckpoint, warm_start
 from src.utils.config_loader import load_secrets
 from src.trading.position_manager import PositionManager  # 실제 잔고 반영
+from src.utils.logger import get_logger, setup_logging
+from src.utils.metrics import SnapshotWriter, get_registry
+
+logger = get_logger(__name__)
 
 if __name__ == "__main__":
-    print("Starting run_live_trading...")
+    # 콘솔 + logs/trading.log (JSON Lines) 비동기 로깅
+    setup_logging()
+    logger.info("Starting run_live_trading...")
 
     # secrets.yaml에서 API 키 로딩
     secrets = load_secrets()
@@ -17,8 +32,11 @@ if __name__ == "__main__":
     # UpbitAPI 인스턴스 생성 (실매수 API)
     exchange = UpbitAPI(access_key=upbit_key, secret_key=upbit_secret)
 
+    # 시그널/주문/체결/잔고를 data/journal/trades.sqlite3에 백그라운드로 기록 (손익 분석: journal.stats(시장))
+    journal = TradeJournal()
+
     # PositionManager 인스턴스 생성 (실제 잔고 반영)
-    position_manager = PositionManager(exchange, base_currency="KRW", asset="BTC")
+    position_manager = PositionManager(exchange, base_currency="KRW", asset="BTC", journal=journal)
 
     # SMA 전략 인스턴스 생성
     # short_window=5, long_window=20 사용, 익절/손절은 RiskManager에서 처리하므로 전략은 BUY/HOLD만 판단
@@ -27,7 +45,39 @@ if __name__ == "__main__":
     # Upbit 마켓 페어
     trading_pair = "KRW-BTC"
 
+    # 손절 5%, 익절 10%
+    risk_manager = RiskManager(stop_loss_pct=0.05, take_profit_pct=0.10)
+
+    # 재시작 시 체크포인트(5분 이내) 또는 최근 1분봉으로 전략 버퍼를 채우고 진입가를 복원해 첫 틱부터 거래
+    checkpoint = StateCheckpoint(f"data/state/{trading_pair}.json")
+    with CandleStore() as store:
+        warm_start(strategy, risk_manager, trading_pair, checkpoint=checkpoint, store=store,
+                   downloader=CandleDownloader(store), exchange=exchange)
+
+    # 실시간 시세 스트림 (스트림이 끊기거나 늦으면 REST 조회로 대체)
+    stream = UpbitTickerStream([trading_pair]).start()
+    price_source = StreamingPriceSource(stream, trading_pair, exchange=exchange, interval=5)
+
+    # 주문 전에 1초 캐시된 호가창으로 체결가를 예측하고, 예상 슬리피지 10bp를 넘는 매수는 줄이거나 건너뜀
+    slippage_estimator = SlippageEstimator(OrderBookCache(exchange, ttl=1.0))
+
+    # 주문은 작업 스레드에서 제출하고 실제 체결(평균 체결가, 수수료)로 잔고와 진입가를 반영
+    order_executor = OrderExecutor(exchange)
+
+    # 단계별 지연 시간/카운터를 10초마다 logs/metrics.json에 저장
+    metrics_writer = SnapshotWriter(get_registry(), "logs/metrics.json", interval=10).start()
+
     # 라이브 트레이딩 실행
-    run_live_trading(exchange, strategy, position_manager, symbol=trading_pair, interval=5)
+    try:
+        run_live_trading(exchange, strategy, position_manager, symbol=trading_pair, interval=5,
+                         price_source=price_source, order_executor=order_executor,
+                         risk_manager=risk_manager, checkpoint=checkpoint,
+                         slippage_estimator=slippage_estimator, max_slippage_bps=10, journal=journal)
+    finally:
+        stream.stop()
+        order_executor.shutdown()  # 추적 중인 주문을 기다린 뒤 남은 체결을 잔고/저널에 반영
+        order_executor.apply_fills(position_manager, risk_manager, market=trading_pair)
+        metrics_writer.stop()
+        journal.close()
 
-    print("After run_live_trading...")
+    logger.info("After run_live_trading...")
@@ -0,0 +1,137 @@
+# src/strategies/breakout.py
+# 채널 돌파 전략: 직전 N개 가격의 최고가를 넘으면 매수, 직전 M개 가격의 최저가를 밑돌면 청산
+from collections import deque
+
+import numpy as np
+
+from src.strategies.indicators import RollingMax, RollingMin, rolling_max, rolling_min
+
+
+def _previous(channel):
+    # 틱 i의 채널 = 틱 i-1까지의 창 (현재 가격 제외)
+    out = np.empty_like(channel)
+    out[:1] = np.nan
+    out[1:] = channel[:-1]
+    return out
+
+
+def breakout_signals(prices, entry_lookback=20, exit_lookback=None):
+    """
+    가격 시계열 전체에 대한 BreakoutStrategy 신호를 한 번에 계산합니다.
+    빈 상태에서 시작해 틱마다 update_price/compute_signals를 호출하고, BUY마다 on_buy, SELL마다 on_sell을
+    호출한 것(라이브 루프와 백테스트처럼 신호대로 체결되어 체결마다 on_buy/on_sell이 호출된 경우)과 같은 결과를 냅니다.
+
+    Args:
+        prices (array-like): 1차원 가격 시계열
+        entry_lookback (int): 진입 채널 기간
+        exit_lookback (int): 청산 채널 기간 (없으면 entry_lookback // 2, 최소 1)
+
+    Returns:
+        np.ndarray: 틱별 "BUY", "SELL", "HOLD" 문자열 배열
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    exit_lookback = exit_lookback or max(1, entry_lookback // 2)
+    signals = np.full(len(prices), "HOLD", dtype="<U4")
+    if len(prices) == 0:
+        return signals
+
+    with np.errstate(invalid="ignore"):
+        entry = prices > _previous(rolling_max(prices, entry_lookback))
+        exit_ = prices < _previous(rolling_min(prices, exit_lookback))
+
+    # 두 조건은 모두 직전 가격을 포함한 창과 비교하므로 동시에 참일 수 없음.
+    # 신호대로 체결되면 포지션은 마지막 진입/청산 조건이 무엇이었는지로 정해지므로 앞으로 채워 구함
+    event = np.flatnonzero(entry | exit_)
+    last = np.full(len(prices), -1)
+    last[event] = event
+    last = np.maximum.accumulate(last)
+    holding = np.where(last >= 0, entry[np.maximum(last, 0)], False)
+    before = np.r_[False, holding[:-1]]
+
+    signals[entry & ~before] = "BUY"
+    signals[exit_ & before] = "SELL"
+    return signals
+
+
+class BreakoutStrategy:
+    """
+    BreakoutStrategy는 채널 돌파 전략입니다.
+
+    - 포지션이 없을 때 현재 가격이 직전 entry_lookback개 가격의 최고가보다 높으면 BUY
+    - 포지션이 있을 때 현재 가격이 직전 exit_lookback개 가격의 최저가보다 낮으면 SELL
+    - 채널 최고/최저는 단조 deque(RollingMax/RollingMin)로 관리하므로 기간과 관계없이 틱당 상각 O(1)입니다.
+
+    인터페이스는 SimpleMovingAverageStrategy와 같습니다. (update_price/compute_signals/on_buy/on_sell)
+    """
+    def __init__(self, entry_lookback=20, exit_lookback=None):
+        """
+        Args:
+            entry_lookback (int): 진입 채널 기간
+            exit_lookback (int): 청산 채널 기간 (없으면 entry_lookback // 2, 최소 1)
+        """
+        if entry_lookback < 1 or (exit_lookback is not None and exit_lookback < 1):
+            raise ValueError("채널 기간은 1 이상이어야 합니다.")
+        self.entry_lookback = entry_lookback
+        self.exit_lookback = exit_lookback or max(1, entry_lookback // 2)
+        # 채널은 직전 가격까지만 포함해야 하므로 한 틱 늦게 넣음
+        self.upper = RollingMax(self.entry_lookback)
+        self.lower = RollingMin(self.exit_lookback)
+        self.last_price = None
+        self.recent = deque(maxlen=self.warmup_period)  # 상태 저장용 최근 가격
+        self.position = None  # "LONG" or None
+        self.entry_price = None
+
+    @property
+    def warmup_period(self):
+        """
+        두 채널이 모두 준비되는 데 필요한 가격 수 (채널 기간 + 현재 가격)
+        """
+        return max(self.entry_lookback, self.exit_lookback) + 1
+
+    def update_price(self, current_price: float):
+        self.recent.append(current_price)
+        if self.last_price is not None:
+            self.upper.update(self.last_price)
+            self.lower.update(self.last_price)
+        self.last_price = current_price
+
+    def compute_signals(self):
+        price = self.last_price
+        if self.position is None:
+            upper = self.upper.value
+            if upper is not None and price > upper:
+                return "BUY"
+        else:
+            lower = self.lower.value
+            if lower is not None and price < lower:
+                return "SELL"
+        return "HOLD"
+
+    def compute_signals_array(self, prices):
+        """
+        빈 상태에서 시작한 이 전략의 신호를 시계열 전체에 대해 계산합니다. (breakout_signals 참고)
+        """
+        return breakout_signals(prices, self.entry_lookback, self.exit_lookback)
+
+    def get_state(self):
+        """
+        재시작 후 이어서 거래할 수 있도록 최근 가격과 포지션을 JSON으로 저장 가능한 dict로 반환합니다.
+        """
+        return {"prices": list(self.recent), "position": self.position, "entry_price": self.entry_price}
+
+    def set_state(self, state):
+        """
+        get_state() 결과를 새 전략에 복원합니다. (가격은 update_price로 다시 넣음)
+        """
+        for price in state.get("prices", []):
+            self.update_price(price)
+        self.position = state.get("position")
+        self.entry_price = state.get("entry_price")
+
+    def on_buy(self, price):
+        self.position = "LONG"
+        self.entry_price = price
+
+    def on_sell(self):
+        self.position = None
+        self.entry_price = None
@@ -0,0 +1,563 @@
+# src/strategies/indicators.py
+# 여러 전략이 공유하는 지표 엔진: 봉마다 O(1) 증분 업데이트 + 백테스트용 벡터화 배치 계산
+import math
+from collections import deque
+
+import numpy as np
+
+# 누적 합계를 쓰는 지표가 부동소수점 누적 오차를 없애기 위해 합계를 다시 계산하는 주기(업데이트 횟수)
+RESYNC_INTERVAL = 1024
+# 블록 EMA 계산에서 한 번에 행렬곱으로 처리하는 구간 길이
+EMA_BLOCK = 128
+
+
+# ---------------------------------------------------------------------------
+# 배치(벡터화) 계산. 결과 배열은 입력과 길이가 같고, 값이 정해지지 않은 앞부분은 NaN입니다.
+# ---------------------------------------------------------------------------
+
+def _nan(n):
+    return np.full(n, np.nan)
+
+
+def linear_filter(x, alpha, initial):
+    """
+    y[t] = alpha * x[t] + (1 - alpha) * y[t-1] (y[-1] = initial)를 블록 단위 행렬곱으로 계산합니다.
+
+    길이 EMA_BLOCK 구간 안의 재귀는 하삼각 행렬 하나와의 곱으로 풀고,
+    구간 사이에는 끝 값 하나만 넘기므로 파이썬 반복은 len(x) / EMA_BLOCK번입니다.
+
+    Args:
+        x (np.ndarray): 입력
+        alpha (float): 평활 계수 (0 < alpha <= 1)
+        initial (float): y[-1]
+
+    Returns:
+        np.ndarray: y
+    """
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    if n == 0:
+        return np.empty(0)
+    block = min(EMA_BLOCK, n)
+    nb = -(-n // block)
+    padded = np.zeros(nb * block)
+    padded[:n] = x
+    decay = 1.0 - alpha
+    j = np.arange(block)
+    lag = j[:, None] - j[None, :]
+    kernel = np.where(lag >= 0, alpha * decay ** np.maximum(lag, 0), 0.0)
+    local = padded.reshape(nb, block) @ kernel.T  # 구간 시작 값이 0일 때의 응답
+    carry_weight = decay ** (j + 1)
+
+    starts = np.empty(nb)
+    prev = float(initial)
+    last_weight = carry_weight[-1]
+    last_local = local[:, -1]
+    for k in range(nb):
+        starts[k] = prev
+        prev = last_local[k] + last_weight * prev
+    return (local + starts[:, None] * carry_weight[None, :]).ravel()[:n]
+
+
+def sma(x, period):
+    """
+    단순 이동평균. 누적합 차분으로 계산합니다. (첫 값을 빼고 누적해 큰 가격의 오차를 줄임)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    out = _nan(len(x))
+    if len(x) < period:
+        return out
+    ref = x[0]
+    csum = np.concatenate(([0.0], np.cumsum(x - ref)))
+    out[period - 1:] = (csum[period:] - csum[:-period]) / period + ref
+    return out
+
+
+def ema(x, period):
+    """
+    지수 이동평균 (alpha = 2 / (period + 1), 첫 값으로 시작). period개 이전은 NaN.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    out = _nan(len(x))
+    if len(x) < period:
+        return out
+    y = linear_filter(x, 2.0 / (period + 1), x[0])
+    out[period - 1:] = y[period - 1:]
+    return out
+
+
+def _wilder(values, period, start):
+    # values[start-period+1 .. start]의 평균으로 시작해 alpha = 1/period로 평활 (Wilder)
+    out = _nan(len(values))
+    if len(values) <= start:
+        return out
+    seed = values[start - period + 1:start + 1].mean()
+    out[start] = seed
+    out[start + 1:] = linear_filter(values[start + 1:], 1.0 / period, seed)
+    return out
+
+
+def rsi(x, period=14):
+    """
+    Wilder RSI. 변화량 period개가 모인 시점(인덱스 period)부터 값이 있습니다.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    out = _nan(len(x))
+    if len(x) <= period:
+        return out
+    change = np.diff(x, prepend=x[0])
+    gain = _wilder(np.maximum(change, 0.0), period, period)
+    loss = _wilder(np.maximum(-change, 0.0), period, period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        value = 100.0 - 100.0 / (1.0 + gain / loss)
+    value = np.where(loss == 0, np.where(gain == 0, 50.0, 100.0), value)
+    out[period:] = value[period:]
+    return out
+
+
+def bollinger(x, period=20, num_std=2.0):
+    """
+    볼린저 밴드 (이동평균 ± num_std * 모표준편차).
+
+    Returns:
+        tuple: (중심선, 상단, 하단) 배열
+    """
+    x = np.asarray(x, dtype=np.float64)
+    mid, std = _nan(len(x)), _nan(len(x))
+    if len(x) >= period:
+        shifted = x - x[0]
+        csum = np.concatenate(([0.0], np.cumsum(shifted)))
+        csq = np.concatenate(([0.0], np.cumsum(shifted * shifted)))
+        mean = (csum[period:] - csum[:-period]) / period
+        var = (csq[period:] - csq[:-period]) / period - mean * mean
+        mid[period - 1:] = mean + x[0]
+        std[period - 1:] = np.sqrt(np.maximum(var, 0.0))
+    return mid, mid + num_std * std, mid - num_std * std
+
+
+def true_range(high, low, close):
+    """
+    True Range. 첫 봉은 high - low.
+    """
+    high, low, close = (np.asarray(a, dtype=np.float64) for a in (high, low, close))
+    prev = np.concatenate(([close[0]], close[:-1])) if len(close) else close
+    tr = np.maximum(high - low, np.maximum(np.abs(high - prev), np.abs(low - prev)))
+    if len(tr):
+        tr[0] = high[0] - low[0]
+    return tr
+
+
+def atr(high, low, close, period=14):
+    """
+    Wilder ATR. 첫 period개 True Range의 평균(인덱스 period-1)부터 값이 있습니다.
+    """
+    return _wilder(true_range(high, low, close), period, period - 1)
+
+
+def _block_extreme(x, period, combine, pad):
+    # van Herk / Gil-Werman: 길이 period 블록의 앞쪽 누적(g)과 뒤쪽 누적(h)으로 창마다 비교 1번
+    x = np.asarray(x, dtype=np.float64)
+    n = len(x)
+    out = _nan(n)
+    if n < period:
+        return out
+    nb = -(-n // period)
+    padded = np.full(nb * period, pad)
+    padded[:n] = x
+    blocks = padded.reshape(nb, period)
+    prefix = combine.accumulate(blocks, axis=1).ravel()
+    suffix = combine.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    end = np.arange(period - 1, n)
+    out[period - 1:] = combine(suffix[end - period + 1], prefix[end])
+    return out
+
+
+def rolling_max(x, period):
+    """
+    최근 period개의 최댓값 (van Herk/Gil-Werman, 원소당 비교 3번).
+    """
+    return _block_extreme(x, period, np.maximum, -np.inf)
+
+
+def rolling_min(x, period):
+    """
+    최근 period개의 최솟값 (van Herk/Gil-Werman).
+    """
+    return _block_extreme(x, period, np.minimum, np.inf)
+
+
+# ---------------------------------------------------------------------------
+# 증분 지표. update()는 봉 하나를 O(1)(상각)로 반영하고, value는 준비 전 None입니다.
+# ---------------------------------------------------------------------------
+
+class SMA:
+    """
+    단순 이동평균.
+
+    exact=True면 값을 읽을 때 창 전체를 np.mean으로 계산합니다. (기존 전략과 비트 단위로 같은 값,
+    창 길이에 비례하는 비용) False면 누적 합계를 O(1)로 갱신하고 RESYNC_INTERVAL마다 math.fsum으로 다시 맞춥니다.
+    두 방식은 값이 미세하게 다를 수 있으므로 exact=True의 이름에는 "_exact"를 붙여 구분합니다.
+    """
+    def __init__(self, period, exact=False):
+        self.period = period
+        self.exact = exact
+        self.key = ("sma", period, exact)
+        self.name = f"sma_{period}_exact" if exact else f"sma_{period}"
+        self.window = deque(maxlen=period)
+        self._sum = 0.0
+        self._since_resync = 0
+        self._cached = None
+
+    @property
+    def ready(self):
+        return len(self.window) >= self.period
+
+    def update(self, close, high=None, low=None):
+        window = self.window
+        self._cached = None
+        if not self.exact:
+            if len(window) == self.period:
+                self._sum -= window[0]
+            self._sum += close
+        window.append(close)
+        if not self.exact:
+            self._since_resync += 1
+            if self._since_resync >= max(RESYNC_INTERVAL, self.period):
+                self._since_resync = 0
+                self._sum = math.fsum(window)
+
+    @property
+    def value(self):
+        if not self.ready:
+            return None
+        if not self.exact:
+            return self._sum / self.period
+        if self._cached is None:
+            self._cached = np.array(self.window).mean()
+        return self._cached
+
+    def batch(self, close, high=None, low=None):
+        return sma(close, self.period)
+
+
+class EMA:
+    """
+    지수 이동평균 (alpha = 2 / (period + 1)). 첫 값으로 시작하며 period개부터 준비됩니다.
+    """
+    def __init__(self, period):
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.key = ("ema", period)
+        self.name = f"ema_{period}"
+        self.count = 0
+        self._value = None
+
+    @property
+    def ready(self):
+        return self.count >= self.period
+
+    def update(self, close, high=None, low=None):
+        self.count += 1
+        if self._value is None:
+            self._value = close
+        else:
+            self._value = self.alpha * close + (1.0 - self.alpha) * self._value
+
+    @property
+    def value(self):
+        return self._value if self.ready else None
+
+    def batch(self, close, high=None, low=None):
+        return ema(close, self.period)
+
+
+class _Wilder:
+    # 첫 period개 입력의 평균으로 시작해 alpha = 1/period로 평활
+    def __init__(self, period):
+        self.period = period
+        self.count = 0
+        self.value = None
+        self._seed_sum = 0.0
+
+    def update(self, x):
+        self.count += 1
+        if self.count < self.period:
+            self._seed_sum += x
+        elif self.count == self.period:
+            self.value = (self._seed_sum + x) / self.period
+        else:
+            self.value += (x - self.value) / self.period
+
+
+class RSI:
+    """
+    Wilder RSI. 변화량 period개가 모이면 준비됩니다.
+    """
+    def __init__(self, period=14):
+        self.period = period
+        self.key = ("rsi", period)
+        self.name = f"rsi_{period}"
+        self._prev = None
+        self._gain = _Wilder(period)
+        self._loss = _Wilder(period)
+
+    @property
+    def ready(self):
+        return self._gain.value is not None
+
+    def update(self, close, high=None, low=None):
+        if self._prev is not None:
+            change = close - self._prev
+            self._gain.update(change if change > 0 else 0.0)
+            self._loss.update(-change if change < 0 else 0.0)
+        self._prev = close
+
+    @property
+    def value(self):
+        if not self.ready:
+            return None
+        gain, loss = self._gain.value, self._loss.value
+        if loss == 0:
+            return 50.0 if gain == 0 else 100.0
+        return 100.0 - 100.0 / (1.0 + gain / loss)
+
+    def batch(self, close, high=None, low=None):
+        return rsi(close, self.period)
+
+
+class Bollinger:
+    """
+    볼린저 밴드. value는 (중심선, 상단, 하단).
+    합계/제곱합은 첫 가격을 뺀 값으로 누적해 큰 가격에서의 상쇄 오차를 줄입니다.
+    """
+    def __init__(self, period=20, num_std=2.0):
+        self.period = period
+        self.num_std = num_std
+        self.key = ("bollinger", period, num_std)
+        self.name = f"bollinger_{period}_{num_std:g}"
+        self.window = deque(maxlen=period)
+        self._ref = None
+        self._sum = 0.0
+        self._sq = 0.0
+        self._since_resync = 0
+
+    @property
+    def ready(self):
+        return len(self.window) >= self.period
+
+    def update(self, close, high=None, low=None):
+        if self._ref is None:
+            self._ref = close
+        x = close - self._ref
+        if len(self.window) == self.period:
+            old = self.window[0]
+            self._sum -= old
+            self._sq -= old * old
+        self.window.append(x)
+        self._sum += x
+        self._sq += x * x
+        self._since_resync += 1
+        if self._since_resync >= max(RESYNC_INTERVAL, self.period):
+            self._since_resync = 0
+            self._sum = math.fsum(self.window)
+            self._sq = math.fsum(v * v for v in self.window)
+
+    @property
+    def value(self):
+        if not self.ready:
+            return None
+        mean = self._sum / self.period
+        std = math.sqrt(max(self._sq / self.period - mean * mean, 0.0))
+        mid = mean + self._ref
+        return mid, mid + self.num_std * std, mid - self.num_std * std
+
+    def batch(self, close, high=None, low=None):
+        return bollinger(close, self.period, self.num_std)
+
+
+class ATR:
+    """
+    Wilder ATR. high/low가 없으면 종가만으로 True Range를 계산합니다.
+    """
+    def __init__(self, period=14):
+        self.period = period
+        self.key = ("atr", period)
+        self.name = f"atr_{period}"
+        self._prev_close = None
+        self._avg = _Wilder(period)
+
+    @property
+    def ready(self):
+        return self._avg.value is not None
+
+    def update(self, close, high=None, low=None):
+        high = close if high is None else high
+        low = close if low is None else low
+        if self._prev_close is None:
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self._avg.update(tr)
+
+    @property
+    def value(self):
+        return self._avg.value
+
+    def batch(self, close, high=None, low=None):
+        high = close if high is None else high
+        low = close if low is None else low
+        return atr(high, low, close, self.period)
+
+
+class RollingMax:
+    """
+    최근 period개의 최댓값. 단조 감소 deque에 (인덱스, 값)을 유지해 업데이트당 상각 O(1)입니다.
+    """
+    def __init__(self, period):
+        self.period = period
+        self.key = ("rolling_max", period)
+        self.name = f"rolling_max_{period}"
+        self.count = 0
+        self._deque = deque()
+
+    @property
+    def ready(self):
+        return self.count >= self.period
+
+    def _better(self, new, old):
+        return new >= old
+
+    def update(self, close, high=None, low=None):
+        value = self._input(close, high, low)
+        dq = self._deque
+        while dq and self._better(value, dq[-1][1]):
+            dq.pop()
+        dq.append((self.count, value))
+        self.count += 1
+        if dq[0][0] <= self.count - 1 - self.period:
+            dq.popleft()
+
+    def _input(self, close, high, low):
+        return close
+
+    @property
+    def value(self):
+        return self._deque[0][1] if self.ready else None
+
+    def batch(self, close, high=None, low=None):
+        return rolling_max(close, self.period)
+
+
+class RollingMin(RollingMax):
+    """
+    최근 period개의 최솟값. 단조 증가 deque를 사용합니다.
+    """
+    def __init__(self, period):
+        super().__init__(period)
+        self.key = ("rolling_min", period)
+        self.name = f"rolling_min_{period}"
+
+    def _better(self, new, old):
+        return new <= old
+
+    def batch(self, close, high=None, low=None):
+        return rolling_min(close, self.period)
+
+
+class IndicatorEngine:
+    """
+    IndicatorEngine은 한 시장의 지표를 봉마다 한 번만 계산해 여러 전략이 공유하도록 하는 클래스입니다.
+
+    - 전략은 sma()/ema()/... 로 지표를 구독합니다. 같은 종류/파라미터의 지표는 하나만 만들어 공유합니다.
+    - update(close, index=i)는 i번째 봉을 반영합니다. 여러 전략이 같은 봉으로 각자 update를 불러도
+      이미 반영한 인덱스는 건너뛰므로 지표 계산은 한 번만 일어납니다.
+    - compute_batch()는 구독한 지표를 가격 시계열 전체에 대해 벡터화해 계산합니다. (백테스트용)
+    """
+    def __init__(self):
+        self._indicators = {}
+        self.count = 0  # 반영한 봉 수
+
+    def subscribe(self, indicator):
+        """
+        지표를 등록하고, 같은 key의 지표가 이미 있으면 그 인스턴스를 반환합니다.
+        업데이트가 시작된 뒤에는 새 지표를 추가할 수 없습니다. (이전 봉을 보지 못해 값이 어긋나므로)
+        """
+        existing = self._indicators.get(indicator.key)
+        if existing is not None:
+            return existing
+        if self.count:
+            raise ValueError("업데이트가 시작된 엔진에는 새 지표를 추가할 수 없습니다.")
+        self._indicators[indicator.key] = indicator
+        return indicator
+
+    def sma(self, period, exact=False):
+        return self.subscribe(SMA(period, exact=exact))
+
+    def ema(self, period):
+        return self.subscribe(EMA(period))
+
+    def rsi(self, period=14):
+        return self.subscribe(RSI(period))
+
+    def bollinger(self, period=20, num_std=2.0):
+        return self.subscribe(Bollinger(period, num_std))
+
+    def atr(self, period=14):
+        return self.subscribe(ATR(period))
+
+    def rolling_max(self, period):
+        return self.subscribe(RollingMax(period))
+
+    def rolling_min(self, period):
+        return self.subscribe(RollingMin(period))
+
+    @property
+    def indicators(self):
+        return list(self._indicators.values())
+
+    def update(self, close, high=None, low=None, index=None):
+        """
+        봉 하나를 모든 지표에 반영합니다.
+
+        Args:
+            close (float): 종가(또는 틱 가격)
+            high (float): 고가 (ATR용, 없으면 종가)
+            low (float): 저가 (ATR용, 없으면 종가)
+            index (int): 봉 순번 (0부터). 이미 반영한 순번이면 건너뜀. None이면 항상 반영
+
+        Returns:
+            bool: 이번 호출에서 반영했으면 True
+        """
+        if index is not None:
+            if index < self.count:
+                return False
+            if index > self.count:
+                raise ValueError(f"봉 순번이 건너뛰었습니다: {index} (다음 순번 {self.count})")
+        for indicator in self._indicators.values():
+            indicator.update(close, high, low)
+        self.count += 1
+        return True
+
+    def update_bar(self, bar, index=None):
+        """
+        {"open", "high", "low", "close", ...} 봉 dict를 반영합니다.
+        """
+        return self.update(bar["close"], bar.get("high"), bar.get("low"), index=index)
+
+    def values(self):
+        """
+        Returns:
+            dict: 지표 이름 -> 현재 값 (준비 전 None)
+        """
+        return {indicator.name: indicator.value for indicator in self._indicators.values()}
+
+    def compute_batch(self, close, high=None, low=None):
+        """
+        구독한 모든 지표를 시계열 전체에 대해 한 번에 계산합니다.
+
+        Returns:
+            dict: 지표 이름 -> 배열 (볼린저는 (중심선, 상단, 하단) 튜플). 준비 전 구간은 NaN
+        """
+        close = np.asarray(close, dtype=np.float64)
+        return {indicator.name: indicator.batch(close, high, low) for indicator in self._indicators.values()}
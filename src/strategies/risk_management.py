@@ -1,4 +1,6 @@
 # src/strategies/risk_management.py
+import numpy as np
+
 
 class RiskManager:
     """
@@ -47,3 +49,317 @@ class RiskManager:
             return "TAKE_PROFIT"
 
         return None
+
+    def can_open(self, notional=0.0):
+        """
+        신규 진입 가능 여부. 단일 RiskManager는 포트폴리오 한도가 없으므로 항상 True.
+        """
+        return True
+
+    def get_state(self):
+        """
+        재시작 후 손절/익절 감시를 이어갈 수 있도록 진입가를 포함한 상태를 반환합니다.
+        """
+        return {"entry_price": self.entry_price}
+
+    def set_state(self, state):
+        """
+        get_state() 결과를 복원합니다.
+        """
+        self.entry_price = state.get("entry_price")
+
+
+# PortfolioRiskManager.evaluate가 반환하는 청산 사유 코드 -> 이름 (0은 청산 없음)
+EXIT_REASONS = (None, "STOP_LOSS", "TAKE_PROFIT", "TRAILING_STOP", "MAX_DRAWDOWN")
+STOP_LOSS, TAKE_PROFIT, TRAILING_STOP, MAX_DRAWDOWN = 1, 2, 3, 4
+
+
+def quote_currency(market):
+    """
+    Upbit 형식 시장 이름의 기준 통화를 반환합니다. (예: "KRW-BTC" -> "KRW", 형식이 다르면 None)
+    """
+    return market.split("-", 1)[0].upper() if "-" in market else None
+
+
+class PortfolioRiskManager:
+    """
+    PortfolioRiskManager는 여러 시장의 포지션 청산 조건을 NumPy 배열로 한 번에 평가하는 클래스입니다.
+
+    - 시장마다 배열의 한 칸(slot)을 쓰며 진입가, 고점(high-water mark), 수량과
+      포지션별 손절/익절/트레일링 스톱 비율을 저장합니다.
+    - evaluate(prices)는 가격 배치 하나에 대해 모든 포지션의 청산 사유를 한 번의 벡터 연산으로 계산하고,
+      보유 평가액(노출)과 계좌 낙폭을 갱신합니다.
+    - 포트폴리오 한도: 노출이 max_exposure를 넘는 신규 진입은 can_open()이 거부하고,
+      고점 대비 자산 낙폭이 max_drawdown_pct에 닿으면 신규 진입을 멈추고 모든 포지션에 MAX_DRAWDOWN을 냅니다.
+    - view(market)는 RiskManager와 같은 인터페이스로 한 시장을 다루는 객체를 반환하므로
+      process_tick, OrderExecutor 등 기존 코드에 그대로 넘길 수 있습니다.
+    - 노출과 자산을 한 통화로 더하므로 모든 시장의 기준 통화가 같아야 합니다. (KRW와 USDT 시장을 섞으면 ValueError)
+    """
+    def __init__(self, stop_loss_pct=0.05, take_profit_pct=0.10, trailing_stop_pct=None,
+                 max_exposure=None, max_drawdown_pct=None, capacity=16):
+        """
+        Args:
+            stop_loss_pct (float): 기본 손절 비율
+            take_profit_pct (float): 기본 익절 비율
+            trailing_stop_pct (float): 기본 트레일링 스톱 비율 (고점 대비 하락, None이면 사용 안 함)
+            max_exposure (float): 보유 평가액 합계 한도 (기준 통화, None이면 제한 없음)
+            max_drawdown_pct (float): 자산 고점 대비 최대 낙폭 (예: 0.2, None이면 제한 없음)
+            capacity (int): 초기 배열 크기 (부족하면 두 배로 늘림)
+        """
+        self.stop_loss_pct = stop_loss_pct
+        self.take_profit_pct = take_profit_pct
+        self.trailing_stop_pct = trailing_stop_pct
+        self.max_exposure = max_exposure
+        self.max_drawdown_pct = max_drawdown_pct
+        self.markets = []   # slot -> 시장
+        self.quote_currency = None  # 모든 시장이 공유하는 기준 통화 (첫 시장에서 정함)
+        self._index = {}    # 시장 -> slot
+        self._allocate(max(1, capacity))
+        self.exposure = 0.0
+        self.equity_peak = None
+        self.drawdown = 0.0
+        self.halted = False
+
+    def _allocate(self, capacity):
+        old = getattr(self, "entry", None)
+        size = 0 if old is None else len(old)
+        columns = {
+            "entry": np.nan, "high": np.nan, "quantity": 0.0, "stop_pct": np.nan,
+            "take_pct": np.nan, "trail_pct": np.nan, "last_price": np.nan,
+        }
+        for name, fill in columns.items():
+            array = np.full(capacity, fill)
+            if old is not None:
+                array[:size] = getattr(self, name)
+            setattr(self, name, array)
+        active = np.zeros(capacity, dtype=bool)
+        codes = np.zeros(capacity, dtype=np.int8)
+        if old is not None:
+            active[:size] = self.active
+            codes[:size] = self.last_codes
+        self.active, self.last_codes = active, codes
+
+    def slot(self, market):
+        """
+        시장의 배열 위치를 반환합니다. 처음 보는 시장이면 새로 배정합니다.
+        기준 통화가 다른 시장은 노출/자산 합계를 의미 없게 만들므로 ValueError를 냅니다.
+        """
+        index = self._index.get(market)
+        if index is None:
+            currency = quote_currency(market)
+            if currency is not None:
+                if self.quote_currency is None:
+                    self.quote_currency = currency
+                elif currency != self.quote_currency:
+                    raise ValueError(f"기준 통화가 다른 시장은 한 포트폴리오에 넣을 수 없습니다: "
+                                     f"{market} ({self.quote_currency} 포트폴리오)")
+            index = len(self.markets)
+            if index == len(self.entry):
+                self._allocate(2 * len(self.entry))
+            self.markets.append(market)
+            self._index[market] = index
+        return index
+
+    def price_vector(self, prices):
+        """
+        {시장: 가격} dict를 slot 순서의 가격 배열로 바꿉니다. 가격이 없는 시장은 NaN.
+        """
+        return np.fromiter((prices.get(m, np.nan) for m in self.markets), dtype=np.float64,
+                           count=len(self.markets))
+
+    def open(self, market, price, quantity=None, stop_loss_pct=None, take_profit_pct=None,
+             trailing_stop_pct=None):
+        """
+        포지션 진입가를 설정합니다. 이미 보유 중이면 진입가만 바꾸고 고점은 유지합니다.
+
+        Args:
+            market (str): 시장
+            price (float): 진입가
+            quantity (float): 보유 수량 (None이면 기존 값 유지)
+            stop_loss_pct, take_profit_pct, trailing_stop_pct (float): 이 포지션만의 비율 (None이면 기본값)
+        """
+        i = self.slot(market)
+        if not self.active[i]:
+            self.high[i] = price
+            self.stop_pct[i] = self.stop_loss_pct if stop_loss_pct is None else stop_loss_pct
+            self.take_pct[i] = self.take_profit_pct if take_profit_pct is None else take_profit_pct
+            trail = self.trailing_stop_pct if trailing_stop_pct is None else trailing_stop_pct
+            self.trail_pct[i] = np.nan if trail is None else trail
+        else:
+            self.high[i] = max(self.high[i], price)
+        self.entry[i] = price
+        self.active[i] = True
+        self.last_codes[i] = 0
+        if quantity is not None:
+            self.quantity[i] = quantity
+
+    def close(self, market):
+        """
+        포지션을 청산 상태로 표시합니다.
+        """
+        i = self._index.get(market)
+        if i is not None:
+            self.active[i] = False
+            self.entry[i] = self.high[i] = np.nan
+            self.quantity[i] = 0.0
+            self.last_codes[i] = 0
+
+    def set_quantity(self, market, quantity):
+        """
+        노출 계산에 쓰는 보유 수량을 갱신합니다. (잔고 동기화 후 호출)
+        """
+        self.quantity[self.slot(market)] = quantity
+
+    def entry_price(self, market):
+        i = self._index.get(market)
+        return None if i is None or not self.active[i] else float(self.entry[i])
+
+    def evaluate(self, prices, cash=None, equity=None):
+        """
+        가격 배치 하나로 모든 포지션의 청산 조건과 포트폴리오 한도를 평가합니다.
+
+        Args:
+            prices (array-like or dict): slot 순서의 가격 배열(NaN은 이번 배치에 가격 없음) 또는 {시장: 가격}
+            cash (float): 현금 잔고. 주면 자산(현금 + 노출)의 고점 대비 낙폭을 갱신
+            equity (float): 호출자가 계산한 총 자산 평가액. 주면 cash 대신 이 값으로 낙폭을 갱신
+
+        Returns:
+            np.ndarray: slot별 청산 사유 코드 (EXIT_REASONS 참고, int8)
+        """
+        if isinstance(prices, dict):
+            prices = self.price_vector(prices)
+        n = len(self.markets)
+        prices = np.asarray(prices, dtype=np.float64)
+        if len(prices) != n:
+            raise ValueError(f"가격 수({len(prices)})가 시장 수({n})와 다릅니다.")
+        active, entry, high = self.active[:n], self.entry[:n], self.high[:n]
+        live = active & ~np.isnan(prices)
+        np.maximum(high, prices, out=high, where=live)
+
+        codes = np.zeros(n, dtype=np.int8)
+        with np.errstate(invalid="ignore"):
+            # 우선순위가 낮은 사유부터 쓰고 높은 사유로 덮어씀 (손절 > 익절 > 트레일링, RiskManager와 같은 순서)
+            codes[live & (prices <= high * (1 - self.trail_pct[:n]))] = TRAILING_STOP
+            codes[live & (prices >= entry * (1 + self.take_pct[:n]))] = TAKE_PROFIT
+            codes[live & (prices <= entry * (1 - self.stop_pct[:n]))] = STOP_LOSS
+
+        held = ~np.isnan(prices)
+        self.last_price[:n][held] = prices[held]
+        # 이번 배치에 가격이 없는 시장은 마지막 가격으로 평가
+        marks = self.last_price[:n]
+        self.exposure = float(np.dot(self.quantity[:n][active & ~np.isnan(marks)],
+                                     marks[active & ~np.isnan(marks)]))
+        if equity is None and cash is not None:
+            equity = cash + self.exposure
+        if equity is not None:
+            self.equity_peak = equity if self.equity_peak is None else max(self.equity_peak, equity)
+            self.drawdown = 1.0 - equity / self.equity_peak if self.equity_peak > 0 else 0.0
+            if self.max_drawdown_pct is not None and self.drawdown >= self.max_drawdown_pct:
+                self.halted = True
+        if self.halted:
+            codes[live & (codes == 0)] = MAX_DRAWDOWN
+
+        self.last_codes[:n] = codes
+        return codes
+
+    def evaluate_one(self, index, price):
+        """
+        slot 하나만 스칼라로 평가합니다. (배치 없이 시장 하나의 가격만 들어온 경우, evaluate와 같은 규칙)
+
+        Returns:
+            int: 청산 사유 코드
+        """
+        code = 0
+        if self.active[index]:
+            if price > self.high[index]:
+                self.high[index] = price
+            entry, trail = self.entry[index], self.trail_pct[index]
+            if price <= entry * (1 - self.stop_pct[index]):
+                code = STOP_LOSS
+            elif price >= entry * (1 + self.take_pct[index]):
+                code = TAKE_PROFIT
+            elif trail == trail and price <= self.high[index] * (1 - trail):
+                code = TRAILING_STOP
+            elif self.halted:
+                code = MAX_DRAWDOWN
+        self.last_price[index] = price
+        self.last_codes[index] = code
+        return code
+
+    def exit_signals(self, prices, cash=None):
+        """
+        evaluate() 결과 중 청산할 포지션만 {시장: 사유} dict로 반환합니다.
+        """
+        codes = self.evaluate(prices, cash=cash)
+        return {self.markets[i]: EXIT_REASONS[codes[i]] for i in np.flatnonzero(codes)}
+
+    def can_open(self, notional=0.0):
+        """
+        신규 진입 가능 여부. 낙폭 한도로 멈췄거나 노출 한도를 넘으면 False.
+
+        Args:
+            notional (float): 새로 살 금액 (원화)
+        """
+        if self.halted:
+            return False
+        return self.max_exposure is None or self.exposure + notional <= self.max_exposure
+
+    def resume(self):
+        """
+        낙폭 한도로 멈춘 신규 진입을 다시 허용하고 자산 고점을 현재 값부터 다시 잽니다.
+        """
+        self.halted = False
+        self.equity_peak = None
+        self.drawdown = 0.0
+
+    def view(self, market):
+        """
+        한 시장을 RiskManager와 같은 인터페이스로 다루는 객체를 반환합니다.
+        """
+        return PositionRiskView(self, market)
+
+
+class PositionRiskView:
+    """
+    PortfolioRiskManager의 한 시장을 RiskManager처럼 다루는 얇은 어댑터입니다.
+    check_exit_conditions는 같은 가격으로 이미 evaluate()된 결과가 있으면 그것을 그대로 사용합니다.
+    """
+    def __init__(self, portfolio, market):
+        self.portfolio = portfolio
+        self.market = market
+        self.index = portfolio.slot(market)
+
+    @property
+    def entry_price(self):
+        return self.portfolio.entry_price(self.market)
+
+    @entry_price.setter
+    def entry_price(self, price):
+        if price is None:
+            self.portfolio.close(self.market)
+        else:
+            self.portfolio.open(self.market, price)
+
+    def set_entry_price(self, price):
+        self.portfolio.open(self.market, price)
+
+    def can_open(self, notional=0.0):
+        return self.portfolio.can_open(notional)
+
+    def check_exit_conditions(self, current_price):
+        p, i = self.portfolio, self.index
+        if not p.active[i]:
+            return None
+        if p.last_price[i] != current_price:
+            p.evaluate_one(i, current_price)
+        return EXIT_REASONS[p.last_codes[i]]
+
+    def get_state(self):
+        p, i = self.portfolio, self.index
+        high = None if not p.active[i] else float(p.high[i])
+        return {"entry_price": self.entry_price, "high_water": high}
+
+    def set_state(self, state):
+        self.entry_price = state.get("entry_price")
+        if state.get("high_water") is not None and self.portfolio.active[self.index]:
+            self.portfolio.high[self.index] = state["high_water"]
@@ -1,26 +1,97 @@
 # src/strategies/simple_moving_average.py
 # 익절/손절 관련 부분 제거 후 포지션 관리 로직 단순화
 import numpy as np
-from collections import deque
+
+from src.strategies.indicators import IndicatorEngine
+
+
+def sma_buy_mask(prices, short_window, long_window):
+    """
+    SimpleMovingAverageStrategy가 포지션 없이 매 틱 반환하는 BUY 여부를 한 번에 계산합니다.
+
+    누적합으로 이동평균을 구한 뒤, 부동소수점 오차 범위 안에서 단기/장기 평균이
+    맞닿는 틱만 전략과 같은 방식(np.mean)으로 다시 계산해 결과를 정확히 맞춥니다.
+
+    Args:
+        prices (np.ndarray): 1차원 가격 배열
+        short_window (int): 단기 이동평균 기간
+        long_window (int): 장기 이동평균 기간
+
+    Returns:
+        np.ndarray: 틱별 BUY 여부 (bool 배열)
+    """
+    prices = np.ascontiguousarray(prices, dtype=np.float64)
+    n = len(prices)
+    mask = np.zeros(n, dtype=bool)
+    short_window = min(short_window, long_window)
+    if n < long_window:
+        return mask
+
+    csum = np.concatenate(([0.0], np.cumsum(prices)))
+    end = np.arange(long_window, n + 1)
+    long_sma = (csum[end] - csum[end - long_window]) / long_window
+    short_sma = (csum[end] - csum[end - short_window]) / short_window
+
+    # 누적합 차분 오차의 상한 근사치. 이보다 가까운 값은 애매한 틱으로 보고 다시 계산한다.
+    abs_prices = np.abs(prices)
+    scale = abs_prices.max() / max(abs_prices.min(), np.finfo(np.float64).tiny)
+    tol = 4 * np.finfo(np.float64).eps * (n + long_window) * scale / short_window
+    diff = short_sma - long_sma
+    signal = diff > 0
+    ambiguous = np.flatnonzero(np.abs(diff) <= tol * np.abs(long_sma))
+    for k in ambiguous:
+        i = k + long_window  # 윈도우의 끝 (exclusive)
+        window = prices[i - long_window:i]
+        signal[k] = window[-short_window:].mean() > window.mean()
+
+    mask[long_window - 1:] = signal
+    return mask
+
 
 class SimpleMovingAverageStrategy:
-    def __init__(self, short_window=5, long_window=20):
+    def __init__(self, short_window=5, long_window=20, incremental=False, engine=None):
+        """
+        Args:
+            short_window (int): 단기 이동평균 기간
+            long_window (int): 장기 이동평균 기간
+            incremental (bool): True면 단기/장기 합계를 누적 관리해 틱당 O(1)로 평균을 계산
+            engine (IndicatorEngine): 같은 시장의 다른 전략과 공유할 지표 엔진 (없으면 전용 엔진 생성)
+        """
         self.short_window = short_window
         self.long_window = long_window
-        self.prices = deque(maxlen=self.long_window)
+        self.incremental = incremental
+        self.engine = engine if engine is not None else IndicatorEngine()
+        # 기본 모드는 창 전체 np.mean (기존 결과 및 sma_buy_mask와 비트 단위로 동일)
+        self.short_sma = self.engine.sma(min(short_window, long_window), exact=not incremental)
+        self.long_sma = self.engine.sma(long_window, exact=not incremental)
+        self.updates = 0  # 이 전략이 받은 가격 수 (공유 엔진의 봉 순번)
         self.position = None  # "LONG" or None
         self.entry_price = None
 
+    @property
+    def prices(self):
+        return self.long_sma.window
+
+    @property
+    def warmup_period(self):
+        """
+        신호를 내기 위해 필요한 최소 가격 수
+        """
+        return self.long_window
+
     def update_price(self, current_price: float):
-        self.prices.append(current_price)
+        # 공유 엔진이면 같은 봉을 먼저 넘긴 전략만 실제로 지표를 계산함
+        self.engine.update(current_price, index=self.updates)
+        self.updates += 1
+
+    def _moving_averages(self):
+        return self.short_sma.value, self.long_sma.value
 
     def compute_signals(self):
-        if len(self.prices) < self.long_window:
+        if not self.long_sma.ready:
             return "HOLD"
 
-        prices_array = np.array(self.prices)
-        short_sma = prices_array[-self.short_window:].mean()
-        long_sma = prices_array.mean()
+        short_sma, long_sma = self._moving_averages()
 
         if self.position is None:
             # 매수 조건: 5일 SMA가 20일 SMA 상향 돌파 시 BUY
@@ -33,6 +104,38 @@ class SimpleMovingAverageStrategy:
             # 청산은 RiskManager를 통해 처리하므로 여기서는 HOLD만 반환.
             return "HOLD"
 
+    def compute_signals_array(self, prices):
+        """
+        가격 시계열 전체에 대한 신호를 한 번에 계산합니다.
+        빈 버퍼에서 시작해 update_price/compute_signals를 차례로 호출한 것과 같은 결과를 냅니다.
+
+        Args:
+            prices (array-like): 1차원 가격 시계열
+
+        Returns:
+            np.ndarray: 틱별 "BUY" 또는 "HOLD" 문자열 배열
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        signals = np.full(len(prices), "HOLD", dtype="<U4")
+        if self.position is None:
+            signals[sma_buy_mask(prices, self.short_window, self.long_window)] = "BUY"
+        return signals
+
+    def get_state(self):
+        """
+        재시작 후 이어서 거래할 수 있도록 최근 가격과 포지션을 JSON으로 저장 가능한 dict로 반환합니다.
+        """
+        return {"prices": list(self.prices), "position": self.position, "entry_price": self.entry_price}
+
+    def set_state(self, state):
+        """
+        get_state() 결과를 새 전략에 복원합니다. (가격은 update_price로 다시 넣음)
+        """
+        for price in state.get("prices", []):
+            self.update_price(price)
+        self.position = state.get("position")
+        self.entry_price = state.get("entry_price")
+
     def on_buy(self, price):
         self.position = "LONG"
         self.entry_price = price
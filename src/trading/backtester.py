@@ -0,0 +1,329 @@
+# src/trading/backtester.py
+# run_live_trading과 동일한 BUY/HOLD/SELL 규칙을 과거 가격 배열 위에서 재현하는 백테스터
+import numpy as np
+
+from src.strategies.risk_management import RiskManager
+from src.strategies.simple_moving_average import SimpleMovingAverageStrategy, sma_buy_mask
+
+# 체결 사유 코드
+REASON_SIGNAL = 0       # 전략 BUY 신호
+REASON_STOP_LOSS = 1    # RiskManager STOP_LOSS
+REASON_TAKE_PROFIT = 2  # RiskManager TAKE_PROFIT
+
+REASON_NAMES = {
+    REASON_SIGNAL: "SIGNAL",
+    REASON_STOP_LOSS: "STOP_LOSS",
+    REASON_TAKE_PROFIT: "TAKE_PROFIT",
+}
+
+# 보유 중 청산 조건을 찾을 때 처음 검사하는 구간 길이 (이후 두 배씩 늘림)
+_SCAN_CHUNK = 1024
+
+
+def to_price_array(data, column="close"):
+    """
+    백테스트 입력을 1차원 float64 가격 배열로 변환합니다.
+
+    Args:
+        data: 1차원 틱 가격 배열, (N, 5) OHLCV 배열, 'close' 필드를 가진 구조화 배열 또는 dict
+        column (str): 구조화 배열/dict에서 사용할 컬럼 이름
+
+    Returns:
+        np.ndarray: 연속 메모리의 float64 가격 배열
+    """
+    if isinstance(data, dict):
+        data = data[column]
+    arr = np.asarray(data)
+    if arr.dtype.names:
+        arr = arr[column]
+    elif arr.ndim == 2:
+        # open, high, low, close, volume 순서의 OHLCV 배열
+        arr = arr[:, 3]
+    if arr.ndim != 1:
+        raise ValueError("가격 데이터는 1차원 배열이어야 합니다.")
+    return np.ascontiguousarray(arr, dtype=np.float64)
+
+
+class BacktestResult:
+    """
+    백테스트 결과(체결 내역, 자산 곡선, 요약 지표)를 담는 클래스입니다.
+    """
+    def __init__(self, prices, initial_cash, fill_index, fill_side, fill_price,
+                 fill_volume, fill_fee, fill_reason, cash_after, coin_after):
+        self.prices = prices
+        self.initial_cash = float(initial_cash)
+        self.fill_index = np.asarray(fill_index, dtype=np.int64)
+        self.fill_side = np.asarray(fill_side, dtype=np.int8)      # 1=buy, -1=sell
+        self.fill_price = np.asarray(fill_price, dtype=np.float64)
+        self.fill_volume = np.asarray(fill_volume, dtype=np.float64)
+        self.fill_fee = np.asarray(fill_fee, dtype=np.float64)
+        self.fill_reason = np.asarray(fill_reason, dtype=np.int8)
+        self.cash_after = np.asarray(cash_after, dtype=np.float64)
+        self.coin_after = np.asarray(coin_after, dtype=np.float64)
+
+        # 체결 직후 잔고를 틱 단위로 앞으로 채워 자산 곡선을 만든다.
+        n = len(prices)
+        pos = np.searchsorted(self.fill_index, np.arange(n), side="right") - 1
+        has_fill = pos >= 0
+        safe_pos = np.where(has_fill, pos, 0)
+        if len(self.fill_index):
+            self.cash = np.where(has_fill, self.cash_after[safe_pos], self.initial_cash)
+            self.coin = np.where(has_fill, self.coin_after[safe_pos], 0.0)
+        else:
+            self.cash = np.full(n, self.initial_cash)
+            self.coin = np.zeros(n)
+        self.equity = self.cash + self.coin * prices
+
+    @property
+    def num_trades(self):
+        return len(self.fill_index)
+
+    @property
+    def final_equity(self):
+        return float(self.equity[-1]) if len(self.equity) else self.initial_cash
+
+    @property
+    def total_return(self):
+        return self.final_equity / self.initial_cash - 1.0
+
+    @property
+    def total_fees(self):
+        return float(self.fill_fee.sum())
+
+    @property
+    def max_drawdown(self):
+        if not len(self.equity):
+            return 0.0
+        peak = np.maximum.accumulate(self.equity)
+        return float(np.max(1.0 - self.equity / peak))
+
+    def trades(self):
+        """
+        체결 내역을 dict 리스트로 반환합니다.
+
+        Returns:
+            list: {"index", "side", "price", "volume", "fee", "reason"} 목록
+        """
+        return [
+            {
+                "index": int(i),
+                "side": "buy" if s > 0 else "sell",
+                "price": float(p),
+                "volume": float(v),
+                "fee": float(f),
+                "reason": REASON_NAMES[int(r)],
+            }
+            for i, s, p, v, f, r in zip(self.fill_index, self.fill_side, self.fill_price,
+                                        self.fill_volume, self.fill_fee, self.fill_reason)
+        ]
+
+    def summary(self):
+        """
+        요약 지표를 dict로 반환합니다.
+        """
+        return {
+            "total_return": self.total_return,
+            "max_drawdown": self.max_drawdown,
+            "num_trades": self.num_trades,
+            "total_fees": self.total_fees,
+            "final_equity": self.final_equity,
+        }
+
+
+class Backtester:
+    """
+    SimpleMovingAverageStrategy + RiskManager 조합을 과거 가격 위에서 재현하는 백테스터입니다.
+
+    run_live_trading의 규칙을 그대로 따릅니다.
+      - 매 틱 전략 신호를 계산하고, RiskManager의 STOP_LOSS/TAKE_PROFIT이 있으면 SELL로 대체
+      - BUY: 보유량이 max_coin_holdings 미만이고 잔고가 충분하면 buy_amount(원)만큼 현재가로 매수,
+        진입가를 현재가로 갱신하고 strategy.on_buy 호출 (보유 중에는 전략이 BUY를 내지 않음)
+      - SELL: min(보유량, sell_volume)만큼 현재가로 매도하고 진입가 초기화, strategy.on_sell 호출
+
+    mode="vectorized"는 NumPy 연산으로 신호와 청산 지점을 찾고,
+    mode="loop"는 실제 전략/리스크 객체로 틱마다 도는 참조 구현입니다. 두 결과는 같아야 합니다.
+    """
+    def __init__(self, short_window=5, long_window=20, stop_loss_pct=0.05, take_profit_pct=0.10,
+                 fee_rate=0.0005, initial_cash=1000000, buy_amount=5250, sell_volume=0.001,
+                 max_coin_holdings=1.0):
+        """
+        Args:
+            short_window (int): 단기 이동평균 기간
+            long_window (int): 장기 이동평균 기간
+            stop_loss_pct (float): 손절 비율
+            take_profit_pct (float): 익절 비율
+            fee_rate (float): 체결 금액 대비 수수료율 (Upbit 원화마켓 0.05%)
+            initial_cash (float): 초기 원화 잔고
+            buy_amount (float): 매수 1회당 원화 금액 (라이브 루프의 5250원)
+            sell_volume (float): 매도 1회당 최대 코인 수량 (라이브 루프의 0.001)
+            max_coin_holdings (float): 최대 코인 보유량
+        """
+        self.short_window = short_window
+        self.long_window = long_window
+        self.stop_loss_pct = stop_loss_pct
+        self.take_profit_pct = take_profit_pct
+        self.fee_rate = fee_rate
+        self.initial_cash = float(initial_cash)
+        self.buy_amount = float(buy_amount)
+        self.sell_volume = float(sell_volume)
+        self.max_coin_holdings = float(max_coin_holdings)
+
+    def run(self, data, mode="vectorized", buy_mask=None):
+        """
+        백테스트를 실행합니다.
+
+        Args:
+            data: 가격 데이터 (to_price_array 참고)
+            mode (str): "vectorized" 또는 "loop"
+            buy_mask (np.ndarray): 미리 계산한 BUY 여부 배열 (없으면 계산)
+
+        Returns:
+            BacktestResult: 백테스트 결과
+        """
+        prices = to_price_array(data)
+        if mode == "vectorized":
+            if buy_mask is None:
+                buy_mask = sma_buy_mask(prices, self.short_window, self.long_window)
+            fills = self._run_vectorized(prices, buy_mask)
+        elif mode == "loop":
+            fills = self._run_loop(prices)
+        else:
+            raise ValueError(f"지원하지 않는 mode: {mode}")
+        return BacktestResult(prices, self.initial_cash, *fills)
+
+    def _run_loop(self, prices):
+        """
+        라이브 루프와 같은 순서로 틱마다 처리하는 참조 구현입니다.
+        """
+        strategy = SimpleMovingAverageStrategy(short_window=self.short_window,
+                                               long_window=self.long_window)
+        risk_manager = RiskManager(stop_loss_pct=self.stop_loss_pct,
+                                   take_profit_pct=self.take_profit_pct)
+        buy_cost = self.buy_amount + self.buy_amount * self.fee_rate
+        cash, coin = self.initial_cash, 0.0
+        fills = tuple([] for _ in range(8))
+
+        for i, current_price in enumerate(prices.tolist()):
+            strategy.update_price(current_price)
+            signal = strategy.compute_signals()
+            reason = REASON_SIGNAL
+
+            exit_signal = risk_manager.check_exit_conditions(current_price)
+            if exit_signal in ["STOP_LOSS", "TAKE_PROFIT"]:
+                signal = "SELL"
+                reason = REASON_STOP_LOSS if exit_signal == "STOP_LOSS" else REASON_TAKE_PROFIT
+
+            if signal == "BUY":
+                if coin >= self.max_coin_holdings or cash < buy_cost:
+                    continue
+                volume = self.buy_amount / current_price
+                cash -= buy_cost
+                coin += volume
+                risk_manager.set_entry_price(current_price)
+                strategy.on_buy(current_price)
+                self._record(fills, i, 1, current_price, volume, buy_cost - self.buy_amount,
+                             reason, cash, coin)
+            elif signal == "SELL":
+                volume = min(coin, self.sell_volume)
+                if volume <= 0:
+                    continue
+                revenue = current_price * volume
+                fee = revenue * self.fee_rate
+                coin -= volume
+                cash += revenue - fee
+                risk_manager.entry_price = None
+                strategy.on_sell()
+                self._record(fills, i, -1, current_price, volume, fee, reason, cash, coin)
+        return fills
+
+    def _run_vectorized(self, prices, buy_mask):
+        """
+        체결이 일어나는 지점만 골라 처리하는 벡터화 구현입니다.
+
+        포지션이 없으면 매수가 가능한 다음 BUY 틱을 searchsorted로 찾고, 보유 중에는 진입가 기준
+        손절/익절 조건을 처음 만족하는 틱을 가격 배열에서 찾아 그 사이 틱을 건너뜁니다.
+        """
+        n = len(prices)
+        sl_factor = 1 - self.stop_loss_pct
+        tp_factor = 1 + self.take_profit_pct
+        buy_cost = self.buy_amount + self.buy_amount * self.fee_rate
+        buy_fee = buy_cost - self.buy_amount
+        buy_idx = np.flatnonzero(buy_mask)
+
+        cash, coin, entry = self.initial_cash, 0.0, None
+        fills = tuple([] for _ in range(8))
+        i = 0
+        while i < n:
+            if entry is None:
+                # 포지션이 없는 동안은 잔고가 바뀌지 않으므로 매수할 수 없으면 끝까지 매수 없음
+                if coin >= self.max_coin_holdings or cash < buy_cost:
+                    break
+                k = int(np.searchsorted(buy_idx, i))
+                if k >= len(buy_idx):
+                    break
+                i = int(buy_idx[k])
+                price = float(prices[i])
+                volume = self.buy_amount / price
+                cash -= buy_cost
+                coin += volume
+                entry = price
+                self._record(fills, i, 1, price, volume, buy_fee, REASON_SIGNAL, cash, coin)
+                i += 1
+            else:
+                j, reason = self._first_exit(prices, i, n, entry * sl_factor, entry * tp_factor)
+                if j >= n:
+                    break
+                cash, coin = self._sell(fills, prices, j, reason, cash, coin)
+                entry = None
+                i = j + 1
+        return fills
+
+    def _first_exit(self, prices, start, stop, lower, upper):
+        """
+        [start, stop) 구간에서 손절/익절 조건을 처음 만족하는 인덱스와 사유를 찾습니다.
+        구간을 점점 크게 나눠 검사해, 가까운 청산 지점을 찾을 때 전체 배열을 훑지 않습니다.
+        """
+        chunk = _SCAN_CHUNK
+        while start < stop:
+            seg_end = min(start + chunk, stop)
+            seg = prices[start:seg_end]
+            hit = np.flatnonzero((seg <= lower) | (seg >= upper))
+            if len(hit):
+                j = start + int(hit[0])
+                reason = REASON_STOP_LOSS if prices[j] <= lower else REASON_TAKE_PROFIT
+                return j, reason
+            start = seg_end
+            chunk *= 2
+        return stop, None
+
+    def _sell(self, fills, prices, i, reason, cash, coin):
+        volume = min(coin, self.sell_volume)
+        if volume <= 0:
+            return cash, coin
+        price = float(prices[i])
+        revenue = price * volume
+        fee = revenue * self.fee_rate
+        coin -= volume
+        cash += revenue - fee
+        self._record(fills, i, -1, price, volume, fee, reason, cash, coin)
+        return cash, coin
+
+    @staticmethod
+    def _record(fills, index, side, price, volume, fee, reason, cash, coin):
+        for column, value in zip(fills, (index, side, price, volume, fee, reason, cash, coin)):
+            column.append(value)
+
+
+def run_backtest(data, mode="vectorized", **params):
+    """
+    Backtester를 생성해 바로 실행하는 편의 함수입니다.
+
+    Args:
+        data: 가격 데이터
+        mode (str): "vectorized" 또는 "loop"
+        **params: Backtester 생성자 인자
+
+    Returns:
+        BacktestResult: 백테스트 결과
+    """
+    return Backtester(**params).run(data, mode=mode)
@@ -1,128 +1,339 @@
 # src/trading/live_trading.py
 
-import time
 import logging
+import time
+
 from src.strategies.risk_management import RiskManager
+from src.trading.order_executor import FINAL_STATES, apply_fill, fill_from_order, notify_strategy
+from src.trading.price_source import PollingPriceSource, PriceSourceExhausted
+from src.utils.logger import get_logger, log_event
+from src.utils.metrics import get_registry
 
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
+logger = get_logger(__name__)
 
-def run_live_trading(exchange, strategy, position_manager, symbol="KRW-BTC", interval=5):
-    max_coin_holdings = 1.0  # 최대 보유 개수
-    fixed_buy_amount = 5250  # 매수 시 항상 5250원 매수
-    risk_manager = RiskManager(stop_loss_pct=0.05, take_profit_pct=0.10)  # 손절 5%, 익절 10%
+MAX_COIN_HOLDINGS = 1.0  # 최대 보유 개수
+FIXED_BUY_AMOUNT = 5250  # 매수 시 항상 5250원 매수
+MIN_ORDER_TOTAL = 5000  # 거래소가 min_order_total을 알려주지 않을 때의 최소 주문 금액 (Upbit KRW 마켓)
 
-    print("[DEBUG] run_live_trading 시작")
+# 단계별 지연 시간(stage 라벨: price_fetch, fill_apply, signal, risk_check, slippage, order, checkpoint,
+# balance_sync)
+STAGE_METRIC = "live_stage_seconds"
+ERROR_METRIC = "live_errors_total"
 
-    while True:
-        print("[DEBUG] 가격 조회 시작")
-        try:
-            current_price = exchange.get_current_price(symbol)
-        except Exception as e:
-            print(f"[ERROR] 가격 조회 실패: {e}")
-            logger.error(f"Failed to get current price: {e}")
-            time.sleep(interval)
-            continue
 
-        print(f"[DEBUG] 현재가: {current_price}")
+def process_tick(exchange, strategy, position_manager, risk_manager, symbol, current_price,
+                 max_coin_holdings=MAX_COIN_HOLDINGS, fixed_buy_amount=FIXED_BUY_AMOUNT,
+                 order_executor=None, metrics=None, slippage_estimator=None, max_slippage_bps=None,
+                 journal=None):
+    """
+    현재가 하나에 대해 시그널 계산, 손절/익절 확인, 주문 및 잔고 반영을 수행합니다.
+    run_live_trading과 멀티 마켓 러너가 공유하는 한 틱 처리 로직입니다.
 
-        print("[DEBUG] 시그널 계산 시작")
-        try:
-            # simple_moving_average.py 수정된 코드에 맞추어 사용
+    Args:
+        exchange: 거래소 API (place_order 사용)
+        strategy: update_price/compute_signals를 제공하는 전략. on_buy/on_sell이 있으면 체결이 반영될 때 호출
+        position_manager (PositionManager): 잔고 관리자
+        risk_manager (RiskManager): 손절/익절 관리자
+        symbol (str): 마켓 페어
+        current_price (float): 현재가
+        max_coin_holdings (float): 최대 보유 개수
+        fixed_buy_amount (float): 매수 1회 금액 (기준 통화)
+        order_executor (OrderExecutor): 주어지면 주문을 비동기로 제출하고,
+            잔고/진입가는 실제 체결이 확인된 뒤 apply_fills로 반영.
+            없으면 place_order 응답이 최종 상태일 때 그 체결 내역/수수료로 반영하고,
+            아직 체결 중이면 잔고를 재조정 대상으로 표시 (_book_order 참고)
+        metrics (MetricsRegistry): 단계별 지연 시간/카운터를 기록할 레지스트리 (없으면 공용 레지스트리)
+        slippage_estimator (SlippageEstimator): 주어지면 주문 전에 캐시된 호가창으로 체결가를 예측하고,
+            매수 금액을 max_slippage_bps 안으로 줄임 (최소 주문 금액 미만이면 매수하지 않음)
+        max_slippage_bps (float): 매수 허용 슬리피지 (bp, None이면 줄이지 않고 예측만 함)
+        journal (TradeJournal): 주어지면 시그널과 제출한 주문을 기록 (체결/잔고는 PositionManager가 기록)
+
+    Returns:
+        bool: 정상 처리 시 True, 시그널 계산/주문 실패 시 False (로그는 이미 기록됨)
+    """
+    metrics = metrics or get_registry()
+
+    if order_executor is not None:
+        # 지난 틱 이후 확인된 실제 체결가/수량/수수료 반영
+        with metrics.time(STAGE_METRIC, stage="fill_apply"):
+            order_executor.apply_fills(position_manager, risk_manager, market=symbol, strategy=strategy)
+
+    try:
+        # simple_moving_average.py 수정된 코드에 맞추어 사용
+        with metrics.time(STAGE_METRIC, stage="signal"):
             strategy.update_price(current_price)
             signal = strategy.compute_signals()
-            print(f"[DEBUG] 시그널: {signal}")
-        except Exception as e:
-            print(f"[ERROR] 시그널 계산 실패: {e}")
-            logger.error(f"Failed to calculate signal: {e}")
-            time.sleep(interval)
-            continue
+    except Exception as e:
+        metrics.inc(ERROR_METRIC, stage="signal")
+        log_event(logger, logging.ERROR, "signal_failed", symbol=symbol, error=repr(e))
+        return False
 
-        # RiskManager로 손절/익절 조건 확인
+    # RiskManager로 손절/익절 조건 확인
+    with metrics.time(STAGE_METRIC, stage="risk_check"):
         exit_signal = risk_manager.check_exit_conditions(current_price)
-        if exit_signal:
-            print(f"[DEBUG] 리스크 관리 신호: {exit_signal}")
-            # STOP_LOSS 또는 TAKE_PROFIT 신호는 결국 청산을 의미하므로 SELL로 처리
-            if exit_signal in ["STOP_LOSS", "TAKE_PROFIT"]:
-                signal = "SELL"
-
-        if signal == "HOLD":
-            print("[DEBUG] HOLD 상태 진입")
-            logger.info(f"Current price: {current_price:.2f}, Signal: HOLD")
-            logger.info(f"No action taken. cash={position_manager.cash_balance}, coin={position_manager.coin_balance}")
-
-        elif signal == "BUY":
-            print("[DEBUG] BUY 신호 발생")
-            if position_manager.coin_balance >= max_coin_holdings:
-                print("[DEBUG] 이미 최대 보유 개수 보유 중, 추가 매수 불가")
-                logger.info("Already holding max coin. No additional buy allowed.")
+    if exit_signal:
+        logger.debug("Risk exit signal: %s", exit_signal)
+        # STOP_LOSS, TAKE_PROFIT, TRAILING_STOP, MAX_DRAWDOWN 모두 결국 청산을 의미하므로 SELL로 처리
+        signal = "SELL"
+
+    metrics.inc("live_signals_total", signal=signal)
+    if journal is not None:
+        journal.record_signal(symbol, signal, current_price)
+    log_event(logger, logging.DEBUG, "tick", symbol=symbol, price=current_price, signal=signal,
+              exit_signal=exit_signal)
+
+    if signal == "HOLD":
+        log_event(logger, logging.INFO, "hold", symbol=symbol, price=current_price,
+                  cash=position_manager.cash_balance, coin=position_manager.coin_balance)
+
+    elif signal == "BUY":
+        if position_manager.coin_balance >= max_coin_holdings:
+            log_event(logger, logging.INFO, "buy_skipped", symbol=symbol, reason="max_holdings",
+                      coin=position_manager.coin_balance)
+        elif not risk_manager.can_open(fixed_buy_amount):
+            # 포트폴리오 노출/낙폭 한도
+            log_event(logger, logging.INFO, "buy_skipped", symbol=symbol, reason="risk_limit")
+        elif order_executor is not None and order_executor.pending(symbol):
+            log_event(logger, logging.INFO, "buy_skipped", symbol=symbol, reason="order_pending")
+        else:
+            buy_amount, estimate = _estimate_fill(slippage_estimator, symbol, "buy", fixed_buy_amount,
+                                                  max_slippage_bps, metrics)
+            if buy_amount < min(fixed_buy_amount, getattr(exchange, "min_order_total", MIN_ORDER_TOTAL)):
+                # 호가가 얇아 슬리피지 한도 안에서 최소 주문 금액도 채울 수 없음
+                log_event(logger, logging.INFO, "buy_skipped", symbol=symbol, reason="thin_book",
+                          amount=buy_amount)
+            elif order_executor is not None:
+                with metrics.time(STAGE_METRIC, stage="order"):
+                    order_executor.submit(symbol, "buy", price=buy_amount,
+                                          quote=estimate.avg_price if estimate is not None and estimate.volume
+                                          else current_price)
+                metrics.inc("live_orders_total", side="buy")
+                if journal is not None:
+                    journal.record_order(symbol, "buy", price=current_price, funds=buy_amount)
+                log_event(logger, logging.INFO, "order_submitted", symbol=symbol, side="buy",
+                          price=current_price, amount=buy_amount, **_estimate_fields(estimate))
             else:
-                print("[DEBUG] 5250원 매수 로직 수행")
-                buy_volume = fixed_buy_amount / current_price
-                print(f"[DEBUG] 매수 수량: {buy_volume}")
                 try:
-                    order_result = exchange.place_order(symbol, "buy", price=fixed_buy_amount)
+                    with metrics.time(STAGE_METRIC, stage="order"):
+                        order_result = exchange.place_order(symbol, "buy", price=buy_amount)
                 except Exception as e:
-                    print(f"[ERROR] 매수 주문 실패: {e}")
-                    logger.error(f"Buy order failed: {e}")
-                    time.sleep(interval)
-                    continue
-
-                print(f"[DEBUG] 주문 결과: {order_result}")
-
-                executed_price = current_price
-                executed_quantity = buy_volume
-
-                print("[DEBUG] 포지션 반영 시도")
-                if position_manager.execute_order("buy", executed_price, executed_quantity):
-                    logger.info(f"Current price: {current_price:.2f}, Signal: BUY")
-                    logger.info(f"Order executed: {order_result}")
-                    logger.info(f"After order: cash={position_manager.cash_balance}, coin={position_manager.coin_balance}")
-                    print("[DEBUG] 매수 성공")
-                    risk_manager.set_entry_price(executed_price)
-                else:
-                    logger.info("Buy order failed. Not enough cash.")
-                    print("[DEBUG] 매수 실패: 자금 부족")
-
-        elif signal == "SELL":
-            print("[DEBUG] SELL 신호 발생")
-            sell_volume = min(position_manager.coin_balance, 0.001)
-            print(f"[DEBUG] 매도 수량: {sell_volume}")
-            if sell_volume <= 0:
-                print("[DEBUG] 매도할 코인이 없음")
-                logger.info("No coin to sell.")
+                    metrics.inc(ERROR_METRIC, stage="order")
+                    log_event(logger, logging.ERROR, "order_failed", symbol=symbol, side="buy", error=repr(e))
+                    return False
+
+                metrics.inc("live_orders_total", side="buy")
+                if journal is not None:
+                    journal.record_order(symbol, "buy", price=current_price, funds=buy_amount,
+                                         order_id=_order_id(order_result))
+                quote = estimate.avg_price if estimate is not None and estimate.volume else current_price
+                _book_order(symbol, "buy", order_result, quote, position_manager, risk_manager, strategy)
+
+    elif signal == "SELL":
+        sell_volume = min(position_manager.coin_balance, 0.001)
+        if sell_volume <= 0:
+            log_event(logger, logging.INFO, "sell_skipped", symbol=symbol, reason="no_coin")
+            # 팔 코인이 없으면 전략도 포지션이 없는 상태로 맞춤 (체결되지 않은 매수 등)
+            notify_strategy(strategy, "sell", current_price)
+        elif order_executor is not None:
+            if order_executor.pending(symbol):
+                log_event(logger, logging.INFO, "sell_skipped", symbol=symbol, reason="order_pending")
             else:
-                try:
+                with metrics.time(STAGE_METRIC, stage="order"):
+                    order_executor.submit(symbol, "sell", volume=sell_volume, quote=current_price)
+                metrics.inc("live_orders_total", side="sell")
+                if journal is not None:
+                    journal.record_order(symbol, "sell", price=current_price, volume=sell_volume)
+                log_event(logger, logging.INFO, "order_submitted", symbol=symbol, side="sell",
+                          price=current_price, volume=sell_volume)
+        else:
+            # 청산(손절 포함)은 줄이거나 건너뛰지 않고 예상 체결가만 반영
+            _, estimate = _estimate_fill(slippage_estimator, symbol, "sell", sell_volume, None, metrics)
+            try:
+                with metrics.time(STAGE_METRIC, stage="order"):
                     order_result = exchange.place_order(symbol, "sell", volume=sell_volume)
-                except Exception as e:
-                    print(f"[ERROR] 매도 주문 실패: {e}")
-                    logger.error(f"Sell order failed: {e}")
-                    time.sleep(interval)
-                    continue
-
-                print(f"[DEBUG] 주문 결과: {order_result}")
-
-                executed_price = current_price
-                executed_quantity = sell_volume
-
-                print("[DEBUG] 포지션 반영 시도")
-                if position_manager.execute_order("sell", executed_price, executed_quantity):
-                    logger.info(f"Current price: {current_price:.2f}, Signal: SELL")
-                    logger.info(f"Order executed: {order_result}")
-                    logger.info(f"After order: cash={position_manager.cash_balance}, coin={position_manager.coin_balance}")
-                    print("[DEBUG] 매도 성공")
-                    risk_manager.entry_price = None
-                else:
-                    logger.info("Sell order failed. Not enough coin.")
-                    print("[DEBUG] 매도 실패: 코인 부족")
-
-        print("[DEBUG] 다음 루프 전 대기")
-        time.sleep(interval)
+            except Exception as e:
+                metrics.inc(ERROR_METRIC, stage="order")
+                log_event(logger, logging.ERROR, "order_failed", symbol=symbol, side="sell", error=repr(e))
+                return False
+
+            metrics.inc("live_orders_total", side="sell")
+            if journal is not None:
+                journal.record_order(symbol, "sell", price=current_price, volume=sell_volume,
+                                     order_id=_order_id(order_result))
+            quote = estimate.avg_price if estimate is not None and estimate.volume else current_price
+            _book_order(symbol, "sell", order_result, quote, position_manager, risk_manager, strategy)
+
+    return True
+
+
+def _book_order(symbol, side, order_result, quote, position_manager, risk_manager, strategy=None):
+    """
+    동기 주문(place_order) 응답을 잔고와 진입가에 반영합니다.
+
+    응답이 최종 상태(done/cancel)면 OrderExecutor와 같이 체결 내역과 수수료(fill_from_order)로 반영합니다.
+    아직 체결 중이면 체결 결과를 알 수 없으므로 잔고는 다음 동기화에서 거래소 잔고로 맞추도록 표시하고,
+    시장가 주문은 접수되면 체결되므로 진입가와 전략 포지션은 주문 당시 시세로 갱신합니다.
+
+    Args:
+        symbol (str): 마켓 페어
+        side (str): "buy" 또는 "sell"
+        order_result (dict): place_order 응답 (Upbit 주문 형식)
+        quote (float): 주문 당시 예상 체결가 (체결 금액을 알 수 없을 때의 대체 가격)
+        position_manager (PositionManager): 잔고 관리자
+        risk_manager (RiskManager): 진입가를 갱신할 리스크 관리자
+        strategy: 체결을 알릴 전략 (on_buy/on_sell)
+
+    Returns:
+        bool: 체결을 잔고에 반영했으면 True
+    """
+    state = order_result.get("state") if isinstance(order_result, dict) else None
+    if state not in FINAL_STATES:
+        position_manager.mark_mismatch()
+        if side == "buy":
+            risk_manager.set_entry_price(quote)
+        else:
+            risk_manager.entry_price = None
+        notify_strategy(strategy, side, quote)
+        log_event(logger, logging.INFO, "order_pending", symbol=symbol, side=side, state=state,
+                  order_id=_order_id(order_result))
+        return False
+
+    fill = fill_from_order(order_result, side, quote=quote)
+    fill.market = fill.market or symbol
+    if not apply_fill(fill, position_manager, risk_manager, strategy):
+        log_event(logger, logging.INFO, "position_update_failed", symbol=symbol, side=side,
+                  volume=fill.volume, avg_price=fill.avg_price)
+        return False
+    log_event(logger, logging.INFO, "order_executed", symbol=symbol, side=side, uuid=fill.uuid,
+              price=fill.avg_price, volume=fill.volume, fee=fill.fee,
+              cash=position_manager.cash_balance, coin=position_manager.coin_balance)
+    return True
+
+
+def _estimate_fill(slippage_estimator, symbol, side, amount, max_slippage_bps, metrics):
+    """
+    주문 전에 호가창으로 체결을 예측하고, 매수는 슬리피지 한도에 맞춰 금액을 줄입니다.
+    추정기가 없거나 호가 조회에 실패하면 원래 금액과 None을 반환합니다.
+
+    Returns:
+        tuple: (매수 금액 또는 매도 수량, FillEstimate 또는 None)
+    """
+    if slippage_estimator is None:
+        return amount, None
+    try:
+        with metrics.time(STAGE_METRIC, stage="slippage"):
+            if side == "buy":
+                sized, estimate = slippage_estimator.size_buy(symbol, amount, max_slippage_bps)
+            else:
+                sized, estimate = slippage_estimator.size_sell(symbol, amount, max_slippage_bps)
+    except Exception as e:
+        metrics.inc(ERROR_METRIC, stage="slippage")
+        log_event(logger, logging.WARNING, "slippage_estimate_failed", symbol=symbol, side=side, error=repr(e))
+        return amount, None
+    metrics.observe("live_expected_slippage_bps", estimate.slippage_bps)
+    log_event(logger, logging.DEBUG, "slippage_estimate", symbol=symbol, side=side, requested=amount,
+              sized=sized, **_estimate_fields(estimate))
+    return sized, estimate
+
+
+def _order_id(order_result):
+    return order_result.get("uuid") if isinstance(order_result, dict) else None
+
+
+def _estimate_fields(estimate):
+    if estimate is None:
+        return {}
+    return {"expected_price": estimate.avg_price, "expected_slippage_bps": round(estimate.slippage_bps, 2),
+            "levels": estimate.levels}
+
+
+def run_live_trading(exchange, strategy, position_manager, symbol="KRW-BTC", interval=5, price_source=None,
+                     order_executor=None, metrics=None, max_ticks=None, risk_manager=None, checkpoint=None,
+                     slippage_estimator=None, max_slippage_bps=None, journal=None,
+                     fixed_buy_amount=FIXED_BUY_AMOUNT):
+    """
+    실시간 매매 루프를 실행합니다. 가격 소스가 PriceSourceExhausted를 발생시키거나
+    max_ticks만큼 처리하면 종료합니다. (ReplayPriceSource로 기록 데이터를 빠르게 재생 가능)
+
+    Args:
+        exchange: 거래소 API (place_order 사용)
+        strategy: update_price/compute_signals를 제공하는 전략
+        position_manager (PositionManager): 잔고 관리자
+        symbol (str): 마켓 페어 (예: "KRW-BTC")
+        interval (float): 틱 간격(초)
+        price_source: get_price()/wait()를 제공하는 가격 소스.
+            None이면 REST로 조회 후 interval초 대기하는 PollingPriceSource 사용
+        order_executor (OrderExecutor): 주어지면 주문을 루프를 막지 않고 제출하고 실제 체결로 잔고 반영
+        metrics (MetricsRegistry): 단계별 지연 시간/카운터를 기록할 레지스트리 (없으면 공용 레지스트리)
+        max_ticks (int): 이 횟수만큼 틱을 처리하면 종료 (None이면 무한 실행)
+        risk_manager (RiskManager): 손절/익절 관리자 (없으면 손절 5%, 익절 10%로 생성).
+            warm_start로 진입가를 복원한 인스턴스를 넘기면 재시작 직후에도 손절이 동작
+        checkpoint (StateCheckpoint): 주어지면 상태가 바뀐 틱과 checkpoint.interval초마다, 그리고 종료 시
+            전략/리스크 상태를 저장 (StateCheckpoint.maybe_save 참고)
+        slippage_estimator (SlippageEstimator): 주문 전 체결가 예측/매수 금액 조정 (process_tick 참고)
+        max_slippage_bps (float): 매수 허용 슬리피지 (bp)
+        journal (TradeJournal): 시그널/주문 기록 (체결/잔고는 position_manager의 저널이 기록)
+        fixed_buy_amount (float): 매수 1회 금액 (기준 통화. Binance USDT 마켓이면 USDT)
+
+    Returns:
+        int: 처리한 틱 수
+    """
+    metrics = metrics or get_registry()
+    if risk_manager is None:
+        risk_manager = RiskManager(stop_loss_pct=0.05, take_profit_pct=0.10)  # 손절 5%, 익절 10%
+
+    if price_source is None:
+        price_source = PollingPriceSource(exchange, symbol, interval)
+
+    log_event(logger, logging.INFO, "live_trading_started", symbol=symbol, interval=interval)
+
+    ticks = 0
+    while max_ticks is None or ticks < max_ticks:
+        try:
+            with metrics.time(STAGE_METRIC, stage="price_fetch"):
+                current_price = price_source.get_price()
+        except PriceSourceExhausted:
+            log_event(logger, logging.INFO, "price_source_exhausted", symbol=symbol, ticks=ticks)
+            break
+        except Exception as e:
+            metrics.inc(ERROR_METRIC, stage="price_fetch")
+            log_event(logger, logging.ERROR, "price_fetch_failed", symbol=symbol, error=repr(e))
+            price_source.wait()
+            continue
+
+        started = time.perf_counter()
+        ok = process_tick(exchange, strategy, position_manager, risk_manager, symbol, current_price,
+                          fixed_buy_amount=fixed_buy_amount, order_executor=order_executor, metrics=metrics,
+                          slippage_estimator=slippage_estimator, max_slippage_bps=max_slippage_bps,
+                          journal=journal)
+        metrics.observe("live_tick_seconds", time.perf_counter() - started)
+        metrics.inc("live_ticks_total")
+        ticks += 1
+        if checkpoint is not None:
+            try:
+                with metrics.time(STAGE_METRIC, stage="checkpoint"):
+                    checkpoint.maybe_save(symbol, strategy, risk_manager)
+            except Exception as e:
+                metrics.inc(ERROR_METRIC, stage="checkpoint")
+                log_event(logger, logging.ERROR, "checkpoint_failed", symbol=symbol, error=repr(e))
+        if not ok:
+            price_source.wait()
+            continue
+
+        price_source.wait()
 
         # 잔고 동기화
         try:
-            position_manager.update_balances()
-            print("[DEBUG] 잔고 동기화 완료")
+            with metrics.time(STAGE_METRIC, stage="balance_sync"):
+                position_manager.update_balances()
+        except Exception as e:
+            metrics.inc(ERROR_METRIC, stage="balance_sync")
+            log_event(logger, logging.ERROR, "balance_sync_failed", symbol=symbol, error=repr(e))
+
+    if checkpoint is not None:
+        # 종료 직전 상태를 남겨 바로 재시작해도 가격 버퍼를 그대로 이어받음
+        try:
+            checkpoint.save(symbol, strategy, risk_manager)
         except Exception as e:
-            print(f"[ERROR] 잔고 동기화 실패: {e}")
-            logger.error(f"Failed to update balances: {e}")
+            log_event(logger, logging.ERROR, "checkpoint_failed", symbol=symbol, error=repr(e))
+    return ticks
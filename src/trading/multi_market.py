@@ -0,0 +1,178 @@
+# src/trading/multi_market.py
+# 한 프로세스에서 여러 (거래소, 마켓, 전략, 포지션 관리자) 조합을 asyncio로 운용하는 러너
+import asyncio
+import logging
+
+from src.strategies.risk_management import RiskManager, quote_currency
+from src.trading.live_trading import FIXED_BUY_AMOUNT, process_tick
+from src.utils.logger import get_logger, log_event
+
+logger = get_logger(__name__)
+
+
+class MarketSlot:
+    """
+    MarketSlot은 멀티 마켓 러너가 운용하는 마켓 하나의 상태를 묶는 클래스입니다.
+    """
+    def __init__(self, market, strategy, position_manager, risk_manager=None, journal=None, exchange=None,
+                 fixed_buy_amount=FIXED_BUY_AMOUNT):
+        """
+        Args:
+            market (str): 예: "KRW-BTC", "USDT-BTC"
+            strategy: update_price/compute_signals를 제공하는 전략
+            position_manager (PositionManager): 이 마켓의 잔고 관리자
+            risk_manager (RiskManager): 손절/익절 관리자 (없으면 5%/10%로 생성)
+            journal (TradeJournal): 시그널/주문 기록 (여러 슬롯이 공유 가능)
+            exchange (ExchangeAPI): 이 마켓을 거래할 거래소 (없으면 run_tick에 넘긴 기본 거래소)
+            fixed_buy_amount (float): 매수 1회 금액 (이 마켓의 기준 통화)
+        """
+        self.market = market
+        self.strategy = strategy
+        self.position_manager = position_manager
+        self.risk_manager = risk_manager or RiskManager(stop_loss_pct=0.05, take_profit_pct=0.10)
+        self.journal = journal
+        self.exchange = exchange
+        self.fixed_buy_amount = fixed_buy_amount
+        self.last_price = None  # 마지막으로 조회한 현재가 (자산 평가용)
+        self.ticks = 0     # 정상 처리한 틱 수
+        self.failures = 0  # 실패한 틱 수
+
+    def tick(self, exchange, current_price):
+        """
+        한 틱을 처리하고 성공 시 잔고를 동기화합니다. (작업 스레드에서 실행)
+
+        Returns:
+            bool: 처리 성공 여부
+        """
+        if not process_tick(exchange, self.strategy, self.position_manager, self.risk_manager,
+                            self.market, current_price, fixed_buy_amount=self.fixed_buy_amount,
+                            journal=self.journal):
+            return False
+        self.position_manager.update_balances()
+        return True
+
+
+async def _run_slot(exchange, slot, prices):
+    if slot.market not in prices:
+        raise KeyError(f"{slot.market} 현재가 없음")
+    return await asyncio.to_thread(slot.tick, slot.exchange or exchange, prices[slot.market])
+
+
+async def _fetch_prices(exchange, slots):
+    # 거래소마다 요청 한 번으로 그 거래소 마켓들의 현재가를 조회하고, 거래소끼리는 동시에 조회.
+    # 한 거래소의 조회 실패는 그 거래소 마켓들만 건너뛰고, 모든 거래소가 실패하면 예외를 그대로 올림
+    venues = {}
+    for slot in slots:
+        venue = slot.exchange or exchange
+        venues.setdefault(id(venue), (venue, []))[1].append(slot.market)
+    batches = await asyncio.gather(*(asyncio.to_thread(venue.get_current_prices, markets)
+                                     for venue, markets in venues.values()), return_exceptions=True)
+    prices, failed = {}, []
+    for (venue, markets), batch in zip(venues.values(), batches):
+        if isinstance(batch, BaseException):
+            failed.append((venue, markets, batch))
+        else:
+            prices.update(batch)
+    if failed and len(failed) == len(batches):
+        raise failed[0][2]
+    for venue, markets, error in failed:
+        log_event(logger, logging.ERROR, "price_fetch_failed", venue=getattr(venue, "name", None),
+                  markets=markets, error=repr(error))
+    return prices
+
+
+def _check_quote_currency(slots):
+    # 현금/보유 평가액을 한 통화로 더하므로 KRW와 USDT 시장을 한 포트폴리오에 섞을 수 없음
+    currencies = {quote_currency(slot.market) for slot in slots}
+    if len(currencies) > 1:
+        raise ValueError(f"포트폴리오 리스크는 기준 통화가 같은 시장끼리만 평가할 수 있습니다: {sorted(currencies)}")
+
+
+def _portfolio_equity(slots, prices):
+    """
+    모든 슬롯의 총 자산 평가액(현금 + 보유 코인의 현재가 평가액)을 계산합니다.
+    같은 계좌(AccountSnapshot)를 공유하는 슬롯의 현금은 거래소 잔고로 한 번만 세고,
+    이번 배치에 가격이 없는 시장은 마지막 가격으로 평가합니다.
+    """
+    cash, holdings, counted = 0.0, 0.0, set()
+    for slot in slots:
+        pm = slot.position_manager
+        snapshot = getattr(pm, "snapshot", None)
+        if snapshot is not None:
+            key = (id(snapshot), pm.base_currency)
+            if key not in counted:
+                counted.add(key)
+                cash += snapshot.balance(pm.base_currency)
+        elif id(pm) not in counted:
+            counted.add(id(pm))
+            cash += pm.cash_balance
+        price = prices.get(slot.market, slot.last_price)
+        if price is not None:
+            holdings += pm.coin_balance * price
+    return cash + holdings
+
+
+async def run_tick(exchange, slots, portfolio=None):
+    """
+    모든 마켓의 현재가를 거래소별로 한 번에 조회하고 각 마켓의 틱을 동시에 처리합니다.
+    한 마켓의 실패는 다른 마켓에 영향을 주지 않습니다.
+
+    Args:
+        exchange: get_current_prices/place_order를 제공하는 기본 거래소 API (슬롯에 거래소가 없을 때 사용)
+        slots (list): MarketSlot 목록. 슬롯마다 다른 거래소를 지정할 수 있음
+        portfolio (PortfolioRiskManager): 주어지면 조회한 가격 배치로 모든 포지션의 청산 조건과
+            포트폴리오 한도를 한 번에 평가 (슬롯의 risk_manager는 portfolio.view(market)여야 함).
+            낙폭은 공유 현금과 모든 슬롯 보유분의 평가액을 더한 총 자산으로 계산 (_portfolio_equity 참고).
+            슬롯들의 기준 통화가 다르면 ValueError
+
+    Returns:
+        dict: 마켓 -> True(성공) / False(처리 실패) / 예외
+    """
+    if portfolio is not None:
+        _check_quote_currency(slots)
+    prices = await _fetch_prices(exchange, slots)
+    if portfolio is not None:
+        portfolio.evaluate(prices, equity=_portfolio_equity(slots, prices) if slots else None)
+    for slot in slots:
+        slot.last_price = prices.get(slot.market, slot.last_price)
+    results = await asyncio.gather(*(_run_slot(exchange, slot, prices) for slot in slots),
+                                   return_exceptions=True)
+    outcome = {}
+    for slot, result in zip(slots, results):
+        if isinstance(result, BaseException):
+            log_event(logger, logging.ERROR, "tick_failed", symbol=slot.market, error=repr(result))
+        if result is True:
+            slot.ticks += 1
+        else:
+            slot.failures += 1
+        outcome[slot.market] = result
+        if portfolio is not None:
+            portfolio.set_quantity(slot.market, slot.position_manager.coin_balance)
+    return outcome
+
+
+async def run_multi_market(exchange, slots, interval=5, max_ticks=None, portfolio=None):
+    """
+    여러 마켓을 하나의 이벤트 루프에서 interval초마다 운용합니다.
+
+    Args:
+        exchange: get_current_prices/place_order를 제공하는 기본 거래소 API
+        slots (list): MarketSlot 목록 (슬롯별 거래소는 run_tick 참고)
+        interval (float): 틱 간격(초). 틱 처리 시간만큼 대기 시간을 줄여 주기를 유지
+        max_ticks (int): 이 횟수만큼 실행 후 종료 (None이면 무한 실행)
+        portfolio (PortfolioRiskManager): 포트폴리오 리스크 관리자 (run_tick 참고, 슬롯들의 기준 통화가 다르면 ValueError)
+    """
+    if portfolio is not None:
+        _check_quote_currency(slots)  # 설정 오류는 틱마다 기록하지 않고 시작할 때 알림
+    loop = asyncio.get_running_loop()
+    tick = 0
+    while max_ticks is None or tick < max_ticks:
+        started = loop.time()
+        try:
+            await run_tick(exchange, slots, portfolio=portfolio)
+        except Exception as e:
+            log_event(logger, logging.ERROR, "price_fetch_failed", error=repr(e))
+        tick += 1
+        if max_ticks is not None and tick >= max_ticks:
+            break
+        await asyncio.sleep(max(0.0, interval - (loop.time() - started)))
@@ -0,0 +1,225 @@
+# src/trading/optimizer.py
+# SimpleMovingAverageStrategy 윈도우와 RiskManager 비율을 백테스트로 탐색하는 파라미터 최적화기
+import inspect
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from src.strategies.simple_moving_average import sma_buy_mask
+from src.trading.backtester import Backtester, to_price_array
+
+# Backtester 생성자 기본값 (결과 행에 모든 파라미터를 채울 때 사용)
+_DEFAULTS = {name: p.default for name, p in inspect.signature(Backtester.__init__).parameters.items()
+             if p.default is not inspect.Parameter.empty}
+
+# 정렬 기준별 방향 (True면 값이 작을수록 좋음)
+_ASCENDING_METRICS = {"max_drawdown", "total_fees"}
+
+# 워커 프로세스가 공유 메모리에서 붙인 가격 배열
+_worker_shm = None
+_worker_prices = None
+
+
+def _init_worker(shm_name, shape, dtype):
+    """
+    워커 프로세스 시작 시 공유 메모리의 가격 배열을 복사 없이 연결합니다.
+    """
+    global _worker_shm, _worker_prices
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_prices = np.ndarray(shape, dtype=dtype, buffer=_worker_shm.buf)
+
+
+def _evaluate_group(task):
+    """
+    같은 (short_window, long_window) 조합을 공유하는 파라미터 묶음을 평가합니다.
+    이동평균 BUY 여부는 묶음당 한 번만 계산합니다.
+    """
+    (short_window, long_window), param_list = task
+    prices = _worker_prices
+    buy_mask = sma_buy_mask(prices, short_window, long_window)
+    rows = []
+    for params in param_list:
+        result = Backtester(**params).run(prices, buy_mask=buy_mask)
+        row = dict(params)
+        row.update(result.summary())
+        rows.append(row)
+    return rows
+
+
+def _group_by_windows(param_list, min_tasks=1):
+    """
+    파라미터를 (short_window, long_window)별로 묶습니다.
+    묶음 수가 min_tasks보다 적으면 큰 묶음을 나눠 작업이 대략 min_tasks개 이상이 되게 합니다.
+    (나뉜 묶음은 이동평균 BUY 여부를 각자 다시 계산합니다)
+    """
+    groups = {}
+    for params in param_list:
+        key = (params["short_window"], params["long_window"])
+        groups.setdefault(key, []).append(params)
+    size = max(1, -(-len(param_list) // max(1, min_tasks)))
+    return [(key, params[i:i + size]) for key, params in groups.items()
+            for i in range(0, len(params), size)]
+
+
+def _is_valid(params):
+    return (params.get("short_window", _DEFAULTS["short_window"])
+            < params.get("long_window", _DEFAULTS["long_window"]))
+
+
+def rank_results(rows, sort_by="total_return"):
+    """
+    결과를 지정한 지표 기준으로 정렬합니다.
+
+    Args:
+        rows (list): run_sweep 결과 dict 목록
+        sort_by (str): 정렬 기준 지표 (total_return, max_drawdown, num_trades 등)
+
+    Returns:
+        list: 정렬된 결과 목록 (각 항목에 "rank" 추가)
+    """
+    reverse = sort_by not in _ASCENDING_METRICS
+    ranked = sorted(rows, key=lambda row: row[sort_by], reverse=reverse)
+    for rank, row in enumerate(ranked, start=1):
+        row["rank"] = rank
+    return ranked
+
+
+def format_results(rows, top=20):
+    """
+    순위표를 사람이 읽기 쉬운 문자열 표로 만듭니다.
+
+    Args:
+        rows (list): rank_results 결과
+        top (int): 출력할 상위 개수
+
+    Returns:
+        str: 표 문자열
+    """
+    header = f"{'rank':>4} {'short':>5} {'long':>5} {'SL%':>6} {'TP%':>6} {'return%':>9} {'MDD%':>7} {'trades':>7}"
+    lines = [header, "-" * len(header)]
+    for row in rows[:top]:
+        lines.append(
+            f"{row['rank']:>4} {row['short_window']:>5} {row['long_window']:>5} "
+            f"{row['stop_loss_pct'] * 100:>6.2f} {row['take_profit_pct'] * 100:>6.2f} "
+            f"{row['total_return'] * 100:>9.2f} {row['max_drawdown'] * 100:>7.2f} {row['num_trades']:>7}"
+        )
+    return "\n".join(lines)
+
+
+def run_sweep(data, param_list, max_workers=None, sort_by="total_return"):
+    """
+    주어진 파라미터 조합들을 프로세스 풀에서 백테스트하고 순위표를 반환합니다.
+    가격 배열은 공유 메모리에 한 번만 올리고, 워커는 이를 복사 없이 참조합니다.
+
+    Args:
+        data: 가격 데이터 (to_price_array 참고)
+        param_list (list): Backtester 생성자 인자 dict 목록 (빠진 인자는 기본값, 결과 행에도 기본값이 채워짐)
+        max_workers (int): 워커 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스에서 실행)
+        sort_by (str): 정렬 기준 지표
+
+    Returns:
+        list: 정렬된 결과 dict 목록
+    """
+    global _worker_prices
+    prices = to_price_array(data)
+    # 호출자의 dict를 바꾸지 않도록 복사하고, 주지 않은 파라미터는 Backtester 기본값으로 채운다
+    param_list = [dict(_DEFAULTS, **p) for p in param_list if _is_valid(p)]
+    max_workers = max_workers or os.cpu_count() or 1
+    groups = _group_by_windows(param_list, min_tasks=max_workers)
+    if not groups:
+        return []
+
+    if max_workers == 1:
+        _worker_prices = prices
+        try:
+            rows = [row for task in groups for row in _evaluate_group(task)]
+        finally:
+            _worker_prices = None
+        return rank_results(rows, sort_by)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(prices.nbytes, 1))
+    try:
+        shared = np.ndarray(prices.shape, dtype=prices.dtype, buffer=shm.buf)
+        shared[:] = prices
+        # 워커당 몇 개의 묶음을 한 번에 넘겨 IPC 왕복을 줄인다
+        chunksize = max(1, len(groups) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(shm.name, prices.shape, prices.dtype.str)) as executor:
+            rows = [row for rows in executor.map(_evaluate_group, groups, chunksize=chunksize)
+                    for row in rows]
+        del shared
+    finally:
+        shm.close()
+        shm.unlink()
+    return rank_results(rows, sort_by)
+
+
+def grid_search(data, param_grid, max_workers=None, sort_by="total_return", **fixed_params):
+    """
+    파라미터 격자의 모든 조합을 평가합니다.
+
+    Args:
+        data: 가격 데이터
+        param_grid (dict): 파라미터 이름 -> 후보 값 목록
+            예: {"short_window": [3, 5], "long_window": [20, 60], "stop_loss_pct": [0.03, 0.05]}
+        max_workers (int): 워커 프로세스 수
+        sort_by (str): 정렬 기준 지표
+        **fixed_params: 모든 조합에 공통으로 넣을 Backtester 인자
+
+    Returns:
+        list: 정렬된 결과 dict 목록
+    """
+    names = list(param_grid)
+    param_list = [
+        dict(fixed_params, **dict(zip(names, values)))
+        for values in itertools.product(*(param_grid[name] for name in names))
+    ]
+    return run_sweep(data, param_list, max_workers=max_workers, sort_by=sort_by)
+
+
+def random_search(data, param_space, n_iter=100, seed=None, max_workers=None,
+                  sort_by="total_return", **fixed_params):
+    """
+    파라미터 공간에서 무작위로 서로 다른 유효 조합(short_window < long_window) n_iter개를 뽑아 평가합니다.
+    공간의 조합이 n_iter개보다 적으면 찾은 조합만 평가하므로 결과가 n_iter개보다 적을 수 있습니다.
+
+    Args:
+        data: 가격 데이터
+        param_space (dict): 파라미터 이름 -> 후보 목록(list) 또는 (최소, 최대) 범위(tuple).
+            범위의 두 값이 모두 int면 정수, 아니면 실수로 균등 추출합니다.
+        n_iter (int): 추출할 조합 수 (최대)
+        seed (int): 난수 시드
+        max_workers (int): 워커 프로세스 수
+        sort_by (str): 정렬 기준 지표
+        **fixed_params: 모든 조합에 공통으로 넣을 Backtester 인자
+
+    Returns:
+        list: 정렬된 결과 dict 목록
+    """
+    rng = random.Random(seed)
+
+    def sample(space):
+        if isinstance(space, tuple):
+            low, high = space
+            if isinstance(low, int) and isinstance(high, int):
+                return rng.randint(low, high)
+            return rng.uniform(low, high)
+        return rng.choice(list(space))
+
+    # 중복/무효 조합이 연속으로 이만큼 나오면 공간을 다 쓴 것으로 본다
+    max_misses = max(100, n_iter * 10)
+    param_list, seen, misses = [], set(), 0
+    while len(param_list) < n_iter and misses < max_misses:
+        params = dict(fixed_params, **{name: sample(space) for name, space in param_space.items()})
+        key = tuple(sorted(params.items()))
+        if key in seen or not _is_valid(params):
+            misses += 1
+            continue
+        seen.add(key)
+        param_list.append(params)
+        misses = 0
+    return run_sweep(data, param_list, max_workers=max_workers, sort_by=sort_by)
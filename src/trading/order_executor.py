@@ -1,2 +1,236 @@
+# src/trading/order_executor.py
+# 주문을 백그라운드에서 제출하고 체결 상태를 추적하는 주문 실행기
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.logger import get_logger, log_event
+
+logger = get_logger(__name__)
+
+FINAL_STATES = ("done", "cancel")
+
+
 def execute_order(api, symbol: str, side: str, quantity: float) -> dict:
     return api.place_order(symbol, side, quantity)
+
+
+class Fill:
+    """
+    Fill은 하나의 주문이 최종 상태에 도달했을 때의 실제 체결 결과입니다.
+    """
+    def __init__(self, uuid, market, side, volume, avg_price, fee, state, order=None):
+        self.uuid = uuid
+        self.market = market
+        self.side = side            # "buy" 또는 "sell"
+        self.volume = volume        # 체결 수량
+        self.avg_price = avg_price  # 평균 체결가 (알 수 없으면 None)
+        self.fee = fee              # 지불 수수료 (기준 통화)
+        self.state = state          # "done" 또는 "cancel"
+        self.order = order          # 마지막 주문 조회 응답
+
+    @property
+    def funds(self):
+        return self.volume * (self.avg_price or 0.0)
+
+    def __repr__(self):
+        return (f"Fill({self.market} {self.side} volume={self.volume} avg_price={self.avg_price} "
+                f"fee={self.fee} state={self.state})")
+
+
+def fill_from_order(order, side, quote=None):
+    """
+    Upbit 주문 조회 응답(/order)에서 평균 체결가, 체결 수량, 수수료를 계산합니다.
+
+    체결 내역(trades)이 없으면 executed_funds로, 그것도 없으면 주문 당시 시세(quote)로 평균가를 정합니다.
+    어느 것도 없으면 평균가는 None이며, 0원 체결로 기록하지 않습니다.
+
+    Args:
+        order (dict): 주문 조회 응답 (trades 포함)
+        side (str): "buy" 또는 "sell"
+        quote (float): 주문 당시 시세 (체결 금액을 알 수 없을 때의 대체 가격)
+
+    Returns:
+        Fill: 체결 결과
+    """
+    trades = order.get("trades") or []
+    volume = sum(float(t["volume"]) for t in trades)
+    funds = sum(float(t["funds"]) for t in trades)
+    if not trades:
+        volume = float(order.get("executed_volume") or 0.0)
+        funds = float(order.get("executed_funds") or 0.0)
+    if volume and funds:
+        avg_price = funds / volume
+    elif volume and quote:
+        avg_price = float(quote)
+    else:
+        avg_price = None
+    return Fill(order["uuid"], order.get("market"), side, volume, avg_price,
+                float(order.get("paid_fee") or 0.0), order.get("state"), order)
+
+
+def apply_fill(fill, position_manager, risk_manager=None, strategy=None):
+    """
+    체결 결과를 PositionManager와 RiskManager에 반영하고, 전략에 포지션 변화를 알립니다. (on_buy/on_sell)
+    평균 체결가를 알 수 없는 체결은 반영하지 않고 다음 재조정에서 거래소 잔고로 맞추도록 표시합니다.
+
+    Returns:
+        bool: 잔고 반영 성공 여부 (체결 수량이 없으면 False)
+    """
+    if fill.volume <= 0:
+        return False
+    if not fill.avg_price:
+        logger.warning("Fill without a known price, reconciling balances instead: %s", fill)
+        position_manager.mark_mismatch()
+        return False
+    if not position_manager.execute_order(fill.side, fill.avg_price, fill.volume, fee=fill.fee):
+        logger.warning("Fill could not be applied to local balances: %s", fill)
+        return False
+    if risk_manager is not None:
+        if fill.side == "buy":
+            risk_manager.set_entry_price(fill.avg_price)
+        else:
+            risk_manager.entry_price = None
+    notify_strategy(strategy, fill.side, fill.avg_price)
+    return True
+
+
+def notify_strategy(strategy, side, price):
+    """
+    체결된 주문을 전략의 포지션 상태에 반영합니다. on_buy/on_sell이 없는 전략은 무시합니다.
+
+    Args:
+        strategy: 전략 (None 가능)
+        side (str): "buy" 또는 "sell"
+        price (float): 매수 체결가
+    """
+    if side == "buy":
+        if hasattr(strategy, "on_buy"):
+            strategy.on_buy(price)
+    elif hasattr(strategy, "on_sell"):
+        strategy.on_sell()
+
+
+class OrderExecutor:
+    """
+    OrderExecutor는 주문 제출과 체결 추적을 작업 스레드에서 처리하는 클래스입니다.
+
+    submit()은 즉시 반환하고, 작업 스레드가 place_order 후 주문 UUID를 /order 상태 조회로
+    done 또는 cancel이 될 때까지 추적합니다. 완료된 체결은 큐에 쌓이며,
+    매매 루프는 apply_fills()로 자기 스레드에서 잔고/진입가에 반영합니다.
+    제출이나 추적에 실패한 주문은 결과를 알 수 없으므로, apply_fills()가 그 마켓의 잔고를 재조정 대상으로 표시합니다.
+    """
+    def __init__(self, exchange, poll_interval=0.2, timeout=30.0, max_workers=4, on_fill=None):
+        """
+        Args:
+            exchange: place_order/get_order를 제공하는 거래소 API
+            poll_interval (float): 주문 상태 조회 간격(초)
+            timeout (float): 최종 상태를 기다리는 최대 시간(초)
+            max_workers (int): 동시에 추적할 주문 수
+            on_fill (callable): 체결 완료 시 작업 스레드에서 호출할 콜백 on_fill(fill)
+        """
+        self.exchange = exchange
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.on_fill = on_fill
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="order")
+        self._fills = {}    # market -> 완료된 Fill 목록
+        self._pending = {}  # market -> 진행 중 주문 수
+        self._failed = set()  # 결과를 알 수 없는 주문이 있었던 market
+        self._lock = threading.Lock()
+
+    def submit(self, market, side, volume=None, price=None, quote=None):
+        """
+        주문을 작업 스레드에 넘기고 바로 반환합니다.
+
+        Args:
+            market (str): 예: "KRW-BTC"
+            side (str): "buy" 또는 "sell"
+            volume (float): 매도 수량
+            price (float): 매수 원화 금액
+            quote (float): 주문 당시 시세 (체결 금액이 응답에 없을 때의 대체 가격)
+
+        Returns:
+            concurrent.futures.Future: 완료 시 Fill을 반환
+        """
+        with self._lock:
+            self._pending[market] = self._pending.get(market, 0) + 1
+        return self._executor.submit(self._run, market, side, volume, price, quote)
+
+    def pending(self, market=None):
+        """
+        진행 중인 주문 수를 반환합니다.
+        """
+        with self._lock:
+            if market is None:
+                return sum(self._pending.values())
+            return self._pending.get(market, 0)
+
+    def _run(self, market, side, volume, price, quote):
+        try:
+            order = self.exchange.place_order(market, side, volume=volume, price=price)
+            fill = self._track(order, side, quote)
+            fill.market = fill.market or market
+            log_event(logger, logging.INFO, "order_filled", symbol=fill.market, side=fill.side,
+                      uuid=fill.uuid, state=fill.state, volume=fill.volume,
+                      avg_price=fill.avg_price, fee=fill.fee)
+            with self._lock:
+                self._fills.setdefault(market, []).append(fill)
+            if self.on_fill is not None:
+                self.on_fill(fill)
+            return fill
+        except Exception as e:
+            log_event(logger, logging.ERROR, "order_failed", symbol=market, side=side, error=repr(e))
+            with self._lock:
+                self._failed.add(market)
+            raise
+        finally:
+            with self._lock:
+                self._pending[market] -= 1
+
+    def _track(self, order, side, quote=None):
+        uuid = order["uuid"]
+        deadline = time.monotonic() + self.timeout
+        while order.get("state") not in FINAL_STATES:
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"주문 {uuid} 체결 확인 시간 초과 (state={order.get('state')})")
+            time.sleep(self.poll_interval)
+            order = self.exchange.get_order(uuid)
+        if float(order.get("executed_volume") or 0.0) and not order.get("trades"):
+            # 최종 상태인데 체결 내역이 비어 있으면 한 번 더 조회
+            order = self.exchange.get_order(uuid)
+        return fill_from_order(order, side, quote)
+
+    def apply_fills(self, position_manager, risk_manager=None, market=None, strategy=None):
+        """
+        완료된 체결을 꺼내 잔고와 진입가에 반영합니다. 매매 루프 스레드에서 호출합니다.
+        실패한 주문이 있었던 마켓이면 position_manager.mark_mismatch()로 다음 동기화에서 재조정하게 합니다.
+
+        Args:
+            position_manager (PositionManager): 잔고 관리자
+            risk_manager (RiskManager): 진입가를 갱신할 리스크 관리자
+            market (str): 이 마켓의 체결만 반영 (None이면 전체)
+            strategy: 체결을 알릴 전략 (on_buy/on_sell, market을 지정했을 때 사용)
+
+        Returns:
+            list: 반영한 Fill 목록
+        """
+        with self._lock:
+            if market is None:
+                fills = [f for market_fills in self._fills.values() for f in market_fills]
+                self._fills.clear()
+                failed = bool(self._failed)
+                self._failed.clear()
+            else:
+                fills = self._fills.pop(market, [])
+                failed = market in self._failed
+                self._failed.discard(market)
+        if failed:
+            position_manager.mark_mismatch()
+        for fill in fills:
+            apply_fill(fill, position_manager, risk_manager, strategy)
+        return fills
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -1,70 +1,192 @@
 # src/trading/position_manager.py
 
+import threading
+import time
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AccountSnapshot:
+    """
+    AccountSnapshot은 거래소 계좌 목록(/accounts)을 한 번 조회해 모든 통화의 잔고를 제공하는 클래스입니다.
+    여러 PositionManager가 공유하면 max_age초 안의 동기화 요청은 조회 한 번으로 처리됩니다.
+    """
+    def __init__(self, exchange, max_age=1.0, clock=time.monotonic):
+        """
+        Args:
+            exchange: get_accounts()를 제공하는 거래소 API
+            max_age (float): 이 시간(초) 안에 조회한 스냅샷은 재사용
+            clock (callable): 현재 시각(초)을 반환하는 함수
+        """
+        self.exchange = exchange
+        self.max_age = max_age
+        self.clock = clock
+        self.balances = {}
+        self.fetched_at = None
+        self.fetches = 0
+        self._lock = threading.Lock()
+
+    def refresh(self, max_age=None):
+        """
+        스냅샷이 max_age초보다 오래되었으면 계좌 목록을 다시 조회합니다.
+
+        Returns:
+            dict: 통화(대문자) -> 잔고
+        """
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            now = self.clock()
+            if self.fetched_at is not None and now - self.fetched_at < max_age:
+                return self.balances
+            accounts = self.exchange.get_accounts()
+            self.balances = {d['currency'].upper(): float(d['balance']) for d in accounts}
+            self.fetched_at = now
+            self.fetches += 1
+            return self.balances
+
+    def balance(self, currency):
+        return self.balances.get(currency.upper(), 0.0)
+
+
 class PositionManager:
-    def __init__(self, exchange, base_currency="KRW", asset="BTC"):
+    def __init__(self, exchange, base_currency="KRW", asset="BTC", reconcile_interval=60.0,
+                 snapshot=None, clock=time.monotonic, journal=None):
+        """
+        Args:
+            exchange: 거래소 API (get_accounts 사용)
+            base_currency (str): 기준 통화
+            asset (str): 거래 대상 코인
+            reconcile_interval (float): 거래소 잔고와 맞추는 주기(초). None이면 요청 시에만 동기화
+            snapshot (AccountSnapshot): 여러 PositionManager가 공유할 계좌 스냅샷 (없으면 생성)
+            clock (callable): 현재 시각(초)을 반환하는 함수
+            journal (TradeJournal): 주어지면 반영한 체결과 잔고 스냅샷을 기록
+        """
         self.exchange = exchange
+        self.journal = journal
+        self.market = f"{base_currency}-{asset}"
         self.base_currency = base_currency
         self.asset = asset
+        self.reconcile_interval = reconcile_interval
+        self.snapshot = snapshot or AccountSnapshot(exchange, clock=clock)
+        self.clock = clock
         self.cash_balance = 0.0   # 원화(기준 통화) 잔고
         self.coin_balance = 0.0   # 코인 잔고
-        self.update_balances()
+        self.needs_reconcile = False  # 로컬 잔고와 거래소 잔고 불일치 의심
+        self.last_sync = None
+        self.mismatches = 0
+        self.update_balances()  # 첫 동기화는 공유 스냅샷 재사용
 
-    def update_balances(self):
-        # 거래소로부터 실제 잔고를 조회
-        self.cash_balance = self.exchange.get_balance(self.base_currency)
-        self.coin_balance = self.exchange.get_balance(self.asset)
+    def sync(self, tolerance=1e-9, fresh=False):
+        """
+        계좌 스냅샷 한 번으로 기준 통화/코인 잔고를 거래소 값으로 맞춥니다.
+        로컬 잔고와 차이가 있으면 경고를 남깁니다.
 
-    def execute_order(self, side: str, price: float, quantity: float) -> bool:
+        Args:
+            tolerance (float): 차이로 보지 않을 오차
+            fresh (bool): True면 공유 스냅샷을 재사용하지 않고 새로 조회
+        """
+        # 강제 동기화/불일치 재조정은 다른 PositionManager가 방금 받은 스냅샷이 아니라 새 조회가 필요
+        balances = self.snapshot.refresh(max_age=0 if fresh or self.needs_reconcile else None)
+        cash = balances.get(self.base_currency.upper(), 0.0)
+        coin = balances.get(self.asset.upper(), 0.0)
+        if self.last_sync is not None and (abs(cash - self.cash_balance) > tolerance
+                                           or abs(coin - self.coin_balance) > tolerance):
+            self.mismatches += 1
+            logger.warning("Balance drift corrected: cash %s -> %s, coin %s -> %s",
+                           self.cash_balance, cash, self.coin_balance, coin)
+        self.cash_balance = cash
+        self.coin_balance = coin
+        self.needs_reconcile = False
+        self.last_sync = self.clock()
+        if self.journal is not None:
+            self.journal.record_balance(self.market, cash, coin)
+
+    def update_balances(self, force=False):
+        """
+        재조정 주기가 지났거나 불일치가 감지되었을 때만 거래소 잔고를 조회합니다.
+        그 사이에는 execute_order로 반영한 로컬 잔고를 사용합니다.
+
+        Args:
+            force (bool): True면 주기와 관계없이 동기화
+
+        Returns:
+            bool: 실제로 동기화했으면 True
+        """
+        due = (
+            force
+            or self.needs_reconcile
+            or self.last_sync is None
+            or (self.reconcile_interval is not None
+                and self.clock() - self.last_sync >= self.reconcile_interval)
+        )
+        if due:
+            self.sync(fresh=force)
+        return due
+
+    def mark_mismatch(self):
+        """
+        거래소 잔고와 어긋났을 가능성이 있을 때 호출하면 다음 update_balances에서 재조정합니다.
+        """
+        self.needs_reconcile = True
+
+    def execute_order(self, side: str, price: float, quantity: float, fee: float = 0.0) -> bool:
         """
         주문 체결 후 잔고를 반영하는 메서드.
-        
+
         Args:
             side (str): "buy" 또는 "sell"
             price (float): 체결 가격
             quantity (float): 체결 수량
+            fee (float): 체결 수수료 (기준 통화)
 
         Returns:
             bool: 잔고 조정 성공 시 True, 실패 시 False
         """
         if side == "buy":
-            cost = price * quantity
+            cost = price * quantity + fee
             if self.cash_balance < cost:
-                # 자금 부족
+                # 자금 부족: 로컬 잔고가 실제와 다를 수 있으므로 재조정 예약
+                self.mark_mismatch()
                 return False
             # 매수 체결 반영
             self.cash_balance -= cost
             self.coin_balance += quantity
-            return True
         elif side == "sell":
             if self.coin_balance < quantity:
-                # 코인 부족
+                # 코인 부족: 재조정 예약
+                self.mark_mismatch()
                 return False
             # 매도 체결 반영
-            revenue = price * quantity
+            revenue = price * quantity - fee
             self.coin_balance -= quantity
             self.cash_balance += revenue
-            return True
         else:
             # 알 수 없는 주문 유형
             return False
+        if self.journal is not None:
+            self.journal.record_fill(self.market, side, price, quantity, fee=fee)
+            self.journal.record_balance(self.market, self.cash_balance, self.coin_balance, price=price)
+        return True
 
     def buy(self, price):
         # 예시 코드 (현재 사용하지 않거나 필요 시 참조)
         amount_to_spend = self.cash_balance * 0.1  # 자금의 10%만 매수 예시
         if amount_to_spend < 5000:
-            print("[DEBUG] Not enough base currency to buy.")
+            logger.debug("Not enough base currency to buy.")
             return None
         market_pair = f"{self.base_currency}-{self.asset}"
         order_resp = self.exchange.place_order(market_pair, side='buy', price=amount_to_spend)
-        self.update_balances()
+        self.update_balances(force=True)
         return order_resp
 
     def sell(self):
         # 예시 코드 (현재 사용하지 않거나 필요 시 참조)
         if self.coin_balance <= 0:
-            print("[DEBUG] No asset to sell.")
+            logger.debug("No asset to sell.")
             return None
         market_pair = f"{self.base_currency}-{self.asset}"
         order_resp = self.exchange.place_order(market_pair, side='sell', volume=self.coin_balance)
-        self.update_balances()
+        self.update_balances(force=True)
         return order_resp
@@ -0,0 +1,162 @@
+# src/trading/price_source.py
+# run_live_trading에 현재가를 공급하는 가격 소스 (REST 폴링 / WebSocket 스트리밍 / 기록 데이터 리플레이)
+import time
+
+import numpy as np
+
+from src.utils.clock import SYSTEM_CLOCK, SimulatedClock
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PriceSourceExhausted(Exception):
+    """
+    더 이상 공급할 가격이 없을 때(리플레이 종료) 발생합니다. run_live_trading은 이 예외를 받으면 루프를 끝냅니다.
+    """
+
+
+class PollingPriceSource:
+    """
+    PollingPriceSource는 기존 방식대로 REST로 현재가를 조회하고 interval초 대기하는 가격 소스입니다.
+    """
+    def __init__(self, exchange, symbol, interval=5, clock=None):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.interval = interval
+        self.clock = clock or SYSTEM_CLOCK
+
+    def get_price(self):
+        """
+        현재가를 반환합니다.
+        """
+        return self.exchange.get_current_price(self.symbol)
+
+    def wait(self):
+        """
+        다음 틱까지 대기합니다.
+        """
+        self.clock.sleep(self.interval)
+
+
+class StreamingPriceSource:
+    """
+    StreamingPriceSource는 WebSocket 스트림(UpbitTickerStream)으로 들어오는 시세를
+    도착 즉시 루프에 넘기는 가격 소스입니다.
+
+    wait()는 새 시세가 도착하면 바로 반환하고, interval초 안에 오지 않으면 그대로 반환합니다.
+    get_price()는 스트림 시세가 stale_after초보다 오래되었으면 REST(exchange)로 대신 조회합니다.
+    """
+    def __init__(self, stream, symbol, exchange=None, interval=5, stale_after=None):
+        """
+        Args:
+            stream (UpbitTickerStream): 시작된 시세 스트림
+            symbol (str): 시장 (예: "KRW-BTC")
+            exchange: REST 폴백에 사용할 거래소 API (get_current_price 필요)
+            interval (float): 새 시세를 기다리는 최대 시간(초)
+            stale_after (float): 이 시간(초)보다 오래된 스트림 시세는 사용하지 않음 (기본값: interval)
+        """
+        self.stream = stream
+        self.symbol = symbol
+        self.exchange = exchange
+        self.interval = interval
+        self.stale_after = interval if stale_after is None else stale_after
+        self._last_seq = 0
+        self.fallbacks = 0  # REST 폴백 횟수
+
+    def get_price(self):
+        """
+        최신 스트림 시세를 반환하고, 오래되었거나 없으면 REST로 조회합니다.
+        """
+        entry = self.stream.latest(self.symbol)
+        if entry is not None and time.monotonic() - entry[2] <= self.stale_after:
+            self._last_seq = entry[3]
+            return entry[0]
+        if self.exchange is None:
+            raise RuntimeError(f"{self.symbol} 스트림 시세 없음")
+        self.fallbacks += 1
+        logger.warning("Stream price for %s is stale; falling back to REST", self.symbol)
+        return self.exchange.get_current_price(self.symbol)
+
+    def wait(self):
+        """
+        마지막으로 사용한 시세 이후의 새 시세가 도착하거나 interval초가 지날 때까지 대기합니다.
+        """
+        self.stream.wait_for_update(self.symbol, after_seq=self._last_seq, timeout=self.interval)
+
+
+class ReplayPriceSource:
+    """
+    ReplayPriceSource는 기록된 틱/캔들 가격을 가상 시계 위에서 재생하는 가격 소스입니다.
+
+    - timestamps가 있으면 실시간 폴링 루프와 똑같이 동작합니다: get_price()는 현재 가상 시각 이전의
+      마지막 기록 가격을 반환하고, wait()는 기다리지 않고 가상 시각을 interval초 앞으로 옮깁니다.
+      따라서 같은 데이터를 실시간으로 interval초마다 폴링했을 때와 같은 가격 순서(= 같은 매매)가 나옵니다.
+    - timestamps가 없으면 틱마다 다음 가격을 하나씩 반환합니다.
+    - 마지막 기록 이후에는 PriceSourceExhausted를 발생시켜 루프를 끝냅니다.
+    """
+    def __init__(self, prices, timestamps=None, symbol="KRW-BTC", interval=5, clock=None, exchange=None):
+        """
+        Args:
+            prices (array-like): 기록된 가격
+            timestamps (array-like): 가격별 시각 (ms, 오름차순). None이면 틱당 한 가격씩 재생
+            symbol (str): 시장
+            interval (float): 틱 간격(초)
+            clock (SimulatedClock): 공유할 가상 시계 (없으면 첫 기록 시각에서 시작하는 시계 생성)
+            exchange: set_price(symbol, price)를 제공하면 재생 가격을 체결가로 반영 (예: MockExchangeAPI)
+        """
+        self.prices = np.ascontiguousarray(prices, dtype=np.float64)
+        self.timestamps = None
+        start = 0.0
+        if timestamps is not None:
+            self.timestamps = np.asarray(timestamps, dtype=np.float64) / 1000.0
+            if len(self.timestamps) != len(self.prices):
+                raise ValueError("prices와 timestamps 길이가 다릅니다.")
+            start = self.timestamps[0] if len(self.timestamps) else 0.0
+        self.symbol = symbol
+        self.interval = interval
+        self.clock = clock or SimulatedClock(start)
+        self.clock.advance_to(start)
+        self.exchange = exchange
+        self._pos = 0
+        self.ticks = 0  # 공급한 가격 수
+
+    @classmethod
+    def from_candles(cls, candles, column="close", **kwargs):
+        """
+        CandleStore.query() 결과(컬럼 dict)로 리플레이 소스를 만듭니다.
+        """
+        return cls(candles[column], timestamps=candles["timestamp"], **kwargs)
+
+    @property
+    def exhausted(self):
+        if self.timestamps is None:
+            return self._pos >= len(self.prices)
+        return len(self.prices) == 0 or self.clock.time() > self.timestamps[-1]
+
+    def get_price(self):
+        """
+        현재 가상 시각의 가격을 반환합니다.
+        """
+        if self.exhausted:
+            raise PriceSourceExhausted(f"{self.symbol} 리플레이 종료 ({self.ticks} ticks)")
+        if self.timestamps is None:
+            price = self.prices[self._pos]
+            self._pos += 1
+        else:
+            # 가상 시각은 앞으로만 가므로 이전 위치부터 탐색
+            now = self.clock.time()
+            self._pos += int(np.searchsorted(self.timestamps[self._pos:], now, side="right")) - 1
+            self._pos = max(self._pos, 0)
+            price = self.prices[self._pos]
+        price = float(price)
+        if self.exchange is not None:
+            self.exchange.set_price(self.symbol, price)
+        self.ticks += 1
+        return price
+
+    def wait(self):
+        """
+        실제로 기다리지 않고 가상 시각을 interval초 앞으로 옮깁니다.
+        """
+        self.clock.sleep(self.interval)
@@ -0,0 +1,65 @@
+# src/trading/replay.py
+# 기록된 틱/캔들 데이터를 가상 시계 위에서 run_live_trading으로 빠르게 재생하는 러너
+import time
+
+import numpy as np
+
+from src.exchange_apis.mock_exchange_api import MockExchangeAPI
+from src.trading.live_trading import run_live_trading
+from src.trading.position_manager import PositionManager
+from src.trading.price_source import ReplayPriceSource
+from src.utils.clock import SimulatedClock
+from src.utils.metrics import MetricsRegistry
+
+
+def run_replay(data, strategy, symbol="KRW-BTC", interval=5, initial_cash=1000000.0, exchange=None,
+               reconcile_interval=60.0, max_ticks=None, metrics=None):
+    """
+    수정하지 않은 라이브 루프(run_live_trading)로 기록 데이터를 CPU가 허용하는 속도로 재생합니다.
+
+    가격 소스, 거래소, PositionManager가 하나의 SimulatedClock을 공유하므로 대기/재조정 주기는
+    모두 가상 시각 기준이며, 같은 입력이면 항상 같은 주문이 나옵니다.
+
+    Args:
+        data: 1차원 가격 배열(틱당 한 가격) 또는 "timestamp"(ms)/"close" 컬럼 dict (CandleStore.query 결과)
+        strategy: update_price/compute_signals를 제공하는 전략
+        symbol (str): 시장
+        interval (float): 틱 간격(초). timestamp가 있으면 이 간격으로 기록을 샘플링
+        initial_cash (float): 거래소 초기 원화 잔고 (exchange를 직접 주면 무시)
+        exchange: set_price/place_order/get_accounts를 제공하는 거래소 (없으면 MockExchangeAPI)
+        reconcile_interval (float): PositionManager 재조정 주기(가상 시각 기준 초)
+        max_ticks (int): 최대 틱 수
+        metrics (MetricsRegistry): 지표 레지스트리 (없으면 공용 레지스트리와 섞이지 않도록 새로 생성)
+
+    Returns:
+        dict: {"ticks", "orders", "cash", "coin", "elapsed", "ticks_per_sec", "simulated_seconds"}
+    """
+    if isinstance(data, dict):
+        timestamps, prices = data["timestamp"], data["close"]
+    else:
+        timestamps, prices = None, np.asarray(data, dtype=np.float64)
+
+    clock = SimulatedClock()
+    if exchange is None:
+        exchange = MockExchangeAPI(initial_cash=initial_cash, clock=clock)
+    source = ReplayPriceSource(prices, timestamps=timestamps, symbol=symbol, interval=interval,
+                               clock=clock, exchange=exchange)
+    started_at = clock.time()
+    asset = symbol.split("-", 1)[1]
+    position_manager = PositionManager(exchange, base_currency=symbol.split("-", 1)[0], asset=asset,
+                                       reconcile_interval=reconcile_interval, clock=clock.monotonic)
+
+    started = time.perf_counter()
+    ticks = run_live_trading(exchange, strategy, position_manager, symbol=symbol, interval=interval,
+                             price_source=source, metrics=metrics or MetricsRegistry(),
+                             max_ticks=max_ticks)
+    elapsed = time.perf_counter() - started
+    return {
+        "ticks": ticks,
+        "orders": list(getattr(exchange, "orders", [])),
+        "cash": position_manager.cash_balance,
+        "coin": position_manager.coin_balance,
+        "elapsed": elapsed,
+        "ticks_per_sec": ticks / elapsed if elapsed > 0 else float("inf"),
+        "simulated_seconds": clock.time() - started_at,
+    }
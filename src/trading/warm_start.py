@@ -0,0 +1,193 @@
+# src/trading/warm_start.py
+# 재시작 직후 첫 틱부터 거래할 수 있도록 전략/리스크 상태를 체크포인트나 최근 캔들로 복원
+import json
+import logging
+import os
+import time
+
+from src.data_handler.fetch_data import interval_to_ms, parse_candles
+from src.utils.logger import get_logger, log_event
+
+logger = get_logger(__name__)
+
+STATE_VERSION = 1
+
+
+class StateCheckpoint:
+    """
+    StateCheckpoint는 한 시장의 전략/리스크 상태를 JSON 파일 하나에 저장하고 읽는 클래스입니다.
+    임시 파일에 쓴 뒤 os.replace로 바꾸므로 저장 중에 프로세스가 죽어도 이전 체크포인트가 남습니다.
+
+    매매 루프는 maybe_save()를 틱마다 호출하고, 실제 파일 쓰기는 리스크 상태(진입가, 고점)나
+    전략 포지션이 바뀌었을 때와 interval초마다만 일어납니다.
+    """
+    def __init__(self, path, clock=None, interval=30.0):
+        """
+        Args:
+            path (str): 체크포인트 파일 경로 (예: "data/state/KRW-BTC.json")
+            clock: time()을 제공하는 시계 (없으면 time 모듈)
+            interval (float): 상태가 바뀌지 않아도 가격 버퍼를 새로 저장하는 주기(초)
+        """
+        self.path = path
+        self.clock = clock or time
+        self.interval = interval
+        self.saves = 0
+        self._saved_at = None
+        self._saved_key = None
+
+    @staticmethod
+    def _key(strategy_state, risk_state):
+        # 가격 버퍼를 뺀, 바뀌면 바로 저장해야 하는 상태
+        return (tuple(sorted(risk_state.items())), strategy_state.get("position"),
+                strategy_state.get("entry_price"))
+
+    def save(self, symbol, strategy, risk_manager):
+        """
+        전략(get_state)과 RiskManager(get_state) 상태를 저장합니다.
+        """
+        self._write(symbol, strategy.get_state(), risk_manager.get_state())
+
+    def maybe_save(self, symbol, strategy, risk_manager):
+        """
+        리스크 상태나 전략 포지션이 마지막 저장 이후 바뀌었거나 interval초가 지났을 때만 저장합니다.
+
+        Returns:
+            bool: 저장했으면 True
+        """
+        strategy_state, risk_state = strategy.get_state(), risk_manager.get_state()
+        if (self._saved_at is not None and self.clock.time() - self._saved_at < self.interval
+                and self._key(strategy_state, risk_state) == self._saved_key):
+            return False
+        self._write(symbol, strategy_state, risk_state)
+        return True
+
+    def _write(self, symbol, strategy_state, risk_state):
+        now = self.clock.time()
+        state = {
+            "version": STATE_VERSION,
+            "symbol": symbol,
+            "saved_at": now,
+            "strategy": strategy_state,
+            "risk": risk_state,
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+        self._saved_at = now
+        self._saved_key = self._key(strategy_state, risk_state)
+        self.saves += 1
+
+    def load(self):
+        """
+        저장된 상태를 반환합니다. 파일이 없거나 읽을 수 없으면 None.
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable checkpoint %s: %r", self.path, e)
+            return None
+        if state.get("version") != STATE_VERSION:
+            logger.warning("Ignoring checkpoint %s with version %s", self.path, state.get("version"))
+            return None
+        return state
+
+    def age(self, state):
+        return self.clock.time() - state["saved_at"]
+
+
+def recent_closes(symbol, count, interval="minute1", store=None, downloader=None, max_staleness=None,
+                  now_ms=None):
+    """
+    최근 캔들 종가를 오래된 순으로 반환합니다. 로컬 CandleStore에 충분히 최근 캔들이 있으면 그것을,
+    없으면 REST 요청 한 번(CandleDownloader.fetch_page, 최대 200개)으로 가져옵니다.
+
+    Args:
+        symbol (str): 시장
+        count (int): 필요한 캔들 수
+        interval (str): 캔들 간격 (예: "minute1")
+        store (CandleStore): 로컬 캔들 저장소
+        downloader (CandleDownloader): REST 조회에 사용할 다운로더
+        max_staleness (float): 로컬 마지막 캔들이 이보다 오래됐으면(초) REST로 조회. None이면 간격 2개
+        now_ms (int): 현재 시각(ms, 테스트용)
+
+    Returns:
+        list: 종가 목록 (없으면 빈 목록)
+    """
+    step = interval_to_ms(interval)
+    now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+    staleness_ms = 2 * step if max_staleness is None else int(max_staleness * 1000)
+
+    if store is not None:
+        time_range = store.time_range(symbol, interval)
+        if time_range is not None and time_range[1] >= now_ms - staleness_ms - step:
+            data = store.query(symbol, interval, start=time_range[1] - count * step, columns=("close",))
+            closes = data["close"][-count:].tolist()
+            if len(closes) >= count:
+                return closes
+    if downloader is not None:
+        candles = sorted(parse_candles(downloader.fetch_page(symbol, interval, count=min(count, 200))),
+                         key=lambda c: c["timestamp"])
+        return [c["close"] for c in candles]
+    return []
+
+
+def warm_start(strategy, risk_manager, symbol, checkpoint=None, max_checkpoint_age=300, store=None,
+               downloader=None, interval="minute1", exchange=None):
+    """
+    실시간 루프를 시작하기 전에 전략 버퍼와 RiskManager 진입가를 복원합니다.
+
+    1. 체크포인트가 max_checkpoint_age초 이내면 전략의 최근 가격 버퍼를 그대로 복원
+       (오래됐으면 가격 버퍼는 버리고 최근 캔들 종가로 채움)
+    2. 진입가는 체크포인트 나이와 관계없이 복원하고, 체크포인트에 없으면 거래소 계좌의
+       평균 매수가(avg_buy_price)를 사용. 코인을 보유하지 않았으면 진입가를 지움
+
+    Args:
+        strategy: update_price/get_state/set_state와 warmup_period를 제공하는 전략
+        risk_manager (RiskManager): 진입가를 복원할 리스크 관리자
+        symbol (str): 시장 (예: "KRW-BTC")
+        checkpoint (StateCheckpoint): 상태 체크포인트
+        max_checkpoint_age (float): 가격 버퍼를 그대로 믿을 체크포인트 최대 나이(초)
+        store (CandleStore): 최근 캔들을 읽을 로컬 저장소
+        downloader (CandleDownloader): 로컬에 없을 때 최근 캔들을 받을 다운로더
+        interval (str): 캔들 간격
+        exchange: get_accounts를 제공하는 거래소 (보유 여부/평균 매수가 확인)
+
+    Returns:
+        str: 가격 버퍼를 채운 출처 ("checkpoint", "candles", "none")
+    """
+    state = checkpoint.load() if checkpoint is not None else None
+    if state is not None and state.get("symbol") != symbol:
+        state = None
+
+    source = "none"
+    if state is not None and checkpoint.age(state) <= max_checkpoint_age:
+        strategy.set_state(state["strategy"])
+        source = "checkpoint"
+    else:
+        closes = recent_closes(symbol, strategy.warmup_period, interval=interval, store=store,
+                               downloader=downloader)
+        if closes:
+            strategy.set_state({"prices": closes})
+            source = "candles"
+    if state is not None:
+        risk_manager.set_state(state["risk"])
+
+    if exchange is not None:
+        currency = symbol.split("-", 1)[1]
+        account = next((a for a in exchange.get_accounts() if a["currency"].upper() == currency), None)
+        held = account is not None and float(account["balance"]) + float(account.get("locked") or 0) > 0
+        if not held:
+            risk_manager.entry_price = None
+        elif risk_manager.entry_price is None and float(account.get("avg_buy_price") or 0) > 0:
+            risk_manager.entry_price = float(account["avg_buy_price"])
+
+    log_event(logger, logging.INFO, "warm_start", symbol=symbol, source=source,
+              prices=len(strategy.get_state()["prices"]), entry_price=risk_manager.entry_price)
+    return source
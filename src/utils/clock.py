@@ -0,0 +1,51 @@
+# src/utils/clock.py
+# 실시간 시계와 리플레이용 가상 시계 (라이브 루프가 time 모듈에 직접 의존하지 않도록)
+import time
+
+
+class SystemClock:
+    """
+    실제 시간을 사용하는 시계입니다.
+    """
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class SimulatedClock:
+    """
+    SimulatedClock은 sleep()이 실제로 기다리지 않고 시각만 앞으로 옮기는 가상 시계입니다.
+    리플레이에서 가격 소스, PositionManager 등이 같은 인스턴스를 공유하면 모두 같은 가상 시각을 봅니다.
+    """
+    def __init__(self, start=0.0):
+        """
+        Args:
+            start (float): 시작 시각 (epoch 초)
+        """
+        self.now = float(start)
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self.now += seconds
+
+    def advance_to(self, timestamp):
+        """
+        timestamp가 현재 시각보다 뒤이면 그 시각으로 이동합니다. (되돌아가지 않음)
+        """
+        if timestamp > self.now:
+            self.now = float(timestamp)
+
+
+SYSTEM_CLOCK = SystemClock()
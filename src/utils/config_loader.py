@@ -1,33 +1,10 @@
 # src/utils/config_loader.py
 
-import logging
 import os
 import yaml
 
-def get_logger(name: str):
-    """
-    로거 설정 함수.
-
-    Args:
-        name (str): 로거 이름
-
-    Returns:
-        logging.Logger: 설정된 로거 객체
-    """
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
-
-    # 콘솔 핸들러
-    ch = logging.StreamHandler()
-    ch.setLevel(logging.INFO)
-
-    formatter = logging.Formatter('[%(asctime)s] %(name)s - %(levelname)s - %(message)s')
-    ch.setFormatter(formatter)
-
-    # 기존 핸들러가 없는 경우에만 추가
-    if not logger.handlers:
-        logger.addHandler(ch)
-    return logger
+# 로거는 src.utils.logger에서 일괄 설정합니다. (기존 import 경로 호환용)
+from src.utils.logger import get_logger  # noqa: F401
 
 def load_secrets():
     """
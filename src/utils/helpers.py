@@ -0,0 +1,49 @@
+# src/utils/helpers.py
+
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def create_session(pool_size=10, headers=None):
+    """
+    커넥션 풀을 사용하는 requests.Session을 생성합니다.
+    같은 호스트로의 요청은 TCP/TLS 연결을 재사용(keep-alive)합니다.
+
+    Args:
+        pool_size (int): 호스트당 유지할 최대 연결 수
+        headers (dict): 모든 요청에 붙일 기본 헤더
+
+    Returns:
+        requests.Session: 설정된 세션
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+_SHARED_SESSION = None
+_SHARED_SESSION_LOCK = threading.Lock()
+
+
+def get_shared_session(pool_size=20):
+    """
+    프로세스 공용 커넥션 풀 세션을 반환합니다. (처음 호출할 때 생성)
+    연결 풀은 호스트별로 따로 관리되므로 여러 거래소 어댑터가 함께 써도 서로의 연결을 빼앗지 않습니다.
+
+    Args:
+        pool_size (int): 호스트당 유지할 최대 연결 수 (처음 생성할 때만 적용)
+
+    Returns:
+        requests.Session: 공용 세션
+    """
+    global _SHARED_SESSION
+    with _SHARED_SESSION_LOCK:
+        if _SHARED_SESSION is None:
+            _SHARED_SESSION = create_session(pool_size=pool_size)
+        return _SHARED_SESSION
@@ -0,0 +1,148 @@
+# src/utils/logger.py
+# 큐 기반 비동기 로깅: 호출 스레드는 레코드를 큐에 넣기만 하고, 포맷/파일 쓰기는 백그라운드 스레드가 처리
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+
+_listener = None
+_queue_handler = None
+
+CONSOLE_FORMAT = '[%(asctime)s] %(name)s - %(levelname)s - %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    로그 레코드를 JSON 한 줄(JSON Lines)로 직렬화하는 포매터입니다.
+    log_event()로 넘긴 필드는 최상위 키로 들어갑니다.
+    """
+    def format(self, record):
+        event = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            event.update(fields)
+        if record.exc_info:
+            event["exc"] = self.formatException(record.exc_info)
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+
+class _FieldsFormatter(logging.Formatter):
+    """
+    콘솔용 포매터. 구조화 필드를 "key=value" 형태로 메시지 뒤에 붙입니다.
+    """
+    def format(self, record):
+        text = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            text += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return text
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    기본 QueueHandler.prepare()는 호출 스레드에서 메시지를 포맷합니다.
+    여기서는 레코드를 그대로 큐에 넣어 문자열 포맷도 백그라운드 스레드에서 하도록 합니다.
+    (같은 프로세스 안의 큐에만 사용하므로 레코드를 직렬화할 필요가 없습니다.)
+    """
+    def prepare(self, record):
+        return record
+
+
+def setup_logging(level=logging.INFO, log_dir="logs", filename="trading.log",
+                  max_bytes=10 * 1024 * 1024, backup_count=5, console=True):
+    """
+    루트 로거를 큐 기반 비동기 로깅으로 설정합니다. 여러 번 호출하면 이전 설정을 교체합니다.
+
+    - 파일: JSON Lines 형식, 크기 기준 로테이션 (log_dir가 None이면 파일 기록 안 함)
+    - 콘솔: 사람이 읽는 형식 (console=False면 출력 안 함)
+
+    Args:
+        level (int or str): 루트 로거 레벨 (이보다 낮은 레벨은 호출 즉시 버려짐)
+        log_dir (str): 로그 파일 디렉터리
+        filename (str): 로그 파일 이름
+        max_bytes (int): 로테이션 기준 파일 크기
+        backup_count (int): 보관할 이전 파일 수
+        console (bool): 콘솔 출력 여부
+
+    Returns:
+        logging.handlers.QueueListener: 시작된 리스너
+    """
+    global _listener, _queue_handler
+    shutdown_logging()
+
+    handlers = []
+    if log_dir is not None:
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = logging.handlers.RotatingFileHandler(
+            os.path.join(log_dir, filename), maxBytes=max_bytes,
+            backupCount=backup_count, encoding="utf-8",
+        )
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(_FieldsFormatter(CONSOLE_FORMAT))
+        handlers.append(console_handler)
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = _DeferredQueueHandler(log_queue)
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def shutdown_logging():
+    """
+    큐에 남은 레코드를 모두 기록하고 백그라운드 스레드를 멈춥니다.
+    """
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+def get_logger(name: str):
+    """
+    모듈용 로거를 반환합니다. 출력 위치와 레벨은 setup_logging()의 루트 설정을 따릅니다.
+
+    Args:
+        name (str): 로거 이름 (보통 __name__)
+
+    Returns:
+        logging.Logger: 로거 객체
+    """
+    return logging.getLogger(name)
+
+
+def log_event(logger, level, event, **fields):
+    """
+    구조화 이벤트를 기록합니다. 레벨이 꺼져 있으면 아무 작업도 하지 않습니다.
+    필드 값의 문자열 변환은 백그라운드 스레드의 포매터에서 이루어집니다.
+
+    Args:
+        logger (logging.Logger): 로거
+        level (int): 로그 레벨
+        event (str): 이벤트 이름 (예: "order_submitted")
+        **fields: 이벤트에 붙일 필드
+    """
+    if logger.isEnabledFor(level):
+        logger.log(level, event, extra={"fields": fields})
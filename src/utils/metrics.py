@@ -0,0 +1,332 @@
+# src/utils/metrics.py
+# 프로세스 내 지연 시간/카운터 집계와 Prometheus 텍스트 / JSON 스냅샷 내보내기
+import json
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Summary:
+    """
+    하나의 측정 대상(이름 + 라벨)에 대한 지연 시간 집계입니다.
+    누적 횟수/합계/최댓값과 최근 window개의 측정값을 보관하고, 백분위수는 최근 측정값으로 계산합니다.
+    """
+    __slots__ = ("samples", "count", "total", "max")
+
+    def __init__(self, window):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def stats(self):
+        """
+        Returns:
+            dict: {"count", "sum", "avg_ms", "last_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"}
+        """
+        ordered = sorted(self.samples)
+        last = len(ordered) - 1
+        stats = {
+            "count": self.count,
+            "sum": self.total,
+            "avg_ms": self.total / self.count * 1000 if self.count else 0.0,
+            "last_ms": self.samples[-1] * 1000 if self.samples else 0.0,
+            "max_ms": self.max * 1000,
+        }
+        for q in QUANTILES:
+            stats[f"p{round(q * 100)}_ms"] = ordered[int(q * last)] * 1000 if ordered else 0.0
+        return stats
+
+
+class _Timer:
+    __slots__ = ("registry", "name", "labels", "start")
+
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.registry.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join('{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+                    for k, v in pairs)
+    return "{" + body + "}"
+
+
+class MetricsRegistry:
+    """
+    MetricsRegistry는 지연 시간(Summary)과 카운터를 이름/라벨별로 모으는 스레드 안전 저장소입니다.
+
+    enabled가 False이면 observe/inc는 바로 반환하고 time()은 아무것도 하지 않는 공용 객체를 돌려주므로,
+    계측 코드를 그대로 둔 채 비용 없이 끌 수 있습니다.
+    """
+    def __init__(self, enabled=True, window=1000):
+        """
+        Args:
+            enabled (bool): 수집 여부
+            window (int): 백분위수 계산에 사용할 최근 측정값 수 (측정 대상별)
+        """
+        self.enabled = enabled
+        self.window = window
+        self._summaries = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def time(self, name, **labels):
+        """
+        with 블록의 실행 시간을 name 지연 시간으로 기록하는 컨텍스트 매니저를 반환합니다.
+        블록에서 예외가 발생해도 기록합니다.
+
+        Args:
+            name (str): 지표 이름 (예: "live_stage_seconds")
+            **labels: 라벨 (예: stage="signal")
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def observe(self, name, seconds, **labels):
+        """
+        지연 시간(초) 하나를 기록합니다.
+        """
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            summary = self._summaries.get(key)
+            if summary is None:
+                summary = self._summaries[key] = Summary(self.window)
+            summary.observe(seconds)
+
+    def inc(self, name, value=1, **labels):
+        """
+        카운터를 value만큼 증가시킵니다.
+        """
+        if not self.enabled:
+            return
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def reset(self):
+        with self._lock:
+            self._summaries.clear()
+            self._counters.clear()
+
+    def counter(self, name, **labels):
+        """
+        카운터의 현재 값을 반환합니다. 기록된 적 없으면 0.
+        """
+        with self._lock:
+            return self._counters.get(_key(name, labels), 0)
+
+    def summary(self, name, label):
+        """
+        name 지연 시간을 라벨 하나의 값별로 묶어 통계를 반환합니다.
+
+        Args:
+            name (str): 지표 이름
+            label (str): 묶을 라벨 이름 (예: "stage")
+
+        Returns:
+            dict: 라벨 값 -> Summary.stats()
+        """
+        with self._lock:
+            items = [(dict(labels).get(label), s) for (n, labels), s in self._summaries.items() if n == name]
+            return {value: s.stats() for value, s in items}
+
+    def snapshot(self):
+        """
+        모든 지표를 JSON으로 직렬화할 수 있는 형태로 반환합니다.
+
+        Returns:
+            dict: {"ts", "summaries": [{"name", "labels", ...stats}], "counters": [{"name", "labels", "value"}]}
+        """
+        with self._lock:
+            summaries = [dict(name=n, labels=dict(labels), **s.stats())
+                         for (n, labels), s in self._summaries.items()]
+            counters = [{"name": n, "labels": dict(labels), "value": v}
+                        for (n, labels), v in self._counters.items()]
+        return {"ts": time.time(), "summaries": summaries, "counters": counters}
+
+    def render_prometheus(self):
+        """
+        Prometheus 텍스트 형식(0.0.4)으로 지표를 출력합니다.
+        지연 시간은 summary(quantile 0.5/0.95/0.99, _sum, _count), 카운터는 counter 타입입니다.
+
+        Returns:
+            str: 노출 텍스트
+        """
+        with self._lock:
+            summaries = sorted((key, s.stats()) for key, s in self._summaries.items())
+            counters = sorted(self._counters.items())
+        lines = []
+        declared = None
+        for (name, labels), stats in summaries:
+            if name != declared:
+                lines.append(f"# TYPE {name} summary")
+                declared = name
+            for q in QUANTILES:
+                value = stats[f"p{round(q * 100)}_ms"] / 1000
+                lines.append(f"{name}{_format_labels(labels, ('quantile', q))} {value!r}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {stats['sum']!r}")
+            lines.append(f"{name}_count{_format_labels(labels)} {stats['count']}")
+        for (name, labels), value in counters:
+            if name != declared:
+                lines.append(f"# TYPE {name} counter")
+                declared = name
+            lines.append(f"{name}{_format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write_snapshot(self, path):
+        """
+        snapshot()을 JSON 파일로 원자적으로 저장합니다.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+
+REGISTRY = MetricsRegistry(enabled=os.getenv("ALPHAMAIND_METRICS", "1") != "0")
+
+
+def get_registry():
+    """
+    프로세스 공용 MetricsRegistry를 반환합니다. (ALPHAMAIND_METRICS=0이면 꺼진 상태로 시작)
+    """
+    return REGISTRY
+
+
+def set_enabled(enabled):
+    """
+    공용 레지스트리의 수집을 켜거나 끕니다.
+    """
+    REGISTRY.enabled = enabled
+
+
+class SnapshotWriter:
+    """
+    SnapshotWriter는 백그라운드 스레드에서 interval초마다 레지스트리 스냅샷을 JSON 파일로 저장합니다.
+    """
+    def __init__(self, registry, path="logs/metrics.json", interval=10.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="metrics-snapshot", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.registry.write_snapshot(self.path)
+
+    def stop(self):
+        """
+        스레드를 멈추고 마지막 스냅샷을 저장합니다.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.registry.write_snapshot(self.path)
+
+
+class MetricsServer:
+    """
+    MetricsServer는 GET /metrics 요청에 Prometheus 텍스트를 응답하는 로컬 HTTP 서버입니다.
+    """
+    def __init__(self, registry, host="127.0.0.1", port=9100):
+        """
+        Args:
+            registry (MetricsRegistry): 노출할 레지스트리
+            host (str): 바인드 주소 (기본값: 로컬만)
+            port (int): 포트 (0이면 임의 포트)
+        """
+        registry_ = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry_.render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.registry = registry
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.1},
+                                        name="metrics-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
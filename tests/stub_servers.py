@@ -0,0 +1,403 @@
+# tests/stub_servers.py
+# 테스트용 로컬 Upbit/Binance API 대역 서버
+import hashlib
+import hmac
+import json
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def make_upbit_candles(market, start_ms, n, step_ms=60_000, base_price=20000.0):
+    """
+    Upbit 캔들 응답 형식의 행 목록을 오래된 순으로 만듭니다.
+    """
+    rows = []
+    for i in range(n):
+        ts = start_ms + i * step_ms
+        dt = datetime.fromtimestamp(ts / 1000, tz=timezone.utc)
+        price = base_price + i
+        rows.append({
+            "market": market,
+            "candle_date_time_utc": dt.strftime("%Y-%m-%dT%H:%M:%S"),
+            "opening_price": price,
+            "high_price": price + 5,
+            "low_price": price - 5,
+            "trade_price": price,
+            "timestamp": ts + step_ms - 1,
+            "candle_acc_trade_price": price * 2,
+            "candle_acc_trade_volume": 2.0,
+        })
+    return rows
+
+
+def _parse_to(value):
+    dt = datetime.strptime(value, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+    return dt.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+class UpbitStubServer:
+    """
+    Upbit REST API 일부를 흉내 내는 로컬 HTTP 서버입니다.
+
+    - candles: {(market, endpoint_path): 오래된 순 캔들 행 목록}
+    - tickers: {market: 현재가}
+    - orderbooks: {market: /orderbook 응답의 orderbook_units 목록}
+    - accounts: /accounts 응답 목록
+    - fail_after: 이 횟수 이후의 요청은 500으로 응답 (중단 시뮬레이션)
+    - fill_after_polls: 주문이 /order 조회 몇 번 만에 현재가로 체결되는지
+    - fail_next: 다음 요청들에 차례로 보낼 오류 상태 코드 목록 (요청은 처리하지 않음)
+    - retry_after: 설정하면 fail_next로 보내는 429 응답에 이 값을 Retry-After 헤더로 보냄
+    - fail_after_commit: 이 횟수만큼의 주문은 접수한 뒤 500으로 응답 (결과를 알 수 없는 실패)
+    - remaining_sec: 설정하면 모든 응답에 Remaining-Req 헤더로 이 값을 보냄
+    - requests: (method, path, params) 요청 기록, client_ports: 요청별 클라이언트 포트
+    """
+    def __init__(self):
+        self.candles = {}
+        self.tickers = {}
+        self.orderbooks = {}
+        self.accounts = []
+        self.orders = []
+        self.requests = []
+        self.client_ports = []
+        self.auth_headers = []
+        self.fail_after = None
+        self.fail_next = []
+        self.retry_after = None
+        self.fail_after_commit = 0
+        self.remaining_sec = None
+        self.fill_after_polls = 1
+        self.fee_rate = 0.0005
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # 헤더/본문을 따로 보내므로 Nagle + 지연 ACK로 keep-alive 요청마다 ~40ms가 붙지 않도록
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub._dispatch(self, "GET")
+
+            def do_POST(self):
+                stub._dispatch(self, "POST")
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05},
+                                        daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _dispatch(self, handler, method):
+        url = urlparse(handler.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        length = int(handler.headers.get("Content-Length") or 0)
+        if length:
+            handler.rfile.read(length)
+        with self._lock:
+            self.requests.append((method, url.path, params))
+            self.client_ports.append(handler.client_address[1])
+            self.auth_headers.append(handler.headers.get("Authorization"))
+            failing = self.fail_after is not None and len(self.requests) > self.fail_after
+            injected = self.fail_next.pop(0) if self.fail_next else None
+        path = url.path[len("/v1/"):]
+        headers = {}
+        if self.remaining_sec is not None:
+            group = "order" if path == "orders" and method == "POST" else path.split("/")[0]
+            if group not in ("order", "candles", "ticker"):
+                group = "default"
+            headers["Remaining-Req"] = f"group={group}; min=1000; sec={self.remaining_sec}"
+        if injected is not None:
+            if injected == 429 and self.retry_after is not None:
+                headers["Retry-After"] = self.retry_after
+            return self._send(handler, injected, {"error": {"message": "injected failure"}}, headers)
+        if failing:
+            return self._send(handler, 500, {"error": {"message": "stub failure"}}, headers)
+
+        if path.startswith("candles/"):
+            return self._send(handler, 200, self._candles(path, params), headers)
+        if path == "ticker":
+            markets = params["markets"].split(",")
+            return self._send(handler, 200, [
+                {"market": m, "trade_price": self.tickers[m], "timestamp": 0} for m in markets
+            ], headers)
+        if path == "orderbook":
+            markets = params["markets"].split(",")
+            return self._send(handler, 200, [
+                {"market": m, "timestamp": 0, "orderbook_units": self.orderbooks[m]} for m in markets
+            ], headers)
+        if path == "accounts":
+            return self._send(handler, 200, self.accounts, headers)
+        if path == "orders" and method == "POST":
+            with self._lock:
+                if params.get("identifier") and any(o.get("identifier") == params["identifier"] for o in self.orders):
+                    return self._send(handler, 400, {"error": {"name": "duplicate_identifier"}}, headers)
+                order = dict(params, uuid=f"order-{len(self.orders) + 1}", state="wait", polls=0)
+                self.orders.append(order)
+                ambiguous = self.fail_after_commit > 0
+                if ambiguous:
+                    self.fail_after_commit -= 1
+            if ambiguous:
+                return self._send(handler, 500, {"error": {"message": "stub failure after commit"}}, headers)
+            return self._send(handler, 201, order, headers)
+        if path == "order":
+            key = "uuid" if "uuid" in params else "identifier"
+            order = next((o for o in self.orders if o.get(key) == params[key]), None)
+            if order is None:
+                return self._send(handler, 404, {"error": {"message": "order not found"}}, headers)
+            order["polls"] += 1
+            if order["state"] == "wait" and order["polls"] >= self.fill_after_polls:
+                self._fill(order)
+            return self._send(handler, 200, order, headers)
+        return self._send(handler, 404, {"error": {"message": f"unknown path {url.path}"}}, headers)
+
+    def _fill(self, order):
+        price = self.tickers[order["market"]]
+        if order["ord_type"] == "price":
+            funds = float(order["price"])
+            volume = funds / price
+            order["state"] = "cancel"  # 시장가 매수는 잔여 원화 때문에 cancel로 끝남
+        else:
+            volume = float(order["volume"])
+            funds = volume * price
+            order["state"] = "done"
+        order["executed_volume"] = str(volume)
+        order["paid_fee"] = str(funds * self.fee_rate)
+        order["trades"] = [{"price": str(price), "volume": str(volume), "funds": str(funds)}]
+
+    def _candles(self, path, params):
+        rows = self.candles.get((params["market"], path), [])
+        if "to" in params:
+            to = _parse_to(params["to"])
+            rows = [r for r in rows if r["candle_date_time_utc"] < to]
+        count = int(params.get("count", 1))
+        return list(reversed(rows[-count:]))
+
+    @staticmethod
+    def _send(handler, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(data)
+
+
+class BinanceStubServer:
+    """
+    Binance 현물 REST API 일부를 흉내 내는 로컬 HTTP 서버입니다.
+
+    - 서명 요청은 X-MBX-APIKEY 헤더와 쿼리의 HMAC-SHA256 signature를 검사합니다. (틀리면 400, code -1022)
+    - tickers: {심볼: 현재가}, balances: /api/v3/account의 balances 목록, klines: {(심볼, 간격): kline 행 목록}
+    - 시장가 주문은 받는 즉시 현재가로 전부 체결되고, 수수료는 기준 통화로 fee_rate만큼 냅니다.
+      buy_fee_in_base=True면 실제 Binance(BNB 미사용)처럼 매수 수수료를 받은 코인에서 뗍니다.
+    - fail_next / fail_after_commit / requests / client_ports는 UpbitStubServer와 같음
+    - used_weight: 설정하면 모든 응답에 X-MBX-USED-WEIGHT-1M 헤더로 이 값을 보냄
+    """
+    def __init__(self, api_key="bk", secret_key="binance-secret"):
+        self.api_key = api_key
+        self.secret_key = secret_key
+        self.tickers = {}
+        self.balances = []
+        self.klines = {}
+        self.orders = []
+        self.trades = []
+        self.requests = []
+        self.client_ports = []
+        self.fail_next = []
+        self.fail_after_commit = 0
+        self.used_weight = None
+        self.fee_rate = 0.001
+        self.buy_fee_in_base = False
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub._dispatch(self, "GET")
+
+            def do_POST(self):
+                stub._dispatch(self, "POST")
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, kwargs={"poll_interval": 0.05},
+                                        daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _signed(self, handler, query):
+        if handler.headers.get("X-MBX-APIKEY") != self.api_key or "&signature=" not in query:
+            return False
+        payload, signature = query.rsplit("&signature=", 1)
+        expected = hmac.new(self.secret_key.encode("utf-8"), payload.encode("utf-8"), hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature)
+
+    def _dispatch(self, handler, method):
+        url = urlparse(handler.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        length = int(handler.headers.get("Content-Length") or 0)
+        if length:
+            handler.rfile.read(length)
+        with self._lock:
+            self.requests.append((method, url.path, params))
+            self.client_ports.append(handler.client_address[1])
+            injected = self.fail_next.pop(0) if self.fail_next else None
+        headers = {}
+        if self.used_weight is not None:
+            headers["X-MBX-USED-WEIGHT-1M"] = str(self.used_weight)
+        if injected is not None:
+            return UpbitStubServer._send(handler, injected, {"code": -1000, "msg": "injected failure"}, headers)
+
+        path = url.path
+        if path == "/api/v3/ticker/price":
+            symbols = json.loads(params["symbols"])
+            return UpbitStubServer._send(handler, 200, [
+                {"symbol": s, "price": str(self.tickers[s])} for s in symbols if s in self.tickers
+            ], headers)
+        if path == "/api/v3/klines":
+            rows = self.klines.get((params["symbol"], params["interval"]), [])
+            if "endTime" in params:
+                rows = [r for r in rows if r[0] <= int(params["endTime"])]
+            return UpbitStubServer._send(handler, 200, rows[-int(params.get("limit", 500)):], headers)
+
+        if not self._signed(handler, url.query):
+            return UpbitStubServer._send(handler, 400, {"code": -1022, "msg": "Signature is not valid."}, headers)
+        if path == "/api/v3/account":
+            return UpbitStubServer._send(handler, 200, {"balances": self.balances}, headers)
+        if path == "/api/v3/order" and method == "POST":
+            with self._lock:
+                if any(o["clientOrderId"] == params["newClientOrderId"] for o in self.orders):
+                    return UpbitStubServer._send(handler, 400, {"code": -2010, "msg": "Duplicate order sent."},
+                                                 headers)
+                order = self._fill(params)
+                ambiguous = self.fail_after_commit > 0
+                if ambiguous:
+                    self.fail_after_commit -= 1
+            if ambiguous:
+                return UpbitStubServer._send(handler, 500, {"code": -1000, "msg": "stub failure after commit"},
+                                             headers)
+            return UpbitStubServer._send(handler, 200, order, headers)
+        if path == "/api/v3/order":
+            order = next((o for o in self.orders
+                          if str(o["orderId"]) == params.get("orderId")
+                          or o["clientOrderId"] == params.get("origClientOrderId")), None)
+            if order is None:
+                return UpbitStubServer._send(handler, 400, {"code": -2013, "msg": "Order does not exist."},
+                                             headers)
+            return UpbitStubServer._send(handler, 200, {k: v for k, v in order.items() if k != "fills"}, headers)
+        if path == "/api/v3/myTrades":
+            return UpbitStubServer._send(handler, 200, [t for t in self.trades
+                                                        if str(t["orderId"]) == params["orderId"]], headers)
+        return UpbitStubServer._send(handler, 404, {"code": -1, "msg": f"unknown path {path}"}, headers)
+
+    def _fill(self, params):
+        symbol = params["symbol"]
+        price = self.tickers[symbol]
+        if "quoteOrderQty" in params:
+            funds = float(params["quoteOrderQty"])
+            qty = funds / price
+        else:
+            qty = float(params["quantity"])
+            funds = qty * price
+        order_id = len(self.orders) + 1
+        quote = symbol[-4:] if symbol.endswith("USDT") else symbol[-3:]
+        if self.buy_fee_in_base and params["side"] == "BUY":
+            commission, asset = qty * self.fee_rate, symbol[:-len(quote)]
+        else:
+            commission, asset = funds * self.fee_rate, quote
+        fill = {"price": str(price), "qty": str(qty), "commission": str(commission), "commissionAsset": asset}
+        order = {"symbol": symbol, "orderId": order_id, "clientOrderId": params["newClientOrderId"],
+                 "status": "FILLED", "side": params["side"], "type": params["type"],
+                 "executedQty": str(qty), "cummulativeQuoteQty": str(funds), "fills": [fill]}
+        self.orders.append(order)
+        self.trades.append(dict(fill, orderId=order_id))
+        return order
+
+
+class UpbitWebSocketStub:
+    """
+    Upbit 시세 WebSocket을 흉내 내는 로컬 서버입니다.
+    push()로 연결된 모든 클라이언트에 ticker 메시지를 보내고, drop_connections()로 연결을 끊습니다.
+    """
+    def __init__(self):
+        from websockets.sync.server import serve
+
+        self.subscriptions = []
+        self._clients = set()
+        self._lock = threading.Lock()
+        self.server = serve(self._handler, "127.0.0.1", 0)
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"ws://127.0.0.1:{self.server.socket.getsockname()[1]}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+
+    def _handler(self, ws):
+        self.subscriptions.append(json.loads(ws.recv()))
+        with self._lock:
+            self._clients.add(ws)
+        try:
+            ws.wait_closed()
+        finally:
+            with self._lock:
+                self._clients.discard(ws)
+
+    @property
+    def client_count(self):
+        with self._lock:
+            return len(self._clients)
+
+    def push(self, market, price, timestamp=0):
+        message = json.dumps({"type": "ticker", "code": market, "trade_price": price,
+                              "trade_timestamp": timestamp}).encode("utf-8")
+        with self._lock:
+            clients = list(self._clients)
+        for ws in clients:
+            ws.send(message)
+
+    def drop_connections(self):
+        with self._lock:
+            clients = list(self._clients)
+        for ws in clients:
+            ws.close()
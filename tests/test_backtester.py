@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from src.strategies.simple_moving_average import SimpleMovingAverageStrategy
+from src.trading.backtester import Backtester, sma_buy_mask, to_price_array
+
+
+def _random_walk(n, seed=0, start=20000.0, vol=0.01):
+    rng = np.random.default_rng(seed)
+    return start * np.exp(np.cumsum(rng.normal(0, vol, n)))
+
+
+def _assert_same(a, b):
+    np.testing.assert_array_equal(a.fill_index, b.fill_index)
+    np.testing.assert_array_equal(a.fill_side, b.fill_side)
+    np.testing.assert_array_equal(a.fill_reason, b.fill_reason)
+    np.testing.assert_array_equal(a.fill_volume, b.fill_volume)
+    np.testing.assert_array_equal(a.cash_after, b.cash_after)
+    np.testing.assert_array_equal(a.equity, b.equity)
+
+
+def test_sma_buy_mask_matches_strategy():
+    prices = np.round(_random_walk(3000, seed=1), 0)
+    prices[500:700] = prices[500]  # 횡보 구간: 단기/장기 평균이 같아지는 틱
+    strategy = SimpleMovingAverageStrategy(short_window=5, long_window=20)
+    expected = []
+    for p in prices.tolist():
+        strategy.update_price(p)
+        expected.append(strategy.compute_signals() == "BUY")
+    np.testing.assert_array_equal(sma_buy_mask(prices, 5, 20), np.array(expected))
+
+
+@pytest.mark.parametrize("params", [
+    dict(),
+    dict(short_window=3, long_window=10, stop_loss_pct=0.01, take_profit_pct=0.01),
+    dict(initial_cash=60000, fee_rate=0.0),
+    dict(max_coin_holdings=0.5, sell_volume=0.3, stop_loss_pct=0.02, take_profit_pct=0.03),
+])
+def test_vectorized_matches_loop(params):
+    prices = _random_walk(5000, seed=2)
+    bt = Backtester(**params)
+    vec = bt.run(prices, mode="vectorized")
+    ref = bt.run(prices, mode="loop")
+    assert vec.num_trades > 0
+    _assert_same(vec, ref)
+
+
+def test_result_metrics():
+    prices = _random_walk(2000, seed=3)
+    result = Backtester().run(prices)
+    assert result.equity.shape == prices.shape
+    assert result.equity[0] == pytest.approx(1000000)
+    assert 0.0 <= result.max_drawdown < 1.0
+    assert result.total_fees > 0
+    trades = result.trades()
+    assert trades[0]["side"] == "buy" and trades[0]["volume"] == pytest.approx(5250 / trades[0]["price"])
+
+
+def test_to_price_array_accepts_ohlcv():
+    ohlcv = np.arange(20, dtype=float).reshape(4, 5)
+    np.testing.assert_array_equal(to_price_array(ohlcv), [3, 8, 13, 18])
+    np.testing.assert_array_equal(to_price_array({"close": [1, 2]}), [1.0, 2.0])
+
+
+def test_grid_search_parallel_matches_serial():
+    from src.trading.optimizer import grid_search
+
+    prices = _random_walk(3000, seed=4)
+    grid = {"short_window": [3, 5], "long_window": [5, 20], "stop_loss_pct": [0.02, 0.05],
+            "take_profit_pct": [0.03]}
+    serial = grid_search(prices, grid, max_workers=1)
+    parallel = grid_search(prices, grid, max_workers=2)
+    # short_window >= long_window 조합(5, 5)은 제외
+    assert len(serial) == 6
+    assert [r["total_return"] for r in serial] == [r["total_return"] for r in parallel]
+    assert serial[0]["rank"] == 1
+    assert serial[0]["total_return"] >= serial[-1]["total_return"]
+    expected = Backtester(**{k: serial[0][k] for k in grid}).run(prices)
+    assert serial[0]["num_trades"] == expected.num_trades
+
+
+def test_random_search_samples_ranges():
+    from src.trading.optimizer import format_results, random_search
+
+    prices = _random_walk(1000, seed=5)
+    rows = random_search(prices, {"short_window": (2, 5), "long_window": [20, 30],
+                                  "stop_loss_pct": (0.01, 0.1), "take_profit_pct": [0.05]},
+                         n_iter=8, seed=1, max_workers=1, sort_by="max_drawdown")
+    assert len(rows) == 8
+    assert all(2 <= r["short_window"] <= 5 and 0.01 <= r["stop_loss_pct"] <= 0.1 for r in rows)
+    assert [r["max_drawdown"] for r in rows] == sorted(r["max_drawdown"] for r in rows)
+    assert "return%" in format_results(rows)
+
+
+def test_random_search_returns_unique_valid_combinations():
+    from src.trading.optimizer import random_search
+
+    prices = _random_walk(500, seed=6)
+    rows = random_search(prices, {"short_window": [3, 5, 20], "long_window": [5, 20]},
+                         n_iter=10, seed=2, max_workers=1)
+    # 유효한 조합은 (3, 5), (3, 20), (5, 20) 세 개뿐
+    assert sorted((r["short_window"], r["long_window"]) for r in rows) == [(3, 5), (3, 20), (5, 20)]
+
+
+def test_run_sweep_splits_groups_and_keeps_caller_params():
+    from src.trading.optimizer import _group_by_windows, run_sweep
+
+    param_list = [{"stop_loss_pct": sl / 100} for sl in range(1, 9)]
+    groups = _group_by_windows([dict(p, short_window=5, long_window=20) for p in param_list], min_tasks=4)
+    assert len(groups) == 4 and all(len(params) == 2 for _, params in groups)
+
+    prices = _random_walk(500, seed=7)
+    serial = run_sweep(prices, param_list, max_workers=1)
+    parallel = run_sweep(prices, param_list, max_workers=4)
+    assert [r["total_return"] for r in serial] == [r["total_return"] for r in parallel]
+    assert all("short_window" not in p for p in param_list)
+
+
+def test_window_only_sweep_formats_with_default_risk_params():
+    from src.trading.optimizer import format_results, run_sweep
+
+    rows = run_sweep(_random_walk(500, seed=8), [{"short_window": 5, "long_window": 20}], max_workers=1)
+    assert rows[0]["stop_loss_pct"] == 0.05 and rows[0]["take_profit_pct"] == 0.10
+    assert "5.00" in format_results(rows)
@@ -0,0 +1,33 @@
+import json
+
+from benchmarks.run_benchmarks import compare_results, main, run_benchmarks
+
+
+def _results(**values):
+    return {"results": {name: {"value": v, "unit": "x", "higher_is_better": not name.endswith("_us")}
+                        for name, v in values.items()}}
+
+
+def test_compare_flags_regressions_in_both_directions():
+    baseline = _results(ticks=1000.0, call_us=100.0, gone=1.0)
+    current = _results(ticks=700.0, call_us=110.0, new=1.0)
+    rows = {row[0]: row for row in compare_results(current, baseline, threshold=0.2)}
+
+    assert set(rows) == {"ticks", "call_us"}
+    assert rows["ticks"][4] is True
+    assert rows["call_us"][4] is False
+    assert round(rows["call_us"][3], 3) == round(100 / 110 - 1, 3)
+
+
+def test_benchmark_run_saves_json_and_fails_on_regression(tmp_path):
+    results = run_benchmarks(only=["risk", "backtest"], scale=0.01, repeat=1)
+    assert results["results"]["risk.check_exit_conditions"]["value"] > 0
+    assert results["results"]["backtest.vectorized"]["unit"] == "bars/s"
+
+    baseline = tmp_path / "baseline.json"
+    inflated = {"results": {name: dict(r, value=r["value"] * 100) for name, r in results["results"].items()}}
+    baseline.write_text(json.dumps(inflated))
+    output = tmp_path / "out.json"
+    assert main(["--only", "risk", "--scale", "0.01", "--repeat", "1",
+                 "--output", str(output), "--baseline", str(baseline)]) == 1
+    assert "risk.check_exit_conditions" in json.loads(output.read_text())["results"]
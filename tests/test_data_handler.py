@@ -0,0 +1,270 @@
+import threading
+
+import numpy as np
+import pytest
+import requests
+
+from src.data_handler.database import COLUMNS, CandleStore
+from src.data_handler.fetch_data import CandleDownloader
+from src.data_handler.journal import BALANCE, FILL, ORDER, SIGNAL, TradeJournal, pnl_stats, realized_pnl
+from src.data_handler.preprocess import (TimeBarAggregator, VolumeBarAggregator, resample_bars, resample_ticks,
+                                         volume_bars)
+from src.strategies.risk_management import RiskManager
+from src.trading.live_trading import process_tick
+from src.trading.position_manager import PositionManager
+from src.utils.metrics import MetricsRegistry
+from tests.stub_servers import UpbitStubServer, make_upbit_candles
+
+MINUTE = 60_000
+
+
+def _candles(start, n):
+    ts = np.arange(start, start + n * MINUTE, MINUTE, dtype=np.int64)
+    close = 20000.0 + ts / MINUTE
+    return {"timestamp": ts, "open": close, "high": close + 1, "low": close - 1,
+            "close": close, "volume": np.ones(n)}
+
+
+@pytest.fixture
+def store(tmp_path):
+    with CandleStore(str(tmp_path / "candles")) as s:
+        yield s
+
+
+def test_append_deduplicates_and_queries_range(store):
+    assert store.append("KRW-BTC", "minute1", _candles(0, 100)) == 100
+    # 겹치는 구간을 다시 넣으면 새 타임스탬프만 저장
+    assert store.append("KRW-BTC", "minute1", _candles(50 * MINUTE, 100)) == 50
+    assert store.append("KRW-BTC", "minute1", _candles(0, 10)) == 0
+    assert store.count("KRW-BTC", "minute1") == 150
+    assert store.time_range("KRW-BTC", "minute1") == (0, 149 * MINUTE)
+
+    out = store.query("KRW-BTC", "minute1", start=90 * MINUTE, end=110 * MINUTE)
+    np.testing.assert_array_equal(out["timestamp"], np.arange(90, 110) * MINUTE)
+    np.testing.assert_array_equal(out["close"], 20000.0 + np.arange(90, 110))
+    assert store.query("KRW-ETH", "minute1")["close"].size == 0
+
+
+def test_backfill_is_merged_in_order(store):
+    store.append("KRW-BTC", "minute1", _candles(100 * MINUTE, 50))
+    store.append("KRW-BTC", "minute1", _candles(0, 100))  # 과거 방향으로 채움
+    out = store.query("KRW-BTC", "minute1", columns=("close",))
+    assert list(out) == ["close"]
+    assert np.all(np.diff(store.query("KRW-BTC", "minute1")["timestamp"]) == MINUTE)
+
+
+def test_single_segment_query_is_zero_copy(store, tmp_path):
+    store.append("KRW-BTC", "minute1", _candles(0, 60))
+    store.append("KRW-BTC", "minute1", _candles(60 * MINUTE, 60))
+    assert store.compact("KRW-BTC", "minute1") == 120
+    out = store.query("KRW-BTC", "minute1", start=10 * MINUTE, end=20 * MINUTE)
+    assert all(isinstance(out[name], np.memmap) for name in COLUMNS)
+    assert not out["close"].flags.writeable
+
+    # 다시 열어도 인덱스가 유지
+    store.close()
+    with CandleStore(str(tmp_path / "candles")) as reopened:
+        assert reopened.count("KRW-BTC", "minute1") == 120
+        assert reopened.markets() == [("KRW-BTC", "minute1")]
+
+
+def test_compact_does_not_duplicate_concurrent_appends(store):
+    pages = 100
+    store.append("KRW-BTC", "minute1", _candles(0, 10))
+
+    def append_pages():
+        for k in range(1, pages):
+            store.append("KRW-BTC", "minute1", _candles(k * 10 * MINUTE, 10))
+
+    writer = threading.Thread(target=append_pages)
+    writer.start()
+    while writer.is_alive():
+        store.compact("KRW-BTC", "minute1")
+    writer.join()
+    store.compact("KRW-BTC", "minute1")
+
+    # 합치는 도중 추가된 세그먼트가 합친 세그먼트와 원래 세그먼트에 이중으로 남지 않음
+    assert store.count("KRW-BTC", "minute1") == pages * 10
+    np.testing.assert_array_equal(store.query("KRW-BTC", "minute1")["timestamp"], np.arange(pages * 10) * MINUTE)
+
+
+def test_append_accepts_list_of_dicts(store):
+    rows = [{"timestamp": 2, "open": 1, "high": 1, "low": 1, "close": 1, "volume": 0},
+            {"timestamp": 1, "open": 2, "high": 2, "low": 2, "close": 2, "volume": 0},
+            {"timestamp": 2, "open": 3, "high": 3, "low": 3, "close": 3, "volume": 0}]
+    assert store.append("KRW-BTC", "day", rows) == 2
+    np.testing.assert_array_equal(store.query("KRW-BTC", "day")["close"], [2, 1])
+
+
+def test_downloader_pages_backwards_and_resumes(store, tmp_path):
+    start, n = 1_700_000_000_000 - 1_700_000_000_000 % MINUTE, 1000
+    with UpbitStubServer() as server:
+        for market in ("KRW-BTC", "KRW-ETH"):
+            server.candles[(market, "candles/minutes/1")] = make_upbit_candles(market, start, n)
+        end = start + n * MINUTE
+        downloader = CandleDownloader(store, base_url=server.base_url, checkpoint_dir=str(tmp_path / "ckpt"))
+
+        # 3페이지 후 서버 장애 -> 예외, 체크포인트는 받은 곳까지 기록
+        server.fail_after = 3
+        with pytest.raises(requests.HTTPError):
+            downloader.download("KRW-BTC", "minute1", start, end)
+        assert store.count("KRW-BTC", "minute1") == 3 * 200
+        assert not downloader.load_checkpoint("KRW-BTC", "minute1")["done"]
+
+        server.fail_after = None
+        server.requests.clear()
+        results = downloader.download_many(["KRW-BTC", "KRW-ETH"], "minute1", start, end)
+        assert results == {"KRW-BTC": 400, "KRW-ETH": 1000}
+        # 이어받기: KRW-BTC는 남은 2페이지만 요청
+        btc_requests = [r for r in server.requests if r[2]["market"] == "KRW-BTC"]
+        assert len(btc_requests) == 2
+
+    out = store.query("KRW-BTC", "minute1")
+    np.testing.assert_array_equal(out["timestamp"], start + np.arange(n) * MINUTE)
+    np.testing.assert_array_equal(out["close"], 20000.0 + np.arange(n))
+    # 다운로드가 끝나면 페이지별 세그먼트를 합쳐 전 구간 조회가 복사 없는 memmap
+    assert all(isinstance(out[name], np.memmap) for name in COLUMNS)
+    assert downloader.download("KRW-BTC", "minute1", start, end) == 0
+
+
+def _ticks(n, seed=0):
+    rng = np.random.default_rng(seed)
+    steps = rng.integers(0, 20000, n)
+    steps[::500] += 5 * MINUTE  # 간헐적으로 몇 분씩 빈 구간
+    ts = 1700000000000 + np.cumsum(steps)
+    prices = 50000000.0 * np.exp(np.cumsum(rng.normal(0.0, 1e-3, n)))
+    return ts, prices, rng.exponential(0.01, n)
+
+
+def _stream(aggregator, ts, prices, volumes):
+    bars = []
+    for t, p, v in zip(ts.tolist(), prices.tolist(), volumes.tolist()):
+        bars += aggregator.update(t, p, v)
+    bars += aggregator.flush()
+    return {name: np.array([b[name] for b in bars]) for name in COLUMNS}
+
+
+@pytest.mark.parametrize("fill_gaps", [True, False])
+def test_streaming_time_bars_match_batch_resample(fill_gaps):
+    ts, prices, volumes = _ticks(5000)
+    streamed = _stream(TimeBarAggregator(MINUTE, fill_gaps=fill_gaps), ts, prices, volumes)
+    batch = resample_ticks(ts, prices, volumes, MINUTE, fill_gaps=fill_gaps)
+    for name in COLUMNS:
+        np.testing.assert_array_equal(streamed[name], batch[name])
+    assert np.all(np.diff(batch["timestamp"]) == MINUTE) == fill_gaps
+
+
+def test_late_ticks_merge_within_lateness_and_drop_after():
+    emitted = []
+    agg = TimeBarAggregator(MINUTE, allowed_lateness_ms=10_000, on_bar=emitted.append)
+    assert agg.update(0, 100.0, 1.0) == []
+    assert agg.update(MINUTE + 5_000, 105.0, 1.0) == []   # 워터마크가 아직 봉 끝 + 10초 전
+    assert agg.update(30_000, 90.0, 1.0) == []            # 늦었지만 허용 범위: 첫 봉에 합쳐짐
+    bars = agg.update(MINUTE + 10_000, 106.0, 1.0)
+    assert bars == [{"timestamp": 0, "open": 100.0, "high": 100.0, "low": 90.0, "close": 90.0, "volume": 2.0}]
+    assert agg.update(50_000, 80.0, 1.0) == []            # 이미 확정된 봉: 버림
+    assert agg.late_ticks == 1
+    assert agg.flush()[0]["close"] == 106.0
+    assert len(emitted) == 2
+
+
+def test_volume_bars_and_bar_resampling():
+    ts, prices, volumes = _ticks(5000, seed=1)
+    streamed = _stream(VolumeBarAggregator(0.5), ts, prices, volumes)
+    batch = volume_bars(ts, prices, volumes, 0.5)
+    for name in COLUMNS:
+        np.testing.assert_array_equal(streamed[name], batch[name])
+    assert np.all(batch["volume"][:-1] >= 0.5 - volumes.max())
+
+    five = resample_bars(resample_ticks(ts, prices, volumes, MINUTE, fill_gaps=False), 5 * MINUTE)
+    direct = resample_ticks(ts, prices, volumes, 5 * MINUTE)
+    for name in ("timestamp", "open", "high", "low", "close"):
+        np.testing.assert_array_equal(five[name], direct[name])
+    np.testing.assert_allclose(five["volume"], direct["volume"])
+
+
+def _loop_realized_pnl(side, price, volume, fee):
+    pos = basis = 0.0
+    out = []
+    for s, p, v, f in zip(side, price, volume, fee):
+        if s > 0:
+            pos += v
+            basis += p * v + f
+            out.append(0.0)
+        elif pos <= 0:
+            out.append(np.nan)
+        else:
+            frac = min(v / pos, 1.0)
+            out.append(p * v - f - basis * frac)
+            basis *= 1.0 - frac
+            pos = max(pos - v, 0.0)
+    return np.array(out)
+
+
+def test_realized_pnl_matches_average_cost_loop():
+    rng = np.random.default_rng(5)
+    n = 5000
+    side = np.where(rng.random(n) < 0.55, 1, -1)
+    side[0] = -1  # 기록 이전 보유분 매도: 원가를 모름
+    price = 100.0 + np.cumsum(rng.normal(0, 0.5, n))
+    volume = rng.uniform(0.001, 0.01, n)
+    fee = price * volume * 0.0005
+
+    expected = _loop_realized_pnl(side, price, volume, fee)
+    np.testing.assert_allclose(realized_pnl(side, price, volume, fee), expected, rtol=1e-9, atol=1e-9)
+
+    stats = pnl_stats(side, price, volume, fee)
+    closed = expected[(side < 0) & ~np.isnan(expected)]
+    assert stats["realized_pnl"] == pytest.approx(closed.sum())
+    assert stats["win_rate"] == pytest.approx((closed > 0).mean())
+    assert stats["total_fees"] == pytest.approx(fee.sum())
+
+
+def test_journal_batches_writes_and_reports_stats(tmp_path):
+    class Flip:
+        signal = "SELL"
+
+        def update_price(self, price):
+            pass
+
+        def compute_signals(self):
+            self.signal = "BUY" if self.signal == "SELL" else "SELL"
+            return self.signal
+
+    class Exchange:
+        orders = 0
+
+        def get_accounts(self):
+            return [{"currency": "KRW", "balance": "1000000.0"}]
+
+        def place_order(self, market, side, volume=None, price=None):
+            self.orders += 1
+            volume = volume if volume is not None else price / self.price
+            return {"uuid": f"order-{self.orders}", "market": market, "state": "done",
+                    "executed_volume": str(volume), "paid_fee": "0",
+                    "trades": [{"price": str(self.price), "volume": str(volume), "funds": str(volume * self.price)}]}
+
+    exchange = Exchange()
+    with TradeJournal(str(tmp_path / "journal.sqlite3"), flush_interval=60.0) as journal:
+        positions = PositionManager(exchange, reconcile_interval=None, journal=journal)
+        strategy, risk = Flip(), RiskManager(stop_loss_pct=0.5, take_profit_pct=0.5)
+        for price in (50000000.0, 52000000.0, 50000000.0, 49000000.0):
+            exchange.price = price
+            process_tick(exchange, strategy, positions, risk, "KRW-BTC", price, metrics=MetricsRegistry(),
+                         journal=journal)
+        assert journal.count() == 0  # 아직 큐에만 있음 (flush_interval 전)
+        assert journal.flush(timeout=5)
+        assert [journal.count(kind) for kind in (SIGNAL, ORDER, FILL, BALANCE)] == [4, 4, 4, 5]
+
+        fills = journal.fills("KRW-BTC")
+        assert fills["side"].tolist() == [1, -1, 1, -1]
+        stats = journal.stats("KRW-BTC")
+        assert stats["num_sells"] == 2 and stats["win_rate"] == 0.5
+        expected = 5250 * 52 / 50 + 5250 * 49 / 50 - 2 * 5250
+        assert stats["realized_pnl"] == pytest.approx(expected, rel=1e-9)
+        assert stats["final_equity"] == pytest.approx(positions.cash_balance
+                                                      + positions.coin_balance * 49000000.0)
+        assert stats["max_drawdown"] > 0
+        journal.record_signal("KRW-BTC", "HOLD", 1.0)
+    with TradeJournal(str(tmp_path / "journal.sqlite3")) as reopened:
+        assert reopened.count(SIGNAL) == 5  # close()가 남은 행을 씀
@@ -0,0 +1,379 @@
+import logging
+
+import jwt
+import pytest
+import requests
+
+from src.exchange_apis.binance_api import BinanceAPI, ticker_price_weight
+from src.exchange_apis.mock_exchange_api import MockExchangeAPI, SimulatedExchangeError
+from src.exchange_apis.orderbook import OrderBookCache, SlippageEstimator
+from src.exchange_apis.rate_limit import (BinanceRateLimitController, RateLimitController, RetryPolicy, TokenBucket,
+                                          parse_remaining_req)
+from src.exchange_apis.upbit_api import UpbitAPI
+from src.strategies.risk_management import RiskManager
+from src.trading.order_executor import OrderExecutor, fill_from_order
+from src.trading.position_manager import PositionManager
+from src.utils.clock import SimulatedClock
+from src.utils.metrics import MetricsRegistry
+from tests.stub_servers import BinanceStubServer, UpbitStubServer
+
+SECRET = "test-secret-key-0123456789abcdef"
+
+
+@pytest.fixture
+def server():
+    with UpbitStubServer() as s:
+        s.tickers = {"KRW-BTC": 50000000.0}
+        s.accounts = [{"currency": "KRW", "balance": "100000.0"},
+                      {"currency": "BTC", "balance": "0.5"}]
+        yield s
+
+
+@pytest.fixture
+def api(server):
+    client = UpbitAPI(access_key="ak", secret_key=SECRET, base_url=server.base_url,
+                     metrics=MetricsRegistry())
+    yield client
+    client.close()
+
+
+def test_requests_reuse_one_connection(api, server):
+    for _ in range(5):
+        assert api.get_current_price("KRW-BTC") == 50000000.0
+    assert api.get_balance("btc") == 0.5
+    assert api.get_balance("ETH") == 0.0
+    assert len(set(server.client_ports)) == 1
+
+    stats = api.latency_stats()
+    assert stats["GET /ticker"]["count"] == 5
+    assert stats["GET /accounts"]["count"] == 2
+    assert stats["GET /ticker"]["p95_ms"] >= stats["GET /ticker"]["p50_ms"] > 0
+
+
+def test_place_order_signs_query(api, server):
+    result = api.place_order("KRW-BTC", "buy", price=5250)
+    assert result["side"] == "bid" and result["ord_type"] == "price" and result["price"] == "5250"
+    token = server.auth_headers[-1].split(" ", 1)[1]
+    payload = jwt.decode(token, SECRET, algorithms=["HS256"])
+    assert payload["access_key"] == "ak" and payload["query_hash_alg"] == "SHA512"
+    with pytest.raises(ValueError):
+        api.place_order("KRW-BTC", "sell")
+
+
+def test_debug_logging_is_opt_in_and_hides_token(server, caplog):
+    caplog.set_level(logging.DEBUG, logger="src.exchange_apis.upbit_api")
+    quiet = UpbitAPI(access_key="ak", secret_key=SECRET, base_url=server.base_url)
+    quiet.get_balance("KRW")
+    assert not caplog.records
+
+    verbose = UpbitAPI(access_key="ak", secret_key=SECRET, base_url=server.base_url, debug=True)
+    verbose.get_balance("KRW")
+    assert caplog.records
+    assert all("Bearer" not in r.getMessage() for r in caplog.records)
+
+
+def test_get_current_prices_uses_one_request(api, server):
+    server.tickers["KRW-ETH"] = 3000000.0
+    assert api.get_current_prices(["KRW-BTC", "KRW-ETH"]) == {"KRW-BTC": 50000000.0,
+                                                              "KRW-ETH": 3000000.0}
+    assert server.requests[-1][2] == {"markets": "KRW-BTC,KRW-ETH"}
+    assert len(server.requests) == 1
+
+
+
+def _resilient_api(server, **kwargs):
+    return UpbitAPI(access_key="ak", secret_key=SECRET, base_url=server.base_url, metrics=MetricsRegistry(),
+                    retry=RetryPolicy(max_retries=3, base_delay=0.01, seed=0), **kwargs)
+
+
+def test_token_bucket_follows_remaining_req_header():
+    assert parse_remaining_req("group=default; min=1800; sec=29") == ("default", 29)
+    assert parse_remaining_req("garbage") is None
+
+    clock = SimulatedClock()
+    bucket = TokenBucket(10, clock=clock)
+    for _ in range(10):
+        assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(0.1)
+
+    # 다른 클라이언트가 예산을 다 써서 서버가 남은 요청 0을 알려오면 창 하나만큼 멈춤
+    bucket.sync(0)
+    assert bucket.acquire() == pytest.approx(1.0)
+    bucket.pause(0.5)
+    assert bucket.acquire() == pytest.approx(0.5)
+
+
+def test_retries_transient_errors_and_shares_rate_limit(server):
+    controller = RateLimitController(clock=SimulatedClock())
+    api = _resilient_api(server, rate_limiter=controller)
+    other = _resilient_api(server, rate_limiter=controller)
+
+    server.fail_next = [503, 429]
+    server.remaining_sec = 3
+    assert api.get_current_price("KRW-BTC") == 50000000.0
+    assert len(server.requests) == 3
+    assert api.metrics.counter("upbit_request_retries_total", endpoint="GET /ticker") == 2
+    # 응답 헤더로 실제 그룹을 배우고, 같은 컨트롤러를 쓰는 다른 인스턴스도 남은 예산에 맞춰 기다림
+    assert controller.group_for("GET", "/ticker") == "ticker"
+    assert controller.bucket("ticker").tokens <= 3
+    other.get_current_price("KRW-BTC")
+
+    server.fail_next = [503] * 4
+    with pytest.raises(requests.HTTPError):
+        api.get_current_price("KRW-BTC")
+    api.close()
+    other.close()
+
+
+def test_retry_after_accepts_http_date_and_falls_back_on_garbage(server):
+    # HTTP 날짜는 transport 시계 기준으로 해석하고, 대기는 속도 제한 버킷이 함
+    limiter_clock = SimulatedClock()
+    api = _resilient_api(server, rate_limiter=RateLimitController(clock=limiter_clock),
+                         clock=SimulatedClock(start=1445412480.0))  # Wed, 21 Oct 2015 07:28:00 GMT
+
+    server.fail_next = [429]
+    server.retry_after = "Wed, 21 Oct 2015 07:28:30 GMT"
+    assert api.get_current_price("KRW-BTC") == 50000000.0
+    assert limiter_clock.now == pytest.approx(30)
+
+    # 해석할 수 없는 값은 무시하고 백오프 지연만큼 기다림
+    server.fail_next = [429]
+    server.retry_after = "soon"
+    assert api.get_current_price("KRW-BTC") == 50000000.0
+    assert 30 <= limiter_clock.now < 31
+    assert len(server.requests) == 4
+    api.close()
+
+
+def test_place_order_is_safe_to_retry(server):
+    api = _resilient_api(server, rate_limiter=RateLimitController(enabled=False))
+
+    # 접수 후 500 -> identifier로 조회해 이미 접수된 주문을 반환 (중복 주문 없음)
+    server.fail_after_commit = 1
+    result = api.place_order("KRW-BTC", "buy", price=5250, identifier="order-a")
+    assert result["identifier"] == "order-a" and len(server.orders) == 1
+    assert [r[1] for r in server.requests] == ["/v1/orders", "/v1/order"]
+
+    # 접수 전 실패(429, 503) -> 조회에 없으면 같은 identifier로 다시 보냄
+    server.requests.clear()
+    server.fail_next = [429, 503]
+    result = api.place_order("KRW-BTC", "sell", volume=0.001)
+    assert len(server.orders) == 2 and result["identifier"].startswith("amp-")
+    assert [r[1] for r in server.requests] == ["/v1/orders", "/v1/orders", "/v1/order", "/v1/orders"]
+    assert len({r[2]["identifier"] for r in server.requests}) == 1
+
+    # 400 같은 요청 오류는 다시 보내지 않음
+    server.requests.clear()
+    with pytest.raises(requests.HTTPError):
+        api.place_order("KRW-BTC", "buy", price=5250, identifier="order-a")
+    assert len(server.requests) == 1
+    api.close()
+
+
+@pytest.fixture
+def binance():
+    with BinanceStubServer() as s:
+        s.tickers = {"BTCUSDT": 60000.0, "ETHUSDT": 3000.0}
+        s.balances = [{"asset": "USDT", "free": "1000.0", "locked": "0.0"},
+                      {"asset": "BTC", "free": "0.01", "locked": "0.002"}]
+        yield s
+
+
+def _binance_api(server, secret_key=None, **kwargs):
+    return BinanceAPI(api_key=server.api_key, secret_key=secret_key or server.secret_key, base_url=server.base_url,
+                      metrics=MetricsRegistry(), rate_limiter=BinanceRateLimitController(enabled=False),
+                      retry=RetryPolicy(max_retries=3, base_delay=0.01, seed=0), **kwargs)
+
+
+def test_binance_adapter_speaks_upbit_formats(binance):
+    api = _binance_api(binance)
+    assert api.get_current_prices(["USDT-BTC", "USDT-ETH"]) == {"USDT-BTC": 60000.0, "USDT-ETH": 3000.0}
+    assert binance.requests[-1][2] == {"symbols": '["BTCUSDT","ETHUSDT"]'}
+    assert api.get_balance("btc") == 0.01 and api.get_balance("ETH") == 0.0
+    assert api.get_accounts()[1] == {"currency": "BTC", "balance": "0.01", "locked": "0.002", "avg_buy_price": "0"}
+
+    # 시장가 매수는 즉시 체결된 Upbit 형식 주문으로 돌아오므로 OrderExecutor가 따로 조회하지 않음
+    order = api.place_order("USDT-BTC", "buy", price=30, identifier="order-a")
+    assert binance.requests[-1][2]["quoteOrderQty"] == "30"
+    assert order["state"] == "done" and order["side"] == "bid" and order["identifier"] == "order-a"
+    assert float(order["trades"][0]["volume"]) == pytest.approx(30 / 60000.0)
+    assert float(order["paid_fee"]) == pytest.approx(0.03)
+    # 주문 조회는 체결 내역을 myTrades로 채움
+    assert api.get_order(order["uuid"])["trades"] == order["trades"]
+    assert binance.requests[-1][1] == "/api/v3/myTrades"
+    assert api.latency_stats()["POST /api/v3/order"]["count"] == 1
+
+    binance.klines[("BTCUSDT", "1m")] = [[60000 * i, "1", "2", "0.5", str(i), "3"] for i in range(5)]
+    candles = api.get_candles("USDT-BTC", count=2, to=60000 * 4)
+    assert [c["close"] for c in candles] == [2.0, 3.0] and candles[0]["timestamp"] == 120000
+
+    forged = _binance_api(binance, secret_key="wrong-secret")
+    with pytest.raises(requests.HTTPError):
+        forged.get_accounts()
+
+
+def test_binance_base_asset_commission_reduces_volume_not_cash(binance):
+    binance.buy_fee_in_base = True
+    api = _binance_api(binance)
+    order = api.place_order("USDT-BTC", "buy", price=30, identifier="order-fee")
+    # Binance가 받은 코인에서 수수료를 떼므로 수량은 순수량, 기준 통화 수수료는 없음
+    net = 30 / 60000.0 * (1 - 0.001)
+    assert float(order["executed_volume"]) == pytest.approx(net)
+    assert float(order["trades"][0]["volume"]) == pytest.approx(net) and float(order["paid_fee"]) == 0.0
+    fill = fill_from_order(order, "buy")
+    assert fill.volume * fill.avg_price == pytest.approx(30.0) and fill.fee == 0.0
+
+    # 매도 수수료는 기준 통화로 내므로 paid_fee
+    sell = api.place_order("USDT-BTC", "sell", volume=0.0001, identifier="order-fee-sell")
+    assert float(sell["executed_volume"]) == pytest.approx(0.0001)
+    assert float(sell["paid_fee"]) == pytest.approx(0.0001 * 60000.0 * 0.001)
+
+
+def test_binance_get_order_after_restart_and_ticker_weight(binance):
+    order = _binance_api(binance).place_order("USDT-BTC", "buy", price=30, identifier="order-r")
+    # 재시작한 인스턴스는 주문 기록이 없으므로 시장을 받아 origClientOrderId로 조회
+    restarted = _binance_api(binance)
+    with pytest.raises(ValueError):
+        restarted.get_order(identifier="order-r")
+    found = restarted.get_order(identifier="order-r", market="USDT-BTC")
+    assert found["uuid"] == order["uuid"] and found["trades"] == order["trades"]
+    assert binance.requests[-2][2]["origClientOrderId"] == "order-r"
+    assert restarted.get_order(order["uuid"])["state"] == "done"
+
+    assert [ticker_price_weight(n) for n in (1, 20, 21, 100, 101)] == [2, 2, 40, 40, 80]
+
+
+def test_binance_order_is_safe_to_retry_and_weighs_requests(binance):
+    clock = SimulatedClock()
+    controller = BinanceRateLimitController(limits={"weight": (100, 60.0), "orders": (5, 10.0)}, clock=clock)
+    api = _binance_api(binance, clock=clock)
+    api.rate_limiter = api.transport.rate_limiter = controller
+
+    # 접수 후 500 -> origClientOrderId로 조회해 이미 접수된 주문을 반환
+    binance.fail_after_commit = 1
+    order = api.place_order("USDT-BTC", "sell", volume=0.001, identifier="order-b")
+    assert order["state"] == "done" and len(binance.orders) == 1 and order["trades"]
+    assert [r[1] for r in binance.requests] == ["/api/v3/order", "/api/v3/order", "/api/v3/myTrades"]
+    assert binance.requests[1][2]["origClientOrderId"] == "order-b"
+
+    # 가중치만큼 토큰을 쓰고, 서버가 센 사용량 헤더에 맞춰 남은 토큰을 줄임
+    binance.used_weight = 96
+    start = clock.monotonic()
+    api.get_current_prices(["USDT-BTC"])
+    assert controller.bucket("weight").tokens <= 4
+    api.get_accounts()  # 가중치 20 -> 16개가 모자라 기다림
+    assert clock.monotonic() - start == pytest.approx(16 * 60.0 / 100, rel=1e-3)
+
+    bucket = TokenBucket(1.0, burst=10, clock=SimulatedClock())
+    assert bucket.acquire(10) == 0.0
+    assert bucket.acquire(4) == pytest.approx(4.0)
+
+
+def test_simulated_exchange_walks_depth_and_charges_fees():
+    clock = SimulatedClock(1000.0)
+    exchange = MockExchangeAPI(initial_cash=10000000.0, clock=clock, level_volume=0.01, latency=0.05)
+    exchange.set_price("KRW-BTC", 50000000.0)
+    book = exchange.get_orderbook("KRW-BTC")["orderbook_units"]
+    assert book[0]["ask_price"] == 50001000.0 and book[0]["bid_price"] == 49999000.0
+    assert clock.time() == pytest.approx(1000.05)
+
+    order = exchange.place_order("KRW-BTC", "buy", price=2000000)
+    assert order["state"] == "done" and order["trades_count"] > 1
+    volume = float(order["executed_volume"])
+    assert order["price_executed"] > book[0]["ask_price"]
+    assert order["slippage_bps"] > 0
+    assert float(order["paid_fee"]) == pytest.approx(2000000 * 0.0005)
+    assert exchange.get_balance("KRW") == pytest.approx(10000000.0 - 2000000 * 1.0005)
+    assert exchange.get_order(order["uuid"])["trades"] == order["trades"]
+
+    # 같은 가격에서의 다음 주문은 이미 소진된 호가 뒤에서 체결
+    second = exchange.place_order("KRW-BTC", "buy", price=10000)
+    assert float(second["trades"][0]["price"]) >= float(order["trades"][-1]["price"])
+
+    with pytest.raises(SimulatedExchangeError) as err:
+        exchange.place_order("KRW-BTC", "buy", price=4000)
+    assert err.value.name == "under_min_total_bid"
+    with pytest.raises(SimulatedExchangeError) as err:
+        exchange.place_order("KRW-BTC", "sell", volume=volume * 10)
+    assert err.value.name == "insufficient_funds_ask"
+
+    sold = exchange.place_order("KRW-BTC", "sell", volume=volume)
+    assert sold["price_executed"] < 50000000.0
+    assert exchange.slippage_stats()["count"] == 3
+
+
+def test_simulated_orderbook_does_not_advance_the_price():
+    exchange = MockExchangeAPI(initial_cash=10000000.0, latency=0.0)
+    price = exchange.get_current_price("KRW-BTC")
+    for _ in range(3):
+        units = exchange.get_orderbook("KRW-BTC")["orderbook_units"]
+        assert units[0]["bid_price"] < price < units[0]["ask_price"]
+    exchange.place_order("KRW-BTC", "buy", price=10000)
+    assert exchange.get_current_price("KRW-BTC") == price + 10
+
+
+def test_simulated_exchange_drives_position_manager_and_executor():
+    exchange = MockExchangeAPI(initial_cash=1000000.0)
+    exchange.set_price("KRW-BTC", 50000000.0)
+    positions = PositionManager(exchange, reconcile_interval=None)
+    risk = RiskManager()
+
+    executor = OrderExecutor(exchange, poll_interval=0.01)
+    try:
+        executor.submit("KRW-BTC", "buy", price=5250).result(timeout=5)
+        executor.apply_fills(positions, risk)
+    finally:
+        executor.shutdown()
+
+    assert positions.coin_balance == pytest.approx(exchange.get_balance("BTC"))
+    assert positions.cash_balance == pytest.approx(exchange.get_balance("KRW"))
+    assert risk.entry_price == pytest.approx(exchange.orders[0]["price_executed"])
+    positions.update_balances(force=True)
+    assert positions.mismatches == 0
+
+
+def test_slippage_estimate_matches_simulated_fill():
+    exchange = MockExchangeAPI(initial_cash=10000000.0, level_volume=0.01)
+    exchange.set_price("KRW-BTC", 50000000.0)
+    estimator = SlippageEstimator(OrderBookCache(exchange, ttl=60.0))
+
+    estimate = estimator.estimate("KRW-BTC", "buy", funds=2000000)
+    order = exchange.place_order("KRW-BTC", "buy", price=2000000)
+    assert estimate.filled and estimate.levels == order["trades_count"]
+    assert estimate.volume == pytest.approx(float(order["executed_volume"]))
+    assert estimate.avg_price == pytest.approx(order["price_executed"])
+    assert estimate.slippage_bps > 0
+
+    # 한도 안으로 줄인 주문은 예상 슬리피지가 한도를 넘지 않음
+    snapshot = estimator.cache.get("KRW-BTC")
+    for side in ("buy", "sell"):
+        size = snapshot.max_order(side, 1.0)
+        kwargs = {"funds": size} if side == "buy" else {"volume": size}
+        assert 0 < size and snapshot.estimate(side, **kwargs).slippage_bps == pytest.approx(1.0)
+    funds, sized = estimator.size_buy("KRW-BTC", 2000000, max_slippage_bps=0.5)
+    assert funds < 2000000 and sized.slippage_bps <= 0.5 + 1e-9
+    assert estimator.size_buy("KRW-BTC", 5000, max_slippage_bps=50.0)[0] == 5000
+
+
+def test_orderbook_cache_reuses_snapshots_and_batches_refresh(server):
+    server.orderbooks = {
+        m: [{"ask_price": p + 1000, "bid_price": p - 1000, "ask_size": 0.1, "bid_size": 0.2}]
+        for m, p in (("KRW-BTC", 50000000.0), ("KRW-ETH", 3000000.0))
+    }
+    clock = SimulatedClock(0.0)
+    client = UpbitAPI(access_key="ak", secret_key=SECRET, base_url=server.base_url,
+                      rate_limiter=RateLimitController(enabled=False))
+    try:
+        cache = OrderBookCache(client, ttl=1.0, clock=clock)
+        assert cache.prefetch(["KRW-BTC", "KRW-ETH"]) == 2
+        assert cache.get("KRW-ETH").mid == 3000000.0
+        assert cache.get("KRW-BTC").spread_bps == pytest.approx(0.4)
+        assert cache.prefetch(["KRW-BTC", "KRW-ETH"]) == 0
+        clock.sleep(1.5)
+        cache.get("KRW-BTC")
+    finally:
+        client.close()
+
+    orderbook_requests = [r for r in server.requests if r[1] == "/v1/orderbook"]
+    assert [r[2]["markets"] for r in orderbook_requests] == ["KRW-BTC,KRW-ETH", "KRW-BTC"]
+    assert (cache.hits, cache.misses) == (2, 3)
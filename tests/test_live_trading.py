@@ -0,0 +1,617 @@
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from src.data_handler.database import CandleStore
+from src.data_handler.fetch_data import CandleDownloader, parse_candles
+from src.exchange_apis.binance_api import BinanceAPI
+from src.exchange_apis.mock_exchange_api import MockExchangeAPI
+from src.exchange_apis.orderbook import OrderBookCache, SlippageEstimator
+from src.exchange_apis.rate_limit import BinanceRateLimitController, RateLimitController
+from src.exchange_apis.upbit_api import UpbitAPI
+from src.exchange_apis.upbit_websocket import UpbitTickerStream
+from src.strategies.breakout import BreakoutStrategy, breakout_signals
+from src.strategies.risk_management import PortfolioRiskManager, RiskManager
+from src.strategies.simple_moving_average import SimpleMovingAverageStrategy
+from src.trading.live_trading import STAGE_METRIC, process_tick, run_live_trading
+from src.trading.multi_market import MarketSlot, run_multi_market, run_tick
+from src.trading.order_executor import OrderExecutor
+from src.trading.position_manager import AccountSnapshot, PositionManager
+from src.trading.price_source import ReplayPriceSource, StreamingPriceSource
+from src.trading.replay import run_replay
+from src.trading.warm_start import StateCheckpoint, recent_closes, warm_start
+from src.utils.clock import SimulatedClock
+from src.utils.metrics import MetricsRegistry
+from tests.stub_servers import BinanceStubServer, UpbitStubServer, UpbitWebSocketStub, make_upbit_candles
+
+
+class _RestExchange:
+    def __init__(self, price):
+        self.price = price
+        self.calls = 0
+
+    def get_current_price(self, symbol):
+        self.calls += 1
+        return self.price
+
+
+def _wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_streaming_price_source_reacts_to_pushes_and_reconnects():
+    with UpbitWebSocketStub() as server:
+        stream = UpbitTickerStream(["KRW-BTC"], url=server.url, reconnect_delay=0.05)
+        with stream:
+            assert _wait_until(lambda: server.client_count == 1)
+            assert server.subscriptions[0][1] == {"type": "ticker", "codes": ["KRW-BTC"]}
+
+            rest = _RestExchange(1.0)
+            source = StreamingPriceSource(stream, "KRW-BTC", exchange=rest, interval=5)
+            server.push("KRW-BTC", 50000000.0)
+            started = time.monotonic()
+            source.wait()
+            assert time.monotonic() - started < 1.0
+            assert source.get_price() == 50000000.0
+
+            # 같은 시세는 다시 깨우지 않음: interval 동안 대기 후 반환
+            source.interval = 0.1
+            started = time.monotonic()
+            source.wait()
+            assert time.monotonic() - started >= 0.1
+
+            # 연결이 끊기면 백오프 후 재연결하고 다시 구독
+            server.drop_connections()
+            assert _wait_until(lambda: stream.connections == 2 and server.client_count == 1)
+            assert len(server.subscriptions) == 2
+            server.push("KRW-BTC", 50100000.0)
+            source.interval = 5
+            source.wait()
+            assert source.get_price() == 50100000.0
+            assert rest.calls == 0
+
+
+def test_streaming_price_source_falls_back_to_rest():
+    stream = UpbitTickerStream(["KRW-BTC"], url="ws://127.0.0.1:9")
+    rest = _RestExchange(123.0)
+    source = StreamingPriceSource(stream, "KRW-BTC", exchange=rest, interval=0.01)
+    source.wait()
+    assert source.get_price() == 123.0
+    assert source.fallbacks == 1
+
+
+class _BatchExchange:
+    def __init__(self, prices):
+        self.prices = prices
+        self.ticker_calls = 0
+        self.orders = []
+
+    def get_current_prices(self, markets):
+        self.ticker_calls += 1
+        return {m: self.prices[m] for m in markets if m in self.prices}
+
+    def place_order(self, market, side, volume=None, price=None):
+        # 시장가 주문은 현재가로 바로 전부 체결
+        self.orders.append((market, side, volume, price))
+        volume = volume if volume is not None else price / self.prices[market]
+        funds = volume * self.prices[market]
+        return {"uuid": str(len(self.orders)), "market": market, "state": "done", "executed_volume": str(volume),
+                "paid_fee": "0", "trades": [{"price": str(self.prices[market]), "volume": str(volume),
+                                             "funds": str(funds)}]}
+
+
+class _Positions:
+    def __init__(self):
+        self.cash_balance = 1000000.0
+        self.coin_balance = 0.0
+        self.syncs = 0
+        self.needs_reconcile = False
+
+    def execute_order(self, side, price, quantity, fee=0.0):
+        sign = 1 if side == "buy" else -1
+        self.cash_balance -= sign * price * quantity + fee
+        self.coin_balance += sign * quantity
+        return True
+
+    def mark_mismatch(self):
+        self.needs_reconcile = True
+
+    def update_balances(self):
+        self.syncs += 1
+
+
+class _AlwaysBuy:
+    def update_price(self, price):
+        pass
+
+    def compute_signals(self):
+        return "BUY"
+
+
+class _Broken(_AlwaysBuy):
+    def compute_signals(self):
+        raise RuntimeError("boom")
+
+
+def test_multi_market_batches_ticker_and_isolates_failures():
+    exchange = _BatchExchange({"KRW-BTC": 50000000.0, "KRW-ETH": 3000000.0, "KRW-XRP": 700.0})
+    slots = [MarketSlot("KRW-BTC", _AlwaysBuy(), _Positions()),
+             MarketSlot("KRW-ETH", _Broken(), _Positions()),
+             MarketSlot("KRW-XRP", _AlwaysBuy(), _Positions()),
+             MarketSlot("KRW-DOGE", _AlwaysBuy(), _Positions())]  # 시세 없음
+    asyncio.run(run_multi_market(exchange, slots, interval=0, max_ticks=3))
+
+    assert exchange.ticker_calls == 3
+    assert [s.ticks for s in slots] == [3, 0, 3, 0]
+    assert [s.failures for s in slots] == [0, 3, 0, 3]
+    assert sorted({o[0] for o in exchange.orders}) == ["KRW-BTC", "KRW-XRP"]
+    assert slots[0].position_manager.syncs == 3
+    assert slots[0].risk_manager.entry_price == 50000000.0
+
+
+def test_multi_market_polls_each_venue_once_over_shared_session():
+    with UpbitStubServer() as upbit_server, BinanceStubServer() as binance_server:
+        upbit_server.tickers = {"KRW-BTC": 50000000.0, "KRW-ETH": 3000000.0}
+        binance_server.tickers = {"BTCUSDT": 60000.0}
+        upbit = UpbitAPI(access_key="ak", secret_key="test-secret-key-0123456789abcdef",
+                         base_url=upbit_server.base_url, rate_limiter=RateLimitController(enabled=False))
+        binance = BinanceAPI(api_key=binance_server.api_key, secret_key=binance_server.secret_key,
+                             base_url=binance_server.base_url, rate_limiter=BinanceRateLimitController(enabled=False))
+        assert upbit.session is binance.session  # 두 거래소가 하나의 연결 풀 세션을 공유
+
+        slots = [MarketSlot("KRW-BTC", _AlwaysBuy(), _Positions()),
+                 MarketSlot("KRW-ETH", _AlwaysBuy(), _Positions()),
+                 MarketSlot("USDT-BTC", _AlwaysBuy(), _Positions(), exchange=binance, fixed_buy_amount=20)]
+        assert asyncio.run(run_tick(upbit, slots)) == {"KRW-BTC": True, "KRW-ETH": True, "USDT-BTC": True}
+
+        # 거래소마다 현재가 요청 한 번, 주문은 각 슬롯의 거래소로
+        assert [r[1] for r in upbit_server.requests].count("/v1/ticker") == 1
+        assert [r[1] for r in binance_server.requests].count("/api/v3/ticker/price") == 1
+        assert len(upbit_server.orders) == 2 and len(binance_server.orders) == 1
+        assert binance_server.orders[0]["cummulativeQuoteQty"] == "20.0"
+        assert slots[2].position_manager.coin_balance == pytest.approx(20 / 60000.0)
+        # Upbit 주문은 아직 체결 중(wait)이므로 잔고는 다음 동기화에서 재조정
+        assert slots[0].position_manager.needs_reconcile and slots[0].position_manager.coin_balance == 0.0
+        assert not slots[2].position_manager.needs_reconcile
+
+        # 한 거래소의 조회 실패는 다른 거래소 마켓에 영향을 주지 않음
+        binance_server.fail_next = [400]
+        outcome = asyncio.run(run_tick(upbit, slots))
+        assert outcome["KRW-BTC"] is True and isinstance(outcome["USDT-BTC"], KeyError)
+        upbit.close()
+        binance.close()
+
+
+def test_process_tick_sizes_buys_to_slippage_limit():
+    metrics = MetricsRegistry()
+    exchange = MockExchangeAPI(initial_cash=10000000.0, level_volume=0.00002)
+    exchange.set_price("KRW-BTC", 50000000.0)
+    estimator = SlippageEstimator(OrderBookCache(exchange, ttl=60.0))
+    risk = RiskManager()
+
+    # 한도 안에서는 얇은 호가로 최소 주문 금액을 채울 수 없으므로 주문하지 않음
+    positions = _Positions()
+    assert process_tick(exchange, _AlwaysBuy(), positions, risk, "KRW-BTC", 50000000.0,
+                        fixed_buy_amount=20000, metrics=metrics, slippage_estimator=estimator,
+                        max_slippage_bps=0.3)
+    assert exchange.orders == [] and positions.coin_balance == 0.0
+
+    # 한도를 넓히면 줄인 금액으로 주문하고, 예상 평균 체결가로 잔고/진입가를 반영
+    assert process_tick(exchange, _AlwaysBuy(), positions, risk, "KRW-BTC", 50000000.0,
+                        fixed_buy_amount=20000, metrics=metrics, slippage_estimator=estimator,
+                        max_slippage_bps=1.0)
+    order = exchange.orders[0]
+    assert 5000 <= float(order["price"]) < 20000
+    assert positions.coin_balance == pytest.approx(float(order["executed_volume"]))
+    assert risk.entry_price == pytest.approx(order["price_executed"])
+    assert metrics.summary("live_stage_seconds", "stage")["slippage"]["count"] == 2
+
+
+class _AccountsExchange:
+    def __init__(self, balances):
+        self.balances = balances
+        self.calls = 0
+
+    def get_accounts(self):
+        self.calls += 1
+        return [{"currency": c, "balance": str(b)} for c, b in self.balances.items()]
+
+
+class _FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_process_tick_records_stage_latencies():
+    metrics = MetricsRegistry()
+    exchange = _BatchExchange({"KRW-BTC": 50000000.0})
+    risk = RiskManager(stop_loss_pct=0.05, take_profit_pct=0.10)
+    assert process_tick(exchange, _AlwaysBuy(), _Positions(), risk, "KRW-BTC", 50000000.0,
+                        metrics=metrics)
+    assert not process_tick(exchange, _Broken(), _Positions(), risk, "KRW-BTC", 50000000.0,
+                            metrics=metrics)
+
+    stages = metrics.summary(STAGE_METRIC, "stage")
+    assert stages["signal"]["count"] == 2
+    assert stages["risk_check"]["count"] == 1
+    assert stages["order"]["count"] == 1
+    assert metrics.counter("live_orders_total", side="buy") == 1
+    assert metrics.counter("live_errors_total", stage="signal") == 1
+
+    metrics.enabled = False
+    process_tick(exchange, _AlwaysBuy(), _Positions(), risk, "KRW-BTC", 50000000.0, metrics=metrics)
+    assert metrics.summary(STAGE_METRIC, "stage")["signal"]["count"] == 2
+
+
+def test_position_manager_tracks_fills_between_reconciles():
+    exchange = _AccountsExchange({"KRW": 100000.0, "BTC": 0.0})
+    clock = _FakeClock()
+    pm = PositionManager(exchange, reconcile_interval=60, clock=clock)
+    assert (pm.cash_balance, pm.coin_balance, exchange.calls) == (100000.0, 0.0, 1)
+
+    assert pm.execute_order("buy", 50000.0, 0.1, fee=2.5)
+    assert pm.cash_balance == 100000.0 - 5000.0 - 2.5 and pm.coin_balance == 0.1
+    clock.now = 30
+    assert not pm.update_balances()
+    assert exchange.calls == 1
+
+    # 주기가 지나면 한 번의 /accounts 조회로 두 잔고를 맞추고, 차이를 기록
+    exchange.balances = {"KRW": 94990.0, "BTC": 0.1}
+    clock.now = 61
+    assert pm.update_balances()
+    assert (pm.cash_balance, pm.coin_balance, exchange.calls, pm.mismatches) == (94990.0, 0.1, 2, 1)
+
+    # 로컬 잔고로 체결이 불가능하면 다음 틱에 즉시 재조정
+    assert not pm.execute_order("sell", 50000.0, 1.0)
+    clock.now = 62
+    assert pm.update_balances()
+    assert exchange.calls == 3
+
+
+def test_account_snapshot_is_shared_across_markets():
+    exchange = _AccountsExchange({"KRW": 100000.0, "BTC": 0.5, "ETH": 2.0})
+    clock = _FakeClock()
+    snapshot = AccountSnapshot(exchange, max_age=1.0, clock=clock)
+    btc = PositionManager(exchange, asset="BTC", snapshot=snapshot, clock=clock)
+    eth = PositionManager(exchange, asset="ETH", snapshot=snapshot, clock=clock)
+    assert (btc.coin_balance, eth.coin_balance, eth.cash_balance) == (0.5, 2.0, 100000.0)
+    assert exchange.calls == 1
+
+
+def test_order_executor_tracks_orders_to_real_fills():
+    with UpbitStubServer() as server:
+        server.tickers = {"KRW-BTC": 50000000.0}
+        server.accounts = [{"currency": "KRW", "balance": "100000"}]
+        server.fill_after_polls = 3
+        api = UpbitAPI(access_key="ak", secret_key="test-secret-key-0123456789abcdef",
+                       base_url=server.base_url)
+        pm = PositionManager(api)
+        risk = RiskManager()
+        executor = OrderExecutor(api, poll_interval=0.01)
+
+        # 주문 제출 직후에는 잔고가 바뀌지 않고, 체결 추적 중에는 추가 주문을 내지 않음
+        assert process_tick(api, _AlwaysBuy(), pm, risk, "KRW-BTC", 49000000.0, order_executor=executor)
+        assert process_tick(api, _AlwaysBuy(), pm, risk, "KRW-BTC", 49000000.0, order_executor=executor)
+        assert pm.cash_balance == 100000.0
+        assert _wait_until(lambda: executor.pending("KRW-BTC") == 0)
+        executor.submit("KRW-BTC", "sell", volume=0.0001).result(timeout=5)
+        assert _wait_until(lambda: executor.pending("KRW-BTC") == 0)
+        assert len(server.orders) == 2
+
+        fills = executor.apply_fills(pm, risk, market="KRW-BTC")
+        buy = next(f for f in fills if f.side == "buy")
+        assert buy.state == "cancel" and buy.avg_price == 50000000.0
+        assert buy.volume == 5250 / 50000000.0 and buy.fee == 5250 * 0.0005
+        assert risk.entry_price is None  # 매도 체결이 매수 뒤에 반영됨
+        assert pm.cash_balance == 100000.0 - 5250 - buy.fee + 0.0001 * 50000000.0 * (1 - 0.0005)
+        executor.shutdown()
+
+
+def test_process_tick_books_exchange_fills_with_fees():
+    exchange = MockExchangeAPI(initial_cash=100000.0, fee_rate=0.0005, level_volume=0.00005)
+    exchange.set_price("KRW-BTC", 50000000.0)
+    pm = PositionManager(exchange, reconcile_interval=None)
+    risk = RiskManager()
+
+    # 호가를 따라 내려간 실제 평균 체결가와 수수료로 반영하므로 거래소 잔고와 그대로 일치
+    assert process_tick(exchange, _AlwaysBuy(), pm, risk, "KRW-BTC", 50000000.0, metrics=MetricsRegistry())
+    buy = exchange.orders[-1]
+    assert float(buy["paid_fee"]) == pytest.approx(5250 * 0.0005)
+    assert pm.cash_balance == pytest.approx(exchange.balances["KRW"]) == pytest.approx(100000.0 - 5250 * 1.0005)
+    assert pm.coin_balance == pytest.approx(exchange.balances["BTC"])
+    assert risk.entry_price == pytest.approx(buy["price_executed"]) and risk.entry_price > 50000000.0
+
+    exchange.set_price("KRW-BTC", 60000000.0)
+    assert process_tick(exchange, _Hold(), pm, risk, "KRW-BTC", 60000000.0, metrics=MetricsRegistry())
+    assert exchange.orders[-1]["side"] == "ask" and float(exchange.orders[-1]["paid_fee"]) > 0
+    assert pm.cash_balance == pytest.approx(exchange.balances["KRW"]) and pm.coin_balance == pytest.approx(0.0)
+    assert not pm.needs_reconcile and risk.entry_price is None
+
+
+def test_breakout_strategy_enters_and_exits_through_process_tick():
+    rng = np.random.default_rng(11)
+    prices = np.round(5e7 * np.exp(np.cumsum(rng.normal(0.0, 0.001, 400))), -3)
+    exchange = MockExchangeAPI(initial_cash=1e7)
+    pm = PositionManager(exchange, reconcile_interval=None)
+    strategy, risk = BreakoutStrategy(10), RiskManager(stop_loss_pct=0.5, take_profit_pct=0.5)
+    metrics = MetricsRegistry()
+
+    fills = []
+    for i, price in enumerate(prices.tolist()):
+        exchange.set_price("KRW-BTC", price)
+        assert process_tick(exchange, strategy, pm, risk, "KRW-BTC", price, metrics=metrics)
+        fills.extend((i, o["side"]) for o in exchange.orders[len(fills):])
+
+    # 체결될 때마다 on_buy/on_sell이 호출되므로 보유 중에는 재진입하지 않고 청산 채널에서 매도
+    expected = [(i, "bid" if s == "BUY" else "ask") for i, s in enumerate(breakout_signals(prices, 10)) if s != "HOLD"]
+    assert fills == expected
+    assert {"bid", "ask"} <= {side for _, side in fills}
+    assert (strategy.position == "LONG") == (pm.coin_balance > 0)
+
+
+def _replay_prices(n, seed=3):
+    rng = np.random.default_rng(seed)
+    return 50000000.0 * np.exp(np.cumsum(rng.normal(0.0, 0.003, n)))
+
+
+def _fills(result):
+    return [(o["side"], o["executed_volume"], o["price_executed"], o["timestamp"]) for o in result["orders"]]
+
+
+def test_replay_samples_recorded_ticks_like_a_polling_loop():
+    prices = _replay_prices(5000)
+    timestamps = 1700000000000 + 1000 * np.arange(len(prices))  # 1초 간격 기록
+
+    recorded = run_replay({"timestamp": timestamps, "close": prices},
+                          SimpleMovingAverageStrategy(5, 20), interval=5, initial_cash=1e9)
+    again = run_replay({"timestamp": timestamps, "close": prices},
+                       SimpleMovingAverageStrategy(5, 20), interval=5, initial_cash=1e9)
+    # 5초마다 폴링했다면 보았을 가격만 틱당 하나씩 재생
+    sampled = run_replay(prices[::5], SimpleMovingAverageStrategy(5, 20), interval=5, initial_cash=1e9)
+
+    assert recorded["ticks"] == len(prices[::5]) == sampled["ticks"]
+    assert recorded["orders"]
+    assert _fills(recorded) == _fills(again)
+    assert [f[:3] for f in _fills(recorded)] == [f[:3] for f in _fills(sampled)]
+    assert recorded["simulated_seconds"] == 5 * recorded["ticks"]
+    assert recorded["coin"] == pytest.approx(sum(
+        (1 if o["side"] == "bid" else -1) * o["quantity"] for o in recorded["orders"]))
+
+
+def test_run_live_trading_stops_when_replay_is_exhausted():
+    exchange = MockExchangeAPI()
+    source = ReplayPriceSource([1e8, 1.01e8, 1.02e8], exchange=exchange)
+    positions = _Positions()
+    assert run_live_trading(exchange, _AlwaysBuy(), positions, price_source=source) == 3
+    assert exchange.prices["KRW-BTC"] == 1.02e8
+    assert len(exchange.orders) == 3
+
+    source = ReplayPriceSource([100.0] * 10)
+    assert run_live_trading(exchange, _AlwaysBuy(), _Positions(), price_source=source, max_ticks=4) == 4
+
+
+def test_restart_resumes_from_checkpoint(tmp_path):
+    clock = SimulatedClock(1700000000.0)
+    exchange = MockExchangeAPI(initial_cash=1e9, clock=clock)
+    prices = 5e7 * (1 + 1e-4 * np.arange(300))  # 꾸준히 올라 한 번 매수 후 보유 (익절 전)
+    source = ReplayPriceSource(prices, clock=clock, exchange=exchange)
+    strategy, risk = SimpleMovingAverageStrategy(5, 20), RiskManager()
+    checkpoint = StateCheckpoint(str(tmp_path / "state" / "KRW-BTC.json"), clock=clock)
+    run_live_trading(exchange, strategy, PositionManager(exchange, clock=clock.monotonic), price_source=source,
+                     metrics=MetricsRegistry(), risk_manager=risk, checkpoint=checkpoint)
+    assert len(exchange.orders) == 1 and strategy.position == "LONG"
+    assert risk.entry_price == exchange.orders[0]["price_executed"]  # 실제 체결가 (매도 호가)
+
+    # 재시작: 새 전략/리스크 관리자가 첫 틱부터 이전 프로세스와 같은 판단
+    restarted, restarted_risk = SimpleMovingAverageStrategy(5, 20), RiskManager()
+    assert warm_start(restarted, restarted_risk, "KRW-BTC", checkpoint=checkpoint, exchange=exchange) == "checkpoint"
+    assert restarted.get_state() == strategy.get_state()
+    assert restarted_risk.entry_price == risk.entry_price
+    for s in (strategy, restarted):
+        s.update_price(prices[-1] * 1.001)
+    assert restarted.position == "LONG"
+    assert restarted.compute_signals() == strategy.compute_signals() == "HOLD"
+
+    # 오래된 체크포인트는 가격 버퍼를 쓰지 않지만 진입가는 복원. 코인이 없으면 진입가를 지움
+    clock.sleep(3600)
+    stale, stale_risk = SimpleMovingAverageStrategy(5, 20), RiskManager()
+    assert warm_start(stale, stale_risk, "KRW-BTC", checkpoint=checkpoint, exchange=exchange) == "none"
+    assert stale.get_state()["prices"] == [] and stale_risk.entry_price == risk.entry_price
+    exchange.balances["BTC"] = 0.0
+    assert warm_start(SimpleMovingAverageStrategy(5, 20), stale_risk, "KRW-BTC", checkpoint=checkpoint,
+                      exchange=exchange) == "none"
+    assert stale_risk.entry_price is None
+
+
+def test_checkpoint_writes_on_state_change_or_interval(tmp_path):
+    clock = SimulatedClock(1700000000.0)
+    checkpoint = StateCheckpoint(str(tmp_path / "KRW-BTC.json"), clock=clock, interval=30.0)
+    strategy, risk = SimpleMovingAverageStrategy(5, 20), RiskManager()
+    risk.set_entry_price(100.0)
+
+    # 가격 버퍼만 바뀌는 틱은 interval마다 한 번만 저장
+    saved = []
+    for i in range(100):
+        strategy.update_price(100.0 + i)
+        saved.append(checkpoint.maybe_save("KRW-BTC", strategy, risk))
+        clock.sleep(1.0)
+    assert [i for i, s in enumerate(saved) if s] == [0, 30, 60, 90]
+
+    # 진입가가 바뀌면 바로 저장
+    risk.set_entry_price(150.0)
+    assert checkpoint.maybe_save("KRW-BTC", strategy, risk)
+    assert not checkpoint.maybe_save("KRW-BTC", strategy, risk)
+    assert checkpoint.load()["risk"]["entry_price"] == 150.0
+
+
+def test_warm_start_fills_buffers_from_recent_candles(tmp_path):
+    now_ms = int(time.time() * 1000)
+    start = now_ms - now_ms % 60_000 - 50 * 60_000
+    rows = make_upbit_candles("KRW-BTC", start, 50)
+    closes = [r["trade_price"] for r in rows]
+
+    with UpbitStubServer() as server, CandleStore(str(tmp_path / "candles")) as store:
+        server.candles[("KRW-BTC", "candles/minutes/1")] = rows
+        downloader = CandleDownloader(store, base_url=server.base_url, checkpoint_dir=str(tmp_path / "ckpt"),
+                                      rate_limit=RateLimitController(enabled=False))
+
+        # 로컬 저장소가 비어 있으면 REST 한 번으로 최근 캔들을 받음
+        strategy = SimpleMovingAverageStrategy(5, 20)
+        assert warm_start(strategy, RiskManager(), "KRW-BTC", store=store, downloader=downloader) == "candles"
+        assert list(strategy.prices) == closes[-20:]
+        assert len(server.requests) == 1 and server.requests[0][2]["count"] == "20"
+        strategy.update_price(closes[-1] + 100)
+        assert strategy.compute_signals() == "BUY"
+
+        # 최근 캔들이 로컬에 있으면 요청하지 않음
+        store.append("KRW-BTC", "minute1", parse_candles(rows))
+        assert recent_closes("KRW-BTC", 31, store=store, downloader=downloader) == closes[-31:]
+        breakout = BreakoutStrategy(30)
+        warm_start(breakout, RiskManager(), "KRW-BTC", store=store, downloader=downloader)
+        assert len(server.requests) == 1
+        assert breakout.upper.value == max(closes[-31:-1])
+
+    # 체크포인트가 없으면 진입가는 계좌의 평균 매수가로 복원
+    exchange = MockExchangeAPI()
+    exchange.set_price("KRW-BTC", 5e7)
+    exchange.place_order("KRW-BTC", "buy", price=100000)
+    risk = RiskManager()
+    warm_start(SimpleMovingAverageStrategy(5, 20), risk, "KRW-BTC", exchange=exchange)
+    assert risk.entry_price == pytest.approx(exchange.avg_buy_price["BTC"]) and risk.entry_price > 5e7
+
+
+def test_multi_market_evaluates_portfolio_risk_once_per_batch():
+    portfolio = PortfolioRiskManager(stop_loss_pct=0.05, take_profit_pct=0.10, max_exposure=1e9)
+    exchange = _BatchExchange({"KRW-BTC": 50000000.0, "KRW-ETH": 3000000.0})
+    slots = [MarketSlot(m, _AlwaysBuy(), _Positions(), risk_manager=portfolio.view(m))
+             for m in ("KRW-BTC", "KRW-ETH")]
+    asyncio.run(run_tick(exchange, slots, portfolio=portfolio))
+    assert portfolio.entry_price("KRW-BTC") == 50000000.0 and len(exchange.orders) == 2
+    assert portfolio.quantity[portfolio.slot("KRW-ETH")] == slots[1].position_manager.coin_balance > 0
+
+    # BTC 손절가 아래: 배치 평가 결과로 매도, 노출 한도를 넘으면 ETH 추가 매수는 건너뜀
+    exchange.prices["KRW-BTC"] = 47000000.0
+    portfolio.max_exposure = 0.0
+    asyncio.run(run_tick(exchange, slots, portfolio=portfolio))
+    assert exchange.orders[2][:2] == ("KRW-BTC", "sell")
+    assert len(exchange.orders) == 3
+    assert portfolio.entry_price("KRW-BTC") is None
+
+
+class _Hold(_AlwaysBuy):
+    def compute_signals(self):
+        return "HOLD"
+
+
+@pytest.mark.parametrize("reason,prices", [("STOP_LOSS", [94.0]), ("TAKE_PROFIT", [111.0]),
+                                           ("TRAILING_STOP", [108.0, 104.0]), ("MAX_DRAWDOWN", [100.0])])
+def test_process_tick_sells_on_every_portfolio_exit_reason(reason, prices):
+    portfolio = PortfolioRiskManager(stop_loss_pct=0.05, take_profit_pct=0.10, trailing_stop_pct=0.03)
+    view = portfolio.view("KRW-BTC")
+    view.set_entry_price(100.0)
+    portfolio.halted = reason == "MAX_DRAWDOWN"
+    exchange = _BatchExchange({"KRW-BTC": prices[-1]})
+    positions = _Positions()
+    positions.coin_balance = 0.5
+    for price in prices[:-1]:
+        assert view.check_exit_conditions(price) is None
+
+    assert view.check_exit_conditions(prices[-1]) == reason
+    assert process_tick(exchange, _Hold(), positions, view, "KRW-BTC", prices[-1])
+    assert exchange.orders == [("KRW-BTC", "sell", 0.001, None)]
+    assert view.entry_price is None
+
+
+def test_multi_market_drawdown_uses_total_equity():
+    accounts = _AccountsExchange({"KRW": 100000.0, "BTC": 0.5, "ETH": 2.0})
+    snapshot = AccountSnapshot(accounts, max_age=60.0, clock=_FakeClock())
+    portfolio = PortfolioRiskManager(max_drawdown_pct=0.2)
+    slots = [MarketSlot(f"KRW-{asset}", _Hold(), PositionManager(accounts, asset=asset, snapshot=snapshot),
+                        risk_manager=portfolio.view(f"KRW-{asset}")) for asset in ("BTC", "ETH")]
+    exchange = _BatchExchange({"KRW-BTC": 100000.0, "KRW-ETH": 10000.0})
+
+    # 공유 현금은 한 번만 세고, 진입가가 없는 보유분도 현재가로 평가: 100000 + 50000 + 20000
+    asyncio.run(run_tick(exchange, slots, portfolio=portfolio))
+    assert portfolio.equity_peak == 170000.0
+    exchange.prices["KRW-ETH"] = 5000.0
+    asyncio.run(run_tick(exchange, slots, portfolio=portfolio))
+    assert portfolio.drawdown == pytest.approx(10000 / 170000) and not portfolio.halted
+    # 가격이 빠진 시장은 마지막 가격으로 평가
+    del exchange.prices["KRW-ETH"]
+    exchange.prices["KRW-BTC"] = 40000.0
+    asyncio.run(run_tick(exchange, slots, portfolio=portfolio))
+    assert portfolio.drawdown == pytest.approx(40000 / 170000) and portfolio.halted
+
+
+def test_portfolio_rejects_mixed_quote_currencies():
+    portfolio = PortfolioRiskManager()
+    portfolio.view("KRW-BTC")
+    with pytest.raises(ValueError):
+        portfolio.view("USDT-BTC")
+    assert portfolio.quote_currency == "KRW" and portfolio.markets == ["KRW-BTC"]
+
+    exchange = _BatchExchange({"KRW-BTC": 50000000.0, "USDT-BTC": 60000.0})
+    slots = [MarketSlot("KRW-BTC", _Hold(), _Positions()), MarketSlot("USDT-BTC", _Hold(), _Positions())]
+    with pytest.raises(ValueError):
+        asyncio.run(run_tick(exchange, slots, portfolio=PortfolioRiskManager()))
+    with pytest.raises(ValueError):
+        asyncio.run(run_multi_market(exchange, slots, interval=0, max_ticks=1, portfolio=PortfolioRiskManager()))
+    assert exchange.ticker_calls == 0
+    # 포트폴리오 없이 운용하면 거래소별로 그대로 동작
+    assert asyncio.run(run_tick(exchange, slots)) == {"KRW-BTC": True, "USDT-BTC": True}
+
+
+class _TradelessExchange(_AccountsExchange):
+    """체결 수량만 알려주고 체결 내역/금액은 비어 있는 주문을 돌려주는 거래소"""
+    def __init__(self, balances, fail=False):
+        super().__init__(balances)
+        self.fail = fail
+        self.order_queries = 0
+
+    def place_order(self, market, side, volume=None, price=None):
+        if self.fail:
+            raise TimeoutError("order status unknown")
+        return {"uuid": "u1", "market": market, "state": "done", "executed_volume": "0.001", "trades": []}
+
+    def get_order(self, uuid):
+        self.order_queries += 1
+        return {"uuid": uuid, "market": "KRW-BTC", "state": "done", "executed_volume": "0.001", "trades": []}
+
+
+def test_order_executor_never_books_zero_price_and_reconciles_failures():
+    exchange = _TradelessExchange({"KRW": 100000.0})
+    pm = PositionManager(exchange, reconcile_interval=None)
+    risk = RiskManager()
+    executor = OrderExecutor(exchange, poll_interval=0.01)
+    try:
+        # 체결 금액이 없으면 한 번 더 조회하고, 그래도 없으면 주문 당시 시세로 반영
+        fill = executor.submit("KRW-BTC", "buy", price=5000, quote=5000000.0).result(timeout=5)
+        assert exchange.order_queries == 1 and fill.avg_price == 5000000.0
+        executor.apply_fills(pm, risk)
+        assert risk.entry_price == 5000000.0 and pm.coin_balance == 0.001
+
+        # 시세도 모르면 0원으로 반영하지 않고 재조정 대상으로 표시
+        executor.submit("KRW-BTC", "sell", volume=0.001).result(timeout=5)
+        executor.apply_fills(pm, risk)
+        assert risk.entry_price == 5000000.0 and pm.needs_reconcile
+        pm.update_balances()
+
+        # 결과를 알 수 없는 실패도 재조정 대상으로 표시
+        exchange.fail = True
+        with pytest.raises(TimeoutError):
+            executor.submit("KRW-BTC", "buy", price=5000).result(timeout=5)
+        assert not pm.needs_reconcile
+        executor.apply_fills(pm, risk, market="KRW-BTC")
+        assert pm.needs_reconcile
+    finally:
+        executor.shutdown()
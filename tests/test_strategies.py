@@ -0,0 +1,217 @@
+import numpy as np
+import pytest
+
+from src.strategies import indicators
+from src.strategies.breakout import BreakoutStrategy
+from src.strategies.indicators import RESYNC_INTERVAL, IndicatorEngine
+from src.strategies.simple_moving_average import SimpleMovingAverageStrategy
+
+
+def _prices(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return (20000 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))).tolist()
+
+
+def _run(strategy, prices):
+    signals = []
+    for p in prices:
+        strategy.update_price(p)
+        signals.append(strategy.compute_signals())
+    return signals
+
+
+@pytest.mark.parametrize("short_window,long_window", [(5, 20), (3, 3), (10, 200)])
+def test_incremental_matches_default(short_window, long_window):
+    prices = _prices(3 * RESYNC_INTERVAL, seed=short_window)
+    default = SimpleMovingAverageStrategy(short_window, long_window)
+    incremental = SimpleMovingAverageStrategy(short_window, long_window, incremental=True)
+    assert _run(incremental, prices) == _run(default, prices)
+    assert incremental.long_sma.value == pytest.approx(np.mean(prices[-long_window:]))
+    assert incremental.short_sma.value == pytest.approx(np.mean(prices[-short_window:]))
+
+
+def test_compute_signals_array_matches_per_tick():
+    prices = _prices(2000, seed=7)
+    strategy = SimpleMovingAverageStrategy(5, 20)
+    expected = _run(SimpleMovingAverageStrategy(5, 20), prices)
+    signals = strategy.compute_signals_array(prices)
+    assert signals.tolist() == expected
+    assert "BUY" in expected and "HOLD" in expected
+
+
+def test_compute_signals_array_holds_while_long():
+    strategy = SimpleMovingAverageStrategy(5, 20)
+    strategy.on_buy(20000)
+    assert set(strategy.compute_signals_array(_prices(100)).tolist()) == {"HOLD"}
+
+
+def _ohlc(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 20000 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    spread = close * rng.uniform(0, 0.003, n)
+    return close + spread, close - spread, close
+
+
+def _engine_with_all():
+    engine = IndicatorEngine()
+    for subscribe in (lambda: engine.sma(20), lambda: engine.ema(12), lambda: engine.rsi(14),
+                      lambda: engine.bollinger(20, 2.0), lambda: engine.atr(14),
+                      lambda: engine.rolling_max(30), lambda: engine.rolling_min(30)):
+        subscribe()
+    return engine
+
+
+def test_incremental_indicators_match_batch():
+    high, low, close = _ohlc(3 * RESYNC_INTERVAL + 17, seed=4)
+    engine = _engine_with_all()
+    batch = engine.compute_batch(close, high, low)
+    streamed = {name: [] for name in batch}
+    for h, l, c in zip(high, low, close):
+        engine.update(c, h, l)
+        for indicator in engine.indicators:
+            streamed[indicator.name].append(indicator.value)
+
+    for name, expected in batch.items():
+        values = streamed[name]
+        if name.startswith("bollinger"):
+            for column, band in enumerate(expected):
+                got = np.array([np.nan if v is None else v[column] for v in values])
+                np.testing.assert_allclose(got, band, rtol=1e-9, equal_nan=True)
+            continue
+        got = np.array([np.nan if v is None else v for v in values])
+        assert np.array_equal(np.isnan(got), np.isnan(expected)), name
+        if name.startswith("rolling"):
+            assert np.array_equal(got, expected, equal_nan=True), name
+        else:
+            np.testing.assert_allclose(got, expected, rtol=1e-9, atol=1e-9, err_msg=name)
+
+
+def test_batch_indicators_match_naive_definitions():
+    _, _, close = _ohlc(500, seed=5)
+    np.testing.assert_allclose(indicators.sma(close, 10)[9:],
+                               [close[i - 9:i + 1].mean() for i in range(9, 500)], rtol=1e-12)
+    assert np.array_equal(indicators.rolling_max(close, 7)[6:],
+                          [close[i - 6:i + 1].max() for i in range(6, 500)])
+    assert np.array_equal(indicators.rolling_min(close, 7)[6:],
+                          [close[i - 6:i + 1].min() for i in range(6, 500)])
+
+    expected, alpha = [close[0]], 2.0 / 11
+    for price in close[1:]:
+        expected.append(alpha * price + (1 - alpha) * expected[-1])
+    np.testing.assert_allclose(indicators.ema(close, 10)[9:], expected[9:], rtol=1e-12)
+    assert np.isnan(indicators.ema(close, 10)[:9]).all()
+
+
+def test_engine_shares_indicators_and_updates_once_per_bar():
+    engine = IndicatorEngine()
+    fast = SimpleMovingAverageStrategy(5, 20, incremental=True, engine=engine)
+    slow = SimpleMovingAverageStrategy(10, 20, incremental=True, engine=engine)
+    assert fast.long_sma is slow.long_sma
+    assert len(engine.indicators) == 3
+
+    prices = _prices(300, seed=9)
+    expected_fast = _run(SimpleMovingAverageStrategy(5, 20, incremental=True), prices)
+    expected_slow = _run(SimpleMovingAverageStrategy(10, 20, incremental=True), prices)
+    got_fast, got_slow = [], []
+    for p in prices:
+        fast.update_price(p)
+        slow.update_price(p)
+        got_fast.append(fast.compute_signals())
+        got_slow.append(slow.compute_signals())
+    assert engine.count == len(prices)
+    assert got_fast == expected_fast and got_slow == expected_slow
+
+    with pytest.raises(ValueError):
+        engine.ema(12)
+    with pytest.raises(ValueError):
+        engine.update(1.0, index=engine.count + 1)
+
+
+def test_engine_names_exact_and_incremental_sma_apart():
+    engine = IndicatorEngine()
+    engine.sma(5)
+    engine.sma(5, exact=True)
+    for p in _prices(10, seed=3):
+        engine.update(p)
+    assert set(engine.values()) == {"sma_5", "sma_5_exact"}
+    assert engine.values()["sma_5"] == pytest.approx(engine.values()["sma_5_exact"])
+
+
+def _run_with_fills(strategy, prices):
+    signals = []
+    for p in prices:
+        strategy.update_price(p)
+        signal = strategy.compute_signals()
+        if signal == "BUY":
+            strategy.on_buy(p)
+        elif signal == "SELL":
+            strategy.on_sell()
+        signals.append(signal)
+    return signals
+
+
+@pytest.mark.parametrize("entry_lookback,exit_lookback", [(20, None), (1, 1), (500, 2000)])
+def test_breakout_batch_matches_per_tick(entry_lookback, exit_lookback):
+    prices = _prices(5000, seed=entry_lookback)
+    strategy = BreakoutStrategy(entry_lookback, exit_lookback)
+    expected = _run_with_fills(strategy, prices)
+    assert strategy.compute_signals_array(prices).tolist() == expected
+    assert "BUY" in expected and "SELL" in expected
+
+
+def test_breakout_channel_excludes_current_price():
+    strategy = BreakoutStrategy(3, 2)
+    assert _run_with_fills(strategy, [10, 12, 11, 12, 13, 12.5, 12, 11.9]) == \
+        ["HOLD", "HOLD", "HOLD", "HOLD", "BUY", "HOLD", "SELL", "HOLD"]
+
+
+def test_portfolio_risk_matches_single_risk_managers():
+    from src.strategies.risk_management import EXIT_REASONS, PortfolioRiskManager, RiskManager
+
+    rng = np.random.default_rng(11)
+    n = 300
+    markets = [f"KRW-C{i}" for i in range(n)]
+    entries = rng.uniform(100, 1000, n)
+    portfolio = PortfolioRiskManager(stop_loss_pct=0.05, take_profit_pct=0.10, capacity=4)
+    singles = []
+    for market, entry in zip(markets, entries):
+        portfolio.open(market, entry)
+        single = RiskManager(0.05, 0.10)
+        single.set_entry_price(entry)
+        singles.append(single)
+    portfolio.close(markets[7])
+    singles[7].entry_price = None
+
+    for _ in range(20):
+        prices = entries * rng.uniform(0.9, 1.15, n)
+        codes = portfolio.evaluate(dict(zip(markets, prices)))
+        assert [EXIT_REASONS[c] for c in codes] == [s.check_exit_conditions(p) for s, p in zip(singles, prices)]
+    assert len(portfolio.entry) >= n
+
+
+def test_portfolio_trailing_stop_and_limits():
+    from src.strategies.risk_management import PortfolioRiskManager
+
+    portfolio = PortfolioRiskManager(stop_loss_pct=0.5, take_profit_pct=1.0, trailing_stop_pct=0.05,
+                                     max_exposure=1500.0, max_drawdown_pct=0.2)
+    btc, eth = portfolio.view("KRW-BTC"), portfolio.view("KRW-ETH")
+    btc.set_entry_price(100.0)
+    portfolio.set_quantity("KRW-BTC", 10.0)
+
+    # 고점 120에서 5% 넘게 밀리면 트레일링 스톱 (진입가 기준 손절/익절은 아님)
+    assert portfolio.exit_signals({"KRW-BTC": 120.0}, cash=1000.0) == {}
+    assert portfolio.exposure == 1200.0
+    assert not portfolio.can_open(400.0) and portfolio.can_open(300.0)
+    assert btc.check_exit_conditions(114.5) is None
+    assert btc.check_exit_conditions(113.9) == "TRAILING_STOP"
+    assert btc.get_state() == {"entry_price": 100.0, "high_water": 120.0}
+
+    # 자산이 고점(2200) 대비 20% 이상 줄면 신규 진입을 멈추고 모든 포지션 청산 신호
+    eth.set_entry_price(50.0)
+    assert portfolio.exit_signals({"KRW-BTC": 113.0, "KRW-ETH": 50.0}, cash=600.0) == \
+        {"KRW-BTC": "TRAILING_STOP", "KRW-ETH": "MAX_DRAWDOWN"}
+    assert portfolio.halted and not eth.can_open(0.0)
+    btc.entry_price = None
+    assert btc.check_exit_conditions(50.0) is None and btc.entry_price is None
+    portfolio.resume()
+    assert eth.can_open(100.0)
@@ -0,0 +1,141 @@
+import json
+import logging
+import threading
+
+import pytest
+import requests
+
+from src.utils.logger import get_logger, log_event, setup_logging, shutdown_logging
+from src.utils.metrics import MetricsRegistry, MetricsServer, SnapshotWriter
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    root = logging.getLogger()
+    level = root.level
+    yield tmp_path
+    shutdown_logging()
+    root.setLevel(level)
+
+
+def _read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_log_event_writes_json_lines(log_dir):
+    setup_logging(log_dir=str(log_dir), console=False)
+    logger = get_logger("test.events")
+    log_event(logger, logging.INFO, "order_submitted", symbol="KRW-BTC", price=50000000.0)
+    logger.warning("plain %s", "message")
+    shutdown_logging()
+
+    lines = _read_lines(log_dir / "trading.log")
+    assert lines[0]["msg"] == "order_submitted"
+    assert lines[0]["symbol"] == "KRW-BTC"
+    assert lines[0]["price"] == 50000000.0
+    assert lines[0]["level"] == "INFO"
+    assert lines[1]["msg"] == "plain message"
+
+
+def test_disabled_level_skips_formatting(log_dir):
+    setup_logging(level=logging.INFO, log_dir=str(log_dir), console=False)
+    logger = get_logger("test.gating")
+
+    class Exploding:
+        def __str__(self):
+            raise AssertionError("formatted a disabled record")
+
+        __repr__ = __str__
+
+    log_event(logger, logging.DEBUG, "noisy", value=Exploding())
+    logger.debug("noisy %s", Exploding())
+    shutdown_logging()
+    assert _read_lines(log_dir / "trading.log") == []
+
+
+def test_formatting_happens_off_the_calling_thread(log_dir):
+    root = logging.getLogger()
+    # pytest의 캡처 핸들러는 호출 스레드에서 포맷하므로 잠시 떼어 둔다
+    others = list(root.handlers)
+    for handler in others:
+        root.removeHandler(handler)
+    setup_logging(log_dir=str(log_dir), console=False)
+    caller = threading.get_ident()
+    seen = []
+
+    class Probe:
+        def __str__(self):
+            seen.append(threading.get_ident())
+            return "probe"
+
+    get_logger("test.deferred").info("value=%s", Probe())
+    shutdown_logging()
+    for handler in others:
+        root.addHandler(handler)
+    assert seen and caller not in seen
+    assert _read_lines(log_dir / "trading.log")[0]["msg"] == "value=probe"
+
+
+def test_log_file_rotates(log_dir):
+    setup_logging(log_dir=str(log_dir), console=False, max_bytes=2000, backup_count=2)
+    logger = get_logger("test.rotation")
+    for i in range(200):
+        log_event(logger, logging.INFO, "tick", seq=i)
+    shutdown_logging()
+
+    files = sorted(p.name for p in log_dir.iterdir())
+    assert files == ["trading.log", "trading.log.1", "trading.log.2"]
+    assert _read_lines(log_dir / "trading.log")[-1]["seq"] == 199
+
+
+def test_metrics_percentiles_and_counters():
+    metrics = MetricsRegistry(window=100)
+    for ms in range(1, 101):
+        metrics.observe("stage_seconds", ms / 1000, stage="signal")
+    metrics.inc("orders_total", side="buy")
+    metrics.inc("orders_total", 2, side="buy")
+
+    stats = metrics.summary("stage_seconds", "stage")["signal"]
+    assert stats["count"] == 100
+    assert stats["p50_ms"] == pytest.approx(50)
+    assert stats["p95_ms"] == pytest.approx(95)
+    assert stats["p99_ms"] == pytest.approx(99)
+    assert stats["max_ms"] == pytest.approx(100)
+    assert metrics.counter("orders_total", side="buy") == 3
+
+    with metrics.time("stage_seconds", stage="order"):
+        pass
+    assert metrics.summary("stage_seconds", "stage")["order"]["count"] == 1
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = MetricsRegistry(enabled=False)
+    with metrics.time("stage_seconds", stage="signal"):
+        pass
+    metrics.observe("stage_seconds", 0.1, stage="signal")
+    metrics.inc("orders_total")
+    assert metrics.snapshot()["summaries"] == []
+    assert metrics.counter("orders_total") == 0
+
+
+def test_metrics_http_endpoint_and_snapshot_file(tmp_path):
+    metrics = MetricsRegistry()
+    metrics.observe("live_stage_seconds", 0.002, stage="signal")
+    metrics.inc("live_errors_total", stage="order")
+
+    server = MetricsServer(metrics, port=0).start()
+    try:
+        text = requests.get(server.url, timeout=5).text
+    finally:
+        server.stop()
+    assert "# TYPE live_stage_seconds summary" in text
+    assert 'live_stage_seconds{stage="signal",quantile="0.99"} 0.002' in text
+    assert 'live_stage_seconds_count{stage="signal"} 1' in text
+    assert 'live_errors_total{stage="order"} 1' in text
+
+    path = tmp_path / "metrics.json"
+    SnapshotWriter(metrics, str(path), interval=60).start().stop()
+    snapshot = json.loads(path.read_text())
+    assert snapshot["summaries"][0]["labels"] == {"stage": "signal"}
+    assert snapshot["counters"][0]["value"] == 1